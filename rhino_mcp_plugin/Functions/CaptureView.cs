@@ -102,13 +102,14 @@ namespace RhinoMCPModPlugin.Functions
             using var bitmap = view.CaptureToBitmap(size, drawGrid, drawAxes, drawAxes);
             if (bitmap == null) return new JObject { ["error"] = "View capture failed" };
 
-            string pngBase64;
+            // Sent as a raw attachment frame when negotiated; otherwise serialised as base64
+            byte[] pngBytes;
             using (var stream = new MemoryStream())
             {
 #pragma warning disable CA1416
                 bitmap.Save(stream, ImageFormat.Png);
 #pragma warning restore CA1416
-                pngBase64 = Convert.ToBase64String(stream.ToArray());
+                pngBytes = stream.ToArray();
             }
 
             var metadata = new JObject
@@ -136,7 +137,7 @@ namespace RhinoMCPModPlugin.Functions
 
             return new JObject
             {
-                ["png_base64"] = pngBase64,
+                ["png_base64"] = pngBytes,
                 ["metadata"] = metadata
             };
         }
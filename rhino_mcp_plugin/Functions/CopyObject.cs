@@ -22,10 +22,20 @@ public partial class RhinoMCPModFunctions
             throw new InvalidOperationException("Unable to duplicate object geometry.");
         }
 
+        // Optional rotation (about pivot, or the bbox center without one), then translation
         Transform xform = Transform.Identity;
+        if (parameters["rotation_matrix"] != null)
+        {
+            xform = parameters["pivot"] != null
+                ? applyRotationMatrixAtPivot(parameters)
+                : applyRotationMatrix(parameters, geometry);
+        }
         if (parameters["translation"] != null)
         {
-            xform = applyTranslation(parameters);
+            xform = applyTranslation(parameters) * xform;
+        }
+        if (parameters["rotation_matrix"] != null || parameters["translation"] != null)
+        {
             geometry.Transform(xform);
         }
 
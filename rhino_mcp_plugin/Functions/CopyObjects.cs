@@ -1,5 +1,6 @@
 using System;
 using System.Collections.Generic;
+using System.Linq;
 using Newtonsoft.Json.Linq;
 using Rhino;
 
@@ -16,24 +17,24 @@ public partial class RhinoMCPModFunctions
             throw new InvalidOperationException("No objects provided to copy.");
         }
 
+        // One id per entry, null where nothing was copied, so callers can match ids to entries
         var copiedIds = new List<Guid>();
         foreach (var entry in objects)
         {
-            if (entry is not JObject objParams)
-                continue;
-
-            JObject result = CopyObject(objParams);
-            Guid id = castToGuid(result["id"]);
-            if (id != Guid.Empty)
+            Guid id = Guid.Empty;
+            if (entry is JObject objParams)
             {
-                copiedIds.Add(id);
+                JObject result = CopyObject(objParams);
+                id = castToGuid(result["id"]);
             }
+            copiedIds.Add(id);
         }
 
         doc.Views.Redraw();
         return new JObject
         {
-            ["copied"] = copiedIds.Count
+            ["copied"] = copiedIds.Count(id => id != Guid.Empty),
+            ["ids"] = new JArray(copiedIds.Select(id => id != Guid.Empty ? new JValue(id.ToString()) : JValue.CreateNull()))
         };
     }
 }
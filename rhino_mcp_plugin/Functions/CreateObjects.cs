@@ -13,6 +13,8 @@ public partial class RhinoMCPModFunctions
     public JObject CreateObjects(JObject parameters)
         {
             var doc = RhinoDoc.ActiveDoc;
+            if (parameters["format"]?.Type == JTokenType.String && parameters["format"].ToString() == "columnar")
+                return CreateObjectsColumnar(parameters);
             var results = new JObject();
             
             // Process each object in the parameters
@@ -44,4 +46,55 @@ public partial class RhinoMCPModFunctions
             
             return results;
         }
+
+    // Columnar format: shared templates plus per-object columns ("template", "types", "names", and flat
+    // "translations" / "colors" with 3 numbers per object). Object i is its template with row i applied.
+    // Replies {"ids": [id or null per object], "errors": {"<row>": message}}.
+    private JObject CreateObjectsColumnar(JObject parameters)
+    {
+        var doc = RhinoDoc.ActiveDoc;
+        var templates = parameters["templates"] as JArray;
+        if (templates == null || templates.Count == 0)
+            throw new ArgumentException("templates must be a non-empty list");
+        var templateIndices = parameters["template"] as JArray;
+        var types = parameters["types"] as JArray;
+        var names = parameters["names"] as JArray;
+        var translations = parameters["translations"] as JArray;
+        var colors = parameters["colors"] as JArray;
+        int count = castToInt(parameters.SelectToken("count"));
+
+        var ids = new JArray();
+        var errors = new JObject();
+        for (int i = 0; i < count; i++)
+        {
+            try
+            {
+                int templateIndex = templateIndices == null ? 0 : castToInt(templateIndices[i]);
+                // CreateObject writes the new id into its parameters, so every object gets its own copy
+                var spec = (JObject)templates[templateIndex].DeepClone();
+                if (types != null && types[i].Type != JTokenType.Null)
+                    spec["type"] = types[i].ToString();
+                if (names != null && names[i].Type != JTokenType.Null)
+                    spec["name"] = names[i].ToString();
+                if (translations != null)
+                    spec["translation"] = new JArray(translations[3 * i], translations[3 * i + 1], translations[3 * i + 2]);
+                if (colors != null)
+                    spec["color"] = new JArray(colors[3 * i], colors[3 * i + 1], colors[3 * i + 2]);
+                JObject result = CreateObject(spec);
+                ids.Add(result["id"]);
+            }
+            catch (Exception ex)
+            {
+                ids.Add(JValue.CreateNull());
+                errors[i.ToString()] = ex.Message;
+            }
+        }
+
+        doc.Views.Redraw();
+        return new JObject
+        {
+            ["ids"] = ids,
+            ["errors"] = errors
+        };
+    }
 }
\ No newline at end of file
@@ -0,0 +1,150 @@
+using System;
+using System.Collections.Generic;
+using System.Linq;
+using Rhino;
+using Rhino.DocObjects;
+using Rhino.DocObjects.Tables;
+
+namespace RhinoMCPModPlugin.Functions;
+
+// Remembers which objects changed when, so get_document_info(since=token) can return only the
+// objects added, modified or deleted after an earlier reply. Every object event raises a sequence
+// number and stamps the object with it. Change tokens are "<journal>:<document>:<sequence>": tokens
+// from another plugin session or another document, or older than the trimmed history, are expired.
+public static class DocumentChangeJournal
+{
+    private const int MaxEntries = 500000;
+    private static readonly object sync = new object();
+    private static readonly string journalId = Guid.NewGuid().ToString("N").Substring(0, 8);
+    private static readonly Dictionary<Guid, long> changedAt = new Dictionary<Guid, long>();
+    private static long sequence;
+    private static long floor; // Changes at or before this sequence are no longer known
+
+    public static void Hook()
+    {
+        Unhook();
+        RhinoDoc.AddRhinoObject += OnObjectEvent;
+        RhinoDoc.DeleteRhinoObject += OnObjectEvent;
+        RhinoDoc.UndeleteRhinoObject += OnObjectEvent;
+        RhinoDoc.ReplaceRhinoObject += OnReplaceEvent;
+        RhinoDoc.ModifyObjectAttributes += OnAttributesEvent;
+        RhinoDoc.LayerTableEvent += OnLayerEvent;
+        RhinoDoc.EndOpenDocument += OnOpenEvent;
+        RhinoDoc.NewDocument += OnDocumentEvent;
+        RhinoDoc.CloseDocument += OnDocumentEvent;
+    }
+
+    public static void Unhook()
+    {
+        RhinoDoc.AddRhinoObject -= OnObjectEvent;
+        RhinoDoc.DeleteRhinoObject -= OnObjectEvent;
+        RhinoDoc.UndeleteRhinoObject -= OnObjectEvent;
+        RhinoDoc.ReplaceRhinoObject -= OnReplaceEvent;
+        RhinoDoc.ModifyObjectAttributes -= OnAttributesEvent;
+        RhinoDoc.LayerTableEvent -= OnLayerEvent;
+        RhinoDoc.EndOpenDocument -= OnOpenEvent;
+        RhinoDoc.NewDocument -= OnDocumentEvent;
+        RhinoDoc.CloseDocument -= OnDocumentEvent;
+    }
+
+    public static string CurrentToken(RhinoDoc doc)
+    {
+        lock (sync)
+        {
+            return $"{journalId}:{doc.RuntimeSerialNumber}:{sequence}";
+        }
+    }
+
+    // Ids stamped after the token's sequence; false if the token cannot be answered from the journal
+    public static bool TryGetChangesSince(RhinoDoc doc, string token, out HashSet<Guid> ids)
+    {
+        ids = null;
+        string[] parts = token?.Split(':');
+        if (parts == null || parts.Length != 3 || parts[0] != journalId ||
+            parts[1] != doc.RuntimeSerialNumber.ToString() || !long.TryParse(parts[2], out long since))
+        {
+            return false;
+        }
+
+        lock (sync)
+        {
+            if (since < floor || since > sequence)
+            {
+                return false;
+            }
+            ids = new HashSet<Guid>(changedAt.Where(entry => entry.Value > since).Select(entry => entry.Key));
+            return true;
+        }
+    }
+
+    private static void Mark(IEnumerable<Guid> ids)
+    {
+        lock (sync)
+        {
+            sequence++;
+            foreach (var id in ids)
+            {
+                changedAt[id] = sequence;
+            }
+            if (changedAt.Count > MaxEntries)
+            {
+                // Forget the older half; tokens from before it get a full listing instead
+                long threshold = changedAt.Values.OrderBy(value => value).ElementAt(changedAt.Count / 2);
+                foreach (var id in changedAt.Where(entry => entry.Value <= threshold).Select(entry => entry.Key).ToList())
+                {
+                    changedAt.Remove(id);
+                }
+                floor = threshold;
+            }
+        }
+    }
+
+    private static void Reset()
+    {
+        lock (sync)
+        {
+            sequence++;
+            changedAt.Clear();
+            floor = sequence;
+        }
+    }
+
+    private static void OnObjectEvent(object sender, RhinoObjectEventArgs e) => Mark(new[] { e.ObjectId });
+    private static void OnReplaceEvent(object sender, RhinoReplaceObjectEventArgs e) => Mark(new[] { e.ObjectId });
+    private static void OnAttributesEvent(object sender, RhinoModifyObjectAttributesEventArgs e) => Mark(new[] { e.RhinoObject.Id });
+    private static void OnOpenEvent(object sender, DocumentOpenEventArgs e) => Reset();
+    private static void OnDocumentEvent(object sender, DocumentEventArgs e) => Reset();
+
+    // Renaming or reparenting a layer changes the layer path reported for its objects and those of its sublayers
+    private static void OnLayerEvent(object sender, LayerTableEventArgs e)
+    {
+        if (e.EventType != LayerTableEventType.Modified || e.Document == null)
+        {
+            return;
+        }
+        if (e.OldState != null && e.NewState != null && e.OldState.Name == e.NewState.Name &&
+            e.OldState.ParentLayerId == e.NewState.ParentLayerId)
+        {
+            // Visibility, lock or colour changes; the inventory does not report them
+            return;
+        }
+
+        var doc = e.Document;
+        var layer = doc.Layers[e.LayerIndex];
+        if (layer == null)
+        {
+            return;
+        }
+        string prefix = layer.FullPath + "::";
+        var affected = new HashSet<int>(
+            doc.Layers
+                .Where(candidate => candidate != null &&
+                    (candidate.Index == e.LayerIndex || (candidate.FullPath ?? "").StartsWith(prefix)))
+                .Select(candidate => candidate.Index)
+        );
+        Mark(doc.Objects
+            .Where(obj => obj != null && affected.Contains(obj.Attributes.LayerIndex))
+            .Select(obj => obj.Id)
+            .ToList());
+    }
+}
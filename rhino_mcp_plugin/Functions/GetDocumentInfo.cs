@@ -261,10 +261,19 @@ public partial class RhinoMCPModFunctions
             2,
             1000
         );
+        string since = parameters?["since"]?.ToString();
 
         RhinoApp.WriteLine($"Getting document info detail={detail} limit={limit} offset={offset}...");
 
         var doc = RhinoDoc.ActiveDoc;
+        string changeToken = DocumentChangeJournal.CurrentToken(doc);
+        HashSet<Guid> changedIds = null;
+        bool sinceExpired = false;
+        if (!string.IsNullOrEmpty(since) && !DocumentChangeJournal.TryGetChangesSince(doc, since, out changedIds))
+        {
+            // Unknown or too old: answer with the full listing and let the client start over
+            sinceExpired = true;
+        }
 
         var metaData = new JObject
         {
@@ -284,11 +293,16 @@ public partial class RhinoMCPModFunctions
             .OrderBy(docObject => docObject.Id)
             .ToList();
 
+        // With a valid since token only the objects changed after it are listed
+        var candidates = changedIds == null
+            ? objects
+            : objects.Where(docObject => changedIds.Contains(docObject.Id)).ToList();
+
         int skippedObjectErrors = 0;
         var matchedObjects = new List<RhinoObject>();
         if (hasSpatialFilter)
         {
-            foreach (var docObject in objects)
+            foreach (var docObject in candidates)
             {
                 try
                 {
@@ -307,7 +321,7 @@ public partial class RhinoMCPModFunctions
         }
         else
         {
-            matchedObjects = objects;
+            matchedObjects = candidates;
         }
 
         foreach (var docObject in matchedObjects.Skip(offset).Take(limit))
@@ -369,6 +383,23 @@ public partial class RhinoMCPModFunctions
             ["layers"] = layerData
         };
 
+        result["change_token"] = changeToken;
+        if (!string.IsNullOrEmpty(since))
+        {
+            result["since"] = since;
+            result["since_expired"] = sinceExpired;
+        }
+        if (changedIds != null)
+        {
+            // Changed objects that are not listed: deleted, or (with bbox) no longer matching the filter
+            var listedIds = new HashSet<Guid>(matchedObjects.Select(docObject => docObject.Id));
+            var removedIds = changedIds.Where(id => !listedIds.Contains(id)).OrderBy(id => id).ToList();
+            result["removed_count"] = removedIds.Count;
+            result["removed_ids"] = offset == 0
+                ? new JArray(removedIds.Select(id => id.ToString()))
+                : new JArray();
+        }
+
         if (hasSpatialFilter)
         {
             result["spatial_filter"] = new JObject
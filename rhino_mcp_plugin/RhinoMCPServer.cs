@@ -1,5 +1,7 @@
 ﻿using System;
 using System.Collections.Generic;
+using System.IO;
+using System.IO.Compression;
 using System.Linq;
 using System.Net;
 using System.Net.Sockets;
@@ -33,6 +35,11 @@ namespace RhinoMCPModPlugin
         private Thread serverThread;
         private readonly object lockObject = new object();
         private RhinoMCPModFunctions handler;
+        // Command type -> handler method, built once in the constructor
+        private readonly Dictionary<string, Func<JObject, JObject>> commandHandlers;
+        // Document changes made while no MCP command was executing; see FeatureRevisions
+        private static long externalRevision;
+        private static int commandDepth;
         public bool IsRunning
         {
             get
@@ -52,6 +59,7 @@ namespace RhinoMCPModPlugin
             this.listener = null;
             this.serverThread = null;
             this.handler = new RhinoMCPModFunctions();
+            this.commandHandlers = BuildCommandHandlers();
         }
 
 
@@ -68,6 +76,8 @@ namespace RhinoMCPModPlugin
                 running = true;
             }
 
+            HookDocumentEvents();
+
             try
             {
                 // Create TCP listener
@@ -96,6 +106,8 @@ namespace RhinoMCPModPlugin
                 running = false;
             }
 
+            UnhookDocumentEvents();
+
             // Close listener
             if (listener != null)
             {
@@ -170,6 +182,52 @@ namespace RhinoMCPModPlugin
             RhinoApp.WriteLine("Server thread stopped");
         }
 
+        private void HookDocumentEvents()
+        {
+            UnhookDocumentEvents();
+            DocumentChangeJournal.Hook();
+            RhinoDoc.AddRhinoObject += OnDocumentObjectEvent;
+            RhinoDoc.DeleteRhinoObject += OnDocumentObjectEvent;
+            RhinoDoc.UndeleteRhinoObject += OnDocumentObjectEvent;
+            RhinoDoc.ReplaceRhinoObject += OnDocumentReplaceEvent;
+            RhinoDoc.ModifyObjectAttributes += OnDocumentAttributesEvent;
+            RhinoDoc.LayerTableEvent += OnDocumentLayerEvent;
+            RhinoDoc.EndOpenDocument += OnDocumentOpenEvent;
+            RhinoDoc.NewDocument += OnDocumentEvent;
+            RhinoDoc.CloseDocument += OnDocumentEvent;
+        }
+
+        private void UnhookDocumentEvents()
+        {
+            DocumentChangeJournal.Unhook();
+            RhinoDoc.AddRhinoObject -= OnDocumentObjectEvent;
+            RhinoDoc.DeleteRhinoObject -= OnDocumentObjectEvent;
+            RhinoDoc.UndeleteRhinoObject -= OnDocumentObjectEvent;
+            RhinoDoc.ReplaceRhinoObject -= OnDocumentReplaceEvent;
+            RhinoDoc.ModifyObjectAttributes -= OnDocumentAttributesEvent;
+            RhinoDoc.LayerTableEvent -= OnDocumentLayerEvent;
+            RhinoDoc.EndOpenDocument -= OnDocumentOpenEvent;
+            RhinoDoc.NewDocument -= OnDocumentEvent;
+            RhinoDoc.CloseDocument -= OnDocumentEvent;
+        }
+
+        // Document events fire on the UI thread, where MCP commands also run; changes made by a command
+        // are reported to the client by the command itself, so only the others bump the revision
+        private static void NoteExternalChange()
+        {
+            if (commandDepth == 0)
+            {
+                Interlocked.Increment(ref externalRevision);
+            }
+        }
+
+        private static void OnDocumentObjectEvent(object sender, RhinoObjectEventArgs e) => NoteExternalChange();
+        private static void OnDocumentReplaceEvent(object sender, RhinoReplaceObjectEventArgs e) => NoteExternalChange();
+        private static void OnDocumentAttributesEvent(object sender, RhinoModifyObjectAttributesEventArgs e) => NoteExternalChange();
+        private static void OnDocumentLayerEvent(object sender, Rhino.DocObjects.Tables.LayerTableEventArgs e) => NoteExternalChange();
+        private static void OnDocumentOpenEvent(object sender, DocumentOpenEventArgs e) => NoteExternalChange();
+        private static void OnDocumentEvent(object sender, DocumentEventArgs e) => NoteExternalChange();
+
         private bool IsRunningInternal()
         {
             lock (lockObject)
@@ -178,6 +236,54 @@ namespace RhinoMCPModPlugin
             }
         }
 
+        // Wire protocol, see RhinoConnection in rhino_mcp_server/src/rhinomcp/server.py.
+        // Connections start in legacy mode (bare JSON documents). A "negotiate" command can switch
+        // them to length-prefixed framing: a 4-byte big-endian payload length, a flags byte, then the payload.
+        // Framed connections may also enable "request_ids": the envelope "id" is echoed in the reply so the
+        // client can keep several commands in flight and match replies that arrive out of order.
+        // They may also opt into zlib compression: frames at or above the negotiated threshold are deflated
+        // and carry FlagCompressed.
+        // With "attachments", byte[] values at the top level of a result are not base64-encoded: the reply lists
+        // their keys in "attachments" (the values become null) and one FlagAttachment frame per key follows it.
+        // With "revisions", every reply (pongs included) carries "revision": a counter of document changes made outside
+        // MCP commands (user edits, undo, opening another file), so clients know when cached object data is stale.
+        private const int ProtocolVersion = 1;
+        private const string FramingLegacy = "legacy";
+        private const string FramingLengthPrefixed = "length_prefixed";
+        private const string FeatureRequestIds = "request_ids";
+        private const string FeatureAttachments = "attachments";
+        private const string FeatureRevisions = "revisions";
+        // "batch" command: several commands in one request, one UI-thread call and one undo record
+        private const string FeatureBatch = "batch";
+        // create_objects also accepts {"format": "columnar", ...}: shared templates and per-object columns
+        private const string FeatureColumnarCreate = "columnar_create";
+        private static readonly string[] SupportedFeatures = { FeatureRequestIds, FeatureAttachments, FeatureRevisions, FeatureBatch, FeatureColumnarCreate };
+        // Commands that replace the active document: they run outside undo records and cannot be batched
+        private static readonly HashSet<string> DocumentCommands = new HashSet<string> { "open_file", "close_file" };
+        private const int FrameHeaderSize = 5;
+        private const int MaxFrameSize = 512 * 1024 * 1024;
+        private const byte FlagCompressed = 0x01;
+        private const byte FlagAttachment = 0x02;
+        private const string CompressionZlib = "zlib";
+        private const int DefaultCompressionThreshold = 64 * 1024;
+        private const int MinCompressionThreshold = 1024;
+
+        private sealed class ClientSession
+        {
+            public ClientSession(NetworkStream stream)
+            {
+                Stream = stream;
+            }
+
+            public NetworkStream Stream { get; }
+            public object WriteLock { get; } = new object();
+            public bool Framed { get; set; }
+            public bool Compressed { get; set; }
+            public bool Attachments { get; set; }
+            public bool Revisions { get; set; }
+            public int CompressionThreshold { get; set; } = DefaultCompressionThreshold;
+        }
+
         private void HandleClient(TcpClient client)
         {
             RhinoApp.WriteLine("Client handler started");
@@ -188,6 +294,7 @@ namespace RhinoMCPModPlugin
             try
             {
                 NetworkStream stream = client.GetStream();
+                var session = new ClientSession(stream);
 
                 while (IsRunningInternal())
                 {
@@ -196,6 +303,19 @@ namespace RhinoMCPModPlugin
                         // Check if there's data available to read
                         if (client.Available > 0 || stream.DataAvailable)
                         {
+                            if (session.Framed)
+                            {
+                                byte[] payload = ReadFrame(stream);
+                                if (payload == null)
+                                {
+                                    RhinoApp.WriteLine("Client disconnected");
+                                    break;
+                                }
+
+                                DispatchCommand(session, JObject.Parse(Encoding.UTF8.GetString(payload)));
+                                continue;
+                            }
+
                             int bytesRead = stream.Read(buffer, 0, buffer.Length);
                             if (bytesRead == 0)
                             {
@@ -211,45 +331,7 @@ namespace RhinoMCPModPlugin
                                 // Try to parse as JSON
                                 JObject command = JObject.Parse(incompleteData);
                                 incompleteData = string.Empty;
-
-                                // Execute command on Rhino's main thread
-                                RhinoApp.InvokeOnUiThread(new Action(() =>
-                                {
-                                    try
-                                    {
-                                        JObject response = ExecuteCommand(command);
-                                        string responseJson = JsonConvert.SerializeObject(response);
-
-                                        try
-                                        {
-                                            byte[] responseBytes = Encoding.UTF8.GetBytes(responseJson);
-                                            stream.Write(responseBytes, 0, responseBytes.Length);
-                                        }
-                                        catch
-                                        {
-                                            RhinoApp.WriteLine("Failed to send response - client disconnected");
-                                        }
-                                    }
-                                    catch (Exception e)
-                                    {
-                                        RhinoApp.WriteLine($"Error executing command: {e.Message}");
-                                        try
-                                        {
-                                            JObject errorResponse = new JObject
-                                            {
-                                                ["status"] = "error",
-                                                ["message"] = e.Message
-                                            };
-
-                                            byte[] errorBytes = Encoding.UTF8.GetBytes(errorResponse.ToString());
-                                            stream.Write(errorBytes, 0, errorBytes.Length);
-                                        }
-                                        catch
-                                        {
-                                            // Ignore send errors
-                                        }
-                                    }
-                                }));
+                                DispatchCommand(session, command);
                             }
                             catch (JsonException)
                             {
@@ -287,6 +369,251 @@ namespace RhinoMCPModPlugin
             }
         }
 
+        private void DispatchCommand(ClientSession session, JObject command)
+        {
+            // Protocol negotiation is answered on the socket thread, in the framing the client used to ask
+            if (command["type"]?.ToString() == "negotiate")
+            {
+                JObject negotiateResponse = Negotiate(command["params"] as JObject ?? new JObject());
+                SendResponse(session, negotiateResponse.ToString(Formatting.None));
+                session.Framed = negotiateResponse["result"]?["framing"]?.ToString() == FramingLengthPrefixed;
+                session.Compressed = negotiateResponse["result"]?["compression"]?.ToString() == CompressionZlib;
+                session.CompressionThreshold = negotiateResponse["result"]?["compression_threshold"]?.ToObject<int>()
+                    ?? DefaultCompressionThreshold;
+                var grantedFeatures = negotiateResponse["result"]?["features"] as JArray ?? new JArray();
+                session.Attachments = grantedFeatures.Any(token => token.ToString() == FeatureAttachments);
+                session.Revisions = grantedFeatures.Any(token => token.ToString() == FeatureRevisions);
+                return;
+            }
+
+            // Replies carry the request id (if any) so pipelined clients can route them
+            JToken requestId = command["id"];
+
+            // Liveness probe from the client's connection pool; answered without touching the UI thread
+            if (command["type"]?.ToString() == "ping")
+            {
+                var pong = new JObject
+                {
+                    ["status"] = "success",
+                    ["result"] = new JObject { ["pong"] = true }
+                };
+                if (requestId != null)
+                {
+                    pong["id"] = requestId.DeepClone();
+                }
+                if (session.Revisions)
+                {
+                    // Lets clients revalidate cached object data without queueing on the UI thread
+                    pong["revision"] = Interlocked.Read(ref externalRevision);
+                }
+                SendResponse(session, pong.ToString(Formatting.None));
+                return;
+            }
+
+            // Execute command on Rhino's main thread
+            RhinoApp.InvokeOnUiThread(new Action(() =>
+            {
+                try
+                {
+                    JObject response = ExecuteCommand(command);
+                    if (requestId != null)
+                    {
+                        response["id"] = requestId.DeepClone();
+                    }
+                    if (session.Revisions)
+                    {
+                        response["revision"] = Interlocked.Read(ref externalRevision);
+                    }
+                    List<byte[]> attachments = session.Attachments ? DetachBinaryResults(response) : null;
+                    string responseJson = JsonConvert.SerializeObject(response);
+
+                    try
+                    {
+                        SendResponse(session, responseJson, attachments);
+                    }
+                    catch
+                    {
+                        RhinoApp.WriteLine("Failed to send response - client disconnected");
+                    }
+                }
+                catch (Exception e)
+                {
+                    RhinoApp.WriteLine($"Error executing command: {e.Message}");
+                    try
+                    {
+                        JObject errorResponse = new JObject
+                        {
+                            ["status"] = "error",
+                            ["message"] = e.Message
+                        };
+                        if (requestId != null)
+                        {
+                            errorResponse["id"] = requestId.DeepClone();
+                        }
+
+                        SendResponse(session, errorResponse.ToString(Formatting.None));
+                    }
+                    catch
+                    {
+                        // Ignore send errors
+                    }
+                }
+            }));
+        }
+
+        private static JObject Negotiate(JObject parameters)
+        {
+            var requestedFraming = parameters["framing"] as JArray ?? new JArray();
+            bool framed = requestedFraming.Any(token => token.ToString() == FramingLengthPrefixed);
+
+            // Optional features all rely on framing; a legacy connection gets none of them
+            var requestedFeatures = parameters["features"] as JArray ?? new JArray();
+            var grantedFeatures = framed
+                ? requestedFeatures.Select(token => token.ToString()).Where(feature => SupportedFeatures.Contains(feature)).ToList()
+                : new List<string>();
+
+            var result = new JObject
+            {
+                ["version"] = ProtocolVersion,
+                ["framing"] = framed ? FramingLengthPrefixed : FramingLegacy,
+                ["features"] = new JArray(grantedFeatures)
+            };
+
+            var requestedCompression = parameters["compression"] as JArray ?? new JArray();
+            if (framed && requestedCompression.Any(token => token.ToString() == CompressionZlib))
+            {
+                int threshold = parameters["compression_threshold"]?.ToObject<int>() ?? DefaultCompressionThreshold;
+                result["compression"] = CompressionZlib;
+                result["compression_threshold"] = Math.Max(threshold, MinCompressionThreshold);
+            }
+
+            return new JObject
+            {
+                ["status"] = "success",
+                ["result"] = result
+            };
+        }
+
+        // Moves byte[] values out of the result so they can be sent as raw attachment frames
+        private static List<byte[]> DetachBinaryResults(JObject response)
+        {
+            if (!(response["result"] is JObject result)) return null;
+
+            var attachments = new List<byte[]>();
+            var keys = new JArray();
+            foreach (JProperty property in result.Properties().Where(p => p.Value.Type == JTokenType.Bytes).ToList())
+            {
+                attachments.Add((byte[])((JValue)property.Value).Value);
+                keys.Add(property.Name);
+                property.Value = JValue.CreateNull();
+            }
+
+            if (attachments.Count == 0) return null;
+            response["attachments"] = keys;
+            return attachments;
+        }
+
+        private static void SendResponse(ClientSession session, string json, List<byte[]> attachments = null)
+        {
+            byte[] payload = Encoding.UTF8.GetBytes(json);
+            lock (session.WriteLock)
+            {
+                if (!session.Framed)
+                {
+                    session.Stream.Write(payload, 0, payload.Length);
+                    return;
+                }
+
+                byte flags = 0;
+                if (session.Compressed && payload.Length >= session.CompressionThreshold)
+                {
+                    payload = Deflate(payload);
+                    flags = FlagCompressed;
+                }
+
+                byte[] frame = new byte[FrameHeaderSize + payload.Length];
+                WriteFrameHeader(frame, payload.Length, flags);
+                Buffer.BlockCopy(payload, 0, frame, FrameHeaderSize, payload.Length);
+                session.Stream.Write(frame, 0, frame.Length);
+
+                // Attachments follow their reply under the same lock; they are usually already compressed (PNG)
+                if (attachments == null) return;
+                byte[] header = new byte[FrameHeaderSize];
+                foreach (byte[] attachment in attachments)
+                {
+                    WriteFrameHeader(header, attachment.Length, FlagAttachment);
+                    session.Stream.Write(header, 0, header.Length);
+                    session.Stream.Write(attachment, 0, attachment.Length);
+                }
+            }
+        }
+
+        private static void WriteFrameHeader(byte[] frame, int length, byte flags)
+        {
+            frame[0] = (byte)(length >> 24);
+            frame[1] = (byte)(length >> 16);
+            frame[2] = (byte)(length >> 8);
+            frame[3] = (byte)length;
+            frame[4] = flags;
+        }
+
+        // Returns null when the client closed the connection
+        private static byte[] ReadFrame(NetworkStream stream)
+        {
+            byte[] header = new byte[FrameHeaderSize];
+            if (!ReadExactly(stream, header, FrameHeaderSize))
+            {
+                return null;
+            }
+
+            int length = (header[0] << 24) | (header[1] << 16) | (header[2] << 8) | header[3];
+            if (length < 0 || length > MaxFrameSize)
+            {
+                throw new InvalidOperationException($"Frame too large ({length} bytes)");
+            }
+
+            byte[] payload = new byte[length];
+            if (!ReadExactly(stream, payload, length))
+            {
+                return null;
+            }
+            return (header[4] & FlagCompressed) != 0 ? Inflate(payload) : payload;
+        }
+
+        private static byte[] Deflate(byte[] data)
+        {
+            using var output = new MemoryStream(data.Length / 4 + 64);
+            using (var zlib = new ZLibStream(output, CompressionLevel.Fastest, leaveOpen: true))
+            {
+                zlib.Write(data, 0, data.Length);
+            }
+            return output.ToArray();
+        }
+
+        private static byte[] Inflate(byte[] data)
+        {
+            using var input = new MemoryStream(data);
+            using var zlib = new ZLibStream(input, CompressionMode.Decompress);
+            using var output = new MemoryStream(data.Length * 4);
+            zlib.CopyTo(output);
+            return output.ToArray();
+        }
+
+        private static bool ReadExactly(NetworkStream stream, byte[] target, int count)
+        {
+            int offset = 0;
+            while (offset < count)
+            {
+                int read = stream.Read(target, offset, count - offset);
+                if (read == 0)
+                {
+                    return false;
+                }
+                offset += read;
+            }
+            return true;
+        }
+
         private JObject ExecuteCommand(JObject command)
         {
             try
@@ -312,11 +639,10 @@ namespace RhinoMCPModPlugin
             }
         }
 
-        private JObject ExecuteCommandInternal(string cmdType, JObject parameters)
+        // Dictionary to map command types to handler methods
+        private Dictionary<string, Func<JObject, JObject>> BuildCommandHandlers()
         {
-
-            // Dictionary to map command types to handler methods
-            Dictionary<string, Func<JObject, JObject>> handlers = new Dictionary<string, Func<JObject, JObject>>
+            return new Dictionary<string, Func<JObject, JObject>>
             {
                 ["get_document_info"] = this.handler.GetDocumentInfo,
                 ["create_object"] = this.handler.CreateObject,
@@ -364,16 +690,25 @@ namespace RhinoMCPModPlugin
                 ["set_object_material"] = this.handler.SetObjectMaterial,
                 ["get_object_materials"] = this.handler.GetObjectMaterials
             };
+        }
 
-            if (handlers.TryGetValue(cmdType, out var handler))
+        private JObject ExecuteCommandInternal(string cmdType, JObject parameters)
+        {
+            if (cmdType == "batch")
             {
-                bool useUndoRecord = cmdType != "open_file" && cmdType != "close_file";
+                return ExecuteBatch(parameters);
+            }
+
+            if (commandHandlers.TryGetValue(cmdType, out var handler))
+            {
+                bool useUndoRecord = !DocumentCommands.Contains(cmdType);
                 var doc = RhinoDoc.ActiveDoc;
                 uint record = 0;
                 if (useUndoRecord && doc != null)
                 {
                     record = doc.BeginUndoRecord("Run MCP command");
                 }
+                commandDepth++;
                 try
                 {
                     JObject result = handler(parameters);
@@ -398,6 +733,7 @@ namespace RhinoMCPModPlugin
                     {
                         doc.EndUndoRecord(record);
                     }
+                    commandDepth--;
                 }
             }
             else
@@ -409,5 +745,83 @@ namespace RhinoMCPModPlugin
                 };
             }
         }
+
+        // Runs {type, params} commands in order within one undo record. Item failures are reported per
+        // item; with stop_on_error (default) the commands after the first failure are skipped.
+        private JObject ExecuteBatch(JObject parameters)
+        {
+            if (!(parameters["commands"] is JArray commands))
+            {
+                throw new InvalidOperationException("commands must be a list of {type, params} objects.");
+            }
+            bool stopOnError = parameters["stop_on_error"]?.ToObject<bool>() ?? true;
+            var results = new JArray();
+            int succeeded = 0, failed = 0, skipped = 0;
+            bool stopped = false;
+
+            var doc = RhinoDoc.ActiveDoc;
+            uint record = doc != null ? doc.BeginUndoRecord("Run MCP batch") : 0;
+            commandDepth++;
+            try
+            {
+                foreach (JToken token in commands)
+                {
+                    var item = token as JObject;
+                    string itemType = item?["type"]?.ToString();
+                    var entry = new JObject { ["type"] = itemType };
+                    results.Add(entry);
+                    if (stopped)
+                    {
+                        entry["status"] = "skipped";
+                        skipped++;
+                        continue;
+                    }
+
+                    try
+                    {
+                        if (itemType == null || !commandHandlers.TryGetValue(itemType, out var itemHandler))
+                        {
+                            throw new InvalidOperationException($"Unknown command type: {itemType}");
+                        }
+                        if (DocumentCommands.Contains(itemType))
+                        {
+                            throw new InvalidOperationException($"{itemType} cannot run inside a batch.");
+                        }
+                        RhinoApp.WriteLine($"Executing batched command: {itemType}");
+                        entry["result"] = itemHandler(item["params"] as JObject ?? new JObject());
+                        entry["status"] = "success";
+                        succeeded++;
+                    }
+                    catch (Exception e)
+                    {
+                        RhinoApp.WriteLine($"Error in handler: {e.Message}");
+                        entry["status"] = "error";
+                        entry["message"] = e.Message;
+                        failed++;
+                        stopped = stopOnError;
+                    }
+                }
+            }
+            finally
+            {
+                if (doc != null)
+                {
+                    doc.EndUndoRecord(record);
+                }
+                commandDepth--;
+            }
+
+            return new JObject
+            {
+                ["status"] = "success",
+                ["result"] = new JObject
+                {
+                    ["results"] = results,
+                    ["succeeded"] = succeeded,
+                    ["failed"] = failed,
+                    ["skipped"] = skipped
+                }
+            };
+        }
     }
 }
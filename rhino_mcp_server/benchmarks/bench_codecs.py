@@ -0,0 +1,130 @@
+"""Encode/decode cost of the payload codecs on typical tool payloads.
+
+Compares the old stdlib path (json.dumps/json.loads with default separators) with every codec
+rhinomcp.server can use here: compact stdlib JSON and orjson (if installed). Payloads are a create_objects request full of point lists and surfaces, plus the
+synthetic get_document_info replies from bench_compression.py.
+
+    uv run python benchmarks/bench_codecs.py --objects 2000
+"""
+import argparse
+import json
+import random
+import statistics
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from bench_compression import inventory_reply, ortho3_reply, summary_reply  # noqa: E402
+from rhinomcp.server import (  # noqa: E402
+    Codec,
+    OrjsonCodec,
+    StdlibJsonCodec,
+    orjson,
+)
+
+
+class LegacyJsonCodec(Codec):
+    """What send_command did before codecs existed"""
+    name = "json"
+    backend = "json (legacy)"
+
+    def encode(self, obj):
+        return json.dumps(obj).encode("utf-8")
+
+    def decode(self, data):
+        return json.loads(data.decode("utf-8"))
+
+
+def _point(rng):
+    return [round(rng.uniform(-100, 100), 6) for _ in range(3)]
+
+
+def create_objects_request(count, rng, points_per_object=64):
+    """create_objects params: point clouds, polylines and 8x8 control-point surfaces"""
+    params = {}
+    for i in range(count):
+        kind = ("POINTCLOUD", "POLYLINE", "SURFACE")[i % 3]
+        if kind == "SURFACE":
+            params[f"surface_{i}"] = {
+                "type": "SURFACE",
+                "params": {"count": [8, 8], "degree": [3, 3], "points": [_point(rng) for _ in range(64)]},
+                "translation": _point(rng),
+            }
+        else:
+            params[f"{kind.lower()}_{i}"] = {
+                "type": kind,
+                "params": {"points": [_point(rng) for _ in range(points_per_object)]},
+                "color": [rng.randrange(256) for _ in range(3)],
+            }
+    return {"type": "create_objects", "params": params, "id": 1}
+
+
+PAYLOADS = {
+    "create_objects": create_objects_request,
+    "inventory": inventory_reply,
+    "summary": summary_reply,
+    "ortho3": ortho3_reply,
+}
+
+
+def available_codecs():
+    codecs = [LegacyJsonCodec(), StdlibJsonCodec()]
+    if orjson is not None:
+        codecs.append(OrjsonCodec())
+    return codecs
+
+
+def _median_ms(fn, repeats):
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings) * 1000
+
+
+def run(objects: int, repeats: int, seed: int):
+    rows = []
+    for payload_name, build in PAYLOADS.items():
+        payload = build(objects, random.Random(seed))
+        baseline = None
+        for codec in available_codecs():
+            data = codec.encode(payload)
+            encode_ms = _median_ms(lambda: codec.encode(payload), repeats)
+            decode_ms = _median_ms(lambda: codec.decode(data), repeats)
+            if baseline is None:
+                baseline = encode_ms + decode_ms
+            rows.append({
+                "payload": payload_name,
+                "codec": codec.backend,
+                "bytes": len(data),
+                "encode_ms": round(encode_ms, 2),
+                "decode_ms": round(decode_ms, 2),
+                "speedup": round(baseline / (encode_ms + decode_ms), 2),
+            })
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--objects", type=int, default=2000)
+    parser.add_argument("--repeats", type=int, default=7)
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--json", action="store_true", help="Print machine-readable rows")
+    args = parser.parse_args()
+
+    rows = run(args.objects, args.repeats, args.seed)
+    if args.json:
+        print(json.dumps(rows, indent=2))
+        return
+    columns = list(rows[0].keys())
+    print("  ".join(f"{c:>16}" for c in columns))
+    for row in rows:
+        print("  ".join(f"{str(row[c]):>16}" for c in columns))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,163 @@
+"""Byte and latency savings of negotiated zlib frames on synthetic 10k-object replies.
+
+Each reply shape is pushed through a loopback socket as a length-prefixed frame, once raw and
+once compressed, and received with RhinoConnection.receive_frame + unpack_message + json.loads,
+i.e. the same path the MCP server uses.
+
+    uv run python benchmarks/bench_compression.py --objects 10000 --bandwidth-mbps 200
+"""
+import argparse
+import json
+import random
+import socket
+import statistics
+import sys
+import threading
+import time
+import uuid
+import zlib
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from rhinomcp.server import (  # noqa: E402
+    COMPRESSION_LEVEL,
+    COMPRESSION_ZLIB,
+    RhinoConnection,
+    pack_message,
+    unpack_message,
+)
+
+TYPES = ["Brep", "Extrusion", "Mesh", "Curve", "Point"]
+LAYERS = ["Default", "Structure::Columns", "Structure::Beams", "Facade::Panels", "Site"]
+
+
+def _bbox(rng):
+    x, y, z = rng.uniform(-500, 500), rng.uniform(-500, 500), rng.uniform(0, 60)
+    return [[round(x, 3), round(y, 3), round(z, 3)],
+            [round(x + rng.uniform(0.2, 8), 3), round(y + rng.uniform(0.2, 8), 3), round(z + rng.uniform(0.2, 4), 3)]]
+
+
+def _base(rng, index):
+    return {
+        "id": str(uuid.UUID(int=rng.getrandbits(128))),
+        "name": f"object_{index}",
+        "type": rng.choice(TYPES),
+        "layer": rng.choice(LAYERS),
+    }
+
+
+def inventory_reply(count, rng):
+    objects = [dict(_base(rng, i), bbox=_bbox(rng), bbox_frame="world_aabb") for i in range(count)]
+    return {"status": "success", "result": {"detail": "inventory", "object_count": count, "objects": objects}}
+
+
+def summary_reply(count, rng):
+    objects = []
+    for i in range(count):
+        entry = dict(_base(rng, i), bbox=_bbox(rng), bbox_frame="world_aabb", material="-1", color=[0, 0, 0])
+        entry["geometry_summary"] = {"kind": "brep", "face_count": 6, "edge_count": 12, "solid": True}
+        objects.append(entry)
+    return {"status": "success", "result": {"detail": "summary", "object_count": count, "objects": objects}}
+
+
+def ortho3_reply(count, rng, outline_points=24):
+    objects = []
+    for i in range(count):
+        views = []
+        for axis in ("top", "front", "right"):
+            ring = [[round(rng.uniform(-2, 2), 4), round(rng.uniform(-2, 2), 4)] for _ in range(outline_points)]
+            views.append({"axis": axis, "loops": [ring + [ring[0]]]})
+        geometry = {
+            "obb": {"extents": [round(rng.uniform(0.1, 5), 4) for _ in range(3)]},
+            "pose": {"world_from_local": {"R": [[1, 0, 0], [0, 1, 0], [0, 0, 1]],
+                                          "t": [round(rng.uniform(-500, 500), 4) for _ in range(3)]}},
+            "views_frame": "local pose; top=[X,Y] front=[X,Z] right=[Y,Z]; shared origin; silhouette (direction-agnostic)",
+            "views": views,
+        }
+        objects.append(dict(_base(rng, i), geometry=geometry))
+    return {"status": "success", "result": {"geometry_detail": "ortho3", "objects": objects}}
+
+
+SHAPES = {"inventory": inventory_reply, "summary": summary_reply, "ortho3": ortho3_reply}
+
+
+def _transfer(frame: bytes, repeats: int):
+    """Send one frame repeatedly over loopback; return per-receive wall times (seconds)"""
+    server = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    server.bind(("127.0.0.1", 0))
+    server.listen(1)
+    client = socket.create_connection(server.getsockname())
+    peer, _ = server.accept()
+    receiver = RhinoConnection(host="127.0.0.1", port=0, sock=client, negotiate=False)
+    timings = []
+    try:
+        for _ in range(repeats):
+            sender = threading.Thread(target=peer.sendall, args=(frame,))
+            start = time.perf_counter()
+            sender.start()
+            json.loads(unpack_message(*receiver.receive_frame(client)))
+            timings.append(time.perf_counter() - start)
+            sender.join()
+    finally:
+        for sock in (client, peer, server):
+            sock.close()
+    return timings
+
+
+def run(objects: int, repeats: int, bandwidth_mbps: float, seed: int):
+    rows = []
+    for shape, build in SHAPES.items():
+        payload = json.dumps(build(objects, random.Random(seed))).encode("utf-8")
+
+        start = time.perf_counter()
+        compressed = zlib.compress(payload, COMPRESSION_LEVEL)
+        compress_ms = (time.perf_counter() - start) * 1000
+        start = time.perf_counter()
+        zlib.decompress(compressed)
+        decompress_ms = (time.perf_counter() - start) * 1000
+
+        raw_ms = statistics.median(_transfer(pack_message(payload), repeats)) * 1000
+        zlib_ms = statistics.median(_transfer(pack_message(payload, COMPRESSION_ZLIB, 0), repeats)) * 1000
+        row = {
+            "shape": shape,
+            "objects": objects,
+            "raw_bytes": len(payload),
+            "zlib_bytes": len(compressed),
+            "ratio": round(len(payload) / len(compressed), 2),
+            "compress_ms": round(compress_ms, 2),
+            "decompress_ms": round(decompress_ms, 2),
+            "loopback_raw_ms": round(raw_ms, 2),
+            # The sender-side compress_ms happens in the plugin before the frame is written
+            "loopback_zlib_ms": round(zlib_ms + compress_ms, 2),
+        }
+        if bandwidth_mbps:
+            bytes_per_ms = bandwidth_mbps * 1e6 / 8 / 1000
+            row["link_raw_ms"] = round(raw_ms + len(payload) / bytes_per_ms, 2)
+            row["link_zlib_ms"] = round(zlib_ms + compress_ms + len(compressed) / bytes_per_ms, 2)
+        rows.append(row)
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--objects", type=int, default=10000)
+    parser.add_argument("--repeats", type=int, default=5)
+    parser.add_argument("--bandwidth-mbps", type=float, default=0.0,
+                        help="Also model a link of this bandwidth on top of loopback timings")
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--json", action="store_true", help="Print machine-readable rows")
+    args = parser.parse_args()
+
+    rows = run(args.objects, args.repeats, args.bandwidth_mbps, args.seed)
+    if args.json:
+        print(json.dumps(rows, indent=2))
+        return
+    columns = list(rows[0].keys())
+    print("  ".join(f"{c:>16}" for c in columns))
+    for row in rows:
+        print("  ".join(f"{str(row[c]):>16}" for c in columns))
+
+
+if __name__ == "__main__":
+    main()
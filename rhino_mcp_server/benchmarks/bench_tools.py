@@ -0,0 +1,435 @@
+"""Latency, CPU and wire bytes of every registered MCP tool against the fake Rhino plugin.
+
+For each scene size a rhinomcp.fake_rhino server is started in a subprocess, so the numbers
+below cover only this process. Every tool registered with @mcp.tool is then called through
+FastMCP.call_tool, the same wrapper an MCP client goes through. Payload-shape sweeps cover:
+- POLYLINE vertex counts in create_objects
+- outline_max_points for polyline and ortho3 reads
+- get_document_info detail levels and all_pages (cold, and incremental after an edit)
+
+Per (scene, tool, variant) the report has:
+- p50/p95/p99 and mean wall time
+- Python CPU time per call (time.process_time)
+- bytes sent and received on the Rhino socket per call
+- the number of Rhino commands per call
+
+    uv run python benchmarks/bench_tools.py --sizes 100,1000,10000 --repeats 20 --output bench.json
+    uv run python benchmarks/bench_tools.py --sizes 1000 --baseline bench.json
+
+--baseline compares against a previous --output file and prints the p50/p95 ratios.
+"""
+import argparse
+import asyncio
+import json
+import logging
+import os
+import platform
+import socket
+import statistics
+import subprocess
+import sys
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+SRC = Path(__file__).resolve().parents[1] / "src"
+sys.path.insert(0, str(SRC))
+# The pure-Python fake needs seconds for whole-scene scans at 100k objects; measure those instead
+# of timing out at the default 5 s first deadline
+os.environ.setdefault("RHINOMCP_MIN_TIMEOUT", "120")
+
+import rhinomcp  # noqa: E402
+from rhinomcp import server  # noqa: E402
+from rhinomcp import inventory  # noqa: E402
+from rhinomcp.inventory import iter_document_pages  # noqa: E402
+from rhinomcp.server import AsyncRhinoConnectionPool, CommandLog, mcp  # noqa: E402
+
+ROTATE_Z_90 = [[0, -1, 0], [1, 0, 0], [0, 0, 1]]
+
+
+class WireCounter(CommandLog):
+    """CommandLog that also keeps running totals for the benchmark"""
+
+    def __init__(self):
+        super().__init__()
+        self.commands = 0
+        self.sent_bytes = 0
+        self.received_bytes = 0
+
+    def record(self, command_type, duration, sent_bytes, received_bytes, outcome="ok"):
+        self.commands += 1
+        self.sent_bytes += sent_bytes
+        self.received_bytes += received_bytes
+        super().record(command_type, duration, sent_bytes, received_bytes, outcome)
+
+
+@dataclass
+class SceneSample:
+    """Ids and names picked from the fake scene once per scene size"""
+    solids: List[str] = field(default_factory=list)
+    polylines: List[str] = field(default_factory=list)
+    layers: List[Dict[str, Any]] = field(default_factory=list)
+    created: int = 0
+
+    def next_name(self, prefix: str) -> str:
+        self.created += 1
+        return f"{prefix}_{self.created}"
+
+
+ArgsFactory = Callable[[AsyncRhinoConnectionPool, SceneSample], Awaitable[Dict[str, Any]]]
+
+
+@dataclass
+class Case:
+    tool: str
+    variant: str
+    args: ArgsFactory  # Untimed; may prepare the scene (e.g. create objects to delete)
+    repeat_cap: Optional[int] = None  # For calls that walk or rewrite the whole scene
+
+
+def _const(arguments: Dict[str, Any]) -> ArgsFactory:
+    async def factory(pool, sample):
+        return arguments
+    return factory
+
+
+async def _cold_mirror(pool, sample):
+    # Forget the mirrored listing so every call walks all pages
+    inventory._mirrors.clear()
+    return {"all_pages": True}
+
+
+def _edit_one(object_id: str) -> ArgsFactory:
+    async def factory(pool, sample):
+        await pool.send_command("modify_object", {"id": object_id, "translation": [0.001, 0, 0]})
+        return {"all_pages": True}
+    return factory
+
+
+def _polyline(count: int, offset: float) -> List[List[float]]:
+    return [[offset + i * 0.5, (i % 7) * 0.25, (i % 3) * 0.1] for i in range(count)]
+
+
+def build_cases(sample: SceneSample, polyline_lengths: List[int], outline_caps: List[int],
+                batch: int) -> List[Case]:
+    solids = sample.solids[:batch]
+    polylines = sample.polylines[:batch]
+    some = sample.solids[:5]
+    cases = [
+        Case("list_plugins", "", _const({})),
+        Case("get_viewport_info", "", _const({})),
+        Case("get_rhino_log", "lines=20", _const({"lines": 20})),
+        Case("invert_rotation_matrix", "", _const({"rotation_matrix": ROTATE_Z_90})),
+        Case("get_or_set_current_layer", "", _const({})),
+        Case("get_layer_states", "", _const({})),
+        Case("get_materials", "", _const({})),
+        Case("get_document_info", "inventory", _const({"detail": "inventory", "limit": 100})),
+        Case("get_document_info", "inventory limit=1000", _const({"detail": "inventory", "limit": 1000})),
+        Case("get_document_info", "summary", _const({"detail": "summary", "limit": 100})),
+        Case("get_document_info", "full", _const({"detail": "full", "limit": 100})),
+        Case("get_document_info", "bbox filter",
+             _const({"bbox": [[-200, -200, -10], [200, 200, 200]], "limit": 1000})),
+        Case("get_document_info", "all_pages cold", _cold_mirror, repeat_cap=3),
+        Case("get_document_info", "all_pages after 1 edit", _edit_one(some[0])),
+        Case("get_object_info", "obb_pose", _const({"id": some[0], "geometry_detail": "obb_pose"})),
+        Case("get_connectivity_graph", "", _const({}), repeat_cap=3),
+        Case("get_object_materials", f"{len(solids)} ids", _const({"ids": solids})),
+        Case("select_objects", "names", _const({"names": ["brep_1", "mesh_2"]})),
+        Case("get_selected_objects", "", _const({})),
+        Case("deselect_all", "", _const({})),
+        Case("zoom_to_objects", "5 ids", _const({"ids": some})),
+        Case("capture_view", "", _const({"width": 1024, "height": 768})),
+    ]
+    for detail in ("bbox", "obb_pose", "ortho3"):
+        cases.append(Case("get_objects_info", f"{detail} x{len(solids)} solids",
+                          _const({"objects": [{"id": i} for i in solids], "geometry_detail": detail})))
+    for cap in outline_caps:
+        cases.append(Case("get_objects_info", f"ortho3 world outline_max_points={cap}",
+                          _const({"objects": [{"id": i} for i in solids], "geometry_detail": "ortho3",
+                                  "include_world": True, "outline_max_points": cap})))
+        cases.append(Case("get_objects_info", f"polylines outline_max_points={cap}",
+                          _const({"objects": [{"id": i} for i in polylines], "geometry_detail": "obb_pose",
+                                  "include_world": True, "outline_max_points": cap})))
+
+    # Mutating tools last; none of them shrinks the original scene
+    for length in polyline_lengths:
+        async def create_polylines(pool, sample, length=length):
+            return {"objects": [
+                {"type": "POLYLINE", "name": sample.next_name("bench_polyline"),
+                 "params": {"points": _polyline(length, i)}}
+                for i in range(batch)
+            ]}
+        cases.append(Case("create_objects", f"{batch} POLYLINE x{length} points", create_polylines))
+
+    async def create_boxes(pool, sample):
+        return {"objects": [
+            {"type": "BOX", "name": sample.next_name("bench_box"), "color": [200, 10, 10],
+             "params": {"width": 1, "length": 2, "height": 3}, "translation": [i, 0, 0]}
+            for i in range(batch)
+        ]}
+
+    async def boxes_to_delete(pool, sample):
+        created = await pool.send_command("create_objects", {
+            sample.next_name("bench_delete"): {"type": "BOX", "params": {"width": 1, "length": 1, "height": 1}}
+            for _ in range(batch)
+        })
+        return {"ids": [entry["id"] for entry in created.values()], "confirm": True}
+
+    async def layer_to_delete(pool, sample):
+        name = sample.next_name("bench_layer")
+        await pool.send_command("create_layer", {"name": name})
+        return {"name": name}
+
+    async def layer_to_rename(pool, sample):
+        return {"id": sample.layers[-1]["id"], "new_name": sample.next_name("bench_renamed")}
+
+    async def new_layer(pool, sample):
+        return {"name": sample.next_name("bench_layer"), "color": [10, 20, 30]}
+
+    target_layer = sample.layers[0]["name"] if sample.layers else "Default"
+    cases += [
+        Case("create_objects", f"{batch} BOX", create_boxes),
+        Case("copy_objects", f"{len(some)} objects", _const({"objects": [{"id": i, "translation": [0, 0, 50]} for i in some]})),
+        Case("delete_objects", f"{batch} ids", boxes_to_delete),
+        Case("modify_objects", f"{len(solids)} objects",
+             _const({"objects": [{"id": i, "new_color": [1, 2, 3]} for i in solids]})),
+        Case("modify_objects", "all", _const({"all": True, "objects": [{"id": some[0], "new_color": [4, 5, 6]}]}), repeat_cap=3),
+        Case("rotate_objects", f"{len(solids)} objects",
+             _const({"objects": [{"id": i, "rotation_matrix": ROTATE_Z_90, "pivot": [0, 0, 0]} for i in solids]})),
+        Case("reset_objects_pose", f"{len(solids)} objects", _const({"objects": [{"id": i} for i in solids]})),
+        Case("rebase_objects_pose", f"{len(solids)} objects",
+             _const({"objects": [{"id": i, "z_direction": "+z"} for i in solids]})),
+        Case("move_objects_to_layer", f"{len(solids)} ids", _const({"ids": solids, "layer": target_layer})),
+        Case("create_material", "", _const({"name": "bench", "r": 10})),
+        Case("set_object_material", f"{len(solids)} ids", _const({"ids": solids, "material_index": 0})),
+        Case("create_layer", "", new_layer),
+        Case("delete_layer", "", layer_to_delete),
+        Case("rename_layer", "", layer_to_rename),
+        Case("save_layer_state", "", _const({"name": "bench"})),
+        Case("restore_layer_state", "", _const({"name": "bench"})),
+        Case("run_rhino_command", "", _const({"command": "_Redraw"})),
+        Case("open_file", "", _const({"path": "/fake/bench.3dm"})),
+        # Empties the document, so it has to stay last
+        Case("close_file", "", _const({}), repeat_cap=1),
+    ]
+    return cases
+
+
+def _free_port() -> int:
+    with socket.socket() as probe:
+        probe.bind(("127.0.0.1", 0))
+        return probe.getsockname()[1]
+
+
+def start_fake(objects: int, args) -> subprocess.Popen:
+    port = _free_port()
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join(filter(None, [str(SRC), os.environ.get("PYTHONPATH")])))
+    command = [
+        sys.executable, "-m", "rhinomcp.fake_rhino", "--port", str(port), "--objects", str(objects),
+        "--polyline-points", str(args.scene_polyline_points), "--outline-points", str(args.scene_outline_points),
+        "--latency-ms", str(args.latency_ms), "--seed", str(args.seed),
+    ]
+    process = subprocess.Popen(command, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    process.port = port
+    deadline = time.monotonic() + 300
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f"fake_rhino exited with code {process.returncode}")
+        try:
+            socket.create_connection(("127.0.0.1", port), timeout=0.5).close()
+            return process
+        except OSError:
+            time.sleep(0.1)
+    process.kill()
+    raise RuntimeError("fake_rhino did not start listening")
+
+
+async def sample_scene(pool: AsyncRhinoConnectionPool) -> SceneSample:
+    """Pick ids from the first page and walk the rest untimed.
+
+    The fake generates curve points lazily, so without the walk the first timed whole-scene
+    call would pay for building every polyline.
+    """
+    sample = SceneSample()
+    async for page in iter_document_pages(pool, detail="summary", include_bbox=False):
+        if not sample.layers:
+            sample.layers = page.get("layers") or []
+        for obj in page.get("objects") or ():
+            if len(sample.solids) + len(sample.polylines) >= 2000:
+                break
+            kind = (obj.get("geometry_summary") or {}).get("kind")
+            if kind in ("brep", "extrusion", "mesh"):
+                sample.solids.append(obj["id"])
+            elif kind == "polyline":
+                sample.polylines.append(obj["id"])
+    return sample
+
+
+def _failed(result: Any) -> bool:
+    """Tools report errors in their result instead of raising"""
+    text = str(result)[:300]
+    return '"error"' in text or "'error'" in text or "Error " in text
+
+
+def _percentile(sorted_values: List[float], fraction: float) -> float:
+    if len(sorted_values) == 1:
+        return sorted_values[0]
+    position = fraction * (len(sorted_values) - 1)
+    lower = int(position)
+    upper = min(lower + 1, len(sorted_values) - 1)
+    return sorted_values[lower] + (sorted_values[upper] - sorted_values[lower]) * (position - lower)
+
+
+async def run_case(case: Case, pool, sample: SceneSample, repeats: int, wire: WireCounter) -> Dict[str, Any]:
+    calls = min(repeats, case.repeat_cap) if case.repeat_cap else repeats
+    wall, cpu = [], []
+    errors = 0
+    commands = sent = received = 0
+    for _ in range(calls):
+        arguments = await case.args(pool, sample)
+        before = (wire.commands, wire.sent_bytes, wire.received_bytes)
+        cpu_start = time.process_time()
+        start = time.perf_counter()
+        try:
+            result = await mcp.call_tool(case.tool, arguments)
+            errors += _failed(result)
+        except Exception:
+            errors += 1
+        wall.append(time.perf_counter() - start)
+        cpu.append(time.process_time() - cpu_start)
+        commands += wire.commands - before[0]
+        sent += wire.sent_bytes - before[1]
+        received += wire.received_bytes - before[2]
+
+    wall.sort()
+    return {
+        "tool": case.tool,
+        "variant": case.variant,
+        "calls": calls,
+        "errors": errors,
+        "p50_ms": round(_percentile(wall, 0.50) * 1000, 3),
+        "p95_ms": round(_percentile(wall, 0.95) * 1000, 3),
+        "p99_ms": round(_percentile(wall, 0.99) * 1000, 3),
+        "mean_ms": round(statistics.fmean(wall) * 1000, 3),
+        "cpu_ms": round(statistics.fmean(cpu) * 1000, 3),
+        "sent_bytes": sent // calls,
+        "received_bytes": received // calls,
+        "rhino_commands": round(commands / calls, 2),
+    }
+
+
+async def run_scene(objects: int, args, wire: WireCounter) -> List[Dict[str, Any]]:
+    fake = start_fake(objects, args)
+    pool = AsyncRhinoConnectionPool(port=fake.port)
+    server._async_rhino_pool = pool
+    try:
+        sample = await sample_scene(pool)
+        cases = build_cases(sample, args.polyline_points, args.outline_max_points, args.batch)
+        registered = {tool.name for tool in await mcp.list_tools()}
+        missing = registered - {case.tool for case in cases}
+        if missing:
+            print(f"warning: no benchmark case for {', '.join(sorted(missing))}", file=sys.stderr)
+        rows = []
+        for case in cases:
+            if case.tool not in registered or (args.tools and case.tool not in args.tools):
+                continue
+            row = await run_case(case, pool, sample, args.repeats, wire)
+            rows.append({"objects": objects, **row})
+            print(f"{objects:>7} {case.tool:<26} {case.variant:<40} p50={row['p50_ms']:.2f}ms", file=sys.stderr)
+        return rows
+    finally:
+        await pool.close()
+        server._async_rhino_pool = None
+        fake.terminate()
+        fake.wait(timeout=10)
+
+
+def compare(rows: List[Dict[str, Any]], baseline_path: str) -> List[Dict[str, Any]]:
+    baseline = json.loads(Path(baseline_path).read_text())
+    previous = {(r["objects"], r["tool"], r["variant"]): r for r in baseline.get("rows", baseline)}
+    comparison = []
+    for row in rows:
+        old = previous.get((row["objects"], row["tool"], row["variant"]))
+        if old is None:
+            continue
+        comparison.append({
+            "objects": row["objects"],
+            "tool": row["tool"],
+            "variant": row["variant"],
+            "p50_ratio": round(row["p50_ms"] / old["p50_ms"], 2) if old["p50_ms"] else None,
+            "p95_ratio": round(row["p95_ms"] / old["p95_ms"], 2) if old["p95_ms"] else None,
+            "cpu_ratio": round(row["cpu_ms"] / old["cpu_ms"], 2) if old["cpu_ms"] else None,
+            "bytes_delta": (row["sent_bytes"] + row["received_bytes"]) - (old["sent_bytes"] + old["received_bytes"]),
+        })
+    return comparison
+
+
+def _print_table(rows: List[Dict[str, Any]]):
+    columns = list(rows[0].keys())
+    widths = {c: max(len(c), *(len(str(r[c])) for r in rows)) for c in columns}
+    print("  ".join(f"{c:>{widths[c]}}" for c in columns))
+    for row in rows:
+        print("  ".join(f"{str(row[c]):>{widths[c]}}" for c in columns))
+
+
+def _int_list(text: str) -> List[int]:
+    return [int(item) for item in text.split(",") if item]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=_int_list, default=[100, 1000, 10000, 100000])
+    parser.add_argument("--repeats", type=int, default=20)
+    parser.add_argument("--batch", type=int, default=20, help="Objects per multi-object call")
+    parser.add_argument("--polyline-points", type=_int_list, default=[16, 256, 4096],
+                        help="POLYLINE vertex counts sent through create_objects")
+    parser.add_argument("--outline-max-points", type=_int_list, default=[0, 16, 64])
+    parser.add_argument("--scene-polyline-points", type=int, default=1024)
+    parser.add_argument("--scene-outline-points", type=int, default=256)
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="Simulated Rhino time per command")
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--tools", type=lambda text: set(text.split(",")), help="Only run these tools")
+    parser.add_argument("--output", help="Write the JSON report to this file")
+    parser.add_argument("--baseline", help="Compare with a previous --output file")
+    parser.add_argument("--json", action="store_true", help="Print the JSON report instead of a table")
+    args = parser.parse_args()
+
+    logging.getLogger("RhinoMCPServer").setLevel(logging.WARNING)
+    wire = WireCounter()
+    server.command_log = wire
+
+    async def run_all():
+        rows = []
+        for objects in args.sizes:
+            rows += await run_scene(objects, args, wire)
+        return rows
+
+    rows = asyncio.run(run_all())
+    report = {
+        "meta": {
+            "rhinomcp_version": rhinomcp.__version__,
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "codec": server.JSON_CODEC.backend,
+            "compression": server.COMPRESSION_ENABLED,
+            "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "args": {key: sorted(value) if isinstance(value, set) else value for key, value in vars(args).items()},
+        },
+        "rows": rows,
+    }
+    if args.baseline:
+        report["comparison"] = compare(rows, args.baseline)
+    if args.output:
+        Path(args.output).write_text(json.dumps(report, indent=2))
+    if args.json:
+        print(json.dumps(report, indent=2))
+        return
+    _print_table(rows)
+    if report.get("comparison"):
+        print()
+        _print_table(report["comparison"])
+
+
+if __name__ == "__main__":
+    main()
@@ -3,26 +3,50 @@
 __version__ = "0.2.4"
 
 # Expose key classes and functions for easier imports
-from .static.rhinoscriptsyntax import rhinoscriptsyntax_json
-from .server import RhinoConnection, get_rhino_connection, mcp, logger
+from .static.rhinoscriptsyntax import (
+    load_rhinoscriptsyntax,
+    get_rhinoscript_function,
+    rhinoscript_function_names,
+)
+from .server import (
+    RhinoConnection,
+    AsyncRhinoConnection,
+    get_rhino_connection,
+    get_async_rhino_connection,
+    mcp,
+    logger,
+)
+from .inventory import (
+    iter_document_pages,
+    iter_document_objects,
+    aggregate_document_inventory,
+    DocumentMirror,
+    document_mirror,
+)
 
 from .prompts.assert_general_strategy import asset_general_strategy
 
+from .resources.metrics import prometheus_metrics, rhino_metrics
+
 from .tools.create_objects import create_objects
 from .tools.copy_objects import copy_objects
+from .tools.array_objects import array_objects
 from .tools.delete_objects import delete_objects
 from .tools.get_document_info import get_document_info
 from .tools.get_object_info import get_object_info
 from .tools.get_objects_info import get_objects_info
+from .tools.query_region import query_region
 from .tools.get_connectivity_graph import get_connectivity_graph
 from .tools.modify_objects import modify_objects
 from .tools.invert_rotation_matrix import invert_rotation_matrix
 from .tools.rotate_objects import rotate_objects
 from .tools.reset_objects_pose import reset_objects_pose
 from .tools.rebase_objects_pose import rebase_objects_pose
+from .tools.batch import batch
 # from .tools.get_rhinoscript_python_function_names import get_rhinoscript_python_function_names
 # from .tools.get_rhinoscript_python_code_guide import get_rhinoscript_python_code_guide
 # from .tools.execute_rhinoscript_python_code import execute_rhinoscript_python_code
+from .tools.search_rhinoscript_functions import search_rhinoscript_functions
 from .tools.create_layer import create_layer
 from .tools.get_or_set_current_layer import get_or_set_current_layer
 from .tools.delete_layer import delete_layer
@@ -48,3 +72,10 @@ from .tools.extended_tools import (
     set_object_material,
     get_object_materials,
 )
+
+
+def __getattr__(name):
+    # The rhinoscriptsyntax table is loaded on first access, not at import
+    if name == "rhinoscriptsyntax_json":
+        return load_rhinoscriptsyntax()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
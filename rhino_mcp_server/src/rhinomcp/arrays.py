@@ -0,0 +1,291 @@
+# Array patterns for array_objects: the transform of every copy from a compact spec
+"""Linear, grid, polar and along-path arrays.
+
+A pattern has count instances, the original at index 0 and copies at 1..count-1 (grid: the
+product of counts). placements(start, end) computes the copies of instances start..end-1 in closed
+form from their index, so array_objects can build each chunk of copy_objects entries without
+expanding the whole array first.
+
+Every placement is (translation, rotation_matrix, pivot): the copy is rotated about pivot, then
+translated, as copy_objects applies them. rotation_matrix and pivot are None for pure translations.
+An optional jitter adds a random offset within [-j, j] per axis. It is a hash of seed and instance
+index, so a chunk gets the same offsets whatever the chunking.
+
+NumPy is optional. With it a chunk's placements are computed as arrays; without it the same
+formulas run per instance in Python.
+"""
+import math
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional; placements() falls back to the Python loop
+    np = None
+
+ARRAY_KINDS = ("linear", "grid", "polar", "curve")
+MAX_ARRAY_INSTANCES = 100000
+ROUND_DIGITS = 9  # Enough for model units, and keeps the copy_objects payload short
+
+Vector = List[float]
+Matrix = List[List[float]]
+Placement = Tuple[Vector, Optional[Matrix], Optional[Vector]]
+
+_MASK64 = (1 << 64) - 1
+
+
+def _vector(value: Any, name: str, size: int = 3) -> Vector:
+    if not isinstance(value, (list, tuple)) or len(value) != size:
+        raise ValueError(f"pattern.{name} must be a list of {size} numbers")
+    try:
+        vector = [float(v) for v in value]
+    except (TypeError, ValueError):
+        raise ValueError(f"pattern.{name} must be a list of {size} numbers") from None
+    if not all(math.isfinite(v) for v in vector):
+        raise ValueError(f"pattern.{name} must be finite")
+    return vector
+
+
+def _count(value: Any, name: str) -> int:
+    if not isinstance(value, int) or isinstance(value, bool) or value < 1:
+        raise ValueError(f"pattern.{name} must be a positive integer")
+    return value
+
+
+def _axis_rotation(axis: Vector, angle: float) -> Matrix:
+    """Rotation by angle (radians) about the unit vector axis (Rodrigues)"""
+    x, y, z = axis
+    c, s = math.cos(angle), math.sin(angle)
+    t = 1 - c
+    return [[c + t * x * x, t * x * y - s * z, t * x * z + s * y],
+            [t * x * y + s * z, c + t * y * y, t * y * z - s * x],
+            [t * x * z - s * y, t * y * z + s * x, c + t * z * z]]
+
+
+def _align_rotation(a: Vector, b: Vector) -> Matrix:
+    """The smallest rotation taking unit vector a to unit vector b"""
+    vx, vy, vz = a[1] * b[2] - a[2] * b[1], a[2] * b[0] - a[0] * b[2], a[0] * b[1] - a[1] * b[0]
+    c = a[0] * b[0] + a[1] * b[1] + a[2] * b[2]
+    if c < -1 + 1e-12:
+        # Opposite directions: half a turn about any axis perpendicular to a
+        helper = [1.0, 0.0, 0.0] if abs(a[0]) < 0.9 else [0.0, 1.0, 0.0]
+        px, py, pz = a[1] * helper[2] - a[2] * helper[1], a[2] * helper[0] - a[0] * helper[2], a[0] * helper[1] - a[1] * helper[0]
+        norm = math.sqrt(px * px + py * py + pz * pz)
+        return _axis_rotation([px / norm, py / norm, pz / norm], math.pi)
+    k = 1 / (1 + c)
+    return [[1 - k * (vy * vy + vz * vz), -vz + k * vx * vy, vy + k * vx * vz],
+            [vz + k * vx * vy, 1 - k * (vx * vx + vz * vz), -vx + k * vy * vz],
+            [-vy + k * vx * vz, vx + k * vy * vz, 1 - k * (vx * vx + vy * vy)]]
+
+
+def _unit_hash(seed: int, index: int, axis: int) -> float:
+    """Uniform in [0, 1) from (seed, index, axis) (splitmix64)"""
+    x = (seed * 0x9E3779B97F4A7C15 + index * 3 + axis + 1) & _MASK64
+    x = ((x ^ (x >> 30)) * 0xBF58476D1CE4E5B9) & _MASK64
+    x = ((x ^ (x >> 27)) * 0x94D049BB133111EB) & _MASK64
+    return ((x ^ (x >> 31)) >> 11) / float(1 << 53)
+
+
+def _numpy_axis_rotations(axis: Vector, angles):
+    """_axis_rotation for an array of angles: shape (n, 3, 3)"""
+    x, y, z = axis
+    c, s = np.cos(angles), np.sin(angles)
+    t = 1 - c
+    return np.stack([np.stack([c + t * x * x, t * x * y - s * z, t * x * z + s * y], axis=-1),
+                     np.stack([t * x * y + s * z, c + t * y * y, t * y * z - s * x], axis=-1),
+                     np.stack([t * x * z - s * y, t * y * z + s * x, c + t * z * z], axis=-1)], axis=1)
+
+
+def _numpy_align_rotations(a: Vector, tangents):
+    """_align_rotation from a to each row of tangents: shape (n, 3, 3)"""
+    bx, by, bz = tangents[:, 0], tangents[:, 1], tangents[:, 2]
+    vx, vy, vz = a[1] * bz - a[2] * by, a[2] * bx - a[0] * bz, a[0] * by - a[1] * bx
+    c = a[0] * bx + a[1] * by + a[2] * bz
+    opposite = c < -1 + 1e-12
+    k = 1 / np.where(opposite, 1.0, 1 + c)
+    rotations = np.stack([np.stack([1 - k * (vy * vy + vz * vz), -vz + k * vx * vy, vy + k * vx * vz], axis=-1),
+                          np.stack([vz + k * vx * vy, 1 - k * (vx * vx + vz * vz), -vx + k * vy * vz], axis=-1),
+                          np.stack([-vy + k * vx * vz, vx + k * vy * vz, 1 - k * (vx * vx + vy * vy)], axis=-1)],
+                         axis=1)
+    if opposite.any():
+        rotations[opposite] = _align_rotation(a, [-a[0], -a[1], -a[2]])
+    return rotations
+
+
+def _numpy_unit_hash(seed: int, indices, axis: int):
+    """_unit_hash for an array of indices (uint64 arithmetic wraps like the masks there)"""
+    x = np.uint64((seed * 0x9E3779B97F4A7C15 + axis + 1) & _MASK64) + indices.astype(np.uint64) * np.uint64(3)
+    x = (x ^ (x >> np.uint64(30))) * np.uint64(0xBF58476D1CE4E5B9)
+    x = (x ^ (x >> np.uint64(27))) * np.uint64(0x94D049BB133111EB)
+    return ((x ^ (x >> np.uint64(31))) >> np.uint64(11)).astype(float) / float(1 << 53)
+
+
+def _rounded(values: Sequence[float]) -> Vector:
+    return [round(v, ROUND_DIGITS) + 0.0 for v in values]
+
+
+@dataclass
+class ArrayPattern:
+    """A parsed pattern spec; see parse_pattern"""
+    kind: str
+    count: int
+    spacing: Vector = field(default_factory=lambda: [0.0, 0.0, 0.0])
+    counts: Tuple[int, int, int] = (1, 1, 1)
+    center: Vector = field(default_factory=lambda: [0.0, 0.0, 0.0])
+    axis: Vector = field(default_factory=lambda: [0.0, 0.0, 1.0])
+    step: float = 0.0  # Polar angle between instances, radians
+    path: List[Vector] = field(default_factory=list)
+    stations: List[float] = field(default_factory=list)  # Cumulative path length at each path point
+    orient: bool = True
+    jitter: Optional[Vector] = None
+    seed: int = 0
+
+    def _path_point(self, distance: float) -> Tuple[Vector, Vector]:
+        """(point, unit tangent) at distance along the path"""
+        stations, path = self.stations, self.path
+        lo, hi = 0, len(stations) - 1
+        while hi - lo > 1:
+            mid = (lo + hi) // 2
+            if stations[mid] <= distance:
+                lo = mid
+            else:
+                hi = mid
+        a, b = path[lo], path[hi]
+        length = stations[hi] - stations[lo]
+        t = (distance - stations[lo]) / length if length > 0 else 0.0
+        tangent = [(b[i] - a[i]) / length for i in range(3)] if length > 0 else [1.0, 0.0, 0.0]
+        return [a[i] + (b[i] - a[i]) * t for i in range(3)], tangent
+
+    def placements(self, start: int, end: int) -> List[Placement]:
+        """Placements of instances start..end-1 (index 0 is the original and is not moved)"""
+        if np is not None and end > start:
+            return self._numpy_placements(start, end)
+        indices = range(start, end)
+        if self.kind == "linear":
+            dx, dy, dz = self.spacing
+            result = [([k * dx, k * dy, k * dz], None, None) for k in indices]
+        elif self.kind == "grid":
+            nx, ny, _ = self.counts
+            sx, sy, sz = self.spacing
+            result = [([(k % nx) * sx, (k // nx % ny) * sy, (k // (nx * ny)) * sz], None, None) for k in indices]
+        elif self.kind == "polar":
+            result = [([0.0, 0.0, 0.0], _axis_rotation(self.axis, k * self.step), self.center) for k in indices]
+        else:
+            origin, start_tangent = self.path[0], self._path_point(0.0)[1]
+            spacing = self.stations[-1] / (self.count - 1) if self.count > 1 else 0.0
+            result = []
+            for k in indices:
+                point, tangent = self._path_point(k * spacing)
+                rotation = _align_rotation(start_tangent, tangent) if self.orient else None
+                result.append(([point[i] - origin[i] for i in range(3)], rotation, origin if self.orient else None))
+        if self.jitter is not None:
+            jx, jy, jz = self.jitter
+            seed = self.seed
+            for k, (translation, _, _) in zip(indices, result):
+                translation[0] += jx * (2 * _unit_hash(seed, k, 0) - 1)
+                translation[1] += jy * (2 * _unit_hash(seed, k, 1) - 1)
+                translation[2] += jz * (2 * _unit_hash(seed, k, 2) - 1)
+        return [(_rounded(translation), [_rounded(row) for row in rotation] if rotation else None, pivot)
+                for translation, rotation, pivot in result]
+
+    def _numpy_placements(self, start: int, end: int) -> List[Placement]:
+        """placements() with NumPy: one array operation per formula instead of a loop per instance"""
+        indices = np.arange(start, end)
+        k = indices.astype(float)
+        rotations = None
+        pivot: Optional[Vector] = None
+        if self.kind == "linear":
+            translations = np.outer(k, self.spacing)
+        elif self.kind == "grid":
+            nx, ny, _ = self.counts
+            cells = np.stack([indices % nx, indices // nx % ny, indices // (nx * ny)], axis=1)
+            translations = cells * np.asarray(self.spacing)
+        elif self.kind == "polar":
+            translations = np.zeros((len(k), 3))
+            rotations = _numpy_axis_rotations(self.axis, k * self.step)
+            pivot = self.center
+        else:
+            stations, path = np.asarray(self.stations), np.asarray(self.path)
+            spacing = self.stations[-1] / (self.count - 1) if self.count > 1 else 0.0
+            distances = k * spacing
+            lo = np.clip(np.searchsorted(stations, distances, side="right") - 1, 0, len(stations) - 2)
+            a, b = path[lo], path[lo + 1]
+            length = stations[lo + 1] - stations[lo]
+            positive = length > 0
+            safe = np.where(positive, length, 1.0)
+            t = np.where(positive, (distances - stations[lo]) / safe, 0.0)
+            translations = a + (b - a) * t[:, None] - path[0]
+            if self.orient:
+                tangents = np.where(positive[:, None], (b - a) / safe[:, None], [1.0, 0.0, 0.0])
+                rotations = _numpy_align_rotations(self._path_point(0.0)[1], tangents)
+                pivot = self.path[0]
+        if self.jitter is not None:
+            units = np.stack([_numpy_unit_hash(self.seed, indices, axis) for axis in range(3)], axis=1)
+            translations = translations + np.asarray(self.jitter) * (2 * units - 1)
+        translations = (np.round(translations, ROUND_DIGITS) + 0.0).tolist()
+        if rotations is None:
+            return [(translation, None, None) for translation in translations]
+        rotations = (np.round(rotations, ROUND_DIGITS) + 0.0).tolist()
+        return [(translation, rotation, pivot) for translation, rotation in zip(translations, rotations)]
+
+
+def parse_pattern(spec: Dict[str, Any], path: Optional[List[Vector]] = None) -> ArrayPattern:
+    """Validate a pattern spec; raises ValueError.
+
+    - linear: count, spacing [dx, dy, dz] (offset between neighbours)
+    - grid: counts [nx, ny] or [nx, ny, nz], spacing [sx, sy] or [sx, sy, sz]
+    - polar: count, center [x, y, z], axis (default [0, 0, 1]), angle in degrees (default 360).
+      A full turn spreads the instances evenly; a smaller angle puts the last one at angle.
+    - curve: count, path [[x, y, z], ...] (or a curve, resolved by the caller into path), orient
+      (default true: copies turn with the path tangent)
+    Any kind: jitter [jx, jy, jz] and seed.
+    """
+    if not isinstance(spec, dict):
+        raise ValueError("pattern must be a dictionary")
+    kind = spec.get("kind")
+    if kind not in ARRAY_KINDS:
+        raise ValueError(f"pattern.kind must be one of: {', '.join(ARRAY_KINDS)}")
+
+    if kind == "grid":
+        raw_counts = spec.get("counts")
+        if not isinstance(raw_counts, list) or len(raw_counts) not in (2, 3):
+            raise ValueError("pattern.counts must be [nx, ny] or [nx, ny, nz]")
+        counts = tuple(_count(c, "counts") for c in raw_counts) + ((1,) if len(raw_counts) == 2 else ())
+        spacing = spec.get("spacing")
+        if isinstance(spacing, list) and len(spacing) == 2:
+            spacing = [*spacing, 0]
+        pattern = ArrayPattern(kind, counts[0] * counts[1] * counts[2], spacing=_vector(spacing, "spacing"),
+                               counts=counts)
+    else:
+        pattern = ArrayPattern(kind, _count(spec.get("count"), "count"))
+        if kind == "linear":
+            pattern.spacing = _vector(spec.get("spacing"), "spacing")
+        elif kind == "polar":
+            pattern.center = _vector(spec.get("center"), "center")
+            axis = _vector(spec.get("axis", [0, 0, 1]), "axis")
+            norm = math.sqrt(sum(v * v for v in axis))
+            if norm < 1e-12:
+                raise ValueError("pattern.axis must not be zero")
+            pattern.axis = [v / norm for v in axis]
+            angle = float(spec.get("angle", 360.0))
+            divisions = pattern.count if abs(angle) >= 360.0 - 1e-9 else max(pattern.count - 1, 1)
+            pattern.step = math.radians(angle) / divisions
+        else:
+            points = path if path is not None else spec.get("path")
+            if not isinstance(points, list) or len(points) < 2:
+                raise ValueError("pattern.path must list at least 2 points (or give a curve)")
+            pattern.path = [_vector(point, "path[]") for point in points]
+            stations = [0.0]
+            for a, b in zip(pattern.path, pattern.path[1:]):
+                stations.append(stations[-1] + math.dist(a, b))
+            if stations[-1] <= 0:
+                raise ValueError("pattern.path has zero length")
+            pattern.stations = stations
+            pattern.orient = bool(spec.get("orient", True))
+
+    if pattern.count > MAX_ARRAY_INSTANCES:
+        raise ValueError(f"At most {MAX_ARRAY_INSTANCES} instances per array")
+    if spec.get("jitter") is not None:
+        pattern.jitter = _vector(spec["jitter"], "jitter")
+        pattern.seed = int(spec.get("seed") or 0)
+    return pattern
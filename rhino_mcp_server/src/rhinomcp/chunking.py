@@ -0,0 +1,178 @@
+# Splitting large commands into pipelined chunks sized from observed Rhino latency
+"""Send one logical command as several smaller ones.
+
+A command carrying thousands of objects can take Rhino longer than its deadline, and a timeout then
+loses the whole request. send_in_chunks() cuts the items into chunks. A chunk is bounded by
+ChunkSizer.size_for() objects and by about CHUNK_MAX_BYTES of encoded items, estimated from the
+shape of each item so that items are encoded only once, when their chunk is sent. The chunks are pipelined on
+one pooled connection, at most CHUNK_PIPELINE_DEPTH in flight, so Rhino works on one chunk while
+the next is encoded and sent. Rhino runs commands one at a time, so chunks are applied in order.
+
+ChunkSizer keeps an EWMA of Rhino's time per item for each command type. It is measured from the
+reply of each chunk, minus the time the chunk queued behind the previous one. The next chunk is then
+sized to take about CHUNK_TARGET_SECONDS. The first chunks, before any measurement, hold
+INITIAL_CHUNK items.
+"""
+import asyncio
+import os
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, FrozenSet, List, Optional, Sequence
+
+from rhinomcp.server import AsyncRhinoConnectionPool, logger
+
+CHUNK_TARGET_SECONDS = float(os.environ.get("RHINOMCP_CHUNK_TARGET_SECONDS", "2"))
+CHUNK_MAX_BYTES = int(os.environ.get("RHINOMCP_CHUNK_MAX_BYTES", str(4 * 1024 * 1024)))
+CHUNK_PIPELINE_DEPTH = 2  # Chunks in flight; one being run by Rhino, one queued behind it
+INITIAL_CHUNK = 250
+MIN_CHUNK = 10
+MAX_CHUNK = 20000
+CHUNK_EWMA_ALPHA = 0.3
+ITEM_BYTES_ESTIMATE = 320  # Encoded size assumed for an object entry with a name, color and transform
+POINT_BYTES_ESTIMATE = 48  # ... plus this per point in its params (polylines, curves)
+
+
+class ChunkSizer:
+    """Items per chunk for each command type, from the observed Rhino time per item. Thread-safe."""
+
+    def __init__(self, target: float = CHUNK_TARGET_SECONDS, initial: int = INITIAL_CHUNK,
+                 minimum: int = MIN_CHUNK, maximum: int = MAX_CHUNK):
+        self.target = target
+        self.initial = initial
+        self.minimum = minimum
+        self.maximum = maximum
+        self._per_item: Dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def size_for(self, command_type: str) -> int:
+        with self._lock:
+            per_item = self._per_item.get(command_type)
+        if per_item is None:
+            return self.initial
+        return int(min(max(self.target / max(per_item, 1e-9), self.minimum), self.maximum))
+
+    def observe(self, command_type: str, items: int, seconds: float):
+        """Record that Rhino took seconds for a chunk of items"""
+        if items <= 0:
+            return
+        sample = seconds / items
+        with self._lock:
+            previous = self._per_item.get(command_type)
+            self._per_item[command_type] = sample if previous is None else \
+                previous + CHUNK_EWMA_ALPHA * (sample - previous)
+
+    def snapshot(self) -> Dict[str, Dict[str, float]]:
+        with self._lock:
+            per_item = dict(self._per_item)
+        return {command: {"per_item_ms": round(seconds * 1000, 4), "chunk_size": self.size_for(command)}
+                for command, seconds in sorted(per_item.items())}
+
+
+chunk_sizer = ChunkSizer()
+
+
+@dataclass
+class ChunkOutcome:
+    """items[start:end] were sent as one command; result or error holds its reply"""
+    start: int
+    end: int
+    result: Optional[Dict[str, Any]] = None
+    error: Optional[str] = None
+
+
+def estimated_size(item: Any) -> int:
+    """Rough encoded size of an object entry, without encoding it: a fixed size plus its points.
+
+    Point lists are the only part of an entry that grows without bound, so this stays within a
+    small factor of the real size while costing a few lookups instead of a JSON encode.
+    """
+    params = item.get("params") if isinstance(item, dict) else None
+    points = params.get("points") if isinstance(params, dict) else None
+    return ITEM_BYTES_ESTIMATE + (POINT_BYTES_ESTIMATE * len(points) if isinstance(points, list) else 0)
+
+
+def progress_reporter(ctx: Any, verb: str) -> Optional[Callable[[int, int], Awaitable[None]]]:
+    """A send_in_chunks progress callback reporting "<verb> done of total" to the client of ctx.
+
+    Progress is best effort: a failed notification is logged and does not stop the command.
+    """
+    if ctx is None:
+        return None
+
+    async def progress(done: int, total: int):
+        try:
+            await ctx.report_progress(done, total, f"{verb} {done} of {total}")
+        except Exception as e:
+            logger.debug(f"Could not report progress: {str(e)}")
+    return progress
+
+
+async def send_in_chunks(
+    rhino: AsyncRhinoConnectionPool,
+    command_type: str,
+    items: Sequence[Any],
+    make_params: Callable[[int, int, FrozenSet[str]], Dict[str, Any]],
+    progress: Optional[Callable[[int, int], Awaitable[None]]] = None,
+    size_of: Optional[Callable[[Any], int]] = None,
+    sizer: ChunkSizer = chunk_sizer,
+    depth: int = CHUNK_PIPELINE_DEPTH,
+    max_bytes: int = CHUNK_MAX_BYTES,
+) -> List[ChunkOutcome]:
+    """Send items as command_type chunks, in order.
+
+    The params of a chunk are make_params(start, end, features) for items[start:end], given the
+    features the plugin granted on the connection used. size_of(item) (default: estimated_size) is
+    used to bound the encoded size of a chunk; it should be cheap, as every item is sized.
+
+    progress(done, total) is awaited after each chunk. After a chunk fails no further chunks are
+    sent. The outcomes cover items[:k]; the items from k on were never sent.
+    """
+    total = len(items)
+    size_of = size_of or estimated_size
+    outcomes: List[ChunkOutcome] = []
+    if total == 0:
+        return outcomes
+
+    def cut(start: int) -> int:
+        limit = sizer.size_for(command_type)
+        end, size = start, 0
+        while end < total and end - start < limit:
+            size += size_of(items[end])
+            if end > start and size > max_bytes:
+                break
+            end += 1
+        return end
+
+    async def send(start: int, end: int):
+        sent_at = time.monotonic()
+        try:
+            result = await connection.send_command(command_type, make_params(start, end, connection.features))
+            return ChunkOutcome(start, end, result=result), sent_at, time.monotonic()
+        except Exception as e:
+            return ChunkOutcome(start, end, error=str(e)), sent_at, time.monotonic()
+
+    pending: deque = deque()
+    async with rhino.connection() as connection:
+        try:
+            next_start, last_done, failed = 0, 0.0, False
+            while pending or (next_start < total and not failed):
+                while next_start < total and not failed and len(pending) < depth:
+                    end = cut(next_start)
+                    pending.append(asyncio.ensure_future(send(next_start, end)))
+                    next_start = end
+                outcome, sent_at, done_at = await pending.popleft()
+                outcomes.append(outcome)
+                if outcome.error is None:
+                    # Rhino started on this chunk once it arrived and the previous one was finished
+                    sizer.observe(command_type, outcome.end - outcome.start, done_at - max(sent_at, last_done))
+                else:
+                    failed = True
+                last_done = done_at
+                if progress is not None:
+                    await progress(outcome.end, total)
+        finally:
+            for task in pending:
+                task.cancel()
+    return outcomes
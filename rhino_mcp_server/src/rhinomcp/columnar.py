@@ -0,0 +1,109 @@
+# Columnar (struct-of-arrays) input for create_objects
+"""Many objects described as columns instead of one dictionary per object.
+
+columns = {
+    "templates": [ObjectCreateSpec, ...],  # shared type/params/color/rotation_matrix/scale
+    "template": [int, ...],                # template index per object (default: all 0)
+    "types": [str, ...],                   # per-object type, overrides the template's
+    "names": [str | None, ...],
+    "translations": [x0, y0, z0, x1, ...], # flat, 3 numbers per object
+    "colors": [r0, g0, b0, r1, ...],       # flat, 3 numbers per object
+    "count": int,                          # only needed when no per-object column is given
+}
+
+Every column is optional; the number of objects comes from the columns that are present and they
+must agree. Object i is templates[template[i]] with the per-object values of row i applied.
+Plugins granting the "columnar_create" feature expand the rows themselves. For older plugins
+expand_columnar() turns rows into regular create_objects entries.
+"""
+from typing import Any, Dict, List, Optional
+
+from rhinomcp.transforms import check_flat_vectors
+
+COLUMNAR_FORMAT = "columnar"
+PER_OBJECT_COLUMNS = ("template", "types", "names")
+FLAT3_COLUMNS = {"translations": "translation", "colors": "color"}
+
+
+def columnar_count(columns: Dict[str, Any]) -> int:
+    """Validate columns and return the number of objects they describe; raises ValueError"""
+    if not isinstance(columns, dict):
+        raise ValueError("columns must be a dictionary")
+    unknown = set(columns) - {"templates", "count", *PER_OBJECT_COLUMNS, *FLAT3_COLUMNS}
+    if unknown:
+        raise ValueError(f"Unknown columns: {sorted(unknown)}")
+    templates = columns.get("templates")
+    if not isinstance(templates, list) or not templates:
+        raise ValueError("columns.templates must be a non-empty list")
+    for index, template in enumerate(templates):
+        if not isinstance(template, dict) or not isinstance(template.get("params"), dict):
+            raise ValueError(f"columns.templates[{index}].params must be a dictionary")
+
+    counts: Dict[str, int] = {}
+    for name in PER_OBJECT_COLUMNS:
+        if columns.get(name) is not None:
+            if not isinstance(columns[name], list):
+                raise ValueError(f"columns.{name} must be a list")
+            counts[name] = len(columns[name])
+    for name in FLAT3_COLUMNS:
+        if columns.get(name) is not None:
+            check_flat_vectors(columns[name], f"columns.{name}")
+            counts[name] = len(columns[name]) // 3
+    if columns.get("count") is not None:
+        counts["count"] = int(columns["count"])
+    if not counts:
+        raise ValueError("columns needs count or at least one per-object column")
+    if len(set(counts.values())) > 1:
+        raise ValueError(f"columns describe different numbers of objects: {counts}")
+    count = next(iter(counts.values()))
+    if count <= 0:
+        raise ValueError("columns describe no objects")
+
+    indices = columns.get("template")
+    if indices is not None and not all(isinstance(i, int) and 0 <= i < len(templates) for i in indices):
+        raise ValueError(f"columns.template values must be indices into templates (0-{len(templates) - 1})")
+    types = columns.get("types")
+    if types is None or any(t is None for t in types):
+        for index in sorted(set(indices) if indices is not None else {0}):
+            if "type" not in templates[index]:
+                raise ValueError(f"columns.templates[{index}].type is required when types does not give it")
+    return count
+
+
+def columnar_chunk(columns: Dict[str, Any], start: int, end: int) -> Dict[str, Any]:
+    """create_objects params for objects start..end in the plugin's columnar format"""
+    params: Dict[str, Any] = {"format": COLUMNAR_FORMAT, "count": end - start, "templates": columns["templates"]}
+    for name in PER_OBJECT_COLUMNS:
+        if columns.get(name) is not None:
+            params[name] = columns[name][start:end]
+    for name in FLAT3_COLUMNS:
+        if columns.get(name) is not None:
+            params[name] = columns[name][3 * start:3 * end]
+    return params
+
+
+def columnar_object(columns: Dict[str, Any], index: int) -> Dict[str, Any]:
+    """The ObjectCreateSpec of row index"""
+    indices = columns.get("template")
+    spec = dict(columns["templates"][indices[index] if indices is not None else 0])
+    for name, key in (("types", "type"), ("names", "name")):
+        if columns.get(name) is not None and columns[name][index] is not None:
+            spec[key] = columns[name][index]
+    for name, key in FLAT3_COLUMNS.items():
+        if columns.get(name) is not None:
+            spec[key] = columns[name][3 * index:3 * index + 3]
+    return spec
+
+
+def expand_columnar(columns: Dict[str, Any], start: int, end: int) -> Dict[str, Dict[str, Any]]:
+    """create_objects params for objects start..end as regular entries, keyed by row index"""
+    return {str(index): columnar_object(columns, index) for index in range(start, end)}
+
+
+def columnar_row_size(columns: Dict[str, Any], index: int) -> int:
+    """Approximate encoded size of one row, to bound chunks without encoding them"""
+    names: Optional[List[Any]] = columns.get("names")
+    types: Optional[List[Any]] = columns.get("types")
+    size = 4 + (len(str(names[index])) + 3 if names is not None else 0)
+    size += len(str(types[index])) + 3 if types is not None else 0
+    return size + sum(60 for name in FLAT3_COLUMNS if columns.get(name) is not None)
@@ -0,0 +1,1575 @@
+# In-process stand-in for the Rhino plugin
+"""A fake Rhino plugin for offline testing and benchmarking.
+
+FakeRhinoServer speaks the plugin's wire protocol:
+- legacy JSON documents and the negotiate handshake
+- length-prefixed frames with request ids
+- zlib compression and attachments
+
+It answers the plugin's command table from a synthetic in-memory scene. Commands run one at a
+time on a single worker thread, the way Rhino runs them on its UI thread, after an optional
+simulated latency. Reply shapes follow rhino_mcp_plugin closely enough for the tools and the
+connection code. The geometry itself is synthetic (oriented boxes and random polylines).
+
+    uv run python -m rhinomcp.fake_rhino --objects 10000 --latency-ms 2
+
+or in-process:
+
+    with FakeRhinoServer(FakeRhinoConfig(objects=1000)) as fake:
+        pool = AsyncRhinoConnectionPool(port=fake.port)
+"""
+import argparse
+import base64
+import datetime
+import json
+import logging
+import math
+import queue
+import random
+import socket
+import threading
+import time
+import uuid
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from rhinomcp.server import (
+    COMPRESSION_ZLIB,
+    FEATURE_ATTACHMENTS,
+    FEATURE_BATCH,
+    FEATURE_COLUMNAR_CREATE,
+    FEATURE_REQUEST_IDS,
+    FEATURE_REVISIONS,
+    FLAG_ATTACHMENT,
+    FRAME_HEADER,
+    FRAMING_LEGACY,
+    FRAMING_LENGTH_PREFIXED,
+    MAX_FRAME_SIZE,
+    PROTOCOL_VERSION,
+    RHINO_HOST,
+    RHINO_PORT,
+    Codec,
+    StdlibJsonCodec,
+    encode_frame,
+    pack_message,
+    unpack_message,
+)
+
+logger = logging.getLogger("RhinoMCPServer.fake")
+
+# Mirrors of the plugin's protocol limits (RhinoMCPServer.cs)
+SUPPORTED_FEATURES = (FEATURE_REQUEST_IDS, FEATURE_ATTACHMENTS, FEATURE_REVISIONS, FEATURE_BATCH,
+                      FEATURE_COLUMNAR_CREATE)
+DOCUMENT_COMMANDS = ("open_file", "close_file")  # Not allowed inside a batch
+DEFAULT_COMPRESSION_THRESHOLD = 64 * 1024
+MIN_COMPRESSION_THRESHOLD = 1024
+
+# Mirrors of the get_document_info limits (GetDocumentInfo.cs)
+DEFAULT_DOCUMENT_INFO_LIMIT = 100
+MAX_DOCUMENT_INFO_LIMIT = 1000
+DEFAULT_DOCUMENT_INFO_FULL_LIMIT = 300
+DEFAULT_DOCUMENT_INFO_GEOMETRY_POINT_CAP = 64
+
+VIEWS_FRAME = "local pose; top=[X,Y] front=[X,Z] right=[Y,Z]; shared origin; silhouette (direction-agnostic)"
+PNG_SIGNATURE = b"\x89PNG\r\n\x1a\n"
+
+# kind -> (RhinoObject.ObjectType name, Serializer type)
+OBJECT_KINDS = {
+    "point": ("Point", "POINT"),
+    "line": ("Curve", "LINE"),
+    "polyline": ("Curve", "POLYLINE"),
+    "curve": ("Curve", "CURVE"),
+    "extrusion": ("Extrusion", "EXTRUSION"),
+    "brep": ("Brep", "BREP"),
+    "mesh": ("Mesh", "MESH"),
+}
+SOLID_KINDS = frozenset({"extrusion", "brep", "mesh"})
+CURVE_KINDS = frozenset({"line", "polyline", "curve"})
+
+# create_object type -> kind of the fake object it produces
+CREATE_KINDS = {
+    "POINT": "point",
+    "LINE": "line",
+    "POLYLINE": "polyline",
+    "CIRCLE": "curve",
+    "ARC": "curve",
+    "ELLIPSE": "curve",
+    "CURVE": "curve",
+    "BOX": "extrusion",
+    "SPHERE": "brep",
+    "CONE": "brep",
+    "CYLINDER": "brep",
+    "SURFACE": "brep",
+}
+
+IDENTITY = ((1.0, 0.0, 0.0), (0.0, 1.0, 0.0), (0.0, 0.0, 1.0))
+
+# Same order as ExecuteCommandInternal; "select_objects" is deliberately absent, as in the plugin
+COMMAND_TABLE = (
+    "get_document_info",
+    "create_object",
+    "create_objects",
+    "copy_object",
+    "copy_objects",
+    "get_object_info",
+    "get_objects_info",
+    "get_selected_objects_info",
+    "get_connectivity_graph",
+    "delete_objects",
+    "modify_object",
+    "modify_objects",
+    "rotate_object",
+    "rotate_objects",
+    "reset_object_pose",
+    "reset_objects_pose",
+    "rebase_object_pose",
+    "rebase_objects_pose",
+    "execute_rhinoscript_python_code",
+    "create_layer",
+    "get_or_set_current_layer",
+    "delete_layer",
+    "open_file",
+    "close_file",
+    "list_plugins",
+    "run_command",
+    "get_log",
+    "get_selected_objects",
+    "select_objects_by_filter",
+    "deselect_all",
+    "zoom_to_objects",
+    "capture_view",
+    "get_viewport_info",
+    "rename_layer",
+    "move_objects_to_layer",
+    "get_layer_states",
+    "save_layer_state",
+    "restore_layer_state",
+    "get_materials",
+    "create_material",
+    "set_object_material",
+    "get_object_materials",
+)
+
+
+@dataclass
+class FakeRhinoConfig:
+    """Shape of the synthetic scene and of the simulated plugin"""
+    objects: int = 1000
+    layers: int = 8
+    seed: int = 7
+    extent: float = 1000.0  # Objects are scattered over [-extent, extent] in X and Y
+    kind_weights: Dict[str, float] = field(default_factory=lambda: {
+        "extrusion": 4, "brep": 2, "mesh": 1, "polyline": 2, "curve": 1, "line": 1, "point": 1,
+    })
+    polyline_points: int = 64  # Vertices of each generated POLYLINE
+    outline_points: int = 24  # Vertices of each ortho3 loop before outline_max_points applies
+    capture_bytes: int = 256 * 1024  # Size of the fake PNG returned by capture_view
+    # Minimum Rhino time per command: latency (or command_latency[type]) + per_object_latency
+    # for every object the command touched + uniform jitter in [0, latency_jitter]
+    latency: float = 0.0
+    latency_jitter: float = 0.0
+    per_object_latency: float = 0.0
+    command_latency: Dict[str, float] = field(default_factory=dict)
+    # Protocol capabilities; framing=False behaves like a plugin that predates negotiation
+    framing: bool = True
+    features: Tuple[str, ...] = SUPPORTED_FEATURES
+    compression: bool = True
+
+
+def _add(a, b):
+    return [a[0] + b[0], a[1] + b[1], a[2] + b[2]]
+
+
+def _sub(a, b):
+    return [a[0] - b[0], a[1] - b[1], a[2] - b[2]]
+
+
+def _matvec(m, v):
+    return [m[0][0] * v[0] + m[0][1] * v[1] + m[0][2] * v[2],
+            m[1][0] * v[0] + m[1][1] * v[1] + m[1][2] * v[2],
+            m[2][0] * v[0] + m[2][1] * v[1] + m[2][2] * v[2]]
+
+
+def _matmul(a, b):
+    return [[sum(a[i][k] * b[k][j] for k in range(3)) for j in range(3)] for i in range(3)]
+
+
+def _round(values, digits: int = 6) -> List[float]:
+    return [round(v, digits) for v in values]
+
+
+def _bbox_of(points) -> List[List[float]]:
+    xs, ys, zs = zip(*points)
+    return [[min(xs), min(ys), min(zs)], [max(xs), max(ys), max(zs)]]
+
+
+def _color_string(color) -> str:
+    """System.Drawing.Color.ToString(), as get_document_info reports layer colours"""
+    return f"Color [A=255, R={color[0]}, G={color[1]}, B={color[2]}]"
+
+
+def _serialize_color(color) -> Dict[str, int]:
+    return {"r": color[0], "g": color[1], "b": color[2]}
+
+
+def _sample(points: List[Any], max_points: int) -> List[Any]:
+    """Evenly spaced subset of at most max_points, keeping both ends (0 keeps everything)"""
+    if max_points <= 0 or len(points) <= max_points:
+        return points
+    if max_points == 1:
+        return [points[0]]
+    step = (len(points) - 1) / (max_points - 1)
+    return [points[round(i * step)] for i in range(max_points)]
+
+
+def _ring(width: float, height: float, count: int, rounded: bool) -> List[List[float]]:
+    """Closed 2D outline of count vertices (plus the repeated first one) centred on the origin"""
+    count = max(4, count)
+    ring = []
+    for i in range(count):
+        angle = 2 * math.pi * i / count
+        if rounded:
+            u, v = math.cos(angle) * width / 2, math.sin(angle) * height / 2
+        else:
+            # Walk the rectangle perimeter so the vertex count, not the shape, scales the payload
+            c, s = math.cos(angle), math.sin(angle)
+            scale = 1 / max(abs(c), abs(s))
+            u, v = c * scale * width / 2, s * scale * height / 2
+        ring.append([round(u, 4), round(v, 4)])
+    return ring + [ring[0]]
+
+
+@dataclass
+class FakeObject:
+    """One document object: an oriented box for solids, a world-space point list otherwise"""
+    id: str
+    name: str
+    kind: str
+    layer: str
+    center: List[float]
+    extents: List[float]
+    rotation: List[List[float]] = field(default_factory=lambda: [list(row) for row in IDENTITY])
+    color: Tuple[int, int, int] = (0, 0, 0)
+    material: int = -1
+    user_strings: Dict[str, str] = field(default_factory=dict)
+    points: Optional[List[List[float]]] = None
+    seed: int = 0  # Generated curves build their points from this on first use
+    point_budget: int = 64
+
+    @property
+    def object_type(self) -> str:
+        return OBJECT_KINDS[self.kind][0]
+
+    @property
+    def serializer_type(self) -> str:
+        return OBJECT_KINDS[self.kind][1]
+
+    def curve_points(self) -> List[List[float]]:
+        if self.points is None:
+            rng = random.Random(self.seed)
+            count = 2 if self.kind == "line" else self.point_budget
+            half = [e / 2 for e in self.extents]
+            self.points = [[self.center[i] + rng.uniform(-half[i], half[i]) for i in range(3)] for _ in range(count)]
+            self._fit_points()
+        return self.points
+
+    def _fit_points(self):
+        bbox = _bbox_of(self.points)
+        self.center = [(lo + hi) / 2 for lo, hi in zip(*bbox)]
+        self.extents = [hi - lo for lo, hi in zip(*bbox)]
+
+    def corners(self) -> List[List[float]]:
+        half = [e / 2 for e in self.extents]
+        return [
+            _add(self.center, _matvec(self.rotation, [sx * half[0], sy * half[1], sz * half[2]]))
+            for sx in (-1, 1) for sy in (-1, 1) for sz in (-1, 1)
+        ]
+
+    def bbox(self) -> List[List[float]]:
+        if self.kind == "point":
+            return [list(self.center), list(self.center)]
+        if self.kind in CURVE_KINDS:
+            return _bbox_of(self.curve_points())
+        return _bbox_of(self.corners())
+
+    def pose(self) -> Dict[str, Any]:
+        return {"world_from_local": {
+            "R": [_round(row) for row in self.rotation],
+            "t": _round(self.center),
+        }}
+
+    def transform(self, matrix=IDENTITY, pivot=None, translation=(0.0, 0.0, 0.0), scale=None):
+        """Scale about the centre, rotate about pivot, then translate"""
+        pivot = list(pivot) if pivot is not None else list(self.center)
+        if self.kind in CURVE_KINDS:
+            points = self.curve_points()
+            if scale is not None:
+                points = [_add(self.center, [(p[i] - self.center[i]) * scale[i] for i in range(3)]) for p in points]
+            self.points = [_add(_add(pivot, _matvec(matrix, _sub(p, pivot))), translation) for p in points]
+            self._fit_points()
+            return
+        if scale is not None:
+            self.extents = [abs(e * s) for e, s in zip(self.extents, scale)]
+        self.center = _add(_add(pivot, _matvec(matrix, _sub(self.center, pivot))), translation)
+        if self.kind != "point":
+            self.rotation = _matmul(matrix, self.rotation)
+
+    def copy(self, new_id: str) -> "FakeObject":
+        return FakeObject(
+            id=new_id, name=self.name, kind=self.kind, layer=self.layer, center=list(self.center),
+            extents=list(self.extents), rotation=[list(row) for row in self.rotation], color=self.color,
+            material=self.material, user_strings=dict(self.user_strings),
+            points=[list(p) for p in self.points] if self.points is not None else None,
+            seed=self.seed, point_budget=self.point_budget,
+        )
+
+
+class FakeScene:
+    """Synthetic document answering the plugin's command table.
+
+    execute() is not thread-safe; FakeRhinoServer calls it from a single thread only.
+    """
+
+    def __init__(self, config: Optional[FakeRhinoConfig] = None):
+        self.config = config or FakeRhinoConfig()
+        self._rng = random.Random(self.config.seed)
+        self.objects: Dict[str, FakeObject] = {}
+        self.layers: List[Dict[str, Any]] = []
+        self.current_layer = "Default"
+        self.selected: set = set()
+        self.materials: List[Dict[str, Any]] = []
+        self.layer_states: Dict[str, List[Dict[str, Any]]] = {}
+        self.log: List[str] = []
+        self.name = "fake.3dm"
+        self.path = "/fake/fake.3dm"
+        self.created = datetime.datetime(2024, 1, 1).isoformat()
+        self.revision = 0  # Bumped by every command that changes the document
+        self.external_revision = 0  # Bumped by edit_externally(), like user edits in Rhino
+        # DocumentChangeJournal: the revision each object last changed at, for get_document_info(since=...)
+        self.changed_at: Dict[str, int] = {}
+        self._journal_id = uuid.uuid4().hex[:8]
+        self._document_serial = 1
+        self.touched = 0  # Objects serialised or changed by the command being executed
+        self._sorted: Optional[List[FakeObject]] = None
+        self._populate()
+
+    def describe(self) -> str:
+        return f"{len(self.objects)} objects"
+
+    # -- scene construction -------------------------------------------------------------
+
+    def _new_id(self) -> str:
+        return str(uuid.UUID(int=self._rng.getrandbits(128), version=4))
+
+    def _populate(self):
+        config = self.config
+        self._add_layer("Default", (0, 0, 0))
+        for i in range(max(0, config.layers - 1)):
+            self._add_layer(f"Layer {i + 1:02d}", tuple(self._rng.randrange(256) for _ in range(3)))
+
+        kinds = [kind for kind in config.kind_weights if kind in OBJECT_KINDS]
+        weights = [config.kind_weights[kind] for kind in kinds]
+        layer_names = [layer["name"] for layer in self.layers]
+        for i, kind in enumerate(self._rng.choices(kinds, weights, k=config.objects)):
+            center = [self._rng.uniform(-config.extent, config.extent),
+                      self._rng.uniform(-config.extent, config.extent),
+                      self._rng.uniform(0, config.extent / 10)]
+            size = [self._rng.uniform(0.5, 10.0) for _ in range(3)]
+            obj = FakeObject(
+                id=self._new_id(), name=f"{kind}_{i}", kind=kind, layer=self._rng.choice(layer_names),
+                center=center, extents=size if kind != "point" else [0.0, 0.0, 0.0],
+                color=tuple(self._rng.randrange(256) for _ in range(3)),
+                seed=self._rng.getrandbits(32),
+                point_budget=config.polyline_points if kind == "polyline" else 8,
+            )
+            if kind == "extrusion" and self._rng.random() < 0.25:
+                angle = self._rng.uniform(0, math.pi)
+                obj.rotation = [[math.cos(angle), -math.sin(angle), 0.0],
+                                [math.sin(angle), math.cos(angle), 0.0],
+                                [0.0, 0.0, 1.0]]
+            self.objects[obj.id] = obj
+
+    def _add_layer(self, name: str, color, parent: Optional[str] = None) -> Dict[str, Any]:
+        layer = {
+            "id": self._new_id(), "name": name, "color": tuple(color), "visible": True, "locked": False,
+            "parent": parent or str(uuid.UUID(int=0)),
+        }
+        self.layers.append(layer)
+        return layer
+
+    def _changed(self, objects: Iterable[FakeObject] = ()):
+        self.revision += 1
+        self._sorted = None
+        for obj in objects:
+            self.changed_at[obj.id] = self.revision
+
+    def _new_document(self):
+        # Tokens carry the document serial, so every earlier token expires
+        self._document_serial += 1
+        self.changed_at.clear()
+        self._changed()
+
+    def change_token(self) -> str:
+        return f"{self._journal_id}:{self._document_serial}:{self.revision}"
+
+    def _changes_since(self, token: str) -> Optional[set]:
+        parts = str(token).split(":")
+        if len(parts) != 3 or parts[:2] != [self._journal_id, str(self._document_serial)] or not parts[2].isdigit():
+            return None
+        since = int(parts[2])
+        if since > self.revision:
+            return None
+        return {object_id for object_id, revision in self.changed_at.items() if revision > since}
+
+    def edit_externally(self, object_id: Optional[str] = None):
+        """Move an object (the first one by default) as a user editing the model in Rhino would"""
+        obj = self.objects[object_id] if object_id is not None else next(iter(self.objects.values()))
+        obj.transform(IDENTITY, translation=[1.0, 0.0, 0.0])
+        self._changed([obj])
+        self.external_revision += 1
+
+    def _sorted_objects(self) -> List[FakeObject]:
+        # get_document_info pages in Guid order so offsets are stable between calls
+        if self._sorted is None:
+            self._sorted = sorted(self.objects.values(), key=lambda obj: obj.id)
+        return self._sorted
+
+    # -- lookups ------------------------------------------------------------------------
+
+    def _find(self, params: Dict[str, Any]) -> FakeObject:
+        """getObjectByIdOrName: id wins over name, names must be unique"""
+        object_id = params.get("id")
+        name = params.get("name")
+        obj = None
+        if object_id:
+            obj = self.objects.get(str(object_id))
+        elif name:
+            matches = [o for o in self.objects.values() if o.name == name]
+            if not matches:
+                raise ValueError(f"Object with name {name} not found.")
+            if len(matches) > 1:
+                raise ValueError(f"Multiple objects with name {name} found.")
+            obj = matches[0]
+        if obj is None:
+            raise ValueError(f"Object with ID {object_id} not found")
+        self.touched += 1
+        return obj
+
+    def _find_layer(self, name: Optional[str] = None, guid: Optional[str] = None) -> Dict[str, Any]:
+        if guid is not None:
+            layer = next((layer for layer in self.layers if layer["id"] == guid), None)
+            if layer is None:
+                raise ValueError(f"Layer not found for guid: {guid}")
+            return layer
+        if not name:
+            raise ValueError("Layer name cannot be empty")
+        layer = next((layer for layer in self.layers if layer["name"] == name), None)
+        if layer is None:
+            raise ValueError(f"Layer not found for name: {name}")
+        return layer
+
+    def _objects_by_ids(self, ids) -> List[FakeObject]:
+        found = [self.objects[str(i)] for i in ids or () if str(i) in self.objects]
+        self.touched += len(found)
+        return found
+
+    # -- serialisation ------------------------------------------------------------------
+
+    def _base_info(self, obj: FakeObject) -> Dict[str, Any]:
+        return {
+            "id": obj.id,
+            "name": obj.name,
+            "type": obj.serializer_type,
+            "layer": obj.layer,
+            "material": str(obj.material),
+            "color": _serialize_color(obj.color),
+        }
+
+    def _inventory(self, obj: FakeObject, detail: str, include_bbox: bool) -> Dict[str, Any]:
+        info: Dict[str, Any] = {"id": obj.id, "name": obj.name, "type": obj.object_type, "layer": obj.layer}
+        if include_bbox:
+            info["bbox"] = [_round(corner) for corner in obj.bbox()]
+            info["bbox_frame"] = "world_aabb"
+        if detail != "summary":
+            return info
+        info["material"] = str(obj.material)
+        info["color"] = _serialize_color(obj.color)
+        if obj.kind == "polyline":
+            summary = {"kind": "polyline", "point_count": len(obj.curve_points()), "closed": False, "planar": False}
+        elif obj.kind == "curve":
+            summary = {"kind": "curve", "degree": 3, "control_point_count": len(obj.curve_points()),
+                       "closed": False, "planar": False}
+        elif obj.kind == "line":
+            start, end = obj.curve_points()
+            summary = {"kind": "line", "point_count": 2, "length": round(math.dist(start, end), 2)}
+        elif obj.kind == "extrusion":
+            summary = {"kind": "extrusion", "closed": True}
+        elif obj.kind == "brep":
+            summary = {"kind": "brep", "face_count": 6, "edge_count": 12, "solid": True}
+        elif obj.kind == "mesh":
+            summary = {"kind": "mesh", "vertex_count": 8, "face_count": 6, "closed": True}
+        else:
+            summary = {"kind": "point"}
+        info["geometry_summary"] = summary
+        return info
+
+    def _geometry(self, obj: FakeObject, max_points: int, include_world: bool):
+        """Serializer.RhinoObject geometry for obb_pose and detail=full"""
+        if obj.kind == "point":
+            return _round(obj.center)
+        if obj.kind in CURVE_KINDS:
+            points = obj.curve_points()
+            sampled = _sample(points, max_points)
+            geometry: Dict[str, Any] = {
+                "points": [_round(p) for p in sampled],
+                "points_truncated": len(sampled) < len(points),
+                "point_count": len(points),
+                "points_returned": len(sampled),
+                "pose": obj.pose(),
+                "planar": False,
+                "local_points": [_round(_sub(p, obj.center)) for p in sampled],
+            }
+            if include_world:
+                geometry["world_points"] = geometry["points"]
+            return geometry
+        obb: Dict[str, Any] = {"extents": _round(obj.extents, 2)}
+        if include_world:
+            obb["world_corners"] = [_round(corner) for corner in obj.corners()]
+        return {"bbox": [_round(corner) for corner in obj.bbox()], "obb": obb, "pose": obj.pose()}
+
+    def _full(self, obj: FakeObject, max_points: int = 0, include_world: bool = True) -> Dict[str, Any]:
+        info = self._base_info(obj)
+        info["geometry"] = self._geometry(obj, max_points, include_world)
+        return info
+
+    def _detail(self, obj: FakeObject, detail: str, include_world: bool, outline_max_points: int) -> Dict[str, Any]:
+        """BuildGeometryDetailObjectInfo for bbox, obb_pose and ortho3"""
+        if detail == "bbox":
+            info = self._base_info(obj)
+            info["geometry"] = {"bbox": [_round(corner) for corner in obj.bbox()], "bbox_frame": "world_aabb"}
+            return info
+        if detail == "obb_pose" or obj.kind not in SOLID_KINDS:
+            info = self._full(obj, outline_max_points, include_world)
+            if detail == "ortho3" and isinstance(info["geometry"], dict):
+                info["geometry"]["ortho3_note"] = "ortho3 applies to solids/meshes only; returned obb_pose"
+            return info
+
+        ex, ey, ez = obj.extents
+        count = self.config.outline_points
+        if outline_max_points > 0:
+            count = min(count, outline_max_points)
+        rounded = obj.kind != "extrusion"
+        views = []
+        views_dropped = {}
+        kept: List[Tuple[str, float, float]] = []
+        for axis, width, height in (("top", ex, ey), ("front", ex, ez), ("right", ey, ez)):
+            twin = next((k for k, w, h in kept if {round(w, 3), round(h, 3)} == {round(width, 3), round(height, 3)}), None)
+            if twin is not None:
+                views_dropped[axis] = twin
+                continue
+            kept.append((axis, width, height))
+            loop = _ring(width, height, count, rounded)
+            view: Dict[str, Any] = {"axis": axis, "loops": [loop]}
+            if include_world:
+                view["loops_world"] = [[_round(_add(obj.center, _matvec(obj.rotation, self._lift(axis, u, v))))
+                                        for u, v in loop]]
+            views.append(view)
+        geometry: Dict[str, Any] = {
+            "obb": {"extents": _round(obj.extents, 2)},
+            "pose": obj.pose(),
+            "views_frame": VIEWS_FRAME,
+            "views": views,
+        }
+        if views_dropped:
+            geometry["views_dropped"] = views_dropped
+        info = self._base_info(obj)
+        info["geometry"] = geometry
+        return info
+
+    @staticmethod
+    def _lift(axis: str, u: float, v: float) -> List[float]:
+        if axis == "top":
+            return [u, v, 0.0]
+        if axis == "front":
+            return [u, 0.0, v]
+        return [0.0, u, v]
+
+    def _minimal_state(self, obj: FakeObject, changed: List[str], explicit: Optional[Dict[str, Any]] = None):
+        """BuildMinimalObjectState"""
+        updated: Dict[str, Any] = {}
+        if "pose" in changed:
+            updated["pose"] = obj.pose()
+        if "position" in changed:
+            updated["position"] = _round(obj.center)
+        for key in ("layer", "name"):
+            if key in changed:
+                updated[key] = getattr(obj, key)
+        if "color" in changed:
+            updated["color"] = _serialize_color(obj.color)
+        for key, value in (explicit or {}).items():
+            updated.setdefault(key, value)
+        return {"id": obj.id, "name": obj.name, "updated": updated, "changed_fields": list(updated)}
+
+    # -- command dispatch ---------------------------------------------------------------
+
+    def execute(self, command_type: str, params: Dict[str, Any]) -> Dict[str, Any]:
+        """Run one command and return the reply envelope, as ExecuteCommand does"""
+        self.touched = 0
+        self.log.append(f"Executing command: {command_type}")
+        if command_type != "batch" and command_type not in COMMAND_TABLE:
+            return {"status": "error", "message": f"Unknown command type: {command_type}"}
+        try:
+            result = getattr(self, command_type)(params or {})
+        except Exception as e:
+            self.log.append(f"Error in handler: {str(e)}")
+            return {"status": "error", "message": str(e)}
+        return {"status": "success", "result": result}
+
+    def batch(self, params):
+        commands = params.get("commands")
+        if not isinstance(commands, list):
+            raise ValueError("commands must be a list of {type, params} objects.")
+        stop_on_error = params.get("stop_on_error", True)
+        results = []
+        stopped = False
+        for item in commands:
+            item_type = item.get("type") if isinstance(item, dict) else None
+            if stopped:
+                results.append({"type": item_type, "status": "skipped"})
+                continue
+            try:
+                if item_type not in COMMAND_TABLE:
+                    raise ValueError(f"Unknown command type: {item_type}")
+                if item_type in DOCUMENT_COMMANDS:
+                    raise ValueError(f"{item_type} cannot run inside a batch.")
+                self.log.append(f"Executing batched command: {item_type}")
+                result = getattr(self, item_type)(item.get("params") or {})
+                results.append({"type": item_type, "status": "success", "result": result})
+            except Exception as e:
+                self.log.append(f"Error in handler: {str(e)}")
+                results.append({"type": item_type, "status": "error", "message": str(e)})
+                stopped = bool(stop_on_error)
+        statuses = [entry["status"] for entry in results]
+        return {"results": results, "succeeded": statuses.count("success"), "failed": statuses.count("error"),
+                "skipped": statuses.count("skipped")}
+
+    def get_document_info(self, params):
+        detail = params.get("detail") or "inventory"
+        if detail not in ("inventory", "summary", "full"):
+            raise ValueError("detail must be one of: inventory, summary, full.")
+        default_limit = DEFAULT_DOCUMENT_INFO_FULL_LIMIT if detail == "full" else DEFAULT_DOCUMENT_INFO_LIMIT
+        limit = min(max(int(params.get("limit", default_limit)), 1), MAX_DOCUMENT_INFO_LIMIT)
+        offset = max(int(params.get("offset", 0)), 0)
+        include_bbox = params.get("include_bbox", True)
+        max_points = min(max(int(params.get("max_geometry_points", DEFAULT_DOCUMENT_INFO_GEOMETRY_POINT_CAP)), 2), 1000)
+        since = params.get("since")
+        changed = self._changes_since(since) if since else None
+
+        objects = self._sorted_objects()
+        candidates = objects if changed is None else [obj for obj in objects if obj.id in changed]
+        matched = candidates
+        query = params.get("bbox")
+        if query is not None:
+            bbox_mode = params.get("bbox_mode") or "intersects"
+            if bbox_mode not in ("intersects", "contains_center", "contained"):
+                raise ValueError("bbox_mode must be one of: intersects, contains_center, contained.")
+            try:
+                lo = [min(a, b) for a, b in zip(query[0], query[1])]
+                hi = [max(a, b) for a, b in zip(query[0], query[1])]
+                if len(query) != 2 or len(lo) != 3:
+                    raise ValueError
+            except (TypeError, ValueError, IndexError):
+                raise ValueError("bbox must be [[min_x,min_y,min_z],[max_x,max_y,max_z]].")
+            matched = [obj for obj in candidates if _bbox_matches(lo, hi, obj.bbox(), bbox_mode)]
+
+        page = matched[offset:offset + limit]
+        self.touched += len(page)
+        if detail == "full":
+            serialized = [self._full(obj, max_points) for obj in page]
+        else:
+            serialized = [self._inventory(obj, detail, include_bbox) for obj in page]
+        layers = [
+            {"id": layer["id"], "name": layer["name"], "color": _color_string(layer["color"]),
+             "visible": layer["visible"], "locked": layer["locked"]}
+            for layer in self.layers[:limit]
+        ]
+        result = {
+            "meta_data": {
+                "name": self.name,
+                "date_created": self.created,
+                "date_modified": self.created,
+                "tolerance": 0.001,
+                "angle_tolerance": 1.0,
+                "path": self.path,
+                "units": "Millimeters",
+            },
+            "detail": detail,
+            "object_count": len(objects),
+            "objects_returned": len(serialized),
+            "objects_offset": offset,
+            "objects_limit": limit,
+            "objects_truncated": offset + limit < len(matched),
+            "objects_skipped_errors": 0,
+            "objects": serialized,
+            "layer_count": len(self.layers),
+            "layers_returned": len(layers),
+            "layers_limit": limit,
+            "layers_truncated": len(self.layers) > limit,
+            "layers_skipped_errors": 0,
+            "layers": layers,
+            "change_token": self.change_token(),
+        }
+        if since:
+            result["since"] = since
+            result["since_expired"] = changed is None
+        if changed is not None:
+            listed = {obj.id for obj in matched}
+            removed = sorted(object_id for object_id in changed if object_id not in listed)
+            result["removed_count"] = len(removed)
+            result["removed_ids"] = removed if offset == 0 else []
+        if query is not None:
+            result["spatial_filter"] = {
+                "bbox": [lo, hi], "bbox_frame": "world_aabb", "bbox_mode": bbox_mode, "matched_objects": len(matched),
+            }
+        return result
+
+    def _create(self, params) -> FakeObject:
+        object_type = params.get("type")
+        kind = CREATE_KINDS.get(object_type)
+        if kind is None:
+            raise ValueError("Invalid object type")
+        geo = params.get("params") or {}
+        points = None
+        center = [0.0, 0.0, 0.0]
+        extents = [0.0, 0.0, 0.0]
+        if object_type == "POINT":
+            center = [float(geo.get(axis, 0.0)) for axis in ("x", "y", "z")]
+        elif object_type == "LINE":
+            points = [list(map(float, geo["start"])), list(map(float, geo["end"]))]
+        elif object_type in ("POLYLINE", "CURVE", "SURFACE"):
+            points = [list(map(float, p)) for p in geo.get("points") or ()]
+            if object_type == "SURFACE":
+                u_count, v_count = (geo.get("count") or [0, 0])[:2]
+                if u_count < 2 or v_count < 2:
+                    raise ValueError("SURFACE requires count values >= 2 in both directions.")
+                if len(points) != u_count * v_count:
+                    raise ValueError(
+                        f"SURFACE point count mismatch: expected {u_count * v_count} points from count "
+                        f"[{u_count}, {v_count}], got {len(points)}."
+                    )
+            elif len(points) < 2:
+                raise ValueError("unable to create control point curve from given points")
+        elif object_type in ("CIRCLE", "ARC", "ELLIPSE"):
+            center = list(map(float, geo.get("center") or center))
+            rx = float(geo.get("radius", geo.get("radius_x", 1.0)))
+            ry = float(geo.get("radius", geo.get("radius_y", rx)))
+            points = [[center[0] + rx * math.cos(a), center[1] + ry * math.sin(a), center[2]]
+                      for a in (2 * math.pi * i / 32 for i in range(33))]
+        elif object_type == "BOX":
+            extents = [float(geo.get("width", 1.0)), float(geo.get("length", 1.0)), float(geo.get("height", 1.0))]
+        else:
+            radius = float(geo.get("radius", 1.0))
+            height = float(geo.get("height", 2 * radius))
+            extents = [2 * radius, 2 * radius, height]
+
+        obj = FakeObject(
+            id=self._new_id(), name=params.get("name") or "", kind=kind, layer=self.current_layer,
+            center=center, extents=extents, points=points,
+        )
+        if points is not None:
+            obj._fit_points()
+            if object_type == "SURFACE":
+                # A surface through the grid keeps its box, not its control points
+                obj.points = None
+        if "color" in params:
+            obj.color = tuple(int(c) for c in params["color"][:3])
+        self.objects[obj.id] = obj
+        self.touched += 1
+        self._changed([obj])
+        return obj
+
+    def create_object(self, params):
+        obj = self._create(params)
+        return self.modify_object({**params, "id": obj.id, "name": None})
+
+    def create_objects(self, params):
+        if params.get("format") == "columnar":
+            return self._create_objects_columnar(params)
+        results = {}
+        for key, object_params in params.items():
+            try:
+                results[key] = self.create_object(dict(object_params))
+            except Exception as e:
+                results[key] = {"error": str(e)}
+        return results
+
+    def _create_objects_columnar(self, params):
+        templates = params.get("templates") or []
+        indices, types, names = params.get("template"), params.get("types"), params.get("names")
+        translations, colors = params.get("translations"), params.get("colors")
+        ids, errors = [], {}
+        for i in range(int(params.get("count") or 0)):
+            try:
+                spec = dict(templates[indices[i] if indices is not None else 0])
+                if types is not None and types[i] is not None:
+                    spec["type"] = types[i]
+                if names is not None and names[i] is not None:
+                    spec["name"] = names[i]
+                if translations is not None:
+                    spec["translation"] = translations[3 * i:3 * i + 3]
+                if colors is not None:
+                    spec["color"] = colors[3 * i:3 * i + 3]
+                ids.append(self.create_object(spec)["id"])
+            except Exception as e:
+                ids.append(None)
+                errors[str(i)] = str(e)
+        return {"ids": ids, "errors": errors}
+
+    def copy_object(self, params):
+        source = self._find(params)
+        obj = source.copy(self._new_id())
+        translation = list(map(float, params["translation"])) if params.get("translation") is not None else None
+        if params.get("rotation_matrix") is not None:
+            matrix = _rotation_matrix(params["rotation_matrix"], bool(params.get("invert_rotation_matrix")))
+            pivot = list(map(float, params["pivot"])) if params.get("pivot") is not None else None
+            obj.transform(matrix, pivot=pivot, translation=translation or (0.0, 0.0, 0.0))
+        elif translation is not None:
+            obj.transform(translation=translation)
+        self.objects[obj.id] = obj
+        self._changed([obj])
+        return self._full(obj, 32)
+
+    def copy_objects(self, params):
+        entries = params.get("objects")
+        if not entries:
+            raise ValueError("No objects provided to copy.")
+        ids = [self.copy_object(entry).get("id") if isinstance(entry, dict) else None for entry in entries]
+        return {"copied": sum(1 for object_id in ids if object_id), "ids": ids}
+
+    def get_object_info(self, params):
+        obj = self._find(params)
+        return self._detail(obj, _geometry_detail(params), bool(params.get("include_world", False)),
+                            int(params.get("outline_max_points") or 0))
+
+    def get_objects_info(self, params):
+        detail = _geometry_detail(params)
+        include_world = bool(params.get("include_world", False))
+        outline_max_points = int(params.get("outline_max_points") or 0)
+        selectors = params.get("objects")
+        if not selectors:
+            raise ValueError("objects must be a non-empty list.")
+        results = []
+        for selector in selectors:
+            if not isinstance(selector, dict):
+                results.append({"error": "Each objects entry must be a dictionary."})
+                continue
+            try:
+                obj = self._find(selector)
+                data = self._detail(obj, detail, include_world, outline_max_points)
+                if params.get("include_attributes"):
+                    data["attributes"] = dict(obj.user_strings)
+                results.append(data)
+            except Exception as e:
+                results.append({"selector": selector, "error": str(e)})
+        return {"geometry_detail": detail, "include_world": include_world, "objects": results}
+
+    def get_selected_objects_info(self, params):
+        detail = _geometry_detail(params)
+        include_world = bool(params.get("include_world", False))
+        outline_max_points = int(params.get("outline_max_points") or 0)
+        selected = []
+        for obj in self._objects_by_ids(self.selected):
+            data = self._detail(obj, detail, include_world, outline_max_points)
+            if params.get("include_attributes"):
+                data["attributes"] = dict(obj.user_strings)
+            selected.append(data)
+        return {"geometry_detail": detail, "include_world": include_world, "selected_objects": selected}
+
+    def get_connectivity_graph(self, params):
+        # Touching solids, found with a sweep over bbox minimum X
+        solids = [obj for obj in self._sorted_objects() if obj.kind in SOLID_KINDS]
+        boxes = sorted(((obj.bbox(), i) for i, obj in enumerate(solids)), key=lambda item: item[0][0][0])
+        edges = []
+        active: List[Tuple[List[List[float]], int]] = []
+        for box, i in boxes:
+            active = [(other, j) for other, j in active if other[1][0] >= box[0][0]]
+            for other, j in active:
+                if _bbox_matches(other[0], other[1], box, "intersects"):
+                    contact = [round((max(box[0][k], other[0][k]) + min(box[1][k], other[1][k])) / 2, 2) for k in range(3)]
+                    edges.append([min(i, j), max(i, j), contact])
+            active.append((box, i))
+        self.touched += len(solids)
+        return {
+            "n": [{"i": i, "name": obj.name, "guid": obj.id} for i, obj in enumerate(solids)],
+            "e": edges,
+            "node_count": len(solids),
+            "edge_count": len(edges),
+            "tolerance": 0.001,
+            "source": "computed",
+        }
+
+    def delete_objects(self, params):
+        if not params.get("confirm"):
+            raise ValueError("Delete blocked: confirm=true is required.")
+        ids = params.get("ids") or []
+        names = params.get("names") or []
+        if not ids and not names:
+            raise ValueError("No ids or names provided.")
+        doomed = [self._find({"id": object_id}) for object_id in ids]
+        doomed += [self._find({"name": name}) for name in names]
+        for obj in doomed:
+            self.objects.pop(obj.id, None)
+            self.selected.discard(obj.id)
+        self._changed(doomed)
+        return {"count": len(doomed)}
+
+    def modify_object(self, params):
+        obj = self._find(params)
+        changed: List[str] = []
+        explicit: Dict[str, Any] = {}
+        if params.get("new_name"):
+            obj.name = str(params["new_name"])
+            changed.append("name")
+        if params.get("new_color") is not None:
+            obj.color = tuple(int(c) for c in params["new_color"][:3])
+            changed.append("color")
+        if params.get("layer"):
+            layer = next((layer for layer in self.layers if params["layer"] in (layer["id"], layer["name"])), None)
+            if layer is not None:
+                obj.layer = layer["name"]
+                changed.append("layer")
+        if params.get("rotation") is not None and params.get("rotation_matrix") is None:
+            raise ValueError("rotation is deprecated; please provide rotation_matrix instead.")
+        translation = [0.0, 0.0, 0.0]
+        matrix = IDENTITY
+        scale = None
+        if params.get("translation") is not None:
+            translation = list(map(float, params["translation"]))
+            changed += ["pose", "position"]
+        if params.get("scale") is not None:
+            scale = list(map(float, params["scale"]))
+            changed.append("scale")
+            explicit["scale"] = params["scale"]
+        if params.get("rotation_matrix") is not None:
+            matrix = _rotation_matrix(params["rotation_matrix"], params.get("invert_rotation_matrix", False))
+            changed += ["pose", "position"]
+        if translation != [0.0, 0.0, 0.0] or scale is not None or matrix is not IDENTITY:
+            obj.transform(matrix, translation=translation, scale=scale)
+        if changed:
+            self._changed([obj])
+        return self._minimal_state(obj, changed, explicit)
+
+    def _each(self, params, handler, empty_message: Optional[str] = None):
+        """Expand the "all" template the way the plugin's *_objects commands do"""
+        entries = [dict(entry) for entry in params.get("objects") or ()]
+        if empty_message and not entries:
+            raise ValueError(empty_message)
+        if "all" in params and len(entries) <= 1:
+            template = entries[0] if entries else {}
+            entries += [{**template, "id": object_id} for object_id in list(self.objects)]
+        return [handler(entry) for entry in entries if "id" in entry or "name" in entry]
+
+    def modify_objects(self, params):
+        updates = self._each(params, self.modify_object)
+        return {"modified": len(updates), "updates": updates}
+
+    def rotate_object(self, params):
+        if params.get("rotation") is not None and params.get("rotation_matrix") is None:
+            raise ValueError("rotation is deprecated; please provide rotation_matrix instead.")
+        if params.get("rotation_matrix") is None:
+            raise ValueError("Missing rotation_matrix.")
+        if params.get("pivot") is None:
+            raise ValueError("Missing pivot.")
+        obj = self._find(params)
+        obj.transform(_rotation_matrix(params["rotation_matrix"]), pivot=list(map(float, params["pivot"])))
+        self._changed([obj])
+        return self._minimal_state(obj, ["pose", "position"])
+
+    def rotate_objects(self, params):
+        updates = self._each(params, self.rotate_object, "No objects provided to rotate.")
+        return {"rotated": len(updates), "updates": updates}
+
+    def reset_object_pose(self, params):
+        obj = self._find(params)
+        matrix = IDENTITY
+        translation = [0.0, 0.0, 0.0]
+        if params.get("reset_rotation", True):
+            matrix = [list(column) for column in zip(*obj.rotation)]
+        if params.get("reset_translation", True):
+            target = list(map(float, params.get("target_translation") or (0.0, 0.0, 0.0)))
+            translation = _sub(target, obj.center)
+        obj.transform(matrix, translation=translation)
+        self._changed([obj])
+        return self._minimal_state(obj, ["pose", "position"])
+
+    def reset_objects_pose(self, params):
+        updates = self._each(params, self.reset_object_pose)
+        return {"reset": len(updates), "updates": updates}
+
+    def rebase_object_pose(self, params):
+        # Re-labels the local frame only; the geometry stays where it is
+        obj = self._find(params)
+        self._changed([obj])
+        return self._minimal_state(obj, ["pose"])
+
+    def rebase_objects_pose(self, params):
+        updates = self._each(params, self.rebase_object_pose)
+        return {"rebased": len(updates), "updates": updates}
+
+    def execute_rhinoscript_python_code(self, params):
+        code = params.get("code")
+        if not code:
+            raise ValueError("Code is required")
+        # There is no Rhino to run it against; report an empty print output
+        self.log.append(f"Script received ({len(code)} characters)")
+        return {"success": True, "result": "Script successfully executed! Print output: "}
+
+    def create_layer(self, params):
+        color = params.get("color") or (0, 0, 0)
+        parent = self._find_layer(params["parent"])["id"] if params.get("parent") else None
+        layer = self._add_layer(params.get("name") or f"Layer {len(self.layers):02d}", color[:3], parent)
+        self._changed()
+        return _serialize_layer(layer)
+
+    def get_or_set_current_layer(self, params):
+        if "guid" in params or "name" in params:
+            layer = self._find_layer(params.get("name"), params.get("guid"))
+            self.current_layer = layer["name"]
+        return _serialize_layer(self._find_layer(self.current_layer))
+
+    def delete_layer(self, params):
+        if "guid" not in params and "name" not in params:
+            raise ValueError("Either name or guid is required")
+        layer = self._find_layer(params.get("name"), params.get("guid"))
+        self.layers.remove(layer)
+        self._changed([obj for obj in self.objects.values() if obj.layer == layer["name"]])
+        return {"success": True, "message": f"Layer {layer['name']} deleted"}
+
+    def open_file(self, params):
+        path = params.get("path")
+        if not path:
+            raise ValueError("path is required")
+        previous = self.path
+        self.path = str(path)
+        self.name = self.path.replace("\\", "/").rsplit("/", 1)[-1]
+        self._new_document()
+        return {
+            "opened": True, "path": self.path, "name": self.name, "was_already_open": previous == self.path,
+            "closed_previous": bool(params.get("close_current")),
+            "saved_previous": bool(params.get("close_current") and params.get("save_current")),
+            "previous_path": previous,
+        }
+
+    def close_file(self, params):
+        result = {
+            "closed": True, "path": self.path, "name": self.name, "was_modified": self.revision > 0,
+            "save_requested": bool(params.get("save_changes")), "saved": bool(params.get("save_changes")),
+            "save_path": params.get("save_path") or self.path,
+        }
+        # Rhino replaces the closed document with an empty untitled one
+        self.objects.clear()
+        self.selected.clear()
+        self.name, self.path = "", ""
+        self._new_document()
+        return result
+
+    def list_plugins(self, params):
+        plugins = [
+            {"name": name, "id": str(uuid.uuid5(uuid.NAMESPACE_DNS, name)), "status": "Installed"}
+            for name in ("RhinoMCPMod", "Grasshopper", "IronPython", "RhinoCycles")
+        ]
+        return {"plugins": plugins, "count": len(plugins)}
+
+    def run_command(self, params):
+        command = params.get("command") or ""
+        if not command:
+            return {"error": "Command name is required"}
+        self.log.append(command)
+        return {"message": f"Command '{command}' executed successfully.", "success": True}
+
+    def get_log(self, params):
+        lines = max(1, min(100, int(params.get("lines") or 20)))
+        entries = self.log[-lines:]
+        return {"entries": entries, "count": len(entries)}
+
+    def get_selected_objects(self, params):
+        selected = [{"id": obj.id, "name": obj.name, "type": obj.object_type, "layer": obj.layer}
+                    for obj in self._objects_by_ids(self.selected)]
+        return {"selected": selected, "count": len(selected)}
+
+    def select_objects_by_filter(self, params):
+        ids = {str(i) for i in params.get("ids") or ()}
+        names = {str(n).lower() for n in params.get("names") or ()}
+        layer = (params.get("layer") or "").lower()
+        object_type = (params.get("type") or "").lower()
+        selected = 0
+        for obj in self.objects.values():
+            if (obj.id in ids or obj.name.lower() in names or (layer and obj.layer.lower() == layer)
+                    or (object_type and obj.object_type.lower() == object_type)):
+                self.selected.add(obj.id)
+                selected += 1
+        self.touched += selected
+        return {"message": f"Selected {selected} object(s).", "count": selected}
+
+    def deselect_all(self, params):
+        self.selected.clear()
+        return {"message": "All objects deselected."}
+
+    def zoom_to_objects(self, params):
+        targets = self._objects_by_ids(params.get("ids") or self.selected)
+        if not targets:
+            return {"error": "No objects to zoom to"}
+        return {"message": f"Zoomed to {len(targets)} object(s)."}
+
+    def capture_view(self, params):
+        width = int(params.get("width") or 1024)
+        height = int(params.get("height") or 768)
+        png = PNG_SIGNATURE + bytes(max(0, self.config.capture_bytes - len(PNG_SIGNATURE)))
+        return {
+            "png_base64": png,
+            "metadata": {
+                "view": params.get("view") or "Perspective",
+                "width": width,
+                "height": height,
+                "display_mode": params.get("display_mode") or "Shaded",
+                "objects": len(self.objects),
+            },
+        }
+
+    def get_viewport_info(self, params):
+        viewports = [
+            {"id": str(uuid.uuid5(uuid.NAMESPACE_DNS, name)), "name": name,
+             "cameraLocation": "0.00,0.00,100.00", "cameraTarget": "0.00,0.00,0.00"}
+            for name in ("Top", "Front", "Right", "Perspective")
+        ]
+        return {"viewports": viewports, "count": len(viewports)}
+
+    def rename_layer(self, params):
+        layer = next((layer for layer in self.layers if layer["id"] == params.get("id")), None)
+        if layer is None:
+            return {"error": "Layer not found"}
+        old_name = layer["name"]
+        layer["name"] = params.get("new_name") or old_name
+        renamed = [obj for obj in self.objects.values() if obj.layer == old_name]
+        for obj in renamed:
+            obj.layer = layer["name"]
+        self._changed(renamed)
+        return {"message": f"Layer renamed to '{layer['name']}'."}
+
+    def move_objects_to_layer(self, params):
+        layer = next((layer for layer in self.layers if layer["name"] == params.get("layer")), None)
+        if layer is None:
+            return {"error": "Layer not found"}
+        moved = self._objects_by_ids(params.get("ids"))
+        for obj in moved:
+            obj.layer = layer["name"]
+        self._changed(moved)
+        return {"message": f"Moved {len(moved)} object(s) to layer.", "count": len(moved)}
+
+    def get_layer_states(self, params):
+        layers = [
+            {"index": i, "name": layer["name"], "visible": layer["visible"], "locked": layer["locked"],
+             "color": ",".join(str(c) for c in layer["color"])}
+            for i, layer in enumerate(self.layers)
+        ]
+        return {"layers": layers, "count": len(layers)}
+
+    def save_layer_state(self, params):
+        name = params.get("name")
+        if not name:
+            return {"error": "name is required"}
+        self.layer_states[name] = [
+            {"name": layer["name"], "visible": layer["visible"], "locked": layer["locked"]} for layer in self.layers
+        ]
+        return {"message": f"Layer state '{name}' saved.", "name": name}
+
+    def restore_layer_state(self, params):
+        name = params.get("name")
+        if not name:
+            return {"error": "name is required"}
+        if name not in self.layer_states:
+            return {"error": f"Layer state '{name}' not found."}
+        restored = 0
+        for state in self.layer_states[name]:
+            layer = next((layer for layer in self.layers if layer["name"] == state["name"]), None)
+            if layer is not None:
+                layer["visible"], layer["locked"] = state["visible"], state["locked"]
+                restored += 1
+        self._changed()
+        return {"message": f"Restored {restored} layer(s).", "count": restored}
+
+    def get_materials(self, params):
+        materials = [
+            {"index": i, "name": material["name"], "color": ",".join(str(c) for c in material["color"])}
+            for i, material in enumerate(self.materials)
+        ]
+        return {"materials": materials, "count": len(materials)}
+
+    def create_material(self, params):
+        name = params.get("name") or "NewMaterial"
+        color = tuple(int(params.get(channel, 128)) for channel in ("r", "g", "b"))
+        self.materials.append({"name": name, "color": color})
+        self._changed()
+        return {"message": f"Material '{name}' created.", "index": len(self.materials) - 1}
+
+    def set_object_material(self, params):
+        index = params.get("material_index")
+        index = -1 if index is None else int(index)
+        if index < 0 and params.get("material_name"):
+            index = next((i for i, m in enumerate(self.materials) if m["name"] == params["material_name"]), -1)
+        if index < 0:
+            return {"error": "Material not found"}
+        updated = self._objects_by_ids(params.get("ids"))
+        for obj in updated:
+            obj.material = index
+        self._changed(updated)
+        return {"message": f"Updated {len(updated)} object(s) material.", "count": len(updated)}
+
+    def get_object_materials(self, params):
+        targets = self._objects_by_ids(params.get("ids")) if params.get("ids") else list(self.objects.values())
+        objects = [
+            {"id": obj.id, "name": obj.name, "material_index": obj.material,
+             "material_name": self.materials[obj.material]["name"] if 0 <= obj.material < len(self.materials) else ""}
+            for obj in targets
+        ]
+        return {"objects": objects, "count": len(objects)}
+
+
+def _geometry_detail(params) -> str:
+    detail = params.get("geometry_detail") or "obb_pose"
+    if detail not in ("bbox", "obb_pose", "ortho3"):
+        raise ValueError("geometry_detail must be one of: bbox, obb_pose, ortho3.")
+    return detail
+
+
+def _rotation_matrix(value, invert: bool = False) -> List[List[float]]:
+    matrix = [list(map(float, row[:3])) for row in value[:3]]
+    if len(matrix) != 3 or any(len(row) != 3 for row in matrix):
+        raise ValueError("rotation_matrix must be a 3x3 matrix.")
+    return [list(column) for column in zip(*matrix)] if invert else matrix
+
+
+def _bbox_matches(lo, hi, bbox, mode: str) -> bool:
+    (bx0, by0, bz0), (bx1, by1, bz1) = bbox
+    if mode == "contained":
+        return (lo[0] <= bx0 and bx1 <= hi[0] and lo[1] <= by0 and by1 <= hi[1]
+                and lo[2] <= bz0 and bz1 <= hi[2])
+    if mode == "contains_center":
+        cx, cy, cz = (bx0 + bx1) / 2, (by0 + by1) / 2, (bz0 + bz1) / 2
+        return lo[0] <= cx <= hi[0] and lo[1] <= cy <= hi[1] and lo[2] <= cz <= hi[2]
+    return bx0 <= hi[0] and bx1 >= lo[0] and by0 <= hi[1] and by1 >= lo[1] and bz0 <= hi[2] and bz1 >= lo[2]
+
+
+def _serialize_layer(layer: Dict[str, Any]) -> Dict[str, Any]:
+    return {"id": layer["id"], "name": layer["name"], "color": _serialize_color(layer["color"]),
+            "parent": layer["parent"]}
+
+
+class _FakeSession:
+    """Per-client protocol state, like ClientSession in the plugin"""
+
+    def __init__(self, sock: socket.socket):
+        self.sock = sock
+        self.buffer = bytearray()
+        self.framed = False
+        self.compression: Optional[str] = None
+        self.compression_threshold = DEFAULT_COMPRESSION_THRESHOLD
+        self.attachments = False
+        self.revisions = False
+        self.codec: Codec = StdlibJsonCodec()
+        self.write_lock = threading.Lock()
+        self.closed = False
+
+    def _fill(self, size: int) -> bool:
+        while len(self.buffer) < size:
+            chunk = self.sock.recv(max(65536, size - len(self.buffer)))
+            if not chunk:
+                return False
+            self.buffer += chunk
+        return True
+
+    def read_command(self) -> Optional[Dict[str, Any]]:
+        """Next command, or None once the client has gone away"""
+        if self.framed:
+            if not self._fill(FRAME_HEADER.size):
+                return None
+            length, flags = FRAME_HEADER.unpack_from(self.buffer)
+            if length > MAX_FRAME_SIZE:
+                raise ConnectionError(f"Frame too large ({length} bytes)")
+            if not self._fill(FRAME_HEADER.size + length):
+                return None
+            payload = bytes(self.buffer[FRAME_HEADER.size:FRAME_HEADER.size + length])
+            del self.buffer[:FRAME_HEADER.size + length]
+            return self.codec.decode(unpack_message(flags, payload))
+
+        # Legacy: keep reading until the buffer starts with a complete JSON document
+        decoder = json.JSONDecoder()
+        while True:
+            try:
+                text = self.buffer.decode("utf-8")
+            except UnicodeDecodeError:
+                text = ""  # A multi-byte character is still on its way
+            start = len(text) - len(text.lstrip())
+            if start < len(text):
+                try:
+                    command, end = decoder.raw_decode(text, start)
+                except json.JSONDecodeError:
+                    pass
+                else:
+                    del self.buffer[:len(text[:end].encode("utf-8"))]
+                    return command
+            chunk = self.sock.recv(65536)
+            if not chunk:
+                return None
+            self.buffer += chunk
+
+    def send(self, response: Dict[str, Any], attachments: Optional[List[bytes]] = None):
+        with self.write_lock:
+            if self.closed:
+                return
+            if not self.framed:
+                self.sock.sendall(json.dumps(response, separators=(",", ":")).encode("utf-8"))
+                return
+            frames = [pack_message(self.codec.encode(response), self.compression, self.compression_threshold)]
+            frames += [encode_frame(blob, FLAG_ATTACHMENT) for blob in attachments or ()]
+            self.sock.sendall(b"".join(frames))
+
+
+class FakeRhinoServer:
+    """Threaded TCP server answering like the Rhino plugin, backed by a FakeScene.
+
+    One thread per client reads commands; negotiate and ping are answered on that thread, and
+    everything else is queued to a single "UI" thread that sleeps for the simulated latency and
+    then executes it. Use as a context manager, or call start()/stop().
+    """
+
+    def __init__(self, config: Optional[FakeRhinoConfig] = None, host: str = RHINO_HOST, port: int = 0,
+                 scene: Optional[FakeScene] = None):
+        self.config = config or (scene.config if scene is not None else FakeRhinoConfig())
+        self.scene = scene or FakeScene(self.config)
+        self.host = host
+        self.port = port
+        self.commands: Counter = Counter()  # Commands executed, by type
+        self._latency_rng = random.Random(self.config.seed)
+        self._listener: Optional[socket.socket] = None
+        self._queue: "queue.Queue[Optional[Tuple[_FakeSession, Dict[str, Any]]]]" = queue.Queue()
+        self._sessions: List[_FakeSession] = []
+        self._threads: List[threading.Thread] = []
+        self._running = threading.Event()
+
+    def __enter__(self) -> "FakeRhinoServer":
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+    def start(self) -> "FakeRhinoServer":
+        listener = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        listener.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        listener.bind((self.host, self.port))
+        listener.listen()
+        listener.settimeout(0.2)
+        self._listener = listener
+        self.port = listener.getsockname()[1]
+        self._running.set()
+        for target, name in ((self._accept_loop, "fake-rhino-accept"), (self._ui_loop, "fake-rhino-ui")):
+            thread = threading.Thread(target=target, name=name, daemon=True)
+            thread.start()
+            self._threads.append(thread)
+        logger.info(f"Fake Rhino listening on {self.host}:{self.port} with {self.scene.describe()}")
+        return self
+
+    def stop(self):
+        self._running.clear()
+        self._queue.put(None)
+        if self._listener is not None:
+            self._listener.close()
+            self._listener = None
+        for session in list(self._sessions):
+            self._close_session(session)
+        for thread in self._threads:
+            thread.join(timeout=2)
+        self._threads.clear()
+
+    def _accept_loop(self):
+        while self._running.is_set():
+            try:
+                client, _ = self._listener.accept()
+            except socket.timeout:
+                continue
+            except OSError:
+                break
+            client.settimeout(None)
+            client.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+            session = _FakeSession(client)
+            self._sessions.append(session)
+            threading.Thread(target=self._client_loop, args=(session,), name="fake-rhino-client", daemon=True).start()
+
+    def _close_session(self, session: _FakeSession):
+        with session.write_lock:
+            session.closed = True
+        try:
+            session.sock.shutdown(socket.SHUT_RDWR)
+        except OSError:
+            pass
+        try:
+            session.sock.close()
+        except OSError:
+            pass
+        if session in self._sessions:
+            self._sessions.remove(session)
+
+    def _client_loop(self, session: _FakeSession):
+        try:
+            while self._running.is_set():
+                command = session.read_command()
+                if command is None:
+                    break
+                self._dispatch(session, command)
+        except (OSError, ValueError, ConnectionError) as e:
+            logger.debug(f"Fake Rhino client dropped: {str(e)}")
+        finally:
+            self._close_session(session)
+
+    def _dispatch(self, session: _FakeSession, command: Dict[str, Any]):
+        command_type = command.get("type")
+        if command_type == "negotiate" and self.config.framing:
+            self._negotiate(session, command.get("params") or {})
+            return
+        if command_type == "ping":
+            pong: Dict[str, Any] = {"status": "success", "result": {"pong": True}}
+            if "id" in command:
+                pong["id"] = command["id"]
+            if session.revisions:
+                pong["revision"] = self.scene.external_revision
+            session.send(pong)
+            return
+        self._queue.put((session, command))
+
+    def _negotiate(self, session: _FakeSession, params: Dict[str, Any]):
+        framed = FRAMING_LENGTH_PREFIXED in (params.get("framing") or ())
+        result: Dict[str, Any] = {
+            "version": PROTOCOL_VERSION,
+            "framing": FRAMING_LENGTH_PREFIXED if framed else FRAMING_LEGACY,
+            "features": [f for f in params.get("features") or () if framed and f in self.config.features],
+        }
+        if framed and self.config.compression and COMPRESSION_ZLIB in (params.get("compression") or ()):
+            threshold = int(params.get("compression_threshold", DEFAULT_COMPRESSION_THRESHOLD))
+            result["compression"] = COMPRESSION_ZLIB
+            result["compression_threshold"] = max(threshold, MIN_COMPRESSION_THRESHOLD)
+
+        session.send({"status": "success", "result": result})
+        session.framed = framed
+        session.compression = result.get("compression")
+        session.compression_threshold = result.get("compression_threshold", DEFAULT_COMPRESSION_THRESHOLD)
+        session.attachments = FEATURE_ATTACHMENTS in result["features"]
+        session.revisions = FEATURE_REVISIONS in result["features"]
+
+    def _latency(self, command_type: str, touched: int) -> float:
+        config = self.config
+        delay = config.command_latency.get(command_type, config.latency) + config.per_object_latency * touched
+        if config.latency_jitter > 0:
+            delay += self._latency_rng.uniform(0, config.latency_jitter)
+        return delay
+
+    def _ui_loop(self):
+        while True:
+            item = self._queue.get()
+            if item is None:
+                break
+            session, command = item
+            command_type = command.get("type") or ""
+            started = time.perf_counter()
+            response = self.scene.execute(command_type, command.get("params") or {})
+            self.commands[command_type] += 1
+            remaining = self._latency(command_type, self.scene.touched) - (time.perf_counter() - started)
+            if remaining > 0:
+                time.sleep(remaining)
+            if "id" in command:
+                response["id"] = command["id"]
+            if session.revisions:
+                response["revision"] = self.scene.external_revision
+            attachments = _detach_binary_results(response) if session.attachments else None
+            try:
+                session.send(_encode_binary_results(response), attachments)
+            except OSError:
+                logger.debug("Failed to send response - client disconnected")
+
+
+def _detach_binary_results(response: Dict[str, Any]) -> Optional[List[bytes]]:
+    """DetachBinaryResults: move bytes values into attachment frames"""
+    result = response.get("result")
+    if not isinstance(result, dict):
+        return None
+    keys = [key for key, value in result.items() if isinstance(value, (bytes, bytearray))]
+    if not keys:
+        return None
+    response["attachments"] = keys
+    blobs = [bytes(result[key]) for key in keys]
+    for key in keys:
+        result[key] = None
+    return blobs
+
+
+def _encode_binary_results(response: Dict[str, Any]) -> Dict[str, Any]:
+    """Bytes left in the result go out as base64 strings, as Newtonsoft serialises byte[].
+    Batch item results can hold them too; only top-level values become attachments."""
+    result = response.get("result")
+    if isinstance(result, dict):
+        _base64_values(result)
+        if isinstance(result.get("results"), list):
+            for item in result["results"]:
+                if isinstance(item, dict) and isinstance(item.get("result"), dict):
+                    _base64_values(item["result"])
+    return response
+
+
+def _base64_values(result: Dict[str, Any]):
+    for key, value in result.items():
+        if isinstance(value, (bytes, bytearray)):
+            result[key] = base64.b64encode(value).decode("ascii")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve a synthetic Rhino document over the plugin protocol")
+    parser.add_argument("--host", default=RHINO_HOST)
+    parser.add_argument("--port", type=int, default=RHINO_PORT)
+    parser.add_argument("--objects", type=int, default=1000)
+    parser.add_argument("--layers", type=int, default=8)
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--polyline-points", type=int, default=64)
+    parser.add_argument("--outline-points", type=int, default=24)
+    parser.add_argument("--capture-kb", type=int, default=256)
+    parser.add_argument("--latency-ms", type=float, default=0.0)
+    parser.add_argument("--jitter-ms", type=float, default=0.0)
+    parser.add_argument("--per-object-us", type=float, default=0.0, help="Extra latency per object touched")
+    parser.add_argument("--legacy", action="store_true", help="Refuse negotiation, like plugins without framing")
+    parser.add_argument("--no-compression", action="store_true")
+    args = parser.parse_args()
+
+    config = FakeRhinoConfig(
+        objects=args.objects,
+        layers=args.layers,
+        seed=args.seed,
+        polyline_points=args.polyline_points,
+        outline_points=args.outline_points,
+        capture_bytes=args.capture_kb * 1024,
+        latency=args.latency_ms / 1000,
+        latency_jitter=args.jitter_ms / 1000,
+        per_object_latency=args.per_object_us / 1e6,
+        framing=not args.legacy,
+        compression=not args.no_compression,
+    )
+    server = FakeRhinoServer(config, host=args.host, port=args.port).start()
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.stop()
+
+
+if __name__ == "__main__":
+    main()
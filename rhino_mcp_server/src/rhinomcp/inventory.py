@@ -0,0 +1,288 @@
+# Paged access to get_document_info
+import asyncio
+import json
+import os
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, AsyncIterator, Dict, List, Optional
+
+from rhinomcp.server import AsyncRhinoConnectionPool, get_async_rhino_connection
+
+DOCUMENT_PAGE_LIMIT = 1000  # The plugin caps get_document_info limit at this value
+# Largest listing a DocumentMirror keeps; bigger documents are streamed instead of mirrored
+MIRROR_MAX_OBJECTS = int(os.environ.get("RHINOMCP_MIRROR_MAX_OBJECTS", "100000"))
+
+
+async def iter_document_pages(
+    rhino: Optional[AsyncRhinoConnectionPool] = None,
+    page_size: int = DOCUMENT_PAGE_LIMIT,
+    offset: int = 0,
+    **params: Any,
+) -> AsyncIterator[Dict[str, Any]]:
+    """Yield get_document_info results page by page until objects_truncated is false.
+
+    The request for the next page is sent before the current page is yielded, so Rhino builds
+    page n+1 while the caller consumes page n. Extra keyword arguments (detail, include_bbox,
+    bbox, bbox_mode, max_geometry_points) are passed through unchanged.
+
+    Pages are addressed by offset, so objects added or deleted during the walk can shift later
+    pages by a few objects.
+    """
+    rhino = rhino or await get_async_rhino_connection()
+    page_size = max(1, min(page_size, DOCUMENT_PAGE_LIMIT))
+
+    def fetch(at: int) -> asyncio.Future:
+        return asyncio.ensure_future(
+            rhino.send_command("get_document_info", {**params, "limit": page_size, "offset": at})
+        )
+
+    pending: Optional[asyncio.Future] = fetch(offset)
+    try:
+        while pending is not None:
+            page = await pending
+            pending = None
+            returned = page.get("objects_returned", len(page.get("objects") or ()))
+            offset += returned
+            if page.get("objects_truncated") and returned:
+                pending = fetch(offset)
+            yield page
+    finally:
+        if pending is not None:
+            # The caller stopped early; drop the prefetched page without an unretrieved-exception warning
+            pending.cancel()
+            pending.add_done_callback(lambda future: future.cancelled() or future.exception())
+
+
+async def iter_document_objects(
+    rhino: Optional[AsyncRhinoConnectionPool] = None,
+    page_size: int = DOCUMENT_PAGE_LIMIT,
+    **params: Any,
+) -> AsyncIterator[Dict[str, Any]]:
+    """Yield every object of the document (or of a bbox filter), prefetching one page ahead"""
+    async for page in iter_document_pages(rhino, page_size, **params):
+        for obj in page.get("objects") or ():
+            yield obj
+
+
+@dataclass
+class InventoryAggregate:
+    """Whole-document statistics built one object at a time.
+
+    The aggregate itself holds only the distinct types and layers plus sample_size objects. When it
+    is fed from a DocumentMirror the mirror holds the listing; see aggregate_document_inventory.
+    """
+    sample_size: int = 100
+    object_count: int = 0
+    by_type: Dict[str, int] = field(default_factory=dict)
+    by_layer: Dict[str, int] = field(default_factory=dict)
+    bbox: Optional[List[List[float]]] = None
+    sample: List[Dict[str, Any]] = field(default_factory=list)
+
+    def add(self, obj: Dict[str, Any]):
+        self.object_count += 1
+        object_type = obj.get("type", "(unknown)")
+        layer = obj.get("layer", "(unknown)")
+        self.by_type[object_type] = self.by_type.get(object_type, 0) + 1
+        self.by_layer[layer] = self.by_layer.get(layer, 0) + 1
+
+        bbox = obj.get("bbox")
+        if bbox and len(bbox) == 2:
+            if self.bbox is None:
+                self.bbox = [list(bbox[0]), list(bbox[1])]
+            else:
+                self.bbox = [
+                    [min(a, b) for a, b in zip(self.bbox[0], bbox[0])],
+                    [max(a, b) for a, b in zip(self.bbox[1], bbox[1])],
+                ]
+
+        if len(self.sample) < self.sample_size:
+            self.sample.append(obj)
+
+    def as_dict(self) -> Dict[str, Any]:
+        result: Dict[str, Any] = {
+            "object_count": self.object_count,
+            "objects_by_type": dict(sorted(self.by_type.items(), key=lambda item: -item[1])),
+            "objects_by_layer": dict(sorted(self.by_layer.items(), key=lambda item: -item[1])),
+            "objects_returned": len(self.sample),
+            "objects_truncated": self.object_count > len(self.sample),
+            "objects": self.sample,
+        }
+        if self.bbox is not None:
+            result["bbox"] = self.bbox
+            result["bbox_frame"] = "world_aabb"
+        return result
+
+
+class DocumentMirror:
+    """A local copy of the document listing, kept current with get_document_info change tokens.
+
+    The first sync() walks every page. Later syncs send the change_token of the previous one as
+    since, so Rhino lists only the objects added or changed after it plus the ids to remove. The
+    whole listing is fetched again when the plugin reports since_expired (another document,
+    another plugin session, trimmed history) or does not return change tokens at all.
+
+    The whole listing is held in memory, so it is capped at max_objects. A sync that would exceed
+    it stops, empties the mirror and sets oversized; callers then stream the document instead.
+    """
+
+    def __init__(self, max_objects: Optional[int] = None, **params: Any):
+        self.params = params
+        self.max_objects = MIRROR_MAX_OBJECTS if max_objects is None else max_objects
+        self.oversized = False  # The last sync hit max_objects and the mirror was emptied
+        self.objects: Dict[str, Dict[str, Any]] = {}
+        self.header: Dict[str, Any] = {}  # Metadata and layers from the latest first page
+        self.token: Optional[str] = None
+        # Bumped by every sync; changed_at maps ids to the version they last changed in, so
+        # derived structures (rhinomcp.spatial) can catch up without rescanning everything
+        self.version = 0
+        self.reloaded_at = 0  # Version of the last full listing
+        self.changed_at: Dict[str, int] = {}
+        self._lock = asyncio.Lock()
+
+    async def sync(self, rhino: Optional[AsyncRhinoConnectionPool] = None,
+                   page_size: int = DOCUMENT_PAGE_LIMIT) -> Dict[str, Any]:
+        """Bring the mirror up to date and return what changed"""
+        async with self._lock:
+            since = self.token
+            params = dict(self.params)
+            if since is not None:
+                params["since"] = since
+            # A failed walk leaves the mirror half updated; the next sync starts over
+            self.token = None
+            stats = {"full": since is None, "upserted": 0, "removed": 0, "pages_fetched": 0,
+                     "objects_skipped_errors": 0, "oversized": False}
+            first_page: Optional[Dict[str, Any]] = None
+            oversized = False
+            self.version += 1
+            async for page in iter_document_pages(rhino, page_size, **params):
+                stats["pages_fetched"] += 1
+                if first_page is None:
+                    first_page = page
+                    if since is None or page.get("since_expired") or "removed_ids" not in page:
+                        stats["full"] = True
+                        self.objects = {}
+                        self.changed_at = {}
+                        self.reloaded_at = self.version
+                        listed = (page.get("spatial_filter") or {}).get("matched_objects", page.get("object_count", 0))
+                        if listed > self.max_objects:
+                            oversized = True
+                            break
+                    for object_id in page.get("removed_ids") or ():
+                        self.changed_at[object_id] = self.version
+                        if self.objects.pop(object_id, None) is not None:
+                            stats["removed"] += 1
+                stats["objects_skipped_errors"] += page.get("objects_skipped_errors", 0)
+                for obj in page.get("objects") or ():
+                    self.objects[obj["id"]] = obj
+                    if not stats["full"]:
+                        self.changed_at[obj["id"]] = self.version
+                    stats["upserted"] += 1
+                if len(self.objects) > self.max_objects:
+                    oversized = True
+                    break
+
+            if first_page is not None:
+                self.header = {key: value for key, value in first_page.items()
+                               if key not in ("objects", "removed_ids")}
+                self.token = first_page.get("change_token")
+            self.oversized = stats["oversized"] = oversized
+            if oversized:
+                self.objects, self.changed_at, self.reloaded_at = {}, {}, self.version
+                self.token = None
+            return stats
+
+    def changes_since(self, version: int) -> Optional[List[str]]:
+        """Ids added, changed or removed after version; None if the whole listing was reloaded since"""
+        if version < self.reloaded_at:
+            return None
+        return [object_id for object_id, changed in self.changed_at.items() if changed > version]
+
+    def iter_objects(self):
+        """Objects in the plugin's listing order (by id)"""
+        for object_id in sorted(self.objects):
+            yield self.objects[object_id]
+
+
+MAX_MIRRORS = 4  # Distinct get_document_info parameter sets mirrored at once
+_mirrors: "OrderedDict[str, DocumentMirror]" = OrderedDict()
+
+
+def document_mirror(**params: Any) -> DocumentMirror:
+    """The shared mirror for these get_document_info parameters (least recently used ones are dropped)"""
+    key = json.dumps(params, sort_keys=True, default=str)
+    mirror = _mirrors.get(key)
+    if mirror is None:
+        mirror = _mirrors[key] = DocumentMirror(**params)
+        while len(_mirrors) > MAX_MIRRORS:
+            _mirrors.popitem(last=False)
+    _mirrors.move_to_end(key)
+    return mirror
+
+
+async def aggregate_document_inventory(
+    rhino: Optional[AsyncRhinoConnectionPool] = None,
+    sample_size: int = 100,
+    page_size: int = DOCUMENT_PAGE_LIMIT,
+    **params: Any,
+) -> Dict[str, Any]:
+    """Summarise the whole document (or a bbox filter) as an InventoryAggregate.
+
+    Listings of up to MIRROR_MAX_OBJECTS come from the shared DocumentMirror for these params, so
+    after the first call only the objects changed since the previous one are fetched. Larger ones
+    are streamed page by page on every call, keeping memory bounded by the aggregate; such replies
+    have no sync or change_token. Document metadata, layers and the spatial filter echo come from
+    the first page.
+    """
+    mirror = document_mirror(**params)
+    if not mirror.oversized:
+        stats = await mirror.sync(rhino, page_size)
+        if not stats["oversized"]:
+            return _mirror_aggregate(mirror, stats, sample_size)
+    return await _stream_aggregate(rhino, mirror, sample_size, page_size)
+
+
+def _header_keys(header: Dict[str, Any]) -> Dict[str, Any]:
+    return {key: header[key] for key in ("meta_data", "detail", "spatial_filter", "layer_count",
+                                         "layers_returned", "layers_truncated", "layers") if key in header}
+
+
+def _mirror_aggregate(mirror: DocumentMirror, stats: Dict[str, Any], sample_size: int) -> Dict[str, Any]:
+    aggregate = InventoryAggregate(sample_size=max(0, sample_size))
+    for obj in mirror.iter_objects():
+        aggregate.add(obj)
+
+    result = _header_keys(mirror.header)
+    if "spatial_filter" in result:
+        # The first page counts only the changes that matched
+        result["spatial_filter"] = {**result["spatial_filter"], "matched_objects": len(mirror.objects)}
+    result.update(aggregate.as_dict())
+    result["objects_skipped_errors"] = stats["objects_skipped_errors"]
+    result["pages_fetched"] = stats["pages_fetched"]
+    result["sync"] = {"full": stats["full"], "upserted": stats["upserted"], "removed": stats["removed"]}
+    if mirror.token is not None:
+        result["change_token"] = mirror.token
+    return result
+
+
+async def _stream_aggregate(rhino: Optional[AsyncRhinoConnectionPool], mirror: DocumentMirror,
+                            sample_size: int, page_size: int) -> Dict[str, Any]:
+    aggregate = InventoryAggregate(sample_size=max(0, sample_size))
+    first_page: Optional[Dict[str, Any]] = None
+    pages = 0
+    skipped_errors = 0
+    async for page in iter_document_pages(rhino, page_size, **mirror.params):
+        if first_page is None:
+            first_page = page
+        pages += 1
+        skipped_errors += page.get("objects_skipped_errors", 0)
+        for obj in page.get("objects") or ():
+            aggregate.add(obj)
+    if aggregate.object_count <= mirror.max_objects:
+        # The document shrank below the cap: mirror it again from the next call
+        mirror.oversized = False
+
+    result = _header_keys(first_page or {})
+    result.update(aggregate.as_dict())
+    result["objects_skipped_errors"] = skipped_errors
+    result["pages_fetched"] = pages
+    return result
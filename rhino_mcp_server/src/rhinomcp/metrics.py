@@ -0,0 +1,185 @@
+# Per-command counters and histograms for the Rhino connection
+"""Per-command metrics recorded by RhinoConnection.send_command and AsyncRhinoConnection.send_command.
+
+Each command reports its total duration, split into four phases:
+- encode: codec encoding and compression of the request
+- send: writing the request to the socket
+- wait: everything until the reply is complete (Rhino's own time, transfer, and queueing
+  behind other commands on the same connection)
+- decode: decompression and codec decoding of the reply and its attachments
+
+Durations and request/reply sizes go into fixed-bucket histograms, so memory does not grow with
+traffic and percentiles are bucket estimates. CommandMetrics.snapshot() backs the rhino://metrics
+resource; prometheus_text() renders the same series in the Prometheus text exposition format.
+"""
+import bisect
+import datetime
+import threading
+import time
+from collections import Counter
+from dataclasses import dataclass
+from typing import Any, Dict, List, Sequence
+
+PHASES = ("encode", "send", "wait", "decode")
+DURATION_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0,
+                    30.0, 60.0, 120.0, 300.0)
+SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304, 16777216, 67108864, 268435456)
+
+
+@dataclass
+class CommandTiming:
+    """Seconds one command spent encoding, sending and decoding; the rest of its duration is wait"""
+    encode: float = 0.0
+    send: float = 0.0
+    decode: float = 0.0
+
+    def phases(self, duration: float) -> Dict[str, float]:
+        wait = max(0.0, duration - self.encode - self.send - self.decode)
+        return {"encode": self.encode, "send": self.send, "wait": wait, "decode": self.decode}
+
+
+class Histogram:
+    """Fixed-bucket histogram with Prometheus semantics (upper bounds inclusive)"""
+
+    def __init__(self, buckets: Sequence[float]):
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)  # Last slot is +Inf
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+
+    def observe(self, value: float):
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.sum += value
+        self.max = max(self.max, value)
+
+    def quantile(self, q: float) -> float:
+        """Estimate by linear interpolation inside the bucket, like histogram_quantile()"""
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        seen = 0
+        for index, count in enumerate(self.counts):
+            if count and seen + count >= rank:
+                if index == len(self.buckets):
+                    return self.max
+                lower = self.buckets[index - 1] if index else 0.0
+                upper = min(self.buckets[index], self.max)
+                return lower + (upper - lower) * max(0.0, rank - seen) / count
+            seen += count
+        return self.max
+
+    def cumulative(self) -> List[int]:
+        total = 0
+        result = []
+        for count in self.counts:
+            total += count
+            result.append(total)
+        return result
+
+
+class _CommandSeries:
+    def __init__(self):
+        self.outcomes: Counter = Counter()
+        self.duration = Histogram(DURATION_BUCKETS)
+        self.phases = {phase: Histogram(DURATION_BUCKETS) for phase in PHASES}
+        self.sent_bytes = Histogram(SIZE_BUCKETS)
+        self.received_bytes = Histogram(SIZE_BUCKETS)
+
+
+def _ms(seconds: float) -> float:
+    return round(seconds * 1000, 3)
+
+
+class CommandMetrics:
+    """Counters and histograms per command type; safe to share between threads"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._series: Dict[str, _CommandSeries] = {}
+        self.since = time.time()
+
+    def observe(self, command_type: str, outcome: str, duration: float, timing: CommandTiming,
+                sent_bytes: int, received_bytes: int):
+        with self._lock:
+            series = self._series.get(command_type)
+            if series is None:
+                series = self._series[command_type] = _CommandSeries()
+            series.outcomes[outcome] += 1
+            series.duration.observe(duration)
+            for phase, seconds in timing.phases(duration).items():
+                series.phases[phase].observe(seconds)
+            series.sent_bytes.observe(sent_bytes)
+            series.received_bytes.observe(received_bytes)
+
+    def reset(self):
+        with self._lock:
+            self._series.clear()
+            self.since = time.time()
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Per-command summary, ordered by total time spent so the dominant commands come first"""
+        with self._lock:
+            commands = {}
+            for command_type, series in self._series.items():
+                duration = series.duration
+                commands[command_type] = {
+                    "calls": duration.count,
+                    "outcomes": dict(series.outcomes),
+                    "total_ms": _ms(duration.sum),
+                    "duration_ms": {
+                        "mean": _ms(duration.sum / duration.count),
+                        "p50": _ms(duration.quantile(0.50)),
+                        "p95": _ms(duration.quantile(0.95)),
+                        "p99": _ms(duration.quantile(0.99)),
+                        "max": _ms(duration.max),
+                    },
+                    "phases_ms": {
+                        phase: {"mean": _ms(histogram.sum / histogram.count), "p95": _ms(histogram.quantile(0.95))}
+                        for phase, histogram in series.phases.items()
+                    },
+                    "sent_bytes": {"total": int(series.sent_bytes.sum), "max": int(series.sent_bytes.max)},
+                    "received_bytes": {
+                        "total": int(series.received_bytes.sum),
+                        "p95": int(series.received_bytes.quantile(0.95)),
+                        "max": int(series.received_bytes.max),
+                    },
+                }
+            since = self.since
+        return {
+            "since": datetime.datetime.fromtimestamp(since).isoformat(timespec="seconds"),
+            "commands": dict(sorted(commands.items(), key=lambda item: -item[1]["total_ms"])),
+        }
+
+    def prometheus_text(self) -> str:
+        """Render every series in the Prometheus text exposition format (version 0.0.4)"""
+        lines: List[str] = []
+
+        def histogram(name: str, help_text: str, unit_buckets, entries):
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} histogram")
+            for labels, hist in entries:
+                for bound, count in zip((*unit_buckets, "+Inf"), hist.cumulative()):
+                    lines.append(f'{name}_bucket{{{labels},le="{bound}"}} {count}')
+                lines.append(f"{name}_sum{{{labels}}} {hist.sum:.9g}")
+                lines.append(f"{name}_count{{{labels}}} {hist.count}")
+
+        with self._lock:
+            series = sorted(self._series.items())
+            lines.append("# HELP rhinomcp_commands_total Rhino commands sent, by outcome")
+            lines.append("# TYPE rhinomcp_commands_total counter")
+            for command_type, entry in series:
+                for outcome, count in sorted(entry.outcomes.items()):
+                    lines.append(f'rhinomcp_commands_total{{command="{command_type}",outcome="{outcome}"}} {count}')
+            histogram("rhinomcp_command_duration_seconds", "Round trip of a Rhino command", DURATION_BUCKETS,
+                      [(f'command="{command_type}"', entry.duration) for command_type, entry in series])
+            histogram("rhinomcp_command_phase_seconds", "Time per phase (encode, send, wait, decode)",
+                      DURATION_BUCKETS,
+                      [(f'command="{command_type}",phase="{phase}"', entry.phases[phase])
+                       for command_type, entry in series for phase in PHASES])
+            histogram("rhinomcp_command_sent_bytes", "Request size on the wire", SIZE_BUCKETS,
+                      [(f'command="{command_type}"', entry.sent_bytes) for command_type, entry in series])
+            histogram("rhinomcp_command_received_bytes", "Reply payload size", SIZE_BUCKETS,
+                      [(f'command="{command_type}"', entry.received_bytes) for command_type, entry in series])
+        return "\n".join(lines) + "\n"
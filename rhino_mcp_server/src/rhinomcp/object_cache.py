@@ -0,0 +1,202 @@
+# LRU cache of per-object info replies, invalidated by mutations and document revisions
+"""Cache of get_object_info / get_objects_info entries keyed by object GUID.
+
+An entry is keyed by (GUID, geometry_detail, include_world, outline_max_points, include_attributes)
+and holds the object dictionary Rhino returned for it. Entries are dropped:
+- when this server sends a command that can change them: commands that name their targets
+  (modify_objects, delete_objects, move_objects_to_layer, ...) drop those objects only, and
+  every other non read-only command (run_command, scripts, layer edits, all=True) drops everything;
+  a batch drops what each of its commands would
+- when the plugin reports a new document revision, i.e. a change made outside MCP commands
+  (user edits, undo, opening another file)
+
+The revision comes with the "revisions" protocol feature. Without it nothing is served from the
+cache, since edits made in Rhino could not be detected. Every reply carries the revision, and
+entries are only served within REVALIDATE_AFTER seconds of the last one. Past that the tools ping
+Rhino first, which the plugin answers without waiting for its UI thread.
+
+Fetches capture the cache epoch before sending and store their results under that epoch. An
+invalidation in the meantime bumps the epoch and the late result is discarded, so a reply that
+raced a mutation on another connection is never cached.
+
+document_epoch counts every command that can add, remove or change objects, creations and copies
+included, and every change of revision. Caches of the whole inventory (the spatial index) compare it instead of epoch.
+"""
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Set, Tuple
+
+REVALIDATE_AFTER = 1.0  # Seconds a reported revision is trusted without asking Rhino again
+
+# Commands that do not change object info. Selection, views and new objects leave existing
+# entries as they are.
+READ_ONLY_COMMANDS = frozenset({
+    "ping", "get_document_info", "get_object_info", "get_objects_info", "get_selected_objects_info",
+    "get_connectivity_graph", "list_plugins", "get_log", "get_selected_objects", "get_viewport_info",
+    "capture_view", "get_layer_states", "get_materials", "get_object_materials", "zoom_to_objects",
+    "select_objects", "select_objects_by_filter", "deselect_all", "save_layer_state", "create_layer",
+    "create_material", "create_object", "create_objects", "copy_object", "copy_objects",
+    "get_or_set_current_layer",
+})
+# Commands that leave the inventory (object ids, names, types, layers, boxes) as it is
+INVENTORY_READ_ONLY_COMMANDS = READ_ONLY_COMMANDS - {"create_object", "create_objects", "copy_object", "copy_objects"}
+# Commands that only change the objects they select with "id"/"name"
+SINGLE_OBJECT_COMMANDS = frozenset({"modify_object", "rotate_object", "reset_object_pose", "rebase_object_pose"})
+# Commands that only change the objects listed in "objects" (unless "all" is set)
+MULTI_OBJECT_COMMANDS = frozenset({"modify_objects", "rotate_objects", "reset_objects_pose", "rebase_objects_pose"})
+# Commands that only change the objects listed in "ids" (and "names")
+ID_LIST_COMMANDS = frozenset({"delete_objects", "move_objects_to_layer", "set_object_material"})
+
+CacheKey = Tuple[str, str, bool, int, bool]
+
+
+def normalize_id(value: Any) -> str:
+    return str(value).strip().strip("{}").lower()
+
+
+class ObjectInfoCache:
+    """Bounded LRU of object info dictionaries; safe to share between threads"""
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[CacheKey, Dict[str, Any]]" = OrderedDict()
+        self._keys_by_id: Dict[str, Set[CacheKey]] = {}
+        self.epoch = 0
+        self.document_epoch = 0
+        self.revision: Optional[int] = None
+        self._revision_seen = 0.0
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+
+    @property
+    def enabled(self) -> bool:
+        """Entries are only served once the plugin reports revisions"""
+        return self.max_entries > 0 and self.revision is not None
+
+    def revision_current(self) -> bool:
+        """A revision was reported within REVALIDATE_AFTER seconds"""
+        return self.revision is not None and time.monotonic() - self._revision_seen <= REVALIDATE_AFTER
+
+    async def revalidate(self, rhino):
+        """Ping Rhino if the last revision is too old to serve entries on; errors just leave it stale"""
+        if self.revision is not None and not self.revision_current():
+            try:
+                await rhino.send_command("ping")
+            except Exception:
+                pass
+
+    @staticmethod
+    def key(id: Any, geometry_detail: str, include_world: bool, outline_max_points: Optional[int] = 0,
+            include_attributes: bool = False) -> CacheKey:
+        return (normalize_id(id), geometry_detail, bool(include_world), int(outline_max_points or 0),
+                bool(include_attributes))
+
+    def get(self, key: CacheKey) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            value = self._entries.get(key) if self.max_entries > 0 and self.revision_current() else None
+            if value is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, key: CacheKey, value: Dict[str, Any], epoch: int):
+        """Store a value fetched while the cache was at epoch; dropped if anything was invalidated since"""
+        with self._lock:
+            if not self.enabled or epoch != self.epoch:
+                return
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            self._keys_by_id.setdefault(key[0], set()).add(key)
+            while len(self._entries) > self.max_entries:
+                self._forget(next(iter(self._entries)))
+
+    def observe_revision(self, revision: Any):
+        """Record the document revision from a reply; a change drops every entry"""
+        with self._lock:
+            self._revision_seen = time.monotonic()
+            if revision == self.revision:
+                return
+            if self.revision is not None:
+                self._clear()
+                self.document_epoch += 1
+            self.revision = revision
+
+    def invalidate_for(self, command_type: str, params: Optional[Dict[str, Any]]):
+        """Drop the entries a command can change"""
+        if command_type not in INVENTORY_READ_ONLY_COMMANDS and command_type != "batch":
+            with self._lock:
+                self.document_epoch += 1
+        if command_type in READ_ONLY_COMMANDS:
+            return
+        params = params or {}
+        if command_type == "batch":
+            for command in params.get("commands") or []:
+                if isinstance(command, dict):
+                    self.invalidate_for(str(command.get("type")), command.get("params"))
+            return
+        ids: Set[str] = set()
+        names: Set[str] = set()
+        if command_type in SINGLE_OBJECT_COMMANDS:
+            selectors = [params]
+        elif command_type in MULTI_OBJECT_COMMANDS and "all" not in params:  # The plugin checks the key only
+            selectors = params.get("objects") or []
+        elif command_type in ID_LIST_COMMANDS:
+            selectors = [{"id": id} for id in params.get("ids") or []]
+            selectors += [{"name": name} for name in params.get("names") or []]
+        else:
+            self.clear()
+            return
+
+        for selector in selectors:
+            if not isinstance(selector, dict):
+                continue
+            if selector.get("id"):
+                ids.add(normalize_id(selector["id"]))
+            elif selector.get("name"):
+                names.add(str(selector["name"]))
+        with self._lock:
+            self.epoch += 1
+            self.invalidations += 1
+            for id in ids:
+                for key in list(self._keys_by_id.get(id, ())):
+                    self._forget(key)
+            if names:
+                for key in [key for key, value in self._entries.items() if value.get("name") in names]:
+                    self._forget(key)
+
+    def clear(self):
+        with self._lock:
+            self._clear()
+
+    def _clear(self):
+        self.epoch += 1
+        self.invalidations += 1
+        self._entries.clear()
+        self._keys_by_id.clear()
+
+    def _forget(self, key: CacheKey):
+        self._entries.pop(key, None)
+        keys = self._keys_by_id.get(key[0])
+        if keys is not None:
+            keys.discard(key)
+            if not keys:
+                del self._keys_by_id[key[0]]
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "enabled": self.enabled,
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "revision": self.revision,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+                "invalidations": self.invalidations,
+            }
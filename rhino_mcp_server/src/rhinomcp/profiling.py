@@ -0,0 +1,266 @@
+# Opt-in cProfile/tracemalloc profiling of tool calls
+"""Profile tool calls with cProfile and tracemalloc and write one report per call.
+
+Set RHINOMCP_PROFILE_DIR=<dir> (or call start_profiling()) and every tool call, or only those named
+in RHINOMCP_PROFILE_TOOLS=get_objects_info,capture_view, writes two files to the directory:
+- <stem>.prof: the cProfile stats (snakeviz, pstats)
+- <stem>.json: the summary, described below
+
+The summary records:
+- wall and process CPU time
+- each Rhino command sent during the call, with its encode/send/wait/decode split
+- python_ms, the wall time not spent inside Rhino commands
+- the functions with the most own time
+- the traced memory peak and top allocations (RHINOMCP_PROFILE_MEMORY=0 turns tracemalloc off)
+
+cProfile follows the event loop thread. Other coroutines that run while the tool awaits Rhino are
+included, and work on executor threads is not. Only one call is profiled at a time. Calls that
+start while another is being profiled run unprofiled and are counted in ToolProfiler.skipped.
+
+    uv run python -m rhinomcp.profiling /tmp/rhinomcp-profiles --tool get_objects_info --top 30
+"""
+import argparse
+import cProfile
+import datetime
+import itertools
+import json
+import logging
+import os
+import pstats
+import statistics
+import time
+import tracemalloc
+from collections import defaultdict
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional
+
+from rhinomcp import server
+from rhinomcp.server import LogPreview
+
+logger = logging.getLogger("RhinoMCPServer.profiling")
+
+PROFILE_TOOLS = os.environ.get("RHINOMCP_PROFILE_TOOLS", "")
+PROFILE_MEMORY = os.environ.get("RHINOMCP_PROFILE_MEMORY", "1").lower() not in ("0", "false", "no")
+PROFILE_TOP = int(os.environ.get("RHINOMCP_PROFILE_TOP", "25"))
+TRACEMALLOC_FRAMES = 8
+MAX_TRACED_COMMANDS = 200  # Commands listed per summary; the totals still cover all of them
+
+
+def _ms(seconds: float) -> float:
+    return round(seconds * 1000, 3)
+
+
+def _function_name(key) -> str:
+    filename, line, name = key
+    return f"{filename}:{line}({name})" if line else name
+
+
+def top_functions(stats: pstats.Stats, limit: int, sort: str = "tottime") -> List[Dict[str, Any]]:
+    """The functions with the most own (tottime) or cumulative (cumtime) time"""
+    index = 2 if sort == "tottime" else 3
+    rows = sorted(stats.stats.items(), key=lambda item: -item[1][index])[:limit]
+    return [
+        {"function": _function_name(key), "calls": calls, "tottime_ms": _ms(tottime), "cumtime_ms": _ms(cumtime)}
+        for key, (_, calls, tottime, cumtime, _) in rows
+    ]
+
+
+class ToolProfiler:
+    """Wraps tool calls in cProfile and tracemalloc and writes a report per call"""
+
+    def __init__(self, directory: str | Path, tools: Iterable[str] = (), memory: bool = PROFILE_MEMORY,
+                 top: int = PROFILE_TOP):
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.tools = frozenset(tools)
+        self.memory = memory
+        self.top = top
+        self.profiled = 0
+        self.skipped = 0
+        self._active = False
+        self._seq = itertools.count(1)
+
+    def wants(self, name: str) -> bool:
+        return not self.tools or name in self.tools
+
+    async def profile(self, name: str, arguments: Dict[str, Any],
+                      call: Callable[[str, Dict[str, Any]], Awaitable[Any]]) -> Any:
+        if self._active:
+            # cProfile cannot nest; interleaved calls would also blur each other's numbers
+            self.skipped += 1
+            return await call(name, arguments)
+
+        self._active = True
+        trace: List[Dict[str, Any]] = []
+        token = server.command_trace.set(trace)
+        baseline = None
+        started_tracing = False
+        if self.memory:
+            if tracemalloc.is_tracing():
+                baseline = tracemalloc.take_snapshot()
+                tracemalloc.reset_peak()
+            else:
+                tracemalloc.start(TRACEMALLOC_FRAMES)
+                started_tracing = True
+        profiler = cProfile.Profile()
+        started = datetime.datetime.now()
+        wall_started = time.perf_counter()
+        cpu_started = time.process_time()
+        failed = False
+        profiler.enable()
+        try:
+            return await call(name, arguments)
+        except BaseException:
+            failed = True
+            raise
+        finally:
+            profiler.disable()
+            wall = time.perf_counter() - wall_started
+            cpu = time.process_time() - cpu_started
+            server.command_trace.reset(token)
+            memory = self._memory_summary(baseline, started_tracing) if self.memory else None
+            self._active = False
+            try:
+                self._write(name, arguments, started, wall, cpu, failed, profiler, trace, memory)
+            except Exception as e:
+                logger.warning(f"Could not write the profile of {name}: {str(e)}")
+
+    def _memory_summary(self, baseline: Optional[tracemalloc.Snapshot], started_tracing: bool) -> Dict[str, Any]:
+        peak = tracemalloc.get_traced_memory()[1]
+        snapshot = tracemalloc.take_snapshot().filter_traces((tracemalloc.Filter(False, tracemalloc.__file__),))
+        if started_tracing:
+            tracemalloc.stop()
+        if baseline is not None:
+            rows = [(stat.traceback, stat.size_diff, stat.count_diff) for stat in snapshot.compare_to(baseline, "lineno")]
+        else:
+            rows = [(stat.traceback, stat.size, stat.count) for stat in snapshot.statistics("lineno")]
+        rows.sort(key=lambda row: -abs(row[1]))
+        return {
+            "peak_bytes": peak,
+            # Allocations made during the call and still alive at its end
+            "top_allocations": [
+                {"location": f"{frame.filename}:{frame.lineno}", "size_bytes": size, "count": count}
+                for traceback, size, count in rows[:self.top]
+                for frame in traceback[:1]
+            ],
+        }
+
+    def _write(self, name: str, arguments: Dict[str, Any], started: datetime.datetime, wall: float, cpu: float,
+               failed: bool, profiler: cProfile.Profile, trace: List[Dict[str, Any]],
+               memory: Optional[Dict[str, Any]]):
+        stem = f"{started:%Y%m%d-%H%M%S}-{next(self._seq):05d}-{name}"
+        profile_path = self.directory / f"{stem}.prof"
+        profiler.dump_stats(profile_path)
+        rhino = sum(entry["duration"] for entry in trace)
+        summary = {
+            "tool": name,
+            "started": started.isoformat(timespec="milliseconds"),
+            "failed": failed,
+            "arguments": str(LogPreview(arguments)),
+            "wall_ms": _ms(wall),
+            "cpu_ms": _ms(cpu),
+            # Concurrent commands can overlap, so this is a lower bound of the Python time
+            "python_ms": _ms(max(0.0, wall - rhino)),
+            "rhino_ms": _ms(rhino),
+            "rhino_commands": len(trace),
+            "commands": [
+                {key: _ms(value) if key in ("duration", "encode", "send", "wait", "decode") else value
+                 for key, value in entry.items()}
+                for entry in trace[:MAX_TRACED_COMMANDS]
+            ],
+            "profile": profile_path.name,
+            "top_functions": top_functions(pstats.Stats(profiler), self.top),
+        }
+        if memory is not None:
+            summary["memory"] = memory
+        (self.directory / f"{stem}.json").write_text(json.dumps(summary, indent=2))
+        self.profiled += 1
+
+
+def start_profiling(directory: str | Path, tools: Optional[Iterable[str]] = None, memory: bool = PROFILE_MEMORY,
+                    top: int = PROFILE_TOP) -> ToolProfiler:
+    """Profile tool calls (all of them, or those named in tools) until stop_profiling()"""
+    if tools is None:
+        tools = [tool.strip() for tool in PROFILE_TOOLS.split(",") if tool.strip()]
+    profiler = server.tool_profiler = ToolProfiler(directory, tools, memory, top)
+    logger.info(f"Profiling {', '.join(sorted(profiler.tools)) or 'all tools'} into {profiler.directory}")
+    return profiler
+
+
+def stop_profiling():
+    profiler, server.tool_profiler = server.tool_profiler, None
+    if profiler is not None:
+        logger.info(f"Profiled {profiler.profiled} tool calls ({profiler.skipped} skipped while busy)")
+
+
+def load_summaries(directory: str | Path, tool: Optional[str] = None) -> List[Dict[str, Any]]:
+    summaries = []
+    for path in sorted(Path(directory).glob("*.json")):
+        try:
+            summary = json.loads(path.read_text())
+        except ValueError:
+            continue
+        if "tool" in summary and (tool is None or summary["tool"] == tool):
+            summary["_path"] = path
+            summaries.append(summary)
+    return summaries
+
+
+def aggregate(summaries: List[Dict[str, Any]]) -> Dict[str, Dict[str, Any]]:
+    """Per-tool calls, wall percentiles and the share of time spent in Python"""
+    by_tool: Dict[str, List[Dict[str, Any]]] = defaultdict(list)
+    for summary in summaries:
+        by_tool[summary["tool"]].append(summary)
+
+    result = {}
+    for tool, calls in by_tool.items():
+        wall = sorted(call["wall_ms"] for call in calls)
+        total_wall = sum(wall)
+        python = sum(call["python_ms"] for call in calls)
+        result[tool] = {
+            "calls": len(calls),
+            "failed": sum(bool(call.get("failed")) for call in calls),
+            "wall_p50_ms": wall[len(wall) // 2],
+            "wall_max_ms": wall[-1],
+            "python_ms_mean": round(python / len(calls), 3),
+            "rhino_ms_mean": round(statistics.fmean(call["rhino_ms"] for call in calls), 3),
+            "cpu_ms_mean": round(statistics.fmean(call["cpu_ms"] for call in calls), 3),
+            "python_share": round(python / total_wall, 3) if total_wall else 0.0,
+            "peak_memory_max": max((call.get("memory") or {}).get("peak_bytes", 0) for call in calls),
+        }
+    return dict(sorted(result.items(), key=lambda item: -item[1]["wall_p50_ms"] * item[1]["calls"]))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Aggregate per-call tool profiles written by rhinomcp.profiling")
+    parser.add_argument("directory")
+    parser.add_argument("--tool", help="Only this tool")
+    parser.add_argument("--top", type=int, default=25, help="Functions to list from the merged profiles")
+    parser.add_argument("--sort", choices=("tottime", "cumtime"), default="tottime")
+    parser.add_argument("--json", action="store_true", help="Print machine-readable output")
+    args = parser.parse_args()
+
+    summaries = load_summaries(args.directory, args.tool)
+    if not summaries:
+        parser.exit(1, f"No profiles found in {args.directory}\n")
+    tools = aggregate(summaries)
+    profiles = [str(summary["_path"].with_name(summary["profile"])) for summary in summaries
+                if summary["_path"].with_name(summary["profile"]).exists()]
+    functions = top_functions(pstats.Stats(*profiles), args.top, args.sort) if profiles else []
+
+    if args.json:
+        print(json.dumps({"tools": tools, "top_functions": functions}, indent=2))
+        return
+    columns = list(next(iter(tools.values())).keys())
+    width = max(len("tool"), *(len(tool) for tool in tools))
+    print(f"{'tool':<{width}}  " + "  ".join(f"{c:>15}" for c in columns))
+    for tool, row in tools.items():
+        print(f"{tool:<{width}}  " + "  ".join(f"{str(row[c]):>15}" for c in columns))
+    print()
+    print(f"Top {len(functions)} functions by {args.sort} over {len(profiles)} profiles:")
+    for row in functions:
+        print(f"{row['tottime_ms']:>12.3f} ms own  {row['cumtime_ms']:>12.3f} ms cum  {row['calls']:>9}  {row['function']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -57,6 +57,7 @@ def asset_general_strategy() -> str:
     - When the user names a focused region or you already know a target bbox, scope the scene scan with get_document_info(..., bbox=[[min_x,min_y,min_z],[max_x,max_y,max_z]], bbox_mode="intersects").
     - Use get_document_info(detail="summary") when compact per-object descriptors are needed without coordinate arrays.
     - Use limit/offset on get_document_info when the scene is large; watch objects_truncated and objects_returned.
+    - For whole-scene counts on large models use get_document_info(all_pages=true): per-type/per-layer counts, overall bbox and a sample of `limit` objects in one call.
     - Use get_object_info / get_objects_info to understand source objects.
     - Prefer get_objects_info for detailed geometry of selected targets after inventory/summary identifies them.
     - Use geometry_detail="bbox" for lean detail when only coarse location/size matters.
@@ -68,6 +69,8 @@ def asset_general_strategy() -> str:
     - the user asks for duplication/patterning, or
     - preserving an original while creating variants is explicitly required.
     - Prefer batch operations when the operation is intentionally applied to many objects.
+    - For regular repetition (rows, grids, rings, along a curve) use array_objects with one pattern instead of
+      listing every copy.
 
     CREATION RULE:
     - Create new geometry only when:
@@ -0,0 +1,438 @@
+# Recording of Rhino sessions and replay without Rhino
+"""Record every command and reply exchanged with Rhino, and serve recordings back.
+
+While a SessionRecorder is installed (RHINOMCP_RECORD=session.rmcp, or start_recording()), both
+connection classes append each command envelope, the decoded reply and its timing and sizes to
+the recording file. The file uses the wire protocol's frame layout:
+- the magic bytes SESSION_MAGIC, then a header frame
+- one JSON frame per command, zlib-compressed above RECORD_COMPRESSION_THRESHOLD
+- attachment blobs (view captures) stored raw, as FLAG_ATTACHMENT frames after their record
+
+ReplayServer answers the plugin protocol from a recording, so real sessions become repeatable
+load tests of the Python side: framing, decompression, decoding and the tools' formatting.
+
+    uv run python -m rhinomcp.recording info session.rmcp
+    uv run python -m rhinomcp.recording serve session.rmcp --port 1999 --speed 0
+    uv run python -m rhinomcp.recording replay session.rmcp --repeat 5
+"""
+import argparse
+import asyncio
+import datetime
+import json
+import logging
+import statistics
+import threading
+import time
+from collections import defaultdict
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any, BinaryIO, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from rhinomcp import server
+from rhinomcp.fake_rhino import SUPPORTED_FEATURES, FakeRhinoConfig, FakeRhinoServer
+from rhinomcp.server import (
+    COMPRESSION_ZLIB,
+    FEATURE_REVISIONS,
+    FLAG_ATTACHMENT,
+    FRAME_HEADER,
+    JSON_CODEC,
+    RHINO_HOST,
+    RHINO_PORT,
+    AsyncRhinoConnectionPool,
+    RhinoError,
+    _attach_blobs,
+    _attachment_payload,
+    encode_frame,
+    pack_message,
+    unpack_message,
+)
+
+logger = logging.getLogger("RhinoMCPServer.recording")
+
+SESSION_MAGIC = b"RMCPREC1"
+SESSION_FORMAT = "rhinomcp-session"
+SESSION_FORMAT_VERSION = 1
+RECORD_COMPRESSION_THRESHOLD = 1024
+
+
+@dataclass
+class RecordedCommand:
+    offset: float  # Seconds between the start of the recording and sending the command
+    duration: float  # Round trip as seen by the connection, including decoding
+    command: Dict[str, Any]  # Envelope as sent: type, params and the request id, if any
+    response: Optional[Dict[str, Any]]  # Decoded reply envelope; None if no reply arrived
+    outcome: str
+    sent_bytes: int
+    received_bytes: int
+
+    @property
+    def type(self) -> str:
+        return self.command.get("type") or ""
+
+    @property
+    def params(self) -> Dict[str, Any]:
+        return self.command.get("params") or {}
+
+
+def _split_attachments(response: Dict[str, Any]) -> Tuple[Dict[str, Any], List[bytes | bytearray | memoryview]]:
+    """Return a copy of the reply without its attachment values, and the values"""
+    keys = response.get("attachments") or ()
+    result = response.get("result")
+    if not keys or not isinstance(result, dict):
+        return response, []
+    blobs = [result[key] for key in keys]
+    return {**response, "result": {**result, **{key: None for key in keys}}}, blobs
+
+
+class SessionRecorder:
+    """Append commands and replies to a session file; safe to share between threads.
+
+    Records are encoded and written on the calling thread (the event loop for tool calls), so
+    recording costs time proportional to the reply size. Use it for capturing sessions, not
+    for routine serving.
+    """
+
+    def __init__(self, path: str | Path):
+        self.path = Path(path)
+        self.commands = 0
+        self._lock = threading.Lock()
+        self._started = time.monotonic()
+        self._file: Optional[BinaryIO] = open(self.path, "wb")
+        self._file.write(SESSION_MAGIC)
+        self._write(JSON_CODEC.encode({
+            "format": SESSION_FORMAT,
+            "version": SESSION_FORMAT_VERSION,
+            "created": datetime.datetime.now().isoformat(timespec="seconds"),
+            "host": RHINO_HOST,
+            "port": RHINO_PORT,
+        }))
+        self.commands = 0
+
+    def __enter__(self) -> "SessionRecorder":
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def _write(self, payload: bytes, blobs: Iterable[bytes | bytearray | memoryview] = ()):
+        with self._lock:
+            if self._file is None:
+                return
+            self._file.write(pack_message(payload, COMPRESSION_ZLIB, RECORD_COMPRESSION_THRESHOLD))
+            for blob in blobs:
+                self._file.write(encode_frame(bytes(blob), FLAG_ATTACHMENT))
+            self.commands += 1
+
+    def record(self, command: Dict[str, Any], response: Optional[Dict[str, Any]], started: float,
+               duration: float, sent_bytes: int, received_bytes: int, outcome: str = "ok"):
+        blobs: List[bytes | bytearray | memoryview] = []
+        if response is not None:
+            response, blobs = _split_attachments(response)
+        entry = RecordedCommand(
+            offset=round(started - self._started, 6),
+            duration=round(duration, 6),
+            command=command,
+            response=response,
+            outcome=outcome,
+            sent_bytes=sent_bytes,
+            received_bytes=received_bytes,
+        )
+        try:
+            payload = JSON_CODEC.encode(asdict(entry))
+        except TypeError as e:
+            logger.warning(f"Not recording {entry.type}: {str(e)}")
+            return
+        self._write(payload, blobs)
+
+    def close(self):
+        with self._lock:
+            file, self._file = self._file, None
+        if file is not None:
+            file.close()
+            logger.info(f"Recorded {self.commands} commands to {self.path}")
+
+
+def start_recording(path: str | Path) -> SessionRecorder:
+    """Record every command sent by any connection until stop_recording()"""
+    stop_recording()
+    recorder = server.session_recorder = SessionRecorder(path)
+    logger.info(f"Recording Rhino session to {recorder.path}")
+    return recorder
+
+
+def stop_recording():
+    recorder, server.session_recorder = server.session_recorder, None
+    if recorder is not None:
+        recorder.close()
+
+
+def _read_frame(file: BinaryIO) -> Optional[Tuple[int, bytes]]:
+    """Read one frame; None at the end of the file or of a truncated recording"""
+    header = file.read(FRAME_HEADER.size)
+    if not header:
+        return None
+    if len(header) < FRAME_HEADER.size:
+        logger.warning("Recording ends with a truncated frame header")
+        return None
+    length, flags = FRAME_HEADER.unpack(header)
+    payload = file.read(length)
+    if len(payload) < length:
+        # The recording process was killed mid-write; keep what is complete
+        logger.warning("Recording ends with a truncated frame")
+        return None
+    return flags, payload
+
+
+def read_session_header(path: str | Path) -> Dict[str, Any]:
+    with open(path, "rb") as file:
+        return _read_header(file, path)
+
+
+def _read_header(file: BinaryIO, path: str | Path) -> Dict[str, Any]:
+    frame = _read_frame(file) if file.read(len(SESSION_MAGIC)) == SESSION_MAGIC else None
+    header = JSON_CODEC.decode(unpack_message(*frame)) if frame is not None else {}
+    if header.get("format") != SESSION_FORMAT:
+        raise ValueError(f"{path} is not a rhinomcp session recording")
+    if header.get("version") != SESSION_FORMAT_VERSION:
+        raise ValueError(f"Unsupported session recording version: {header.get('version')}")
+    return header
+
+
+def read_session(path: str | Path) -> Iterator[RecordedCommand]:
+    """Yield the recorded commands in order; attachments come back as memoryviews, as on the wire"""
+    with open(path, "rb") as file:
+        _read_header(file, path)
+        while (frame := _read_frame(file)) is not None:
+            entry = JSON_CODEC.decode(unpack_message(*frame))
+            response = entry.get("response")
+            if response and response.get("attachments"):
+                frames = [_read_frame(file) for _ in response["attachments"]]
+                if any(frame is None for frame in frames):
+                    return
+                _attach_blobs(response, [_attachment_payload(*frame) for frame in frames])
+            yield RecordedCommand(**entry)
+
+
+def _params_key(command_type: str, params: Dict[str, Any]) -> Tuple[str, str]:
+    return command_type, json.dumps(params, sort_keys=True, separators=(",", ":"), default=str)
+
+
+class ReplayScene:
+    """Answers commands from a recording instead of a document.
+
+    A command gets the next reply recorded for the same type and params. When the params differ
+    (generated names, new ids) it falls back to the replies of that type in recorded order. With
+    loop=True exhausted replies start over, so one recording can drive any number of runs.
+    Commands that got no reply while recording (timeouts, dropped connections) are left out.
+    """
+
+    def __init__(self, records: Iterable[RecordedCommand], loop: bool = True):
+        self.loop = loop
+        self.touched = 0
+        self.last_duration = 0.0  # Recorded round trip of the command executed last
+        self.replies = 0
+        self._by_params: Dict[Tuple[str, str], List[Tuple[Dict[str, Any], float]]] = defaultdict(list)
+        self._by_type: Dict[str, List[Tuple[Dict[str, Any], float]]] = defaultdict(list)
+        self._cursors: Dict[Any, int] = {}
+        for record in records:
+            if record.response is None:
+                continue
+            envelope = {key: value for key, value in record.response.items() if key not in ("id", "attachments")}
+            result = envelope.get("result")
+            if isinstance(result, dict):
+                # The server detaches bytes values again if the client negotiated attachments
+                envelope["result"] = {
+                    key: bytes(value) if isinstance(value, memoryview) else value for key, value in result.items()
+                }
+            reply = (envelope, record.duration)
+            self._by_params[_params_key(record.type, record.params)].append(reply)
+            self._by_type[record.type].append(reply)
+            self.replies += 1
+
+    def describe(self) -> str:
+        return f"{self.replies} recorded replies"
+
+    def _next(self, replies: List[Tuple[Dict[str, Any], float]], cursor: Any) -> Optional[Tuple[Dict[str, Any], float]]:
+        index = self._cursors.get(cursor, 0)
+        if index >= len(replies):
+            if not self.loop or not replies:
+                return None
+            index = 0
+        self._cursors[cursor] = index + 1
+        return replies[index]
+
+    def execute(self, command_type: str, params: Dict[str, Any]) -> Dict[str, Any]:
+        key = _params_key(command_type, params)
+        reply = self._next(self._by_params.get(key, []), key) or self._next(self._by_type.get(command_type, []),
+                                                                          command_type)
+        if reply is None:
+            self.last_duration = 0.0
+            return {"status": "error", "message": f"No recorded reply for {command_type}"}
+        envelope, self.last_duration = reply
+        result = envelope.get("result")
+        # FakeRhinoServer adds the id and detaches attachments in place
+        return {**envelope, "result": dict(result)} if isinstance(result, dict) else dict(envelope)
+
+
+class ReplayServer(FakeRhinoServer):
+    """FakeRhinoServer answering from a recording.
+
+    Each reply is held back for its recorded round trip times speed; speed=0 replies as fast as
+    possible. records may be a path or RecordedCommand objects.
+    """
+
+    def __init__(self, records: str | Path | Iterable[RecordedCommand], host: str = RHINO_HOST, port: int = 0,
+                 speed: float = 1.0, loop: bool = True):
+        if isinstance(records, (str, Path)):
+            records = read_session(records)
+        # Recorded replies keep the revision they were recorded with; there is no live one to add
+        features = tuple(feature for feature in SUPPORTED_FEATURES if feature != FEATURE_REVISIONS)
+        config = FakeRhinoConfig(objects=0, features=features)
+        super().__init__(config, host=host, port=port, scene=ReplayScene(records, loop))
+        self.speed = speed
+
+    def _latency(self, command_type: str, touched: int) -> float:
+        return self.scene.last_duration * self.speed
+
+
+def _percentile(values: List[float], fraction: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+async def replay_session(records: List[RecordedCommand], rhino: AsyncRhinoConnectionPool, repeat: int = 1,
+                         concurrency: int = 1) -> Dict[str, Dict[str, Any]]:
+    """Re-send the recorded commands in order and return per-command timings.
+
+    Up to concurrency commands are in flight at once. Replies that are Rhino errors count as
+    errors but do not stop the replay.
+    """
+    wall: Dict[str, List[float]] = defaultdict(list)
+    errors: Dict[str, int] = defaultdict(int)
+    slots = asyncio.Semaphore(max(1, concurrency))
+
+    async def send(record: RecordedCommand):
+        async with slots:
+            started = time.perf_counter()
+            try:
+                await rhino.send_command(record.type, record.params)
+            except RhinoError:
+                errors[record.type] += 1
+            except Exception as e:
+                errors[record.type] += 1
+                logger.warning(f"Replaying {record.type} failed: {str(e)}")
+            wall[record.type].append(time.perf_counter() - started)
+
+    replayable = [record for record in records if record.response is not None]
+    for _ in range(repeat):
+        await asyncio.gather(*(send(record) for record in replayable))
+
+    return {
+        command_type: {
+            "calls": len(timings),
+            "errors": errors[command_type],
+            "mean_ms": round(statistics.fmean(timings) * 1000, 3),
+            "p50_ms": round(_percentile(timings, 0.50) * 1000, 3),
+            "p95_ms": round(_percentile(timings, 0.95) * 1000, 3),
+        }
+        for command_type, timings in sorted(wall.items())
+    }
+
+
+def summarize_session(records: Iterable[RecordedCommand]) -> Dict[str, Dict[str, Any]]:
+    """Per-command calls, outcomes, recorded latency and bytes"""
+    stats: Dict[str, Dict[str, Any]] = {}
+    for record in records:
+        entry = stats.setdefault(record.type, {"calls": 0, "errors": 0, "total_ms": 0.0, "max_ms": 0.0,
+                                               "sent_bytes": 0, "received_bytes": 0})
+        entry["calls"] += 1
+        entry["errors"] += record.outcome != "ok"
+        entry["total_ms"] += record.duration * 1000
+        entry["max_ms"] = max(entry["max_ms"], round(record.duration * 1000, 3))
+        entry["sent_bytes"] += record.sent_bytes
+        entry["received_bytes"] += record.received_bytes
+    for entry in stats.values():
+        entry["total_ms"] = round(entry["total_ms"], 3)
+    return dict(sorted(stats.items()))
+
+
+def _print_table(stats: Dict[str, Dict[str, Any]]):
+    if not stats:
+        print("(no commands)")
+        return
+    columns = list(next(iter(stats.values())).keys())
+    width = max(len("command"), *(len(name) for name in stats))
+    print(f"{'command':<{width}}  " + "  ".join(f"{c:>14}" for c in columns))
+    for name, entry in stats.items():
+        print(f"{name:<{width}}  " + "  ".join(f"{str(entry[c]):>14}" for c in columns))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Inspect, serve and replay recorded Rhino sessions")
+    commands = parser.add_subparsers(dest="action", required=True)
+
+    info = commands.add_parser("info", help="Summarise a recording per command")
+    info.add_argument("path")
+    info.add_argument("--json", action="store_true")
+
+    serve = commands.add_parser("serve", help="Serve a recording over the plugin protocol")
+    serve.add_argument("path")
+    serve.add_argument("--host", default=RHINO_HOST)
+    serve.add_argument("--port", type=int, default=RHINO_PORT)
+    serve.add_argument("--speed", type=float, default=1.0, help="Multiplier for the recorded latency; 0 = none")
+    serve.add_argument("--no-loop", action="store_true", help="Answer with errors once the recording runs out")
+
+    replay = commands.add_parser("replay", help="Send a recording through a connection pool and time it")
+    replay.add_argument("path")
+    replay.add_argument("--repeat", type=int, default=1)
+    replay.add_argument("--concurrency", type=int, default=1)
+    replay.add_argument("--speed", type=float, default=0.0, help="Multiplier for the recorded latency")
+    replay.add_argument("--port", type=int, help="Use a running `serve` instead of an in-process replay server")
+    replay.add_argument("--json", action="store_true")
+    args = parser.parse_args()
+
+    if args.action == "info":
+        header = read_session_header(args.path)
+        stats = summarize_session(read_session(args.path))
+        if args.json:
+            print(json.dumps({"header": header, "commands": stats}, indent=2))
+            return
+        print(f"Recorded {header.get('created')} from {header.get('host')}:{header.get('port')}")
+        _print_table(stats)
+        return
+
+    if args.action == "serve":
+        replay_server = ReplayServer(args.path, host=args.host, port=args.port, speed=args.speed,
+                                     loop=not args.no_loop).start()
+        try:
+            while True:
+                time.sleep(3600)
+        except KeyboardInterrupt:
+            pass
+        finally:
+            replay_server.stop()
+        return
+
+    records = list(read_session(args.path))
+
+    async def run() -> Dict[str, Dict[str, Any]]:
+        pool = AsyncRhinoConnectionPool(port=args.port or replay_server.port)
+        try:
+            return await replay_session(records, pool, args.repeat, args.concurrency)
+        finally:
+            await pool.close()
+
+    replay_server = None if args.port else ReplayServer(records, speed=args.speed).start()
+    try:
+        stats = asyncio.run(run())
+    finally:
+        if replay_server is not None:
+            replay_server.stop()
+    if args.json:
+        print(json.dumps(stats, indent=2))
+        return
+    _print_table(stats)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,31 @@
+import json
+
+from rhinomcp import server
+from rhinomcp.chunking import chunk_sizer
+from rhinomcp.server import mcp
+
+
+def prometheus_metrics() -> str:
+    """Per-command Rhino metrics in the Prometheus text exposition format"""
+    return server.command_metrics.prometheus_text()
+
+
+@mcp.resource("rhino://metrics", name="rhino_metrics", mime_type="application/json")
+def rhino_metrics() -> str:
+    """
+    Per-command Rhino metrics since the server started, the commands with the most total time first.
+
+    For every command type: calls and outcomes, total time, duration mean/p50/p95/p99/max,
+    mean and p95 time per phase (encode, send, wait for Rhino, decode) and request/reply bytes.
+    Percentiles are estimated from histogram buckets.
+    "object_cache" has the entries, hits and misses of the object info cache.
+    "chunking" has the observed Rhino time per object and the current chunk size of chunked commands.
+    """
+    return json.dumps({**server.command_metrics.snapshot(), "object_cache": server.object_cache.stats(),
+                       "chunking": chunk_sizer.snapshot()}, indent=2)
+
+
+@mcp.resource("rhino://metrics/prometheus", name="rhino_metrics_prometheus", mime_type="text/plain")
+def rhino_metrics_prometheus() -> str:
+    """The rhino://metrics series as Prometheus text (version 0.0.4), for scraping or diffing"""
+    return prometheus_metrics()
@@ -0,0 +1,164 @@
+# Full-text search over the rhinoscriptsyntax reference (BM25 with trigram fallback)
+"""Ranked search over the rhinoscriptsyntax functions, built once on first use.
+
+Each function is a document made of weighted fields: Name, Signature, Description and
+ArgumentDesc (FIELD_WEIGHTS). Text is split into lower-case terms; identifiers are split at
+case changes as well as kept whole, so "AddLine", "add line" and "addline" all find AddLine. A
+trailing plural "s" is dropped. Documents are scored with BM25F: field-weighted term frequencies,
+normalised by the weighted document length.
+
+Each query term also matches the vocabulary terms sharing most of its character trigrams, at
+EXPANSION_WEIGHT times that similarity, so typos and other forms of a word ("intersect",
+"intersection") still match; a document scores the best of a query term's matches, not their sum.
+The query words joined together ("object name" -> "objectname") are an extra, exact-only term, so a
+function named after the whole query ranks first.
+"""
+import math
+import re
+import threading
+from collections import Counter, defaultdict
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+from rhinomcp.static.rhinoscriptsyntax import load_rhinoscriptsyntax
+
+FIELD_WEIGHTS = {"Name": 3.0, "Signature": 1.5, "Description": 1.0, "ArgumentDesc": 0.5}
+K1 = 1.2
+B = 0.75
+MIN_TRIGRAM_SIMILARITY = 0.3
+MAX_EXPANSIONS = 4  # Vocabulary terms matched by one query term, itself included
+EXPANSION_WEIGHT = 0.5
+STOPWORDS = frozenset({"a", "an", "and", "are", "as", "be", "by", "for", "from", "if", "in", "is", "it",
+                       "of", "on", "or", "that", "the", "this", "to", "with"})
+
+_WORD = re.compile(r"[A-Za-z0-9]+")
+_CAMEL_PART = re.compile(r"[A-Z]+(?=[A-Z][a-z])|[A-Z]?[a-z]+|[A-Z]+|[0-9]+")
+_SPACE = re.compile(r"\s+")
+_CONTINUATION = re.compile(r"\r?\n[ \t]+")
+
+
+def _stem(term: str) -> str:
+    return term[:-1] if len(term) > 3 and term.endswith("s") and not term.endswith("ss") else term
+
+
+def terms(text: str) -> List[str]:
+    """Search terms of a text: words, their camel-case parts, lower-cased and singular"""
+    result = []
+    for word in _WORD.findall(text or ""):
+        parts = _CAMEL_PART.findall(word)
+        if len(parts) > 1:
+            result.append(_stem(word.lower()))
+        result += [_stem(part.lower()) for part in parts]
+    return [term for term in result if term not in STOPWORDS]
+
+
+def _trigrams(term: str) -> Set[str]:
+    padded = f"^{term}$"
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def _compact(text: str) -> str:
+    return _SPACE.sub(" ", text or "").strip()
+
+
+def _argument_lines(text: str) -> List[str]:
+    """ArgumentDesc as one line per argument (continuation lines are indented)"""
+    return [_compact(line) for line in _CONTINUATION.sub(" ", text or "").splitlines() if line.strip()]
+
+
+class FunctionSearchIndex:
+    """Inverted index of rhinoscriptsyntax functions"""
+
+    def __init__(self, modules: List[Dict[str, Any]]):
+        self.functions: List[Dict[str, Any]] = [function for module in modules for function in module["functions"]]
+        self.postings: Dict[str, List[Tuple[int, float]]] = defaultdict(list)
+        self.lengths: List[float] = []
+        for doc, function in enumerate(self.functions):
+            frequencies: Counter = Counter()
+            for field, weight in FIELD_WEIGHTS.items():
+                for term in terms(function.get(field, "")):
+                    frequencies[term] += weight
+            for term, frequency in frequencies.items():
+                self.postings[term].append((doc, frequency))
+            self.lengths.append(sum(frequencies.values()))
+        average_length = sum(self.lengths) / len(self.lengths) if self.lengths else 1.0
+        self._norms = [K1 * (1 - B + B * length / average_length) for length in self.lengths]
+        count = len(self.functions)
+        self.idf = {term: math.log(1 + (count - len(docs) + 0.5) / (len(docs) + 0.5))
+                    for term, docs in self.postings.items()}
+        self._terms_by_trigram: Dict[str, Set[str]] = defaultdict(set)
+        self._trigram_counts: Dict[str, int] = {}
+        for term in self.postings:
+            grams = _trigrams(term)
+            self._trigram_counts[term] = len(grams)
+            for trigram in grams:
+                self._terms_by_trigram[trigram].add(term)
+
+    def expand(self, term: str) -> List[Tuple[str, float]]:
+        """(indexed term, weight): term itself with 1 if indexed, and similar terms by trigram similarity"""
+        grams = _trigrams(term)
+        shared: Counter = Counter()
+        for trigram in grams:
+            shared.update(self._terms_by_trigram.get(trigram, ()))
+        similar = []
+        for candidate, common in shared.items():
+            similarity = common / (len(grams) + self._trigram_counts[candidate] - common)
+            if candidate == term:
+                similar.append((candidate, 1.0))
+            elif similarity >= MIN_TRIGRAM_SIMILARITY:
+                similar.append((candidate, EXPANSION_WEIGHT * similarity))
+        similar.sort(key=lambda entry: (-entry[1], entry[0]))
+        return similar[:MAX_EXPANSIONS]
+
+    def search(self, query: str, k: int = 10, modules: Optional[List[str]] = None) -> List[Tuple[Dict[str, Any], float]]:
+        """The k best (function, score) for a free-text query, best first"""
+        query_terms = [self.expand(term) for term in dict.fromkeys(terms(query))]
+        words = _WORD.findall(query)
+        joined = _stem("".join(words).lower())
+        if len(words) > 1 and joined in self.postings:
+            query_terms.append([(joined, 1.0)])
+        scores: Counter = Counter()
+        for matches in query_terms:
+            best: Dict[int, float] = {}
+            for term, query_weight in matches:
+                idf = self.idf[term] * query_weight
+                for doc, frequency in self.postings[term]:
+                    score = idf * frequency * (K1 + 1) / (frequency + self._norms[doc])
+                    if score > best.get(doc, 0.0):
+                        best[doc] = score
+            scores.update(best)
+        wanted = set(modules) if modules else None
+        ranked = sorted(scores.items(), key=lambda entry: (-entry[1], self.functions[entry[0]]["Name"]))
+        result = []
+        for doc, score in ranked:
+            function = self.functions[doc]
+            if wanted is None or function.get("ModuleName") in wanted:
+                result.append((function, score))
+                if len(result) >= k:
+                    break
+        return result
+
+
+_index: Optional[FunctionSearchIndex] = None
+_index_lock = threading.Lock()
+
+
+def rhinoscript_search_index() -> FunctionSearchIndex:
+    """The shared index, built on first use"""
+    global _index
+    with _index_lock:
+        if _index is None:
+            _index = FunctionSearchIndex(load_rhinoscriptsyntax())
+        return _index
+
+
+def search_summary(function: Dict[str, Any], score: float) -> Dict[str, Any]:
+    """Compact search hit: what is needed to call the function"""
+    return {
+        "name": function["Name"],
+        "module": function.get("ModuleName"),
+        "signature": function.get("Signature"),
+        "description": _compact(function.get("Description")),
+        "arguments": _argument_lines(function.get("ArgumentDesc")),
+        "returns": _compact(function.get("Returns")),
+        "score": round(score, 3),
+    }
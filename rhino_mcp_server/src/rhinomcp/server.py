@@ -1,23 +1,453 @@
 # rhino_mcp_server.py
 from mcp.server.fastmcp import FastMCP, Context, Image
 import socket
+import struct
 import json
+import abc
 import asyncio
+import contextvars
+import itertools
 import logging
-from dataclasses import dataclass
-from contextlib import asynccontextmanager
-from typing import AsyncIterator, Dict, Any, List
+import os
+import reprlib
+import select
+import threading
+import time
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from contextlib import asynccontextmanager, contextmanager
+from typing import AsyncIterator, Callable, Dict, Any, Iterator, List, Optional, Tuple, TypeVar
+from rhinomcp.metrics import CommandMetrics, CommandTiming
+from rhinomcp.object_cache import ObjectInfoCache
+
+try:
+    import orjson
+except ImportError:  # Optional speed-up; stdlib json is the fallback
+    orjson = None
 
 # Configure logging
-logging.basicConfig(level=logging.INFO, 
-                    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+# Commands are logged as one sampled summary line per command type at INFO; full payloads
+# only at DEBUG (RHINOMCP_LOG_LEVEL=DEBUG). RHINOMCP_LOG_FORMAT=json writes one JSON object
+# per line, including the structured fields attached to command summaries.
+LOG_LEVEL = os.environ.get("RHINOMCP_LOG_LEVEL", "INFO").upper()
+LOG_PREVIEW_CHARS = int(os.environ.get("RHINOMCP_LOG_PREVIEW_CHARS", "240"))
+LOG_SUMMARY_INTERVAL = float(os.environ.get("RHINOMCP_LOG_SUMMARY_SECONDS", "10"))
+
+
+class JsonLogFormatter(logging.Formatter):
+    """One JSON object per record; structured fields come from extra={"rhino": {...}}"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "time": self.formatTime(record),
+            "logger": record.name,
+            "level": record.levelname,
+            "message": record.getMessage(),
+        }
+        entry.update(getattr(record, "rhino", None) or {})
+        if record.exc_info:
+            entry["exc_info"] = self.formatException(record.exc_info)
+        return json.dumps(entry, default=str)
+
+
+if os.environ.get("RHINOMCP_LOG_FORMAT", "").lower() == "json":
+    _log_handler = logging.StreamHandler()
+    _log_handler.setFormatter(JsonLogFormatter())
+    logging.basicConfig(level=LOG_LEVEL, handlers=[_log_handler])
+else:
+    logging.basicConfig(level=LOG_LEVEL,
+                        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
 logger = logging.getLogger("RhinoMCPServer")
 
+# Wire protocol.
+# "legacy": a bare UTF-8 JSON document per message; the receiver has to reparse until it is complete.
+# "length_prefixed": every message is a frame of FRAME_HEADER (payload length, flags) followed by
+# the payload, so the receiver knows the size up front and decodes exactly once.
+# Framing is negotiated with a legacy "negotiate" message right after connecting. Plugins that
+# predate framing answer with an unknown-command error and the connection stays in legacy mode.
+# Optional features are negotiated in the same exchange:
+# - "request_ids": the plugin echoes the envelope "id" in its reply, so replies can be matched to
+#   requests, several commands can be in flight on one connection and answered out of order.
+# - "compression" (opt-in): frames whose payload is at least the negotiated threshold are sent
+#   zlib-deflated with FLAG_COMPRESSED set; smaller frames stay raw.
+# - "attachments": binary result values (e.g. capture_view PNGs) skip base64. The reply envelope
+#   lists their result keys in "attachments" and one FLAG_ATTACHMENT frame per key follows the
+#   JSON frame, carrying the raw bytes.
+# - "revisions": every reply carries "revision", a counter of document changes made outside MCP
+#   commands, so cached object info can be dropped after the user edits the model (object_cache).
+PROTOCOL_VERSION = 1
+FRAMING_LEGACY = "legacy"
+FRAMING_LENGTH_PREFIXED = "length_prefixed"
+FRAME_HEADER = struct.Struct(">IB")  # payload length (big-endian uint32), flags
+FLAG_COMPRESSED = 0x01
+FLAG_ATTACHMENT = 0x02
+MAX_FRAME_SIZE = 512 * 1024 * 1024
+NEGOTIATE_TIMEOUT = 5.0
+RESPONSE_TIMEOUT = 15.0  # Default deadline for commands without a better estimate
+FEATURE_REQUEST_IDS = "request_ids"
+FEATURE_ATTACHMENTS = "attachments"
+FEATURE_REVISIONS = "revisions"
+FEATURE_BATCH = "batch"
+FEATURE_COLUMNAR_CREATE = "columnar_create"
+CLIENT_FEATURES = frozenset({FEATURE_REQUEST_IDS, FEATURE_ATTACHMENTS, FEATURE_REVISIONS, FEATURE_BATCH,
+                             FEATURE_COLUMNAR_CREATE})
+# Commands send_batch refuses: they replace the active document (outside undo records) or are batches
+UNBATCHABLE_COMMANDS = frozenset({"batch", "negotiate", "open_file", "close_file"})
+MAX_IN_FLIGHT = 8  # Pipelined commands per connection
+COMPRESSION_ZLIB = "zlib"
+# Opt in with RHINOMCP_COMPRESSION=zlib; on loopback it trades CPU for bytes
+COMPRESSION_ENABLED = os.environ.get("RHINOMCP_COMPRESSION", "").lower() in ("1", "true", COMPRESSION_ZLIB)
+COMPRESSION_THRESHOLD = int(os.environ.get("RHINOMCP_COMPRESSION_THRESHOLD", str(64 * 1024)))
+COMPRESSION_LEVEL = 1  # Inventory JSON is highly redundant; higher levels buy little and cost a lot
+CODEC_JSON = "json"
+
+# Connection pools
+RHINO_HOST = os.environ.get("RHINOMCP_HOST", "127.0.0.1")
+RHINO_PORT = int(os.environ.get("RHINOMCP_PORT", "1999"))
+POOL_SIZE = int(os.environ.get("RHINOMCP_POOL_SIZE", "4"))
+# Connections idle for longer than this are pinged before being handed out
+IDLE_PROBE_AFTER = float(os.environ.get("RHINOMCP_IDLE_PROBE_SECONDS", "30"))
+CONNECT_RETRIES = 3
+CONNECT_BACKOFF = 0.2  # First reconnect delay in seconds, doubled per attempt
+# Write every command and reply to this file (see rhinomcp.recording) while the server runs
+RECORD_PATH = os.environ.get("RHINOMCP_RECORD")
+# Profile tool calls into this directory (see rhinomcp.profiling)
+PROFILE_DIR = os.environ.get("RHINOMCP_PROFILE_DIR")
+# Object info entries kept by get_object_info/get_objects_info (0 disables the cache)
+OBJECT_CACHE_SIZE = int(os.environ.get("RHINOMCP_OBJECT_CACHE_SIZE", "1024"))
+
+# Command deadlines.
+# Every command starts from a base deadline. Once replies have been observed, the deadline follows
+# an EWMA of the latency and of its deviation (like TCP's retransmission timer), clamped between
+# MIN_TIMEOUT and MAX_TIMEOUT. Each timeout doubles the next deadline until a reply comes back.
+COMMAND_TIMEOUTS: Dict[str, float] = {
+    "ping": 2.0,
+    "deselect_all": 5.0,
+    "get_log": 5.0,
+    "get_viewport_info": 5.0,
+    "get_document_info": 60.0,
+    "get_objects_info": 60.0,
+    "get_connectivity_graph": 60.0,
+    "create_objects": 60.0,
+    "copy_objects": 60.0,
+    "modify_objects": 60.0,
+    "capture_view": 60.0,
+    "run_command": 120.0,
+    "execute_rhinoscript_python_code": 120.0,
+    "close_file": 60.0,
+    "open_file": 300.0,
+}
+MIN_TIMEOUT = float(os.environ.get("RHINOMCP_MIN_TIMEOUT", "5"))
+MAX_TIMEOUT = float(os.environ.get("RHINOMCP_MAX_TIMEOUT", "600"))
+TIMEOUT_EWMA_ALPHA = 0.125  # Weight of the newest sample in the latency mean
+TIMEOUT_DEVIATION_BETA = 0.25  # Weight of the newest sample in the mean deviation
+TIMEOUT_HEADROOM = 3.0  # Deadline = headroom * (mean + 4 * deviation)
+
+T = TypeVar("T")
+
+
+class RhinoError(Exception):
+    """Raised when Rhino executed a command and reported an error"""
+
+
+class RhinoTimeoutError(TimeoutError):
+    """Raised when Rhino did not answer a command before its deadline"""
+
+
+_preview_repr = reprlib.Repr()
+_preview_repr.maxlevel = 3
+_preview_repr.maxdict = 6
+_preview_repr.maxlist = 4
+_preview_repr.maxtuple = 4
+_preview_repr.maxstring = 80
+_preview_repr.maxother = 80
+
+
+class LogPreview:
+    """Size-capped rendering of a payload, built only if the log record is emitted.
+
+    reprlib stops after a few items per level, so the cost does not grow with the payload.
+    """
+    __slots__ = ("value",)
+
+    def __init__(self, value: Any):
+        self.value = value
+
+    def __str__(self) -> str:
+        text = _preview_repr.repr(self.value)
+        if len(text) > LOG_PREVIEW_CHARS:
+            return text[:LOG_PREVIEW_CHARS] + "..."
+        return text
+
+
+@dataclass
+class _CommandLogStats:
+    calls: int = 0
+    failures: int = 0
+    total_s: float = 0.0
+    max_s: float = 0.0
+    sent_bytes: int = 0
+    received_bytes: int = 0
+
+
+class CommandLog:
+    """Per-command summaries: every call at DEBUG, aggregated at INFO at most once per interval"""
+
+    def __init__(self, interval: float = LOG_SUMMARY_INTERVAL):
+        self.interval = interval
+        self._stats: Dict[str, _CommandLogStats] = {}
+        self._last_emitted: Dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def record(self, command_type: str, duration: float, sent_bytes: int, received_bytes: int,
+               outcome: str = "ok"):
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(
+                "command=%s outcome=%s duration_ms=%.1f sent_bytes=%d received_bytes=%d",
+                command_type, outcome, duration * 1000, sent_bytes, received_bytes,
+                extra={"rhino": {"command": command_type, "outcome": outcome, "duration_ms": round(duration * 1000, 2),
+                                 "sent_bytes": sent_bytes, "received_bytes": received_bytes}},
+            )
+        now = time.monotonic()
+        with self._lock:
+            stats = self._stats.setdefault(command_type, _CommandLogStats())
+            stats.calls += 1
+            stats.failures += outcome != "ok"
+            stats.total_s += duration
+            stats.max_s = max(stats.max_s, duration)
+            stats.sent_bytes += sent_bytes
+            stats.received_bytes += received_bytes
+            if now - self._last_emitted.get(command_type, float("-inf")) < self.interval:
+                return
+            self._last_emitted[command_type] = now
+            del self._stats[command_type]
+        logger.info(
+            "command=%s calls=%d failures=%d mean_ms=%.1f max_ms=%.1f sent_bytes=%d received_bytes=%d",
+            command_type, stats.calls, stats.failures, stats.total_s / stats.calls * 1000, stats.max_s * 1000,
+            stats.sent_bytes, stats.received_bytes,
+            extra={"rhino": {"command": command_type, "calls": stats.calls, "failures": stats.failures,
+                             "mean_ms": round(stats.total_s / stats.calls * 1000, 2),
+                             "max_ms": round(stats.max_s * 1000, 2),
+                             "sent_bytes": stats.sent_bytes, "received_bytes": stats.received_bytes}},
+        )
+
+
+command_log = CommandLog()
+# Counters and latency/size histograms per command (rhino://metrics)
+command_metrics = CommandMetrics()
+# While set to a list, every command sent from this context is appended to it (used by the profiler)
+command_trace: contextvars.ContextVar[Optional[List[Dict[str, Any]]]] = contextvars.ContextVar(
+    "rhinomcp_command_trace", default=None
+)
+# rhinomcp.recording.SessionRecorder while a session is being recorded
+session_recorder = None
+# Object info by GUID, dropped by mutating commands and document revision changes
+object_cache = ObjectInfoCache(OBJECT_CACHE_SIZE)
+
+
+@dataclass
+class _LatencyEstimate:
+    mean: float
+    deviation: float
+    backoff: float = 1.0
+
+
+class AdaptiveTimeouts:
+    """Per-command deadlines that follow the observed reply latency.
+
+    Thread-safe; one instance is shared by every connection of both pools.
+    """
+
+    def __init__(
+        self,
+        base: Optional[Dict[str, float]] = None,
+        default: float = RESPONSE_TIMEOUT,
+        minimum: float = MIN_TIMEOUT,
+        maximum: float = MAX_TIMEOUT,
+    ):
+        self.base = dict(COMMAND_TIMEOUTS if base is None else base)
+        self.default = default
+        self.minimum = minimum
+        self.maximum = maximum
+        self._estimates: Dict[str, _LatencyEstimate] = {}
+        self._lock = threading.Lock()
+
+    def timeout_for(self, command_type: str) -> float:
+        """Current deadline in seconds for one command of this type"""
+        with self._lock:
+            estimate = self._estimates.get(command_type)
+            if estimate is None:
+                return self.base.get(command_type, self.default)
+            adaptive = TIMEOUT_HEADROOM * (estimate.mean + 4 * estimate.deviation)
+            # Commands whose base is already below the floor (ping) keep their base as the floor
+            floor = min(self.minimum, self.base.get(command_type, self.default))
+            return min(max(adaptive, floor) * estimate.backoff, self.maximum)
+
+    def observe(self, command_type: str, seconds: float):
+        """Record the latency of a command that got a reply"""
+        with self._lock:
+            estimate = self._estimates.get(command_type)
+            if estimate is None:
+                self._estimates[command_type] = _LatencyEstimate(seconds, seconds / 2)
+                return
+            estimate.deviation += TIMEOUT_DEVIATION_BETA * (abs(seconds - estimate.mean) - estimate.deviation)
+            estimate.mean += TIMEOUT_EWMA_ALPHA * (seconds - estimate.mean)
+            estimate.backoff = 1.0
+
+    def batch_timeout_for(self, command_types: List[str]) -> float:
+        """Deadline for running these commands back to back: the sum of their deadlines"""
+        return min(sum(self.timeout_for(command_type) for command_type in command_types), self.maximum)
+
+    def timed_out(self, command_type: str, waited: float):
+        """Record a missed deadline: the next one for this command is twice as long"""
+        with self._lock:
+            estimate = self._estimates.setdefault(command_type, _LatencyEstimate(waited / TIMEOUT_HEADROOM, 0.0))
+            estimate.backoff = min(estimate.backoff * 2, self.maximum)
+
+    def snapshot(self) -> Dict[str, Dict[str, float]]:
+        """Current estimates per command, for diagnostics"""
+        with self._lock:
+            commands = sorted(self._estimates)
+        return {
+            command: {
+                "mean_s": round(self._estimates[command].mean, 4),
+                "deviation_s": round(self._estimates[command].deviation, 4),
+                "timeout_s": round(self.timeout_for(command), 3),
+            }
+            for command in commands
+        }
+
+
+command_timeouts = AdaptiveTimeouts()
+
+
+def _remaining(deadline: Optional[float]) -> Optional[float]:
+    """Seconds left until a monotonic deadline, or None without one"""
+    return None if deadline is None else deadline - time.monotonic()
+
+
+def _remaining_or_expire(deadline: Optional[float], timeout: Optional[float]) -> Optional[float]:
+    """Like _remaining, but raise once the deadline has passed"""
+    remaining = _remaining(deadline)
+    if remaining is not None and remaining <= 0:
+        raise RhinoTimeoutError(f"Timeout after {timeout:.1f}s before the command could be sent")
+    return remaining
+
+
+def encode_frame(payload: bytes, flags: int = 0) -> bytes:
+    """Prefix a payload with the frame header"""
+    if len(payload) > MAX_FRAME_SIZE:
+        raise ValueError(f"Frame payload too large ({len(payload)} bytes)")
+    return FRAME_HEADER.pack(len(payload), flags) + payload
+
+
+def pack_message(payload: bytes, compression: str | None = None, threshold: int = COMPRESSION_THRESHOLD) -> bytes:
+    """Frame a payload, deflating it when compression was negotiated and it is large enough"""
+    if compression == COMPRESSION_ZLIB and len(payload) >= threshold:
+        return encode_frame(zlib.compress(payload, COMPRESSION_LEVEL), FLAG_COMPRESSED)
+    return encode_frame(payload)
+
+
+def unpack_message(flags: int, payload: bytes | bytearray) -> bytes | bytearray:
+    """Undo pack_message for a received frame"""
+    if flags & FLAG_COMPRESSED:
+        return zlib.decompress(payload)
+    return payload
+
+
+class Codec(abc.ABC):
+    """Turns envelopes into frame payloads and back"""
+    name = ""
+    backend = ""
+
+    @abc.abstractmethod
+    def encode(self, obj: Any) -> bytes:
+        ...
+
+    @abc.abstractmethod
+    def decode(self, data: bytes | bytearray | memoryview) -> Any:
+        ...
+
+
+class StdlibJsonCodec(Codec):
+    name = CODEC_JSON
+    backend = "json"
+
+    def encode(self, obj: Any) -> bytes:
+        return json.dumps(obj, separators=(",", ":")).encode("utf-8")
+
+    def decode(self, data: bytes | bytearray | memoryview) -> Any:
+        return json.loads(bytes(data) if isinstance(data, memoryview) else data)
+
+
+class OrjsonCodec(StdlibJsonCodec):
+    """Same JSON on the wire, several times faster for large point lists"""
+    backend = "orjson"
+
+    def encode(self, obj: Any) -> bytes:
+        try:
+            return orjson.dumps(obj, option=orjson.OPT_SERIALIZE_NUMPY)
+        except TypeError:
+            # Non-string keys, integers beyond 64 bits, custom types: let stdlib json decide
+            return super().encode(obj)
+
+    def decode(self, data: bytes | bytearray | memoryview) -> Any:
+        return orjson.loads(data)
+
+
+JSON_CODEC: Codec = OrjsonCodec() if orjson is not None else StdlibJsonCodec()
+
+
+def _attachment_payload(flags: int, payload: bytes | bytearray) -> bytes | bytearray:
+    """Unpack a frame that must carry an attachment"""
+    if not flags & FLAG_ATTACHMENT:
+        raise ConnectionError("Expected an attachment frame from Rhino")
+    return unpack_message(flags, payload)
+
+
+def _attach_blobs(response: Dict[str, Any], blobs: List[bytes | bytearray]):
+    """Put attachment frames back into the result as zero-copy memoryviews"""
+    result = response.get("result")
+    for key, blob in zip(response.get("attachments") or (), blobs):
+        result[key] = memoryview(blob)
+
+
+def _negotiate_request(compression: bool = False, threshold: int = COMPRESSION_THRESHOLD) -> Dict[str, Any]:
+    params: Dict[str, Any] = {
+        "version": PROTOCOL_VERSION,
+        "framing": [FRAMING_LENGTH_PREFIXED],
+        "features": sorted(CLIENT_FEATURES),
+    }
+    if compression:
+        params["compression"] = [COMPRESSION_ZLIB]
+        params["compression_threshold"] = threshold
+    return {"type": "negotiate", "params": params}
+
+
+def _negotiated_options(response: Dict[str, Any]) -> Tuple[str, frozenset, str | None]:
+    """Return (framing, features, compression) granted by a reply to the negotiate message"""
+    result = response.get("result") or {}
+    if response.get("status") != "success" or result.get("framing") != FRAMING_LENGTH_PREFIXED:
+        return FRAMING_LEGACY, frozenset(), None
+    compression = result.get("compression") if result.get("compression") == COMPRESSION_ZLIB else None
+    return FRAMING_LENGTH_PREFIXED, frozenset(result.get("features") or ()) & CLIENT_FEATURES, compression
+
+
 @dataclass
 class RhinoConnection:
     host: str
     port: int
     sock: socket.socket | None = None  # Changed from 'socket' to 'sock' to avoid naming conflict
+    negotiate: bool = True  # Try to switch to length-prefixed framing after connecting
+    framing: str = FRAMING_LEGACY
+    features: frozenset = frozenset()
+    request_compression: bool = COMPRESSION_ENABLED  # Ask for zlib frames above compression_threshold
+    compression_threshold: int = COMPRESSION_THRESHOLD
+    compression: str | None = None  # Negotiated compression, if any
+    codec: Codec = JSON_CODEC  # Payload codec for framed messages
+    timeouts: AdaptiveTimeouts = field(default_factory=lambda: command_timeouts, repr=False)
+    _ids: Iterator[int] = field(default_factory=lambda: itertools.count(1), repr=False)
     
     def connect(self) -> bool:
         """Connect to the Rhino addon socket server"""
@@ -28,11 +458,19 @@ class RhinoConnection:
             self.sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
             self.sock.connect((self.host, self.port))
             logger.info(f"Connected to Rhino at {self.host}:{self.port}")
-            return True
         except Exception as e:
             logger.error(f"Failed to connect to Rhino: {str(e)}")
             self.sock = None
             return False
+
+        self.framing, self.features, self.compression = FRAMING_LEGACY, frozenset(), None
+        if self.negotiate and not self._negotiate_framing():
+            # The peer never answered the negotiation; start over on a clean legacy socket
+            # so a late reply cannot be mistaken for the response to the next command.
+            self.disconnect()
+            self.negotiate = False
+            return self.connect()
+        return True
     
     def disconnect(self):
         """Disconnect from the Rhino addon"""
@@ -44,11 +482,96 @@ class RhinoConnection:
             finally:
                 self.sock = None
 
-    def receive_full_response(self, sock, buffer_size=8192):
-        """Receive the complete response, potentially in multiple chunks"""
+    def _negotiate_framing(self) -> bool:
+        """Ask the plugin for length-prefixed framing. Returns False if the peer did not answer."""
+        try:
+            self.sock.settimeout(NEGOTIATE_TIMEOUT)
+            request = _negotiate_request(self.request_compression, self.compression_threshold)
+            self.sock.sendall(JSON_CODEC.encode(request))
+            response = JSON_CODEC.decode(self.receive_full_response(self.sock, timeout=NEGOTIATE_TIMEOUT))
+        except Exception as e:
+            logger.warning(f"Protocol negotiation failed, falling back to legacy framing: {str(e)}")
+            return False
+
+        self.framing, self.features, self.compression = _negotiated_options(response)
+        logger.info(
+            f"Using {self.framing} framing, features: {sorted(self.features)}, compression: {self.compression}, "
+            f"codec: {self.codec.name} ({self.codec.backend})"
+        )
+        return True
+
+    def _recv_exactly(self, sock, size: int, mid_frame: bool = False) -> bytearray:
+        """Read exactly size bytes into a preallocated buffer"""
+        buffer = bytearray(size)
+        view = memoryview(buffer)
+        received = 0
+        while received < size:
+            try:
+                count = sock.recv_into(view[received:])
+            except socket.timeout:
+                if received or mid_frame:
+                    # The stream position is lost; the caller must drop the socket
+                    raise ConnectionError("Timed out in the middle of a frame")
+                raise
+            if count == 0:
+                raise ConnectionError("Connection closed while receiving a frame")
+            received += count
+        return buffer
+
+    def receive_frame(self, sock) -> Tuple[int, bytearray]:
+        """Receive one length-prefixed frame and return (flags, payload)"""
+        length, flags = FRAME_HEADER.unpack(self._recv_exactly(sock, FRAME_HEADER.size))
+        if length > MAX_FRAME_SIZE:
+            raise ConnectionError(f"Frame too large ({length} bytes)")
+        return flags, self._recv_exactly(sock, length, mid_frame=True)
+
+    def peer_closed(self) -> bool:
+        """Cheap liveness check: True if the socket is gone or Rhino closed it while idle"""
+        if self.sock is None:
+            return True
+        try:
+            readable, _, _ = select.select([self.sock], [], [], 0)
+            return bool(readable) and self.sock.recv(1, socket.MSG_PEEK) == b""
+        except OSError:
+            return True
+
+    def ping(self) -> bool:
+        """Round-trip a ping command; True if Rhino answered"""
+        try:
+            self.send_command("ping")
+            return True
+        except RhinoError:
+            # Plugins without ping reject the command, but they did answer
+            return True
+        except Exception:
+            return False
+
+    def receive_reply(self, sock, timing: Optional[CommandTiming] = None) -> Tuple[Dict[str, Any], int]:
+        """Receive one framed reply plus its attachment frames; return (response, payload bytes)"""
+        frame = self.receive_frame(sock)
+        decode_started = time.perf_counter()
+        response_data = unpack_message(*frame)
+        response = self.codec.decode(response_data)
+        size = len(response_data)
+        decoding = time.perf_counter() - decode_started
+        if response.get("attachments"):
+            blobs = []
+            for _ in response["attachments"]:
+                frame = self.receive_frame(sock)
+                decode_started = time.perf_counter()
+                blobs.append(_attachment_payload(*frame))
+                decoding += time.perf_counter() - decode_started
+            size += sum(len(blob) for blob in blobs)
+            _attach_blobs(response, blobs)
+        if timing is not None:
+            timing.decode += decoding
+        return response, size
+
+    def receive_full_response(self, sock, buffer_size=8192, timeout=RESPONSE_TIMEOUT):
+        """Receive the complete response, potentially in multiple chunks (legacy framing)"""
         chunks = []
-        # Use a consistent timeout value that matches the addon's timeout
-        sock.settimeout(15.0)  # Match the addon's timeout
+        timed_out = False
+        sock.settimeout(timeout)
         
         try:
             while True:
@@ -61,13 +584,17 @@ class RhinoConnection:
                         break
                     
                     chunks.append(chunk)
-                    
+
+                    # A JSON object can only be complete once a chunk ends with its closing brace
+                    if not chunk.rstrip().endswith(b"}"):
+                        continue
+
                     # Check if we've received a complete JSON object
                     try:
                         data = b''.join(chunks)
-                        json.loads(data.decode('utf-8'))
+                        JSON_CODEC.decode(data)
                         # If we get here, it parsed successfully
-                        logger.info(f"Received complete response ({len(data)} bytes)")
+                        logger.debug("Received complete response (%d bytes)", len(data))
                         return data
                     except json.JSONDecodeError:
                         # Incomplete JSON, continue receiving
@@ -75,12 +602,14 @@ class RhinoConnection:
                 except socket.timeout:
                     # If we hit a timeout during receiving, break the loop and try to use what we have
                     logger.warning("Socket timeout during chunked receive")
+                    timed_out = True
                     break
                 except (ConnectionError, BrokenPipeError, ConnectionResetError) as e:
                     logger.error(f"Socket connection error during receive: {str(e)}")
                     raise  # Re-raise to be handled by the caller
         except socket.timeout:
             logger.warning("Socket timeout during chunked receive")
+            timed_out = True
         except Exception as e:
             logger.error(f"Error during receive: {str(e)}")
             raise
@@ -89,62 +618,114 @@ class RhinoConnection:
         # Try to use what we have
         if chunks:
             data = b''.join(chunks)
-            logger.info(f"Returning data after receive completion ({len(data)} bytes)")
+            logger.debug("Returning data after receive completion (%d bytes)", len(data))
             try:
                 # Try to parse what we have
-                json.loads(data.decode('utf-8'))
+                JSON_CODEC.decode(data)
                 return data
             except json.JSONDecodeError:
                 # If we can't parse it, it's incomplete
+                if timed_out:
+                    raise socket.timeout("Timed out in the middle of a response")
                 raise Exception("Incomplete JSON response received")
+        elif timed_out:
+            raise socket.timeout("No data received before the deadline")
         else:
             raise Exception("No data received")
 
-    def send_command(self, command_type: str, params: Dict[str, Any] = {}) -> Dict[str, Any]:
-        """Send a command to Rhino and return the response"""
+    def send_command(
+        self, command_type: str, params: Dict[str, Any] = {}, timeout: Optional[float] = None
+    ) -> Dict[str, Any]:
+        """Send a command to Rhino and return the response.
+
+        timeout overrides the adaptive per-command deadline (seconds).
+        """
         if not self.sock and not self.connect():
             raise ConnectionError("Not connected to Rhino")
         
-        command = {
-            "type": command_type,
-            "params": params or {}
-        }
+        command = _build_command(command_type, params)
+        if timeout is None:
+            timeout = self.timeouts.timeout_for(command_type)
+        started = time.monotonic()
+        deadline = started + timeout
+        request_id = None
+        if FEATURE_REQUEST_IDS in self.features:
+            request_id = command["id"] = next(self._ids)
+        sent = received = 0
+        outcome = "error"
+        response = None
+        timing = CommandTiming()
+        object_cache.invalidate_for(command_type, params)
         
         try:
-            # Log the command being sent
-            logger.info(f"Sending command: {command_type} with params: {params}")
+            logger.debug("Sending command %s with params: %s", command_type, params)
 
             if self.sock is None:
                 raise Exception("Socket is not connected")
             
-            # Send the command
-            self.sock.sendall(json.dumps(command).encode('utf-8'))
-            logger.info(f"Command sent, waiting for response...")
-            
-            # Set a timeout for receiving - use the same timeout as in receive_full_response
-            self.sock.settimeout(15.0)  # Match the addon's timeout
-            
-            # Receive the response using the improved receive_full_response method
-            response_data = self.receive_full_response(self.sock)
-            logger.info(f"Received {len(response_data)} bytes of data")
-            
-            response = json.loads(response_data.decode('utf-8'))
-            logger.info(f"Response parsed, status: {response.get('status', 'unknown')}")
-            
-            if response.get("status") == "error":
-                logger.error(f"Rhino error: {response.get('message')}")
-                raise Exception(response.get("message", "Unknown error from Rhino"))
-            
-            return response.get("result", {})
+            self.sock.settimeout(timeout)
+
+            if self.framing == FRAMING_LENGTH_PREFIXED:
+                # Send the command and read back one frame of known size
+                phase_started = time.perf_counter()
+                frame = pack_message(self.codec.encode(command), self.compression, self.compression_threshold)
+                timing.encode = time.perf_counter() - phase_started
+                phase_started = time.perf_counter()
+                self.sock.sendall(frame)
+                timing.send = time.perf_counter() - phase_started
+                sent = len(frame)
+                while True:
+                    remaining = _remaining(deadline)
+                    if remaining <= 0:
+                        raise socket.timeout("Deadline passed while skipping stale replies")
+                    self.sock.settimeout(remaining)
+                    response, received = self.receive_reply(self.sock, timing)
+                    if request_id is None or response.get("id") == request_id:
+                        break
+                    # Reply to an earlier request that timed out on our side
+                    logger.warning(f"Discarding stale reply for request {response.get('id')}")
+            else:
+                # Send the command
+                phase_started = time.perf_counter()
+                payload = JSON_CODEC.encode(command)
+                timing.encode = time.perf_counter() - phase_started
+                phase_started = time.perf_counter()
+                self.sock.sendall(payload)
+                timing.send = time.perf_counter() - phase_started
+                sent = len(payload)
+
+                # Receive the response using the improved receive_full_response method
+                response_data = self.receive_full_response(self.sock, timeout=timeout)
+                received = len(response_data)
+                phase_started = time.perf_counter()
+                response = JSON_CODEC.decode(response_data)
+                timing.decode = time.perf_counter() - phase_started
+            self.timeouts.observe(command_type, time.monotonic() - started)
+            outcome = "rhino_error" if response.get("status") == "error" else "ok"
+            if "revision" in response:
+                object_cache.observe_revision(response["revision"])
+            logger.debug("Reply to %s: %s", command_type, response)
+            return _unwrap_response(response)
+        except RhinoError:
+            # Rhino answered; the connection itself is fine
+            raise
         except socket.timeout:
-            logger.error("Socket timeout while waiting for response from Rhino")
-            # Don't try to reconnect here - let the get_rhino_connection handle reconnection
-            # Just invalidate the current socket so it will be recreated next time
-            self.sock = None
-            raise Exception("Timeout waiting for Rhino response - try simplifying your request")
+            outcome = "timeout"
+            logger.error("Timed out after %.1fs waiting for Rhino to answer %s with params: %s",
+                         timeout, command_type, LogPreview(params))
+            self.timeouts.timed_out(command_type, timeout)
+            if request_id is None:
+                # A late reply would be read as the answer to the next command; close the socket
+                # so the pool replaces it
+                self.disconnect()
+            # With request ids the late reply is recognised and skipped, so the socket stays usable
+            raise RhinoTimeoutError(
+                f"Timeout after {timeout:.1f}s waiting for Rhino response to {command_type} - "
+                "try simplifying your request or pass a longer timeout"
+            )
         except (ConnectionError, BrokenPipeError, ConnectionResetError) as e:
             logger.error(f"Socket connection error: {str(e)}")
-            self.sock = None
+            self.disconnect()
             raise Exception(f"Connection to Rhino lost: {str(e)}")
         except json.JSONDecodeError as e:
             logger.error(f"Invalid JSON response from Rhino: {str(e)}")
@@ -154,9 +735,706 @@ class RhinoConnection:
             raise Exception(f"Invalid response from Rhino: {str(e)}")
         except Exception as e:
             logger.error(f"Error communicating with Rhino: {str(e)}")
-            # Don't try to reconnect here - let the get_rhino_connection handle reconnection
-            self.sock = None
+            # Don't try to reconnect here - the pool replaces closed connections
+            self.disconnect()
             raise Exception(f"Communication error with Rhino: {str(e)}")
+        finally:
+            # Again after the reply: fetches that ran while the command was in flight are not stored
+            object_cache.invalidate_for(command_type, params)
+            duration = time.monotonic() - started
+            command_log.record(command_type, duration, sent, received, outcome)
+            command_metrics.observe(command_type, outcome, duration, timing, sent, received)
+            trace = command_trace.get()
+            if trace is not None:
+                trace.append({"command": command_type, "outcome": outcome, "duration": duration,
+                              **timing.phases(duration), "sent_bytes": sent, "received_bytes": received})
+            if session_recorder is not None:
+                session_recorder.record(command, response, started, duration, sent, received, outcome)
+
+    def send_batch(
+        self, commands: List[Dict[str, Any]], stop_on_error: bool = True, timeout: Optional[float] = None
+    ) -> Dict[str, Any]:
+        """Run {type, params} commands in order and return their per-item results.
+
+        With the batch feature they travel as one request and Rhino runs them in one undo record.
+        Otherwise they are sent one after another with the same semantics. With stop_on_error,
+        the commands after the first failure are skipped. timeout covers the whole batch.
+        """
+        envelopes = _batch_commands(commands)
+        if not self.sock and not self.connect():
+            raise ConnectionError("Not connected to Rhino")
+        if timeout is None:
+            timeout = self.timeouts.batch_timeout_for([envelope["type"] for envelope in envelopes])
+        if FEATURE_BATCH in self.features:
+            return self.send_command("batch", {"commands": envelopes, "stop_on_error": stop_on_error}, timeout)
+
+        deadline = time.monotonic() + timeout
+        results: List[Dict[str, Any]] = []
+        stopped = False
+        for envelope in envelopes:
+            if stopped:
+                results.append(_batch_item(envelope["type"], skipped=True))
+                continue
+            try:
+                result = self.send_command(envelope["type"], envelope["params"], _remaining_or_expire(deadline, timeout))
+                results.append(_batch_item(envelope["type"], result))
+            except Exception as e:
+                results.append(_batch_item(envelope["type"], error=e))
+                # Past a timeout or a lost connection the state of Rhino is unknown; always stop
+                stopped = stop_on_error or not isinstance(e, RhinoError)
+        return _batch_result(results)
+
+def _build_command(command_type: str, params: Dict[str, Any] | None) -> Dict[str, Any]:
+    return {
+        "type": command_type,
+        "params": params or {}
+    }
+
+
+def _unwrap_response(response: Dict[str, Any]) -> Dict[str, Any]:
+    """Return the result of a decoded reply or raise RhinoError"""
+    if response.get("status") == "error":
+        logger.error("Rhino error: %s", LogPreview(response.get("message")))
+        raise RhinoError(response.get("message", "Unknown error from Rhino"))
+    return response.get("result", {})
+
+
+def _batch_commands(commands: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Validate send_batch input and return the {type, params} envelopes to send"""
+    envelopes = []
+    for index, command in enumerate(commands):
+        command_type = command.get("type") if isinstance(command, dict) else None
+        if not isinstance(command_type, str) or not command_type:
+            raise ValueError(f"Batch item {index} must be an object with a command type")
+        if command_type in UNBATCHABLE_COMMANDS:
+            raise ValueError(f"Batch item {index}: {command_type} cannot run inside a batch")
+        params = command.get("params") or {}
+        if not isinstance(params, dict):
+            raise ValueError(f"Batch item {index}: params must be an object")
+        envelopes.append(_build_command(command_type, params))
+    return envelopes
+
+
+def _batch_item(command_type: str, result: Optional[Dict[str, Any]] = None, error: Optional[Exception] = None,
+                skipped: bool = False) -> Dict[str, Any]:
+    if skipped:
+        return {"type": command_type, "status": "skipped"}
+    if error is not None:
+        return {"type": command_type, "status": "error", "message": str(error)}
+    return {"type": command_type, "status": "success", "result": result}
+
+
+def _batch_result(results: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Per-item results and counts, shaped like the plugin's batch reply"""
+    statuses = [item["status"] for item in results]
+    return {
+        "results": results,
+        "succeeded": statuses.count("success"),
+        "failed": statuses.count("error"),
+        "skipped": statuses.count("skipped"),
+    }
+
+
+@dataclass
+class AsyncRhinoConnection:
+    """asyncio-streams counterpart of RhinoConnection for use inside the MCP event loop.
+
+    Speaks the same wire protocol (including framing negotiation). When the plugin grants
+    request ids, commands are pipelined: up to max_in_flight requests share the connection
+    and a reader task routes each reply to the waiting caller by id. Otherwise requests on
+    one connection are serialised, but waiting for Rhino still does not block other tools.
+    """
+    host: str
+    port: int
+    reader: asyncio.StreamReader | None = None
+    writer: asyncio.StreamWriter | None = None
+    negotiate: bool = True
+    framing: str = FRAMING_LEGACY
+    features: frozenset = frozenset()
+    request_compression: bool = COMPRESSION_ENABLED
+    compression_threshold: int = COMPRESSION_THRESHOLD
+    compression: str | None = None
+    codec: Codec = JSON_CODEC
+    timeouts: AdaptiveTimeouts = field(default_factory=lambda: command_timeouts, repr=False)
+    max_in_flight: int = MAX_IN_FLIGHT
+    _lock: asyncio.Lock = field(default_factory=asyncio.Lock, repr=False)
+    _write_lock: asyncio.Lock = field(default_factory=asyncio.Lock, repr=False)
+    _ids: Iterator[int] = field(default_factory=lambda: itertools.count(1), repr=False)
+    _pending: Dict[int, asyncio.Future] = field(default_factory=dict, repr=False)
+    _reader_task: asyncio.Task | None = field(default=None, repr=False)
+    _in_flight: asyncio.Semaphore | None = field(default=None, repr=False)
+
+    @property
+    def connected(self) -> bool:
+        return self.writer is not None and not self.writer.is_closing()
+
+    @property
+    def pipelined(self) -> bool:
+        return self.framing == FRAMING_LENGTH_PREFIXED and FEATURE_REQUEST_IDS in self.features
+
+    async def connect(self) -> bool:
+        """Connect to the Rhino addon socket server"""
+        if self.connected:
+            return True
+
+        try:
+            self.reader, self.writer = await asyncio.open_connection(self.host, self.port)
+            logger.info(f"Connected to Rhino at {self.host}:{self.port}")
+        except Exception as e:
+            logger.error(f"Failed to connect to Rhino: {str(e)}")
+            self.reader = self.writer = None
+            return False
+
+        self.framing, self.features, self.compression = FRAMING_LEGACY, frozenset(), None
+        if self.negotiate and not await self._negotiate_framing():
+            # Same as RhinoConnection: never reuse a stream with an unanswered negotiation
+            await self.disconnect()
+            self.negotiate = False
+            return await self.connect()
+
+        if self.pipelined:
+            self._in_flight = asyncio.Semaphore(self.max_in_flight)
+            self._reader_task = asyncio.create_task(self._read_responses())
+        return True
+
+    async def disconnect(self):
+        """Disconnect from the Rhino addon"""
+        reader_task, self._reader_task = self._reader_task, None
+        if reader_task is not None and reader_task is not asyncio.current_task():
+            reader_task.cancel()
+        self._fail_pending(ConnectionError("Connection to Rhino closed"))
+
+        writer, self.reader, self.writer = self.writer, None, None
+        if writer is None:
+            return
+        try:
+            writer.close()
+            await writer.wait_closed()
+        except Exception as e:
+            logger.error(f"Error disconnecting from Rhino: {str(e)}")
+
+    def _fail_pending(self, error: Exception):
+        pending, self._pending = self._pending, {}
+        for future in pending.values():
+            if not future.done():
+                future.set_exception(error)
+
+    async def ping(self) -> bool:
+        """Round-trip a ping command; True if Rhino answered"""
+        try:
+            await self.send_command("ping")
+            return True
+        except RhinoError:
+            return True
+        except Exception:
+            return False
+
+    async def _negotiate_framing(self) -> bool:
+        try:
+            request = _negotiate_request(self.request_compression, self.compression_threshold)
+            self.writer.write(JSON_CODEC.encode(request))
+            await self.writer.drain()
+            response = JSON_CODEC.decode(await asyncio.wait_for(self._read_legacy(), NEGOTIATE_TIMEOUT))
+        except Exception as e:
+            logger.warning(f"Protocol negotiation failed, falling back to legacy framing: {str(e)}")
+            return False
+
+        self.framing, self.features, self.compression = _negotiated_options(response)
+        logger.info(
+            f"Using {self.framing} framing, features: {sorted(self.features)}, compression: {self.compression}, "
+            f"codec: {self.codec.name} ({self.codec.backend})"
+        )
+        return True
+
+    async def _read_legacy(self, buffer_size: int = 65536) -> bytes:
+        """Read one bare JSON document (legacy framing)"""
+        chunks = []
+        while True:
+            chunk = await self.reader.read(buffer_size)
+            if not chunk:
+                raise ConnectionError("Connection closed before receiving a complete response")
+            chunks.append(chunk)
+            if not chunk.rstrip().endswith(b"}"):
+                continue
+            data = b"".join(chunks)
+            try:
+                JSON_CODEC.decode(data)
+                return data
+            except json.JSONDecodeError:
+                continue
+
+    async def _read_frame(self) -> Tuple[int, bytes]:
+        header = await self.reader.readexactly(FRAME_HEADER.size)
+        length, flags = FRAME_HEADER.unpack(header)
+        if length > MAX_FRAME_SIZE:
+            raise ConnectionError(f"Frame too large ({length} bytes)")
+        return flags, await self.reader.readexactly(length)
+
+    async def _read_reply(self, timing: Optional[CommandTiming] = None) -> Tuple[Dict[str, Any], int]:
+        """Read one framed reply plus its attachment frames; return (response, payload bytes)"""
+        frame = await self._read_frame()
+        decode_started = time.perf_counter()
+        response_data = unpack_message(*frame)
+        response = self.codec.decode(response_data)
+        size = len(response_data)
+        decoding = time.perf_counter() - decode_started
+        if response.get("attachments"):
+            blobs = []
+            for _ in response["attachments"]:
+                frame = await self._read_frame()
+                decode_started = time.perf_counter()
+                blobs.append(_attachment_payload(*frame))
+                decoding += time.perf_counter() - decode_started
+            size += sum(len(blob) for blob in blobs)
+            _attach_blobs(response, blobs)
+        if timing is not None:
+            timing.decode += decoding
+        return response, size
+
+    def _pack(self, payload: bytes) -> bytes:
+        return pack_message(payload, self.compression, self.compression_threshold)
+
+    async def _read_responses(self):
+        """Reader task for pipelined connections: route every reply to its waiting request"""
+        try:
+            while True:
+                timing = CommandTiming()
+                response, size = await self._read_reply(timing)
+                future = self._pending.pop(response.get("id"), None)
+                if future is None or future.done():
+                    # The caller timed out or was cancelled; nothing is waiting for this reply
+                    logger.warning(f"Discarding reply for abandoned request {response.get('id')}")
+                    continue
+                future.set_result((response, size, timing.decode))
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.error(f"Socket connection error: {str(e)}")
+            self._reader_task = None
+            await self.disconnect()
+            # disconnect() already failed the waiters; this covers requests that raced with it
+            self._fail_pending(ConnectionError(str(e)))
+
+    async def _exchange(self, command: Dict[str, Any], timing: CommandTiming) -> Tuple[Dict[str, Any], int, int]:
+        """Send one command and read its reply; return (response, received bytes, sent bytes)"""
+        framed = self.framing == FRAMING_LENGTH_PREFIXED
+        phase_started = time.perf_counter()
+        payload = self._pack(self.codec.encode(command)) if framed else JSON_CODEC.encode(command)
+        timing.encode = time.perf_counter() - phase_started
+        phase_started = time.perf_counter()
+        self.writer.write(payload)
+        await self.writer.drain()
+        timing.send = time.perf_counter() - phase_started
+        if framed:
+            return (*await self._read_reply(timing), len(payload))
+        response_data = await self._read_legacy()
+        phase_started = time.perf_counter()
+        response = JSON_CODEC.decode(response_data)
+        timing.decode = time.perf_counter() - phase_started
+        return response, len(response_data), len(payload)
+
+    async def _request_pipelined(self, command: Dict[str, Any], timeout: float,
+                                 timing: CommandTiming) -> Tuple[Dict[str, Any], int, int]:
+        async with self._in_flight:
+            request_id = command["id"] = next(self._ids)
+            future = asyncio.get_running_loop().create_future()
+            self._pending[request_id] = future
+            try:
+                phase_started = time.perf_counter()
+                payload = self._pack(self.codec.encode(command))
+                timing.encode = time.perf_counter() - phase_started
+                async with self._write_lock:
+                    # Waiting for the write lock counts as send time
+                    self.writer.write(payload)
+                    await self.writer.drain()
+                timing.send = time.perf_counter() - phase_started - timing.encode
+                response, size, timing.decode = await asyncio.wait_for(future, timeout)
+                return response, size, len(payload)
+            finally:
+                self._pending.pop(request_id, None)
+
+    async def _request_serialised(self, command: Dict[str, Any], timeout: float,
+                                  timing: CommandTiming) -> Tuple[Dict[str, Any], int, int]:
+        deadline = time.monotonic() + timeout
+        async with self._lock:
+            # Time spent queueing behind other commands counts against the deadline
+            remaining = _remaining(deadline)
+            if remaining <= 0:
+                # Nothing was sent, so the stream is still in sync
+                raise RhinoTimeoutError(f"Timeout after {timeout:.1f}s waiting for the connection to be free")
+            return await asyncio.wait_for(self._exchange(command, timing), remaining)
+
+    async def send_command(
+        self, command_type: str, params: Dict[str, Any] | None = None, timeout: Optional[float] = None
+    ) -> Dict[str, Any]:
+        """Send a command to Rhino and await the response.
+
+        timeout overrides the adaptive per-command deadline (seconds).
+        """
+        if not self.connected:
+            async with self._lock:
+                if not self.connected and not await self.connect():
+                    raise ConnectionError("Not connected to Rhino")
+
+        command = _build_command(command_type, params)
+        if timeout is None:
+            timeout = self.timeouts.timeout_for(command_type)
+        started = time.monotonic()
+        pipelined = self.pipelined
+        received = sent = 0
+        outcome = "error"
+        response = None
+        timing = CommandTiming()
+        object_cache.invalidate_for(command_type, params)
+        try:
+            logger.debug("Sending command %s with params: %s", command_type, params)
+            if pipelined:
+                response, received, sent = await self._request_pipelined(command, timeout, timing)
+            else:
+                response, received, sent = await self._request_serialised(command, timeout, timing)
+            self.timeouts.observe(command_type, time.monotonic() - started)
+            outcome = "rhino_error" if response.get("status") == "error" else "ok"
+            if "revision" in response:
+                object_cache.observe_revision(response["revision"])
+            logger.debug("Reply to %s: %s", command_type, response)
+            return _unwrap_response(response)
+        except RhinoError:
+            raise
+        except RhinoTimeoutError:
+            outcome = "timeout"
+            raise
+        except asyncio.TimeoutError:
+            outcome = "timeout"
+            logger.error("Timed out after %.1fs waiting for Rhino to answer %s with params: %s",
+                         timeout, command_type, LogPreview(params))
+            self.timeouts.timed_out(command_type, timeout)
+            if not pipelined:
+                # A late reply would desynchronise the stream, so drop it
+                await self.disconnect()
+            raise RhinoTimeoutError(
+                f"Timeout after {timeout:.1f}s waiting for Rhino response to {command_type} - "
+                "try simplifying your request or pass a longer timeout"
+            )
+        except (ConnectionError, asyncio.IncompleteReadError) as e:
+            logger.error(f"Socket connection error: {str(e)}")
+            await self.disconnect()
+            raise Exception(f"Connection to Rhino lost: {str(e)}")
+        except json.JSONDecodeError as e:
+            logger.error(f"Invalid JSON response from Rhino: {str(e)}")
+            raise Exception(f"Invalid response from Rhino: {str(e)}")
+        except Exception as e:
+            logger.error(f"Error communicating with Rhino: {str(e)}")
+            await self.disconnect()
+            raise Exception(f"Communication error with Rhino: {str(e)}")
+        finally:
+            # Again after the reply: fetches that ran while the command was in flight are not stored
+            object_cache.invalidate_for(command_type, params)
+            duration = time.monotonic() - started
+            command_log.record(command_type, duration, sent, received, outcome)
+            command_metrics.observe(command_type, outcome, duration, timing, sent, received)
+            trace = command_trace.get()
+            if trace is not None:
+                trace.append({"command": command_type, "outcome": outcome, "duration": duration,
+                              **timing.phases(duration), "sent_bytes": sent, "received_bytes": received})
+            if session_recorder is not None:
+                session_recorder.record(command, response, started, duration, sent, received, outcome)
+
+    async def send_batch(
+        self, commands: List[Dict[str, Any]], stop_on_error: bool = True, timeout: Optional[float] = None
+    ) -> Dict[str, Any]:
+        """Run {type, params} commands in order and await their per-item results; see RhinoConnection.send_batch"""
+        envelopes = _batch_commands(commands)
+        if not self.connected:
+            async with self._lock:
+                if not self.connected and not await self.connect():
+                    raise ConnectionError("Not connected to Rhino")
+        if timeout is None:
+            timeout = self.timeouts.batch_timeout_for([envelope["type"] for envelope in envelopes])
+        if FEATURE_BATCH in self.features:
+            return await self.send_command("batch", {"commands": envelopes, "stop_on_error": stop_on_error}, timeout)
+
+        deadline = time.monotonic() + timeout
+        results: List[Dict[str, Any]] = []
+        stopped = False
+        for envelope in envelopes:
+            if stopped:
+                results.append(_batch_item(envelope["type"], skipped=True))
+                continue
+            try:
+                result = await self.send_command(envelope["type"], envelope["params"],
+                                                 _remaining_or_expire(deadline, timeout))
+                results.append(_batch_item(envelope["type"], result))
+            except Exception as e:
+                results.append(_batch_item(envelope["type"], error=e))
+                stopped = stop_on_error or not isinstance(e, RhinoError)
+        return _batch_result(results)
+
+
+@dataclass
+class _PoolSettings:
+    host: str = RHINO_HOST
+    port: int = RHINO_PORT
+    size: int = POOL_SIZE
+    idle_probe_after: float = IDLE_PROBE_AFTER
+    connect_retries: int = CONNECT_RETRIES
+    backoff: float = CONNECT_BACKOFF
+
+    def _backoff_delays(self) -> Iterator[float]:
+        delay = self.backoff
+        for _ in range(self.connect_retries - 1):
+            yield delay
+            delay *= 2
+
+
+@dataclass
+class RhinoConnectionPool(_PoolSettings):
+    """Bounded pool of RhinoConnection objects for blocking callers.
+
+    checkout() hands out an exclusive connection, re-validating idle ones (closed-socket
+    check always, ping after idle_probe_after seconds) and reconnecting with exponential
+    backoff. send_command() wraps a checkout/checkin so the pool can stand in for a connection.
+    """
+    _idle: List[Tuple[RhinoConnection, float]] = field(default_factory=list, repr=False)
+    _created: int = field(default=0, repr=False)
+    _available: threading.Condition = field(default_factory=threading.Condition, repr=False)
+
+    @property
+    def connected(self) -> bool:
+        with self._available:
+            return self._created > len(self._idle) or any(conn.sock for conn, _ in self._idle)
+
+    def _open(self) -> RhinoConnection:
+        delays = self._backoff_delays()
+        while True:
+            connection = RhinoConnection(host=self.host, port=self.port)
+            if connection.connect():
+                return connection
+            delay = next(delays, None)
+            if delay is None:
+                raise ConnectionError("Could not connect to Rhino. Make sure the Rhino addon is running.")
+            logger.warning(f"Retrying connection to Rhino in {delay:.1f}s")
+            time.sleep(delay)
+
+    def _healthy(self, connection: RhinoConnection, last_used: float) -> bool:
+        if connection.peer_closed():
+            return False
+        if time.monotonic() - last_used < self.idle_probe_after:
+            return True
+        return connection.ping()
+
+    def checkout(self, timeout: Optional[float] = None) -> RhinoConnection:
+        """Take a live connection out of the pool, opening one if needed"""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._available:
+            while not self._idle and self._created >= self.size:
+                remaining = _remaining(deadline)
+                if remaining is not None and remaining <= 0:
+                    raise RhinoTimeoutError(f"No Rhino connection became free within {timeout:.1f}s")
+                self._available.wait(remaining)
+            if self._idle:
+                connection, last_used = self._idle.pop()
+            else:
+                connection, last_used = None, 0.0
+                self._created += 1
+
+        try:
+            if connection is not None:
+                if self._healthy(connection, last_used):
+                    return connection
+                logger.info("Replacing stale Rhino connection")
+                connection.disconnect()
+            return self._open()
+        except BaseException:
+            with self._available:
+                self._created -= 1
+                self._available.notify()
+            raise
+
+    def checkin(self, connection: RhinoConnection):
+        """Return a connection; broken ones are dropped and replaced on demand"""
+        with self._available:
+            if connection.sock is not None:
+                self._idle.append((connection, time.monotonic()))
+            else:
+                self._created -= 1
+            self._available.notify()
+
+    @contextmanager
+    def connection(self, timeout: Optional[float] = None) -> Iterator[RhinoConnection]:
+        connection = self.checkout(timeout)
+        try:
+            yield connection
+        finally:
+            self.checkin(connection)
+
+    def send_command(
+        self, command_type: str, params: Dict[str, Any] = {}, timeout: Optional[float] = None
+    ) -> Dict[str, Any]:
+        """Send a command on a pooled connection and return the response.
+
+        An explicit timeout is a deadline for the whole call, including waiting for a free connection.
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self.connection(timeout) as connection:
+            return connection.send_command(command_type, params, _remaining_or_expire(deadline, timeout))
+
+    def send_batch(
+        self, commands: List[Dict[str, Any]], stop_on_error: bool = True, timeout: Optional[float] = None
+    ) -> Dict[str, Any]:
+        """Run a batch on one pooled connection; see RhinoConnection.send_batch"""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self.connection(timeout) as connection:
+            return connection.send_batch(commands, stop_on_error, _remaining_or_expire(deadline, timeout))
+
+    def close(self):
+        with self._available:
+            idle, self._idle = self._idle, []
+            self._created -= len(idle)
+        for connection, _ in idle:
+            connection.disconnect()
+
+
+@dataclass
+class AsyncRhinoConnectionPool(_PoolSettings):
+    """asyncio counterpart of RhinoConnectionPool handing out AsyncRhinoConnection objects.
+
+    A checked-out connection is exclusive to its holder, who may still pipeline several
+    commands on it. When a pipelined connection (the plugin echoes request ids) is checked
+    in and none is shared yet, it becomes the shared connection instead of going idle:
+    send_command() and send_batch() then pipeline on it concurrently without a checkout.
+    Connections to legacy peers are always checked out exclusively. checkout() hands out the
+    shared connection only when nothing is idle and the pool is full; callers already
+    waiting on it still get their replies, matched by id.
+    """
+    _idle: List[Tuple[AsyncRhinoConnection, float]] = field(default_factory=list, repr=False)
+    _shared: Optional[Tuple[AsyncRhinoConnection, float]] = field(default=None, repr=False)
+    _created: int = field(default=0, repr=False)
+    _available: asyncio.Condition = field(default_factory=asyncio.Condition, repr=False)
+
+    @property
+    def connected(self) -> bool:
+        idle = self._idle + ([self._shared] if self._shared is not None else [])
+        return self._created > len(idle) or any(conn.connected for conn, _ in idle)
+
+    async def _open(self) -> AsyncRhinoConnection:
+        delays = self._backoff_delays()
+        while True:
+            connection = AsyncRhinoConnection(host=self.host, port=self.port)
+            if await connection.connect():
+                return connection
+            delay = next(delays, None)
+            if delay is None:
+                raise ConnectionError("Could not connect to Rhino. Make sure the Rhino addon is running.")
+            logger.warning(f"Retrying connection to Rhino in {delay:.1f}s")
+            await asyncio.sleep(delay)
+
+    async def _healthy(self, connection: AsyncRhinoConnection, last_used: float) -> bool:
+        if not connection.connected or connection.reader.at_eof():
+            return False
+        if time.monotonic() - last_used < self.idle_probe_after:
+            return True
+        return await connection.ping()
+
+    async def checkout(self, timeout: Optional[float] = None) -> AsyncRhinoConnection:
+        """Take a live connection out of the pool, opening one if needed"""
+        async with self._available:
+            try:
+                await asyncio.wait_for(self._available.wait_for(
+                    lambda: self._idle or self._created < self.size or self._shared is not None), timeout
+                )
+            except asyncio.TimeoutError:
+                raise RhinoTimeoutError(f"No Rhino connection became free within {timeout:.1f}s") from None
+            if self._idle:
+                connection, last_used = self._idle.pop()
+            elif self._created < self.size:
+                connection, last_used = None, 0.0
+                self._created += 1
+            else:
+                (connection, last_used), self._shared = self._shared, None
+
+        try:
+            if connection is not None:
+                if await self._healthy(connection, last_used):
+                    return connection
+                logger.info("Replacing stale Rhino connection")
+                await connection.disconnect()
+            return await self._open()
+        except BaseException:
+            async with self._available:
+                self._created -= 1
+                self._available.notify()
+            raise
+
+    async def checkin(self, connection: AsyncRhinoConnection):
+        """Return a connection; broken ones are dropped and replaced on demand"""
+        async with self._available:
+            if not connection.connected:
+                self._created -= 1
+            elif connection.pipelined and self._shared is None:
+                self._shared = (connection, time.monotonic())
+            else:
+                self._idle.append((connection, time.monotonic()))
+            self._available.notify()
+
+    async def _shared_connection(self) -> Optional[AsyncRhinoConnection]:
+        """The shared pipelined connection if it is still open; a closed one is dropped"""
+        if self._shared is None:
+            return None
+        connection, _ = self._shared
+        if connection.connected and not connection.reader.at_eof():
+            return connection
+        async with self._available:
+            if self._shared is not None and self._shared[0] is connection:
+                self._shared = None
+                self._created -= 1
+                self._available.notify()
+        logger.info("Replacing stale Rhino connection")
+        await connection.disconnect()
+        return None
+
+    @asynccontextmanager
+    async def connection(self, timeout: Optional[float] = None) -> AsyncIterator[AsyncRhinoConnection]:
+        connection = await self.checkout(timeout)
+        try:
+            yield connection
+        finally:
+            await self.checkin(connection)
+
+    async def send_command(
+        self, command_type: str, params: Dict[str, Any] | None = None, timeout: Optional[float] = None
+    ) -> Dict[str, Any]:
+        """Send a command on the shared connection, or a pooled one, and await the response.
+
+        An explicit timeout is a deadline for the whole call, including waiting for a free connection.
+        """
+        shared = await self._shared_connection()
+        if shared is not None:
+            return await shared.send_command(command_type, params, timeout)
+        deadline = None if timeout is None else time.monotonic() + timeout
+        async with self.connection(timeout) as connection:
+            return await connection.send_command(command_type, params, _remaining_or_expire(deadline, timeout))
+
+    async def send_batch(
+        self, commands: List[Dict[str, Any]], stop_on_error: bool = True, timeout: Optional[float] = None
+    ) -> Dict[str, Any]:
+        """Run a batch on the shared connection or one pooled connection; see RhinoConnection.send_batch"""
+        shared = await self._shared_connection()
+        if shared is not None:
+            return await shared.send_batch(commands, stop_on_error, timeout)
+        deadline = None if timeout is None else time.monotonic() + timeout
+        async with self.connection(timeout) as connection:
+            return await connection.send_batch(commands, stop_on_error, _remaining_or_expire(deadline, timeout))
+
+    async def close(self):
+        async with self._available:
+            idle, self._idle = self._idle, []
+            if self._shared is not None:
+                idle.append(self._shared)
+                self._shared = None
+            self._created -= len(idle)
+        for connection, _ in idle:
+            await connection.disconnect()
+
 
 @asynccontextmanager
 async def server_lifespan(server: FastMCP) -> AsyncIterator[Dict[str, Any]]:
@@ -167,11 +1445,18 @@ async def server_lifespan(server: FastMCP) -> AsyncIterator[Dict[str, Any]]:
     try:
         # Just log that we're starting up
         logger.info("RhinoMCP server starting up")
+        if RECORD_PATH:
+            from rhinomcp.recording import start_recording
+            start_recording(RECORD_PATH)
+        if PROFILE_DIR:
+            from rhinomcp.profiling import start_profiling
+            start_profiling(PROFILE_DIR)
         
         # Try to connect to Rhino on startup to verify it's available
         try:
-            # This will initialize the global connection if needed
-            rhino = get_rhino_connection()
+            # Open (and keep) the first pooled connection
+            pool = await get_async_rhino_connection()
+            await pool.checkin(await pool.checkout())
             logger.info("Successfully connected to Rhino on startup")
         except Exception as e:
             logger.warning(f"Could not connect to Rhino on startup: {str(e)}")
@@ -180,49 +1465,93 @@ async def server_lifespan(server: FastMCP) -> AsyncIterator[Dict[str, Any]]:
         # Return an empty context - we're using the global connection
         yield {}
     finally:
-        # Clean up the global connection on shutdown
-        global _rhino_connection
-        if _rhino_connection:
+        # Clean up the global pools on shutdown
+        global _rhino_pool, _async_rhino_pool
+        if _async_rhino_pool:
             logger.info("Disconnecting from Rhino on shutdown")
-            _rhino_connection.disconnect()
-            _rhino_connection = None
+            await _async_rhino_pool.close()
+            _async_rhino_pool = None
+        if _rhino_pool:
+            _rhino_pool.close()
+            _rhino_pool = None
+        if session_recorder is not None:
+            from rhinomcp.recording import stop_recording
+            stop_recording()
+        if tool_profiler is not None:
+            from rhinomcp.profiling import stop_profiling
+            stop_profiling()
         logger.info("RhinoMCP server shut down")
 
+# rhinomcp.profiling.ToolProfiler while tool calls are being profiled
+tool_profiler = None
+
+
+class RhinoFastMCP(FastMCP):
+    """FastMCP with an opt-in profiling hook around every tool call"""
+
+    async def call_tool(self, name: str, arguments: Dict[str, Any]) -> Any:
+        profiler = tool_profiler
+        if profiler is not None and profiler.wants(name):
+            return await profiler.profile(name, arguments, super().call_tool)
+        return await super().call_tool(name, arguments)
+
+
 # Create the MCP server with lifespan support
-mcp = FastMCP(
+mcp = RhinoFastMCP(
     "RhinoMCP",
     lifespan=server_lifespan
 )
 
 # Resource endpoints
 
-# Global connection for resources (since resources can't access context)
-_rhino_connection = None
+# Global connection pools for resources (since resources can't access context)
+_rhino_pool: Optional[RhinoConnectionPool] = None
+# Event-loop pool used by the tools
+_async_rhino_pool: Optional[AsyncRhinoConnectionPool] = None
+
+# Bounded pool for blocking work that must not run on the event loop
+_blocking_executor = ThreadPoolExecutor(
+    max_workers=int(os.environ.get("RHINOMCP_BLOCKING_WORKERS", "4")),
+    thread_name_prefix="rhinomcp-blocking",
+)
+
+
+async def run_blocking(fn: Callable[..., T], *args: Any) -> T:
+    """Run a blocking callable on the bounded executor and await its result"""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_blocking_executor, fn, *args)
 
-def get_rhino_connection():
-    """Get or create a persistent Rhino connection"""
-    global _rhino_connection
+def get_rhino_connection() -> RhinoConnectionPool:
+    """Get the blocking Rhino connection pool (use it like a connection)"""
+    global _rhino_pool
 
-    # Create a new connection if needed
-    if _rhino_connection is None:
-        _rhino_connection = RhinoConnection(host="127.0.0.1", port=1999)
-        if not _rhino_connection.connect():
-            logger.error("Failed to connect to Rhino")
-            _rhino_connection = None
-            raise Exception("Could not connect to Rhino. Make sure the Rhino addon is running.")
-        logger.info("Created new persistent connection to Rhino")
+    if _rhino_pool is None:
+        _rhino_pool = RhinoConnectionPool()
+    return _rhino_pool
 
-    return _rhino_connection
+async def get_async_rhino_connection() -> AsyncRhinoConnectionPool:
+    """Get the event-loop Rhino connection pool (use it like a connection)"""
+    global _async_rhino_pool
+
+    if _async_rhino_pool is None:
+        _async_rhino_pool = AsyncRhinoConnectionPool()
+    return _async_rhino_pool
 
 def rhino_connected() -> bool:
     """Check if connected to Rhino"""
-    global _rhino_connection
-    return _rhino_connection is not None and _rhino_connection.sock is not None
+    if _async_rhino_pool is not None and _async_rhino_pool.connected:
+        return True
+    return _rhino_pool is not None and _rhino_pool.connected
 
-def send_to_rhino(command: Dict[str, Any]) -> Dict[str, Any]:
-    """Send a command to Rhino and return the result"""
+def send_to_rhino(command: Dict[str, Any], timeout: Optional[float] = None) -> Dict[str, Any]:
+    """Send a command to Rhino and return the result (blocking)"""
     rhino = get_rhino_connection()
-    return rhino.send_command(command.get("type", "unknown"), command.get("params", {}))
+    return rhino.send_command(command.get("type", "unknown"), command.get("params", {}), timeout)
+
+async def send_to_rhino_async(command: Dict[str, Any], timeout: Optional[float] = None) -> Dict[str, Any]:
+    """Send a command to Rhino and await the result"""
+    rhino = await get_async_rhino_connection()
+    return await rhino.send_command(command.get("type", "unknown"), command.get("params", {}), timeout)
 
 # Main execution
 def main():
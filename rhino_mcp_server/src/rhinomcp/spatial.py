@@ -0,0 +1,245 @@
+# Local R-tree over the inventory mirror for bbox, radius and nearest-neighbour queries
+"""Spatial queries over the mirrored document inventory, answered without a Rhino round trip.
+
+BoxTree is a static R-tree bulk-loaded with Sort-Tile-Recursive: leaves hold up to NODE_CAPACITY
+boxes, tiled along x, then y, then z, so sibling nodes overlap little. It supports the three bbox
+modes of get_document_info plus radius and k-nearest queries. Distances are measured from the query
+point to each object's world axis-aligned bounding box (0 inside it).
+
+SpatialIndex keeps a BoxTree over a DocumentMirror. After a sync it catches up from
+DocumentMirror.changes_since(): changed and deleted ids are masked out of the tree, and their current
+boxes go into a small overlay that is scanned linearly. The tree is rebuilt once the overlay grows
+past REBUILD_FRACTION of it.
+
+region_index() returns the index for the shared inventory mirror. It syncs the mirror (one
+get_document_info(since=...) round trip) only when it may be stale: a command that can change the
+document was sent since the last sync, or the plugin's revision has not been confirmed recently.
+Plugins without change tokens get a full walk on each of those syncs, but the index is still reused
+while neither happens. Plugins without revisions never have a current index, since edits made in
+Rhino could not be detected; query_region sends their queries to Rhino.
+"""
+import heapq
+import itertools
+import math
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+from rhinomcp.inventory import DocumentMirror, document_mirror
+from rhinomcp.server import AsyncRhinoConnectionPool, object_cache
+
+NODE_CAPACITY = 16
+REBUILD_MIN = 256  # Overlay size that always triggers a rebuild
+REBUILD_FRACTION = 0.125  # ... or this fraction of the tree, whichever is larger
+BBOX_MODES = ("intersects", "contains_center", "contained")
+# get_document_info's defaults, so query_region shares its mirror with all_pages=True
+INVENTORY_PARAMS: Dict[str, Any] = {
+    "detail": "inventory", "include_bbox": True, "max_geometry_points": 64, "bbox_mode": "intersects",
+}
+
+Box = Tuple[float, float, float, float, float, float]  # min x, y, z, max x, y, z
+
+
+def box_of(bbox: Any) -> Optional[Box]:
+    """[[min_x, min_y, min_z], [max_x, max_y, max_z]] as a Box (corners in any order); None if malformed"""
+    try:
+        (ax, ay, az), (bx, by, bz) = bbox
+        return (min(ax, bx), min(ay, by), min(az, bz), max(ax, bx), max(ay, by), max(az, bz))
+    except (TypeError, ValueError):
+        return None
+
+
+def _union(boxes: Iterable[Box]) -> Box:
+    boxes = list(boxes)
+    return (min(b[0] for b in boxes), min(b[1] for b in boxes), min(b[2] for b in boxes),
+            max(b[3] for b in boxes), max(b[4] for b in boxes), max(b[5] for b in boxes))
+
+
+def _intersects(a: Box, b: Box) -> bool:
+    return a[0] <= b[3] and a[3] >= b[0] and a[1] <= b[4] and a[4] >= b[1] and a[2] <= b[5] and a[5] >= b[2]
+
+
+def box_matches(query: Box, box: Box, mode: str) -> bool:
+    """The plugin's BboxMatches: inclusive bounds"""
+    if mode == "contained":
+        return (query[0] <= box[0] and box[3] <= query[3] and query[1] <= box[1] and box[4] <= query[4]
+                and query[2] <= box[2] and box[5] <= query[5])
+    if mode == "contains_center":
+        return all(query[i] <= (box[i] + box[i + 3]) / 2 <= query[i + 3] for i in range(3))
+    return _intersects(query, box)
+
+
+def box_distance2(point: Sequence[float], box: Box) -> float:
+    """Squared distance from point to the box (0 inside it)"""
+    x, y, z = point
+    dx = box[0] - x if x < box[0] else (x - box[3] if x > box[3] else 0.0)
+    dy = box[1] - y if y < box[1] else (y - box[4] if y > box[4] else 0.0)
+    dz = box[2] - z if z < box[2] else (z - box[5] if z > box[5] else 0.0)
+    return dx * dx + dy * dy + dz * dz
+
+
+def _center(box: Box, axis: int) -> float:
+    return box[axis] + box[axis + 3]
+
+
+def _tile(items: List[Tuple[Box, Any]], capacity: int) -> List[List[Tuple[Box, Any]]]:
+    """Sort-Tile-Recursive: group items into runs of at most capacity with little overlap"""
+    count = len(items)
+    if count <= capacity:
+        return [items]
+    groups = math.ceil(count / capacity)
+    slices = math.ceil(groups ** (1 / 3))
+    runs = []
+    items = sorted(items, key=lambda item: _center(item[0], 0))
+    slab_size = capacity * slices * slices
+    for x in range(0, count, slab_size):
+        slab = sorted(items[x:x + slab_size], key=lambda item: _center(item[0], 1))
+        strip_size = capacity * slices
+        for y in range(0, len(slab), strip_size):
+            strip = sorted(slab[y:y + strip_size], key=lambda item: _center(item[0], 2))
+            runs += [strip[z:z + capacity] for z in range(0, len(strip), capacity)]
+    return runs
+
+
+class BoxTree:
+    """Static R-tree over (box, value) items.
+
+    A node is (box, is_leaf, children); leaf children are (box, value) items.
+    """
+
+    def __init__(self, items: Iterable[Tuple[Box, Any]], capacity: int = NODE_CAPACITY):
+        level = [(_union(box for box, _ in run), True, run) for run in _tile(list(items), capacity) if run]
+        self.size = sum(len(node[2]) for node in level)
+        while len(level) > 1:
+            runs = _tile([(node[0], node) for node in level], capacity)
+            level = [(_union(box for box, _ in run), False, [node for _, node in run]) for run in runs]
+        self.root = level[0] if level else None
+
+    def __len__(self) -> int:
+        return self.size
+
+    def search(self, query: Box) -> List[Tuple[Box, Any]]:
+        """Items whose box intersects query"""
+        if self.root is None or not _intersects(query, self.root[0]):
+            return []
+        x0, y0, z0, x1, y1, z1 = query
+        result = []
+        stack = [self.root]
+        # Hot loop: children are tested before they are pushed, with the comparisons inlined
+        while stack:
+            _, is_leaf, children = stack.pop()
+            matches = [child for child in children
+                       if child[0][0] <= x1 and child[0][3] >= x0 and child[0][1] <= y1 and child[0][4] >= y0
+                       and child[0][2] <= z1 and child[0][5] >= z0]
+            if is_leaf:
+                result += matches
+            else:
+                stack += matches
+        return result
+
+    def nearest(self, point: Sequence[float]) -> Iterator[Tuple[float, Box, Any]]:
+        """Items by increasing box distance from point, as (squared distance, box, value)"""
+        if self.root is None:
+            return
+        counter = itertools.count()
+        push, pop = heapq.heappush, heapq.heappop
+        heap: List[Tuple[float, int, bool, Any]] = [(box_distance2(point, self.root[0]), next(counter), False, self.root)]
+        while heap:
+            distance2, _, is_item, entry = pop(heap)
+            if is_item:
+                yield distance2, entry[0], entry[1]
+                continue
+            _, is_leaf, children = entry
+            for child in children:
+                push(heap, (box_distance2(point, child[0]), next(counter), is_leaf, child))
+
+
+class SpatialIndex:
+    """A BoxTree over a DocumentMirror plus an overlay of the objects changed since it was built"""
+
+    def __init__(self):
+        self.tree = BoxTree(())
+        self.version = -1  # Mirror version the index reflects
+        self.masked: set = set()  # Ids whose tree entry is outdated
+        self.overlay: Dict[str, Box] = {}  # Current boxes of masked ids
+        self.rebuilds = 0
+
+    def update(self, mirror: DocumentMirror):
+        if self.version == mirror.version:
+            return
+        changes = mirror.changes_since(self.version) if self.version >= 0 else None
+        limit = max(REBUILD_MIN, REBUILD_FRACTION * len(self.tree))
+        if changes is None or len(self.overlay) + len(changes) > limit:
+            items = ((box_of(obj.get("bbox")), object_id) for object_id, obj in mirror.objects.items())
+            self.tree = BoxTree((box, object_id) for box, object_id in items if box is not None)
+            self.masked, self.overlay = set(), {}
+            self.rebuilds += 1
+        else:
+            for object_id in changes:
+                self.masked.add(object_id)
+                obj = mirror.objects.get(object_id)
+                box = box_of(obj.get("bbox")) if obj is not None else None
+                if box is not None:
+                    self.overlay[object_id] = box
+                else:
+                    self.overlay.pop(object_id, None)
+        self.version = mirror.version
+
+    def query_box(self, query: Box, mode: str = "intersects") -> List[str]:
+        """Ids matching a bbox query, in id order like get_document_info"""
+        masked = self.masked
+        found = self.tree.search(query)
+        if mode == "intersects":
+            ids = [object_id for _, object_id in found if object_id not in masked]
+        else:
+            ids = [object_id for box, object_id in found if object_id not in masked and box_matches(query, box, mode)]
+        ids += [object_id for object_id, box in self.overlay.items() if box_matches(query, box, mode)]
+        return sorted(ids)
+
+    def nearest(self, point: Sequence[float], k: Optional[int] = None,
+                radius: Optional[float] = None) -> List[Tuple[str, float]]:
+        """(id, distance) by increasing distance: the k nearest, those within radius, or both limits"""
+        limit2 = radius * radius if radius is not None else math.inf
+        overlay = sorted((box_distance2(point, box), object_id) for object_id, box in self.overlay.items())
+        overlay = [entry for entry in overlay if entry[0] <= limit2]
+        result: List[Tuple[str, float]] = []
+        position = 0
+        for distance2, _, object_id in self.tree.nearest(point):
+            if distance2 > limit2 or (k is not None and len(result) >= k):
+                break
+            if object_id in self.masked:
+                continue
+            while position < len(overlay) and overlay[position][0] <= distance2:
+                result.append((overlay[position][1], math.sqrt(overlay[position][0])))
+                position += 1
+            result.append((object_id, math.sqrt(distance2)))
+        result += [(object_id, math.sqrt(distance2)) for distance2, object_id in overlay[position:]]
+        return result[:k] if k is not None else result
+
+
+_index = SpatialIndex()
+_synced_epoch: Optional[int] = None  # object_cache.document_epoch when the mirror was last synced for queries
+
+
+def mirror_is_current(mirror: DocumentMirror) -> bool:
+    """The last sync succeeded, no command that can change the document was sent since, and the
+    plugin's revision (edits made in Rhino itself) was confirmed recently"""
+    return (bool(mirror.header) and _synced_epoch == object_cache.document_epoch
+            and object_cache.revision_current())
+
+
+async def region_index(rhino: AsyncRhinoConnectionPool, refresh: bool = False) \
+        -> Tuple[SpatialIndex, DocumentMirror, Optional[Dict[str, Any]]]:
+    """The index over the shared inventory mirror, synced first if it may be stale.
+
+    Returns the index, the mirror and the sync stats (None when the mirror was used as is).
+    """
+    global _synced_epoch
+    mirror = document_mirror(**INVENTORY_PARAMS)
+    await object_cache.revalidate(rhino)
+    stats = None
+    if refresh or not mirror_is_current(mirror):
+        epoch = object_cache.document_epoch
+        _synced_epoch = None  # A failed sync leaves the mirror half updated
+        stats = await mirror.sync(rhino)
+        _synced_epoch = epoch
+    _index.update(mirror)
+    return _index, mirror, stats
@@ -0,0 +1,116 @@
+from mcp.server.fastmcp import Context
+from rhinomcp.server import get_async_rhino_connection, mcp, logger
+from rhinomcp.arrays import parse_pattern
+from rhinomcp.chunking import progress_reporter, send_in_chunks
+from typing import Any, Dict, FrozenSet, List, Optional
+import uuid
+
+CURVE_PATH_POINTS = 256  # Points requested for a pattern curve; the path follows them as a polyline
+
+
+async def _curve_path(rhino, curve: str) -> List[List[float]]:
+    params = {"geometry_detail": "obb_pose", "include_world": True, "outline_max_points": CURVE_PATH_POINTS}
+    try:
+        params["id"] = str(uuid.UUID(curve))
+    except ValueError:
+        params["name"] = curve
+    info = await rhino.send_command("get_object_info", params)
+    geometry = info.get("geometry") or {}
+    points = geometry.get("world_points") or geometry.get("points")
+    if not points or len(points) < 2:
+        raise ValueError(f"Object {curve} has no curve points to follow")
+    return points
+
+
+@mcp.tool()
+async def array_objects(
+    ctx: Context,
+    pattern: Dict[str, Any],
+    ids: Optional[List[str]] = None,
+    names: Optional[List[str]] = None,
+) -> Dict[str, Any]:
+    """
+    Copy objects in a linear, grid, polar or along-curve array from one compact pattern, instead of
+    listing every copy in copy_objects. Thousands of copies are sent to Rhino in chunks.
+
+    Parameters:
+    - ids / names: the source objects (at least one). Every instance copies all of them.
+    - pattern: {"kind": ..., ...}. Counts include the original, which stays in place (index 0).
+      - linear: count, spacing [dx, dy, dz] between neighbours
+      - grid: counts [nx, ny] or [nx, ny, nz], spacing [sx, sy] or [sx, sy, sz]
+      - polar: count, center [x, y, z], axis (default [0, 0, 1]), angle in degrees (default 360).
+        Copies turn about the axis; a full turn spreads them evenly, a smaller angle puts the last one at angle.
+      - curve: count, curve (id or name of a curve) or path [[x, y, z], ...]; copies are spread evenly by
+        length from the path start to its end. orient (default true) turns them with the path tangent.
+      - any kind: jitter [jx, jy, jz] adds a random offset within +-j per axis; seed (default 0) makes it repeatable.
+
+    Returns:
+    - instances, sources, copied: counts.
+    - ids: one entry per copy, instance by instance and in source order within an instance, so
+      ids[(i - 1) * sources + j] is the copy of source j at instance i. null where that copy failed or
+      was not sent.
+    - error / not_sent: set when a chunk failed; the copies made in other chunks are kept and listed.
+
+    Example: a 40 x 50 grid of columns 6 apart:
+    {"ids": ["<column id>"], "pattern": {"kind": "grid", "counts": [40, 50], "spacing": [6, 6]}}
+    """
+    try:
+        sources: List[Dict[str, str]] = [{"id": str(i)} for i in ids or []] + [{"name": str(n)} for n in names or []]
+        if not sources:
+            return {"error": "ids or names must list at least one source object"}
+
+        # Get the global connection
+        rhino = await get_async_rhino_connection()
+        path = None
+        if isinstance(pattern, dict) and pattern.get("kind") == "curve" and pattern.get("path") is None:
+            if not pattern.get("curve"):
+                return {"error": "pattern.curve or pattern.path is required for a curve array"}
+            path = await _curve_path(rhino, str(pattern["curve"]))
+        array = parse_pattern(pattern, path)
+        rows = (array.count - 1) * len(sources)
+        if rows <= 0:
+            return {"error": "pattern has no copies; counts include the original"}
+
+        def make_params(start: int, end: int, features: FrozenSet[str]) -> Dict[str, Any]:
+            first = 1 + start // len(sources)
+            placements = array.placements(first, 2 + (end - 1) // len(sources))
+            entries = []
+            for row in range(start, end):
+                translation, rotation, pivot = placements[1 + row // len(sources) - first]
+                entry = {**sources[row % len(sources)], "translation": translation}
+                if rotation is not None:
+                    entry["rotation_matrix"] = rotation
+                    entry["pivot"] = pivot
+                entries.append(entry)
+            return {"objects": entries}
+
+        row_size = 320 if array.kind == "polar" or (array.kind == "curve" and array.orient) else 100
+
+        def size_of(row: int) -> int:
+            return row_size
+
+        outcomes = await send_in_chunks(rhino, "copy_objects", range(rows), make_params,
+                                        progress_reporter(ctx, "Copied"), size_of)
+
+        copied_ids: List[Optional[str]] = [None] * rows
+        copied = 0
+        response: Dict[str, Any] = {"instances": array.count, "sources": len(sources)}
+        for outcome in outcomes:
+            if outcome.error is not None:
+                response["error"] = outcome.error
+                continue
+            copied += int(outcome.result.get("copied") or 0)
+            chunk_ids = outcome.result.get("ids")
+            # The plugin lists one id per entry; anything else cannot be matched to rows
+            if isinstance(chunk_ids, list) and len(chunk_ids) == outcome.end - outcome.start:
+                copied_ids[outcome.start:outcome.end] = chunk_ids
+        not_sent = rows - (outcomes[-1].end if outcomes else 0)
+        response.update({"copied": copied, "ids": copied_ids})
+        if copied and not any(copied_ids):
+            response["ids_unavailable"] = "This Rhino plugin does not report the ids of copies"
+        if not_sent:
+            response["not_sent"] = not_sent
+        return response
+    except Exception as e:
+        logger.error(f"Error arraying objects: {str(e)}")
+        return {"error": str(e)}
@@ -0,0 +1,65 @@
+from mcp.server.fastmcp import Context, Image
+from rhinomcp.server import get_async_rhino_connection, mcp, logger, run_blocking
+from typing import Any, List, Dict
+import base64
+import json
+
+MAX_BATCH_COMMANDS = 500
+
+
+@mcp.tool()
+async def batch(
+    ctx: Context,
+    commands: List[Dict[str, Any]],
+    stop_on_error: bool = True,
+) -> Any:
+    """
+    Run several Rhino commands in order in a single round trip, e.g. create, modify, move to a layer,
+    set a material and capture the view. Rhino runs them together as one undo step.
+
+    Parameters:
+    - commands: List of {"type": command, "params": {...}}, at most 500. The type is a plugin command
+      name, with the params it expects. These are mostly the arguments of the tool with the same name:
+      create_object, copy_objects, delete_objects, modify_object(s), rotate_object(s),
+      reset_object(s)_pose, rebase_object(s)_pose, create_layer, delete_layer, rename_layer,
+      move_objects_to_layer, create_material, set_object_material, select_objects_by_filter,
+      deselect_all, zoom_to_objects, capture_view, get_document_info, get_object(s)_info, run_command.
+      create_objects takes the objects keyed by input index, {"0": ObjectCreateSpec, "1": ...}, and its
+      result uses the same keys; names may repeat. Plugins with the columnar_create feature also take the
+      columnar form {"format": "columnar", "templates", "template", "names", "translations", ...} of the
+      create_objects tool's columns, replying {"ids": [...], "errors": {row: message}}.
+      open_file and close_file cannot be batched.
+    - stop_on_error: If true (default), the commands after the first failure are skipped. If false,
+      every command runs and failures are reported per item.
+
+    Returns:
+    - results: one entry per command, in order: {"type", "status": "success", "result"},
+      {"type", "status": "error", "message"} or {"type", "status": "skipped"}.
+    - succeeded / failed / skipped: counts.
+    Images from capture_view are returned as image content. Their result has "image" (the index of
+    the image) in place of the PNG data.
+    """
+    try:
+        if not commands:
+            return {"error": "commands must be a non-empty list"}
+        if len(commands) > MAX_BATCH_COMMANDS:
+            return {"error": f"At most {MAX_BATCH_COMMANDS} commands per batch"}
+        rhino = await get_async_rhino_connection()
+        result = await rhino.send_batch(commands, stop_on_error)
+
+        images = []
+        for item in result.get("results", []):
+            png_data = (item.get("result") or {}).get("png_base64") if item.get("type") == "capture_view" else None
+            if png_data:
+                data = png_data if isinstance(png_data, (bytes, bytearray, memoryview)) \
+                    else await run_blocking(base64.b64decode, png_data)
+                metadata = {key: value for key, value in item["result"].items() if key != "png_base64"}
+                item["result"] = {**metadata, "image": len(images)}
+                images.append(Image(data=bytes(data), format="png"))
+        if not images:
+            return result
+        return [*images, json.dumps(result, separators=(",", ":"))]
+    except Exception as e:
+        logger.error(f"Error running batch: {str(e)}")
+        return {"error": str(e)}
+
@@ -1,10 +1,10 @@
 from mcp.server.fastmcp import Context
-from rhinomcp.server import get_rhino_connection, mcp, logger
+from rhinomcp.server import get_async_rhino_connection, mcp, logger
 from typing import Any, Dict
 
 
 @mcp.tool()
-def close_file(
+async def close_file(
     ctx: Context,
     save_changes: bool = False,
     save_path: str = None,
@@ -17,12 +17,12 @@ def close_file(
     - save_path: Optional Save As path when save_changes is True.
     """
     try:
-        rhino = get_rhino_connection()
+        rhino = await get_async_rhino_connection()
         command_params = {"save_changes": save_changes}
         if save_path is not None:
             command_params["save_path"] = save_path
 
-        result = rhino.send_command("close_file", command_params)
+        result = await rhino.send_command("close_file", command_params)
         return result
     except Exception as e:
         logger.error(f"Error closing file: {str(e)}")
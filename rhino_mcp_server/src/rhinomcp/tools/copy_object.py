@@ -1,10 +1,10 @@
 from mcp.server.fastmcp import Context
-from rhinomcp.server import get_rhino_connection, mcp, logger
+from rhinomcp.server import get_async_rhino_connection, mcp, logger
 from typing import Any, Dict, List
 
 
 @mcp.tool()
-def copy_object(
+async def copy_object(
     ctx: Context,
     id: str = None,
     translation: List[float] = None
@@ -17,7 +17,7 @@ def copy_object(
     - translation: Optional [x, y, z] translation vector for the copy
     """
     try:
-        rhino = get_rhino_connection()
+        rhino = await get_async_rhino_connection()
 
         params: Dict[str, Any] = {}
         if id is not None:
@@ -25,7 +25,7 @@ def copy_object(
         if translation is not None:
             params["translation"] = translation
 
-        result = rhino.send_command("copy_object", params)
+        result = await rhino.send_command("copy_object", params)
         return f"Copied object: {result['name']}"
     except Exception as e:
         logger.error(f"Error copying object: {str(e)}")
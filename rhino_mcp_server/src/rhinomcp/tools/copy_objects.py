@@ -1,10 +1,10 @@
 from mcp.server.fastmcp import Context
-from rhinomcp.server import get_rhino_connection, mcp, logger
+from rhinomcp.server import get_async_rhino_connection, mcp, logger
 from typing import Any, Dict, List
 
 
 @mcp.tool()
-def copy_objects(
+async def copy_objects(
     ctx: Context,
     objects: List[Dict[str, Any]]
 ) -> str:
@@ -27,9 +27,9 @@ def copy_objects(
             if "id" not in entry and "name" not in entry:
                 return f"Error copying objects: objects[{index}] requires 'id' or 'name'"
 
-        rhino = get_rhino_connection()
+        rhino = await get_async_rhino_connection()
         command_params: Dict[str, Any] = {"objects": objects}
-        result = rhino.send_command("copy_objects", command_params)
+        result = await rhino.send_command("copy_objects", command_params)
         return f"Copied {result['copied']} objects"
     except Exception as e:
         logger.error(f"Error copying objects: {str(e)}")
@@ -1,10 +1,11 @@
 from mcp.server.fastmcp import Context
 import json
-from rhinomcp.server import get_rhino_connection, mcp, logger
+from rhinomcp.server import get_async_rhino_connection, mcp, logger
+from rhinomcp.transforms import normalize_transform
 from typing import Any, List, Dict
 
 @mcp.tool()
-def create_object(
+async def create_object(
     ctx: Context,
     type: str = "BOX",
     name: str = None,
@@ -108,7 +109,7 @@ def create_object(
     """
     try:
         # Get the global connection
-        rhino = get_rhino_connection()
+        rhino = await get_async_rhino_connection()
 
         command_params = {
             "type": type,
@@ -124,9 +125,10 @@ def create_object(
 
         if name: command_params["name"] = name
         if color: command_params["color"] = color
+        command_params = normalize_transform(command_params)
 
         # Create the object
-        result = result = rhino.send_command("create_object", command_params)  
+        result = result = await rhino.send_command("create_object", command_params)  
         
         return f"Created {type} object: {result['name']}"
     except Exception as e:
@@ -1,22 +1,27 @@
 from mcp.server.fastmcp import Context
-from rhinomcp.server import get_rhino_connection, mcp, logger
-from typing import Any, List, Dict
+from rhinomcp.server import FEATURE_COLUMNAR_CREATE, get_async_rhino_connection, mcp, logger
+from rhinomcp.chunking import progress_reporter, send_in_chunks
+from rhinomcp.columnar import columnar_chunk, columnar_count, columnar_row_size, expand_columnar
+from rhinomcp.transforms import normalize_transforms
+from typing import Any, List, Dict, FrozenSet, Optional
 
 
 @mcp.tool()
-def create_objects(
+async def create_objects(
     ctx: Context,
-    objects: List[Dict[str, Any]]
-) -> str:
+    objects: Optional[List[Dict[str, Any]]] = None,
+    columns: Optional[Dict[str, Any]] = None,
+) -> Dict[str, Any]:
     """
-    Create multiple objects at once in the Rhino document.
+    Create multiple objects at once in the Rhino document. Any number of objects can be passed in one
+    call: large lists are sent to Rhino in chunks automatically, with progress reported as they go.
     
     Parameters:
-    - objects: List[ObjectCreateSpec]
+    - objects: List[ObjectCreateSpec] (or use columns)
       ObjectCreateSpec schema:
       - type: required string
       - params: required dictionary
-      - name: optional string (recommended for readable output keys)
+      - name: optional string (names need not be unique)
       - color: optional [r, g, b]
       - translation: optional [x, y, z]
       - rotation_matrix: optional 3x3 matrix
@@ -31,8 +36,21 @@ def create_objects(
     - rotation: Optional [x, y, z] rotation in radians
     - scale: Optional [x, y, z] scale factors
 
+    - columns: the same objects in compact columnar form, for many similar objects (e.g. 10k bricks).
+      Pass either objects or columns. Every column is optional, but those given must agree in length:
+      - templates: required list of shared ObjectCreateSpec parts (type, params, color, rotation_matrix, scale)
+      - template: template index per object (default: every object uses templates[0])
+      - types: type per object, overriding the template's
+      - names: name (or null) per object
+      - translations: flat [x0, y0, z0, x1, y1, z1, ...], 3 numbers per object
+      - colors: flat [r0, g0, b0, r1, ...], 3 numbers per object
+      - count: number of objects, only needed when no per-object column is given
+
     Returns:
-    A message indicating the created objects.
+    - created / failed: counts.
+    - ids: object id per input object, in input order (null where it failed or was not sent).
+    - errors: {input index: message} of the objects that failed, if any.
+    - not_sent: number of objects not sent because an earlier chunk failed as a whole.
     
     Examples of params:
     [
@@ -75,28 +93,84 @@ def create_objects(
             "scale": [1, 1, 1]
         }
     ]
+
+    Example of columns, three bricks in a row and a named sphere:
+    {
+        "templates": [
+            {"type": "BOX", "params": {"width": 2, "length": 1, "height": 0.5}, "color": [180, 60, 40]},
+            {"type": "SPHERE", "params": {"radius": 1.0}}
+        ],
+        "template": [0, 0, 0, 1],
+        "names": [null, null, null, "Ball"],
+        "translations": [0, 0, 0, 2, 0, 0, 4, 0, 0, 0, 3, 1]
+    }
     """
     try:
-        if not objects:
-            return "Error creating objects: objects must be a non-empty list"
+        if (objects is None) == (columns is None):
+            return {"error": "Pass either objects or columns"}
+        if columns is not None:
+            count = columnar_count(columns)
+            columns = {**columns, "templates": normalize_transforms(columns["templates"], "columns.templates")}
+
+            def make_params(start: int, end: int, features: FrozenSet[str]) -> Dict[str, Any]:
+                if FEATURE_COLUMNAR_CREATE in features:
+                    return columnar_chunk(columns, start, end)
+                return expand_columnar(columns, start, end)
+
+            def size_of(index: int) -> int:
+                return columnar_row_size(columns, index)
+            items: Any = range(count)
+        else:
+            if not objects:
+                return {"error": "objects must be a non-empty list"}
+            for index, obj in enumerate(objects):
+                if not isinstance(obj, dict):
+                    return {"error": f"objects[{index}] must be a dictionary"}
+                if "type" not in obj:
+                    return {"error": f"objects[{index}].type is required"}
+                if "params" not in obj or not isinstance(obj["params"], dict):
+                    return {"error": f"objects[{index}].params must be a dictionary"}
+            objects = normalize_transforms(objects)
+
+            # Keyed by input index: names may repeat and must not overwrite each other
+            def make_params(start: int, end: int, features: FrozenSet[str]) -> Dict[str, Any]:
+                return {str(index): objects[index] for index in range(start, end)}
+            items = objects
+            size_of = None
 
         # Get the global connection
-        rhino = get_rhino_connection()
-        command_params = {}
-        for index, obj in enumerate(objects):
-            if not isinstance(obj, dict):
-                return f"Error creating objects: objects[{index}] must be a dictionary"
-            if "type" not in obj:
-                return f"Error creating objects: objects[{index}].type is required"
-            if "params" not in obj or not isinstance(obj["params"], dict):
-                return f"Error creating objects: objects[{index}].params must be a dictionary"
+        rhino = await get_async_rhino_connection()
+        outcomes = await send_in_chunks(rhino, "create_objects", items, make_params,
+                                        progress_reporter(ctx, "Created"), size_of)
+
+        ids: List[Optional[str]] = [None] * len(items)
+        errors: Dict[str, str] = {}
+        for outcome in outcomes:
+            result = outcome.result or {}
+            if outcome.error is not None:
+                # The whole chunk failed; Rhino may still have created some of it before a timeout
+                errors.update((str(index), outcome.error) for index in range(outcome.start, outcome.end))
+            elif isinstance(result.get("ids"), list):
+                # Columnar reply: ids and errors are relative to the chunk
+                for offset, object_id in enumerate(result.get("ids") or []):
+                    ids[outcome.start + offset] = object_id
+                for offset, message in (result.get("errors") or {}).items():
+                    errors[str(outcome.start + int(offset))] = str(message)
+            else:
+                for key, entry in result.items():
+                    if isinstance(entry, dict) and "error" in entry:
+                        errors[key] = str(entry["error"])
+                    else:
+                        ids[int(key)] = entry.get("id") if isinstance(entry, dict) else entry
+        not_sent = len(items) - (outcomes[-1].end if outcomes else 0)
 
-            key = str(obj.get("name", f"object_{index}"))
-            command_params[key] = obj
-        result = rhino.send_command("create_objects", command_params)
-  
-        
-        return f"Created {len(result)} objects"
+        response: Dict[str, Any] = {"created": sum(1 for object_id in ids if object_id), "failed": len(errors),
+                                    "ids": ids}
+        if errors:
+            response["errors"] = errors
+        if not_sent:
+            response["not_sent"] = not_sent
+        return response
     except Exception as e:
-        logger.error(f"Error creating object: {str(e)}")
-        return f"Error creating object: {str(e)}"
+        logger.error(f"Error creating objects: {str(e)}")
+        return {"error": str(e)}
@@ -1,10 +1,10 @@
 from mcp.server.fastmcp import Context
-from rhinomcp.server import get_rhino_connection, mcp, logger
+from rhinomcp.server import get_async_rhino_connection, mcp, logger
 from typing import List
 
 
 @mcp.tool()
-def delete_objects(
+async def delete_objects(
     ctx: Context,
     ids: List[str] = None,
     names: List[str] = None,
@@ -19,7 +19,7 @@ def delete_objects(
     - confirm: Required boolean, must be True to proceed
     """
     try:
-        rhino = get_rhino_connection()
+        rhino = await get_async_rhino_connection()
 
         if not confirm:
             return "Error deleting objects: confirm=true is required"
@@ -30,7 +30,7 @@ def delete_objects(
         if names:
             command_params["names"] = names
 
-        result = rhino.send_command("delete_objects", command_params)
+        result = await rhino.send_command("delete_objects", command_params)
         return f"Deleted {result['count']} objects"
     except Exception as e:
         logger.error(f"Error deleting objects: {str(e)}")
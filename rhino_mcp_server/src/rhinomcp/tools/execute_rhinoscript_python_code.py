@@ -1,11 +1,11 @@
 from mcp.server.fastmcp import Context
 import json
-from rhinomcp.server import get_rhino_connection, mcp, logger
+from rhinomcp.server import get_async_rhino_connection, mcp, logger
 from typing import Any, List, Dict
 
 
 # @mcp.tool()
-def execute_rhinoscript_python_code(ctx: Context, code: str) -> Dict[str, Any]:
+async def execute_rhinoscript_python_code(ctx: Context, code: str) -> Dict[str, Any]:
     """
     Execute arbitrary RhinoScript code in Rhino.
     
@@ -32,9 +32,9 @@ def execute_rhinoscript_python_code(ctx: Context, code: str) -> Dict[str, Any]:
     """
     try:
         # Get the global connection
-        rhino = get_rhino_connection()
+        rhino = await get_async_rhino_connection()
         
-        return rhino.send_command("execute_rhinoscript_python_code", {"code": code})
+        return await rhino.send_command("execute_rhinoscript_python_code", {"code": code})
 
     except Exception as e:
         logger.error(f"Error executing code: {str(e)}")
@@ -1,10 +1,10 @@
 from mcp.server.fastmcp import Context
-from rhinomcp.server import get_rhino_connection, mcp, logger
+from rhinomcp.server import get_async_rhino_connection, mcp, logger
 from typing import Dict, Any
 
 
 @mcp.tool()
-def get_connectivity_graph(
+async def get_connectivity_graph(
     ctx: Context
 ) -> Dict[str, Any]:
     """
@@ -20,8 +20,8 @@ def get_connectivity_graph(
     - tolerance: tolerance used by graph computation
     """
     try:
-        rhino = get_rhino_connection()
-        return rhino.send_command("get_connectivity_graph", {})
+        rhino = await get_async_rhino_connection()
+        return await rhino.send_command("get_connectivity_graph", {})
     except Exception as e:
         logger.error(f"Error getting connectivity graph: {str(e)}")
         return {"error": str(e)}
@@ -1,9 +1,10 @@
 from mcp.server.fastmcp import Context
-from rhinomcp import get_rhino_connection, mcp, logger
+from rhinomcp import get_async_rhino_connection, mcp, logger
+from rhinomcp.inventory import aggregate_document_inventory
 from typing import Any, Dict, List, Optional
 
 @mcp.tool()
-def get_document_info(
+async def get_document_info(
     ctx: Context,
     detail: str = "inventory",
     limit: int = 100,
@@ -12,6 +13,8 @@ def get_document_info(
     max_geometry_points: int = 64,
     bbox: Optional[List[List[float]]] = None,
     bbox_mode: str = "intersects",
+    all_pages: bool = False,
+    since: Optional[str] = None,
 ) -> Dict[str, Any]:
     """
     Get information about the current Rhino document.
@@ -26,20 +29,29 @@ def get_document_info(
     - bbox: Optional world axis-aligned bounding box filter:
       [[min_x, min_y, min_z], [max_x, max_y, max_z]].
     - bbox_mode: Spatial filter mode: "intersects", "contains_center", or "contained".
+    - all_pages: Walk every page server-side and return whole-document counts per type and layer,
+      the overall bbox, and the first `limit` objects as a sample (offset is ignored). Listings of up to
+      RHINOMCP_MIRROR_MAX_OBJECTS objects (default 100000) are mirrored server-side, so repeated calls
+      only fetch the objects changed since the previous one; larger ones are streamed on every call.
+    - since: change_token from an earlier reply. Only objects added or changed after it are listed,
+      and the first page (offset 0) has removed_ids: objects deleted since, or no longer matching bbox.
+      since_expired=true means the token could not be used and the reply is the full listing.
     """
     try:
-        rhino = get_rhino_connection()
+        rhino = await get_async_rhino_connection()
         params: Dict[str, Any] = {
             "detail": detail,
-            "limit": limit,
-            "offset": offset,
             "include_bbox": include_bbox,
             "max_geometry_points": max_geometry_points,
             "bbox_mode": bbox_mode,
         }
         if bbox is not None:
             params["bbox"] = bbox
-        return rhino.send_command("get_document_info", params)
+        if all_pages:
+            return await aggregate_document_inventory(rhino, sample_size=limit, **params)
+        if since:
+            params["since"] = since
+        return await rhino.send_command("get_document_info", {**params, "limit": limit, "offset": offset})
     except Exception as e:
         logger.error(f"Error getting document info from Rhino: {str(e)}")
         return {"error": str(e)}
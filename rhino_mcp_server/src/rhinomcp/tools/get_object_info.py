@@ -1,9 +1,10 @@
 from mcp.server.fastmcp import Context
-from rhinomcp import get_rhino_connection, mcp, logger
+from rhinomcp import get_async_rhino_connection, mcp, logger
+from rhinomcp.server import object_cache
 from typing import Dict, Any
 
 @mcp.tool()
-def get_object_info(
+async def get_object_info(
     ctx: Context,
     id: str = None,
     name: str = None,
@@ -50,8 +51,18 @@ def get_object_info(
     - include_world: Include world-space duplicates such as world points and world corners.
     """
     try:
-        rhino = get_rhino_connection()
-        return rhino.send_command(
+        # Normalised the way get_objects_info does, so equivalent calls share cache entries
+        geometry_detail = str(geometry_detail or "obb_pose").strip().lower()
+        include_world = bool(include_world)
+        rhino = await get_async_rhino_connection()
+        if id:
+            # Repeated lookups by id are answered from the cache until the object changes
+            await object_cache.revalidate(rhino)
+            cached = object_cache.get(object_cache.key(id, geometry_detail, include_world))
+            if cached is not None:
+                return cached
+        epoch = object_cache.epoch
+        result = await rhino.send_command(
             "get_object_info",
             {
                 "id": id,
@@ -60,6 +71,9 @@ def get_object_info(
                 "include_world": include_world,
             }
         )
+        if result.get("id"):
+            object_cache.put(object_cache.key(result["id"], geometry_detail, include_world), result, epoch)
+        return result
 
     except Exception as e:
         logger.error(f"Error getting object info from Rhino: {str(e)}")
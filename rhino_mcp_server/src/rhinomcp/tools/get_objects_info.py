@@ -1,16 +1,21 @@
 from mcp.server.fastmcp import Context
-from rhinomcp.server import get_rhino_connection, mcp, logger
-from typing import Dict, Any, List
+from rhinomcp.server import get_async_rhino_connection, mcp, logger, object_cache
+from typing import Dict, Any, List, Optional, Tuple
+
+# Top-level keys of the plugin's last reply per (geometry_detail, include_world), minus objects,
+# so a reply served wholly from the cache has the same shape as one from Rhino
+_reply_headers: Dict[Tuple[str, bool], Dict[str, Any]] = {}
 
 
 @mcp.tool()
-def get_objects_info(
+async def get_objects_info(
     ctx: Context,
     objects: List[Dict[str, Any]],
     include_attributes: bool = False,
     outline_max_points: int = 0,
     geometry_detail: str = "obb_pose",
     include_world: bool = False,
+    timeout: Optional[float] = None,
 ) -> Dict[str, Any]:
     """
     Get detailed information for multiple objects by explicit selectors.
@@ -28,6 +33,8 @@ def get_objects_info(
         Use it to disambiguate shapes that share the same OBB extents and single silhouette
         (cone vs cylinder vs tapered box). Non-solid/mesh objects fall back to "obb_pose".
     - include_world: Include world-space duplicates such as world points and world corners.
+    - timeout: Optional deadline in seconds; defaults to an estimate from previous calls.
+      Raise it for ortho3 passes over thousands of objects.
 
     Return value (per object) for geometry_detail="ortho3", under object["geometry"]:
       - obb.extents: [x_len, y_len, z_len] full side lengths in the pose local frame.
@@ -53,9 +60,29 @@ def get_objects_info(
             if "id" not in entry and "name" not in entry:
                 return {"error": f"objects[{index}] requires 'id' or 'name'"}
 
-        rhino = get_rhino_connection()
+        # Normalised like the plugin does, so cache keys and echoed values match its reply
+        geometry_detail = str(geometry_detail or "obb_pose").strip().lower()
+        include_world = bool(include_world)
+
+        rhino = await get_async_rhino_connection()
+        # Objects selected by id and still cached are not fetched again; name selectors always are
+        await object_cache.revalidate(rhino)
+        results: List[Optional[Dict[str, Any]]] = [None] * len(objects)
+        missing: List[int] = []
+        for index, entry in enumerate(objects):
+            if entry.get("id"):
+                key = object_cache.key(entry["id"], geometry_detail, include_world, outline_max_points,
+                                       include_attributes)
+                results[index] = object_cache.get(key)
+            if results[index] is None:
+                missing.append(index)
+        if not missing:
+            header = _reply_headers.get((geometry_detail, include_world)) or {
+                "geometry_detail": geometry_detail, "include_world": include_world}
+            return {**header, "objects": results}
+
         params: Dict[str, Any] = {
-            "objects": objects,
+            "objects": [objects[index] for index in missing],
             "include_attributes": include_attributes,
             "geometry_detail": geometry_detail,
             "include_world": include_world,
@@ -63,7 +90,17 @@ def get_objects_info(
         if outline_max_points is not None:
             params["outline_max_points"] = outline_max_points
 
-        return rhino.send_command("get_objects_info", params)
+        epoch = object_cache.epoch
+        reply = await rhino.send_command("get_objects_info", params, timeout)
+        _reply_headers[(geometry_detail, include_world)] = {key: value for key, value in reply.items()
+                                                            if key != "objects"}
+        for index, info in zip(missing, reply.get("objects") or []):
+            results[index] = info
+            if isinstance(info, dict) and info.get("id") and "error" not in info:
+                key = object_cache.key(info["id"], geometry_detail, include_world, outline_max_points,
+                                       include_attributes)
+                object_cache.put(key, info, epoch)
+        return {**reply, "objects": results}
     except Exception as e:
         logger.error(f"Error getting objects info: {str(e)}")
         return {"error": str(e)}
@@ -13,14 +13,14 @@ async def get_rhino_log(ctx: Context, lines: int = 20) -> str:
         Recent command history entries as a formatted string.
     """
     try:
-        from rhinomcp.server import rhino_connected, send_to_rhino
+        from rhinomcp.server import rhino_connected, send_to_rhino_async
         
         if not rhino_connected():
             return "Error: Not connected to Rhino. Start Rhino and run mcpmodstart first."
         
         lines = min(max(1, lines), 100)
         
-        result = send_to_rhino({
+        result = await send_to_rhino_async({
             "type": "get_log",
             "params": {
                 "lines": lines
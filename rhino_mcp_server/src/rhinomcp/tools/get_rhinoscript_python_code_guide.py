@@ -1,5 +1,5 @@
 from mcp.server.fastmcp import Context
-from rhinomcp import get_rhino_connection, mcp, logger, rhinoscriptsyntax_json
+from rhinomcp import get_rhino_connection, mcp, logger, get_rhinoscript_function
 from typing import Any, List, Dict
 
 
@@ -15,10 +15,9 @@ def get_rhinoscript_python_code_guide(ctx: Context, function_name: str) -> Dict[
     You should get the function names first by using the get_rhinoscript_python_function_names tool.
     """
     try:
-        for module in rhinoscriptsyntax_json:
-            for function in module["functions"]:
-                if function["Name"] == function_name:
-                    return function
+        function = get_rhinoscript_function(function_name)
+        if function is not None:
+            return function
 
         return {"success": False, "message": "Function not found"}
 
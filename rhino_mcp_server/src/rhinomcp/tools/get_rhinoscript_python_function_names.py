@@ -1,5 +1,5 @@
 from mcp.server.fastmcp import Context
-from rhinomcp import get_rhino_connection, mcp, logger, rhinoscriptsyntax_json
+from rhinomcp import get_rhino_connection, mcp, logger, rhinoscript_function_names
 from typing import Any, List, Dict
 
 
@@ -44,13 +44,8 @@ def get_rhinoscript_python_function_names(ctx: Context, categories: List[str]) -
     - view
     """
     try:
-        function_names: List[str] = []
-        for i in rhinoscriptsyntax_json:
-            if i["ModuleName"] in categories:
-                function_names.extend([func["Name"] for func in i["functions"]])
-                
         # return the related functions
-        return function_names
+        return rhinoscript_function_names(categories)
     except Exception as e:
         logger.error(f"Error executing code: {str(e)}")
         return []
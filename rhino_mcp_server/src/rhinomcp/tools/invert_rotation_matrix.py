@@ -1,16 +1,10 @@
 from mcp.server.fastmcp import Context
 import json
 from rhinomcp.server import mcp, logger
+from rhinomcp.transforms import normalize_rotation_matrix
 from typing import List
 
 
-def _validate_rotation_matrix(rotation_matrix: List[List[float]]) -> None:
-    if rotation_matrix is None:
-        raise ValueError("rotation_matrix is required")
-    if len(rotation_matrix) != 3 or any(len(row) != 3 for row in rotation_matrix):
-        raise ValueError("rotation_matrix must be a 3x3 matrix")
-
-
 def _transpose_3x3(matrix: List[List[float]]) -> List[List[float]]:
     return [
         [matrix[0][0], matrix[1][0], matrix[2][0]],
@@ -30,15 +24,18 @@ def invert_rotation_matrix(
     For a proper rotation matrix R, inverse(R) = transpose(R).
 
     Parameters:
-    - rotation_matrix: 3x3 rotation matrix
+    - rotation_matrix: 3x3 rotation matrix, orthonormal with det=+1. Slightly off matrices
+      (e.g. rounded values) are re-orthonormalised first; others are rejected.
 
     Returns:
-    - JSON string containing inverse_rotation_matrix
+    - JSON string containing inverse_rotation_matrix, and reorthonormalized=true if the input was corrected
     """
     try:
-        _validate_rotation_matrix(rotation_matrix)
-        inverse_rotation_matrix = _transpose_3x3(rotation_matrix)
-        return json.dumps({"inverse_rotation_matrix": inverse_rotation_matrix})
+        rotation_matrix, reorthonormalized = normalize_rotation_matrix(rotation_matrix)
+        result = {"inverse_rotation_matrix": _transpose_3x3(rotation_matrix)}
+        if reorthonormalized:
+            result["reorthonormalized"] = True
+        return json.dumps(result)
     except Exception as e:
         logger.error(f"Error inverting rotation matrix: {str(e)}")
         return f"Error inverting rotation matrix: {str(e)}"
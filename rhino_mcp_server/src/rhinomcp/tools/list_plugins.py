@@ -9,12 +9,12 @@ async def list_plugins(ctx: Context) -> str:
     Returns a formatted string with plugin information.
     """
     try:
-        from rhinomcp.server import rhino_connected, send_to_rhino
+        from rhinomcp.server import rhino_connected, send_to_rhino_async
         
         if not rhino_connected():
             return "Error: Not connected to Rhino. Start Rhino and run mcpmodstart first."
         
-        result = send_to_rhino({
+        result = await send_to_rhino_async({
             "type": "list_plugins",
             "params": {}
         })
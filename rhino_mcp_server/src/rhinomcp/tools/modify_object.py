@@ -1,10 +1,10 @@
 from mcp.server.fastmcp import Context
-from rhinomcp.server import get_rhino_connection, mcp, logger
+from rhinomcp.server import get_async_rhino_connection, mcp, logger
 from typing import Any, List, Dict
 
 
 @mcp.tool()
-def modify_object(
+async def modify_object(
     ctx: Context,
     id: str = None,
     name: str = None,
@@ -37,7 +37,7 @@ def modify_object(
     """
     try:
         # Get the global connection
-        rhino = get_rhino_connection()
+        rhino = await get_async_rhino_connection()
         
         params : Dict[str, Any] = {}
         
@@ -62,7 +62,7 @@ def modify_object(
         if visible is not None:
             params["visible"] = visible
 
-        return rhino.send_command("modify_object", params)
+        return await rhino.send_command("modify_object", params)
     except Exception as e:
         logger.error(f"Error modifying object: {str(e)}")
         return {"error": str(e)}
@@ -1,10 +1,11 @@
 from mcp.server.fastmcp import Context
-from rhinomcp.server import get_rhino_connection, mcp, logger
+from rhinomcp.server import get_async_rhino_connection, mcp, logger
+from rhinomcp.transforms import normalize_transforms
 from typing import Any, List, Dict
 
 
 @mcp.tool()
-def modify_objects(
+async def modify_objects(
     ctx: Context,
     objects: List[Dict[str, Any]],
     all: bool = None
@@ -30,7 +31,8 @@ def modify_objects(
     - id: The id of the object to modify
     - new_color: Optional [r, g, b] color values (0-255) for the object
     - translation: Optional [x, y, z] translation vector
-    - rotation_matrix: Optional 3x3 rotation matrix (world axes, pivot at bbox center)
+    - rotation_matrix: Optional 3x3 rotation matrix (world axes, pivot at bbox center).
+      Must be orthonormal with det=+1; slightly off matrices (e.g. rounded values) are re-orthonormalised.
     - invert_rotation_matrix: Optional boolean.
       If true, applies inverse(rotation_matrix) (transpose for proper rotation matrices).
       Primary use: align orientation back to world axes. If rotation_matrix is each
@@ -51,14 +53,15 @@ def modify_objects(
                     return {"error": f"objects[{index}] must be a dictionary"}
                 if "id" not in entry and "name" not in entry:
                     return {"error": f"objects[{index}] requires 'id' or 'name'"}
+            objects = normalize_transforms(objects)
 
         # Get the global connection
-        rhino = get_rhino_connection()
+        rhino = await get_async_rhino_connection()
         command_params = {}
         command_params["objects"] = objects
         if all:
             command_params["all"] = all
-        return rhino.send_command("modify_objects", command_params)
+        return await rhino.send_command("modify_objects", command_params)
     except Exception as e:
         logger.error(f"Error modifying objects: {str(e)}")
         return {"error": str(e)}
@@ -1,14 +1,15 @@
 from mcp.server.fastmcp import Context
-from rhinomcp.server import get_rhino_connection, mcp, logger
-from typing import Any, Dict
+from rhinomcp.server import get_async_rhino_connection, mcp, logger
+from typing import Any, Dict, Optional
 
 
 @mcp.tool()
-def open_file(
+async def open_file(
     ctx: Context,
     path: str,
     close_current: bool = False,
     save_current: bool = False,
+    timeout: Optional[float] = None,
 ) -> Dict[str, Any]:
     """
     Open a Rhino .3dm file.
@@ -17,16 +18,18 @@ def open_file(
     - path: Absolute or relative path to the file to open.
     - close_current: Close current document before opening (default False).
     - save_current: Save current document before closing if close_current is True (default False).
+    - timeout: Optional deadline in seconds; defaults to an estimate from previous opens.
     """
     try:
-        rhino = get_rhino_connection()
-        result = rhino.send_command(
+        rhino = await get_async_rhino_connection()
+        result = await rhino.send_command(
             "open_file",
             {
                 "path": path,
                 "close_current": close_current,
                 "save_current": save_current,
             },
+            timeout,
         )
         return result
     except Exception as e:
@@ -0,0 +1,136 @@
+from mcp.server.fastmcp import Context
+from rhinomcp.inventory import document_mirror, iter_document_objects
+from rhinomcp.server import get_async_rhino_connection, mcp, logger, object_cache
+from rhinomcp.spatial import BBOX_MODES, INVENTORY_PARAMS, box_distance2, box_of, mirror_is_current, region_index
+from typing import Any, Dict, List, Optional
+import heapq
+import math
+
+
+@mcp.tool()
+async def query_region(
+    ctx: Context,
+    bbox: Optional[List[List[float]]] = None,
+    bbox_mode: str = "intersects",
+    point: Optional[List[float]] = None,
+    radius: Optional[float] = None,
+    k: Optional[int] = None,
+    limit: int = 100,
+    refresh: bool = False,
+) -> Dict[str, Any]:
+    """
+    Find objects by location using a spatial index of the document inventory kept by this server,
+    so repeated spatial questions do not make Rhino scan the scene.
+
+    Query with one of:
+    - bbox: [[min_x, min_y, min_z], [max_x, max_y, max_z]] with bbox_mode "intersects",
+      "contains_center" or "contained" (same meaning as in get_document_info).
+    - point + radius: objects whose world bounding box is within radius of point, nearest first.
+    - point + k: the k objects nearest to point; combine with radius to cap the distance.
+    Distances are measured to each object's world axis-aligned bounding box (0 when inside it).
+
+    Parameters:
+    - limit: Maximum number of objects returned (matched still counts all of them).
+    - refresh: Resync the index with Rhino even if no change was detected.
+
+    Returns:
+    - objects: inventory entries (id, name, type, layer, bbox), with "distance" for point queries.
+      bbox results are in id order, point results nearest first.
+    - matched / returned / truncated.
+    - source: "index", or "rhino" when the query was sent to Rhino because the index was stale and the
+      plugin cannot report changes, or the document is too large to index here (see
+      RHINOMCP_MIRROR_MAX_OBJECTS). A k query without radius then walks the whole document in Rhino.
+    - sync: what was fetched to bring the index up to date (null when it was current). The first
+      query walks the whole document once; later ones fetch only the objects changed since.
+    """
+    try:
+        if (bbox is None) == (point is None):
+            return {"error": "Provide either bbox or point"}
+        if bbox_mode not in BBOX_MODES:
+            return {"error": f"bbox_mode must be one of: {', '.join(BBOX_MODES)}"}
+        query = None
+        if bbox is not None:
+            query = box_of(bbox)
+            if query is None:
+                return {"error": "bbox must be [[min_x,min_y,min_z],[max_x,max_y,max_z]]"}
+        else:
+            if not isinstance(point, list) or len(point) != 3:
+                return {"error": "point must be [x, y, z]"}
+            if radius is None and k is None:
+                return {"error": "A point query needs radius, k or both"}
+            if radius is not None and radius < 0:
+                return {"error": "radius must be >= 0"}
+            if k is not None and k < 1:
+                return {"error": "k must be >= 1"}
+            if radius is not None:
+                query = tuple(point[i] - radius for i in range(3)) + tuple(point[i] + radius for i in range(3))
+        limit = max(1, limit)
+
+        rhino = await get_async_rhino_connection()
+        mirror = document_mirror(**INVENTORY_PARAMS)
+        await object_cache.revalidate(rhino)
+        stale_tokenless = mirror.header and mirror.token is None and not mirror_is_current(mirror)
+        # Without change tokens a stale index costs a full walk to update: bbox and radius queries go
+        # to Rhino instead. k-only queries rebuild the index once if the plugin reports revisions,
+        # so it serves later ones until something changes; without revisions it would never be
+        # current and they go to Rhino every time. Documents too large to mirror always go to Rhino.
+        to_rhino = stale_tokenless and (query is not None or object_cache.revision is None)
+        if (to_rhino or mirror.oversized) and not refresh:
+            return await _query_rhino(rhino, bbox, bbox_mode, query, point, radius, k, limit)
+
+        index, mirror, stats = await region_index(rhino, refresh)
+        if mirror.oversized:
+            return await _query_rhino(rhino, bbox, bbox_mode, query, point, radius, k, limit)
+        if bbox is not None:
+            matches = [(object_id, None) for object_id in index.query_box(query, bbox_mode)]
+        else:
+            matches = index.nearest(point, k, radius)
+        objects = []
+        for object_id, distance in matches[:limit]:
+            obj = mirror.objects[object_id]
+            objects.append(obj if distance is None else {**obj, "distance": round(distance, 6)})
+        return {
+            "source": "index",
+            "matched": len(matches),
+            "returned": len(objects),
+            "truncated": len(matches) > limit,
+            "objects": objects,
+            "sync": stats,
+        }
+    except Exception as e:
+        logger.error(f"Error querying region: {str(e)}")
+        return {"error": str(e)}
+
+
+async def _query_rhino(rhino, bbox, bbox_mode: str, query, point, radius, k, limit: int) -> Dict[str, Any]:
+    if point is None:
+        page = await rhino.send_command(
+            "get_document_info", {**INVENTORY_PARAMS, "bbox": bbox, "bbox_mode": bbox_mode, "limit": limit}
+        )
+        matched = (page.get("spatial_filter") or {}).get("matched_objects", page.get("objects_returned", 0))
+        objects = page.get("objects") or []
+        return {"source": "rhino", "matched": matched, "returned": len(objects),
+                "truncated": bool(page.get("objects_truncated")), "objects": objects, "sync": None}
+
+    # Objects in the cube around the sphere (the whole document for k alone), then the exact
+    # distance test here; only the k nearest are kept while walking
+    params = dict(INVENTORY_PARAMS)
+    if query is not None:
+        params.update(bbox=[list(query[:3]), list(query[3:])], bbox_mode="intersects")
+    limit2 = radius * radius if radius is not None else math.inf
+    found = []
+    async for obj in iter_document_objects(rhino, **params):
+        box = box_of(obj.get("bbox"))
+        if box is None:
+            continue
+        distance2 = box_distance2(point, box)
+        if distance2 > limit2:
+            continue
+        if k is None or len(found) < k:
+            heapq.heappush(found, (-distance2, obj["id"], obj))
+        elif -distance2 > found[0][0]:
+            heapq.heapreplace(found, (-distance2, obj["id"], obj))
+    found = sorted(((math.sqrt(-d2), obj) for d2, _, obj in found), key=lambda entry: entry[0])
+    objects = [{**obj, "distance": round(distance, 6)} for distance, obj in found[:limit]]
+    return {"source": "rhino", "matched": len(found), "returned": len(objects),
+            "truncated": len(found) > limit, "objects": objects, "sync": None}
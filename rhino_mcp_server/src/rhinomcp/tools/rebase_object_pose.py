@@ -1,10 +1,10 @@
 from mcp.server.fastmcp import Context
-from rhinomcp.server import get_rhino_connection, mcp, logger
+from rhinomcp.server import get_async_rhino_connection, mcp, logger
 from typing import Dict, Any
 
 
 @mcp.tool()
-def rebase_object_pose(
+async def rebase_object_pose(
     ctx: Context,
     id: str = None,
     name: str = None,
@@ -36,7 +36,7 @@ def rebase_object_pose(
         if x_direction is not None and x_direction not in {"+x", "-x", "+y", "-y"}:
             return {"error": "x_direction must be '+x', '-x', '+y' or '-y'"}
 
-        rhino = get_rhino_connection()
+        rhino = await get_async_rhino_connection()
 
         params: Dict[str, Any] = {}
         if id is not None:
@@ -48,7 +48,7 @@ def rebase_object_pose(
         if x_direction is not None:
             params["x_direction"] = x_direction
 
-        return rhino.send_command("rebase_object_pose", params)
+        return await rhino.send_command("rebase_object_pose", params)
     except Exception as e:
         logger.error(f"Error rebasing object pose: {str(e)}")
         return {"error": str(e)}
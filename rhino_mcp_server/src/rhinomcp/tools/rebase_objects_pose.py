@@ -1,10 +1,10 @@
 from mcp.server.fastmcp import Context
-from rhinomcp.server import get_rhino_connection, mcp, logger
+from rhinomcp.server import get_async_rhino_connection, mcp, logger
 from typing import Dict, Any, List
 
 
 @mcp.tool()
-def rebase_objects_pose(
+async def rebase_objects_pose(
     ctx: Context,
     objects: List[Dict[str, Any]] = None,
     all: bool = None
@@ -44,7 +44,7 @@ def rebase_objects_pose(
             if x_direction is not None and x_direction not in {"+x", "-x", "+y", "-y"}:
                 return {"error": f"objects[{index}].x_direction must be '+x', '-x', '+y' or '-y'"}
 
-        rhino = get_rhino_connection()
+        rhino = await get_async_rhino_connection()
 
         params: Dict[str, Any] = {}
         if objects is not None:
@@ -52,7 +52,7 @@ def rebase_objects_pose(
         if all is not None:
             params["all"] = all
 
-        return rhino.send_command("rebase_objects_pose", params)
+        return await rhino.send_command("rebase_objects_pose", params)
     except Exception as e:
         logger.error(f"Error rebasing objects pose: {str(e)}")
         return {"error": str(e)}
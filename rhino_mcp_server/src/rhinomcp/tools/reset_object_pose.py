@@ -1,10 +1,10 @@
 from mcp.server.fastmcp import Context
-from rhinomcp.server import get_rhino_connection, mcp, logger
+from rhinomcp.server import get_async_rhino_connection, mcp, logger
 from typing import Dict, Any, List
 
 
 @mcp.tool()
-def reset_object_pose(
+async def reset_object_pose(
     ctx: Context,
     id: str = None,
     name: str = None,
@@ -27,7 +27,7 @@ def reset_object_pose(
     - target_translation: Optional world target [x, y, z] (default [0, 0, 0])
     """
     try:
-        rhino = get_rhino_connection()
+        rhino = await get_async_rhino_connection()
 
         params: Dict[str, Any] = {}
         if id is not None:
@@ -40,7 +40,7 @@ def reset_object_pose(
         if target_translation is not None:
             params["target_translation"] = target_translation
 
-        return rhino.send_command("reset_object_pose", params)
+        return await rhino.send_command("reset_object_pose", params)
     except Exception as e:
         logger.error(f"Error resetting object pose: {str(e)}")
         return {"error": str(e)}
@@ -1,10 +1,10 @@
 from mcp.server.fastmcp import Context
-from rhinomcp.server import get_rhino_connection, mcp, logger
+from rhinomcp.server import get_async_rhino_connection, mcp, logger
 from typing import Dict, Any, List
 
 
 @mcp.tool()
-def reset_objects_pose(
+async def reset_objects_pose(
     ctx: Context,
     objects: List[Dict[str, Any]] = None,
     all: bool = None
@@ -37,7 +37,7 @@ def reset_objects_pose(
             if "id" not in entry and "name" not in entry:
                 return {"error": f"objects[{index}] requires 'id' or 'name'"}
 
-        rhino = get_rhino_connection()
+        rhino = await get_async_rhino_connection()
 
         params: Dict[str, Any] = {}
         if objects is not None:
@@ -45,7 +45,7 @@ def reset_objects_pose(
         if all is not None:
             params["all"] = all
 
-        return rhino.send_command("reset_objects_pose", params)
+        return await rhino.send_command("reset_objects_pose", params)
     except Exception as e:
         logger.error(f"Error resetting objects pose: {str(e)}")
         return {"error": str(e)}
@@ -1,10 +1,10 @@
 from mcp.server.fastmcp import Context
-from rhinomcp.server import get_rhino_connection, mcp, logger
+from rhinomcp.server import get_async_rhino_connection, mcp, logger
 from typing import Any, Dict, List
 
 
 @mcp.tool()
-def rotate_object(
+async def rotate_object(
     ctx: Context,
     id: str = None,
     name: str = None,
@@ -26,7 +26,7 @@ def rotate_object(
     - pivot: [x, y, z] pivot point in world coordinates
     """
     try:
-        rhino = get_rhino_connection()
+        rhino = await get_async_rhino_connection()
 
         params: Dict[str, Any] = {}
         if id is not None:
@@ -42,7 +42,7 @@ def rotate_object(
             params["invert_rotation_matrix"] = invert_rotation_matrix
         params["pivot"] = pivot
 
-        return rhino.send_command("rotate_object", params)
+        return await rhino.send_command("rotate_object", params)
     except Exception as e:
         logger.error(f"Error rotating object: {str(e)}")
         return {"error": str(e)}
@@ -1,10 +1,11 @@
 from mcp.server.fastmcp import Context
-from rhinomcp.server import get_rhino_connection, mcp, logger
+from rhinomcp.server import get_async_rhino_connection, mcp, logger
+from rhinomcp.transforms import normalize_transforms
 from typing import Any, Dict, List
 
 
 @mcp.tool()
-def rotate_objects(
+async def rotate_objects(
     ctx: Context,
     objects: List[Dict[str, Any]],
     all: bool = None
@@ -24,7 +25,8 @@ def rotate_objects(
     Each object can have the following parameters:
     - id: The id of the object to rotate
     - name: The name of the object to rotate
-    - rotation_matrix: 3x3 rotation matrix, about world axes
+    - rotation_matrix: 3x3 rotation matrix, about world axes. Must be orthonormal with det=+1;
+      slightly off matrices (e.g. rounded values) are re-orthonormalised.
     - invert_rotation_matrix: Optional boolean. If true, applies inverse(rotation_matrix).
     - pivot: [x, y, z] pivot point in world coordinates
 
@@ -35,7 +37,7 @@ def rotate_objects(
         if (not objects) and not all:
             return {"error": "objects must be a non-empty list unless all=true"}
 
-        rhino = get_rhino_connection()
+        rhino = await get_async_rhino_connection()
         for index, entry in enumerate(objects or []):
             if not isinstance(entry, dict):
                 return {"error": f"objects[{index}] must be a dictionary"}
@@ -45,10 +47,12 @@ def rotate_objects(
                 return {"error": f"objects[{index}].rotation_matrix is required"}
             if "pivot" not in entry:
                 return {"error": f"objects[{index}].pivot is required"}
+        if objects:
+            objects = normalize_transforms(objects)
         command_params: Dict[str, Any] = {"objects": objects}
         if all:
             command_params["all"] = all
-        return rhino.send_command("rotate_objects", command_params)
+        return await rhino.send_command("rotate_objects", command_params)
     except Exception as e:
         logger.error(f"Error rotating objects: {str(e)}")
         return {"error": str(e)}
@@ -1,20 +1,22 @@
 """Tool to execute a Rhino command."""
 from mcp.server.fastmcp import Context
 from rhinomcp.server import mcp
+from typing import Optional
 
 @mcp.tool()
-async def run_rhino_command(ctx: Context, command: str) -> str:
+async def run_rhino_command(ctx: Context, command: str, timeout: Optional[float] = None) -> str:
     """Execute a Rhino command by name. Avoid interactive or dialog-based commands — they will block execution.
 
     Args:
         command: The English name of the Rhino command (e.g., "_Line", "_Sphere", "CM_OpenFeatureTree").
             Commands are prefixed with underscore automatically for locale-independence.
+        timeout: Optional deadline in seconds; defaults to an estimate from previous commands.
 
     Returns:
         Result message indicating success or failure.
     """
     try:
-        from rhinomcp.server import rhino_connected, send_to_rhino
+        from rhinomcp.server import rhino_connected, send_to_rhino_async
         
         if not rhino_connected():
             return "Error: Not connected to Rhino. Start Rhino and run mcpmodstart first."
@@ -22,12 +24,12 @@ async def run_rhino_command(ctx: Context, command: str) -> str:
         if not command:
             return "Error: Command name is required."
         
-        result = send_to_rhino({
+        result = await send_to_rhino_async({
             "type": "run_command",
             "params": {
                 "command": command
             }
-        })
+        }, timeout)
         
         if result.get("error"):
             return f"Error: {result['error']}"
@@ -0,0 +1,40 @@
+from mcp.server.fastmcp import Context
+from rhinomcp.server import mcp, logger, run_blocking
+from rhinomcp.rhinoscript_search import rhinoscript_search_index, search_summary
+from typing import Any, Dict, List, Optional
+
+
+def _search(query: str, k: int, modules: Optional[List[str]]) -> Dict[str, Any]:
+    hits = rhinoscript_search_index().search(query, k, modules)
+    return {"query": query, "matches": [search_summary(function, score) for function, score in hits]}
+
+
+@mcp.tool()
+async def search_rhinoscript_functions(
+    ctx: Context,
+    query: str,
+    k: int = 10,
+    modules: Optional[List[str]] = None,
+) -> Dict[str, Any]:
+    """
+    Search the RhinoScriptSyntax reference by keywords and return the best matching functions with
+    their signatures, in one call.
+
+    Parameters:
+    - query: Free text, e.g. "loft curves into surface", "offset curve", "AddLine". Function names,
+      argument names and descriptions are searched; small typos are tolerated.
+    - k: Number of matches to return (1-50, default 10).
+    - modules: Optional list of modules to restrict to (e.g. ["curve", "surface"]).
+
+    Returns:
+    - matches: best first, each with name, module, signature, description, arguments, returns and score.
+    """
+    try:
+        if not query or not query.strip():
+            return {"error": "query must not be empty"}
+        k = min(max(1, k), 50)
+        # The first search decompresses the reference and builds the index; keep it off the event loop
+        return await run_blocking(_search, query, k, modules)
+    except Exception as e:
+        logger.error(f"Error searching rhinoscript functions: {str(e)}")
+        return {"error": str(e)}
@@ -0,0 +1,231 @@
+# Validation of rotation_matrix / translation / scale before they are sent to Rhino
+"""Check every transform of a batch in one pass, so a bad matrix fails here instead of in Rhino.
+
+normalize_transforms() stacks the rotation_matrix, translation, pivot and scale of all entries
+into arrays and checks them together:
+- every value is a finite number of the right shape (3x3, or 3 numbers);
+- a rotation_matrix is orthonormal with determinant +1. Matrices off by at most
+  NEAR_ROTATION_TOLERANCE (max |R^T R - I|), such as rounded ones, are replaced by the nearest
+  rotation (the polar factor U V^T of their SVD). Larger errors, reflections and singular
+  matrices are rejected;
+- scale factors are non-zero.
+
+NumPy is optional. Without it the same checks run per entry in Python, and the nearest rotation
+comes from Newton iterations of the polar decomposition.
+"""
+import math
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional; see the pure-Python path below
+    np = None
+
+ORTHONORMAL_TOLERANCE = 1e-9  # Matrices within this are passed through unchanged
+NEAR_ROTATION_TOLERANCE = 2e-2  # Matrices within this are re-orthonormalised; beyond it rejected
+VECTOR_FIELDS = ("translation", "pivot", "scale")
+POLAR_ITERATIONS = 20
+
+Matrix = List[List[float]]
+
+
+def _describe(where: Optional[str], index: int, field: str) -> str:
+    return f"{where}[{index}].{field}" if where is not None else field
+
+
+# Pure-Python path
+
+def _matrix(value: Any) -> Optional[Matrix]:
+    if not isinstance(value, (list, tuple)) or len(value) != 3:
+        return None
+    rows = []
+    for row in value:
+        if not isinstance(row, (list, tuple)) or len(row) != 3:
+            return None
+        try:
+            rows.append([float(v) for v in row])
+        except (TypeError, ValueError):
+            return None
+    return rows
+
+
+def _vector(value: Any) -> Optional[List[float]]:
+    if not isinstance(value, (list, tuple)) or len(value) != 3:
+        return None
+    try:
+        return [float(v) for v in value]
+    except (TypeError, ValueError):
+        return None
+
+
+def _orthonormal_error(m: Matrix) -> float:
+    return max(abs(sum(m[k][i] * m[k][j] for k in range(3)) - (1.0 if i == j else 0.0))
+               for i in range(3) for j in range(3))
+
+
+def _determinant(m: Matrix) -> float:
+    return (m[0][0] * (m[1][1] * m[2][2] - m[1][2] * m[2][1])
+            - m[0][1] * (m[1][0] * m[2][2] - m[1][2] * m[2][0])
+            + m[0][2] * (m[1][0] * m[2][1] - m[1][1] * m[2][0]))
+
+
+def _inverse_transpose(m: Matrix) -> Matrix:
+    """inverse(m)^T: the cofactor matrix over the determinant"""
+    det = _determinant(m)
+    return [[(m[(i + 1) % 3][(j + 1) % 3] * m[(i + 2) % 3][(j + 2) % 3]
+              - m[(i + 1) % 3][(j + 2) % 3] * m[(i + 2) % 3][(j + 1) % 3]) / det for j in range(3)]
+            for i in range(3)]
+
+
+def _nearest_rotation(m: Matrix) -> Matrix:
+    """Polar factor of m by Newton iteration X <- (X + X^-T) / 2 (converges quadratically)"""
+    x = m
+    for _ in range(POLAR_ITERATIONS):
+        inverse_t = _inverse_transpose(x)
+        nxt = [[(x[i][j] + inverse_t[i][j]) / 2 for j in range(3)] for i in range(3)]
+        if max(abs(nxt[i][j] - x[i][j]) for i in range(3) for j in range(3)) < 1e-15:
+            return nxt
+        x = nxt
+    return x
+
+
+def _check_rotation(m: Matrix, label: str) -> Tuple[Matrix, bool]:
+    if not all(math.isfinite(v) for row in m for v in row):
+        raise ValueError(f"{label} must contain only finite numbers")
+    det = _determinant(m)
+    error = _orthonormal_error(m)
+    if det <= 0 or error > NEAR_ROTATION_TOLERANCE:
+        raise ValueError(f"{label} is not a rotation matrix (det={det:.6g}, max |R^T R - I|={error:.3g})")
+    if error > ORTHONORMAL_TOLERANCE:
+        return _nearest_rotation(m), True
+    return m, False
+
+
+def _python_pass(entries: Sequence[Dict[str, Any]], where: str) -> Dict[int, Matrix]:
+    fixed: Dict[int, Matrix] = {}
+    for index, entry in enumerate(entries):
+        if not isinstance(entry, dict):
+            continue
+        if entry.get("rotation_matrix") is not None:
+            label = _describe(where, index, "rotation_matrix")
+            m = _matrix(entry["rotation_matrix"])
+            if m is None:
+                raise ValueError(f"{label} must be a 3x3 matrix")
+            m, changed = _check_rotation(m, label)
+            if changed:
+                fixed[index] = m
+        for field in VECTOR_FIELDS:
+            if entry.get(field) is not None:
+                _check_vector(_vector(entry[field]), _describe(where, index, field), field)
+    return fixed
+
+
+def _check_vector(vector: Optional[List[float]], label: str, field: str):
+    if vector is None:
+        raise ValueError(f"{label} must be [x, y, z]")
+    if not all(math.isfinite(v) for v in vector):
+        raise ValueError(f"{label} must contain only finite numbers")
+    if field == "scale" and any(v == 0 for v in vector):
+        raise ValueError(f"{label} factors must be non-zero")
+
+
+# NumPy path
+
+def _stack(entries: Sequence[Dict[str, Any]], field: str, shape: Tuple[int, ...], where: str):
+    """(entry indices, float array of shape (n, *shape)) for the entries that have field"""
+    indices = [i for i, entry in enumerate(entries) if isinstance(entry, dict) and entry.get(field) is not None]
+    if not indices:
+        return indices, None
+    try:
+        values = np.asarray([entries[i][field] for i in indices], dtype=float)
+        if values.shape[1:] == shape:
+            return indices, values
+    except (TypeError, ValueError):
+        pass
+    # Ragged or non-numeric: find the first bad entry for the message
+    expected = "a 3x3 matrix" if shape == (3, 3) else "[x, y, z]"
+    for i in indices:
+        try:
+            if np.asarray(entries[i][field], dtype=float).shape != shape:
+                raise ValueError
+        except (TypeError, ValueError):
+            raise ValueError(f"{_describe(where, i, field)} must be {expected}") from None
+    raise ValueError(f"{where}[].{field} must be {expected}")
+
+
+def _numpy_pass(entries: Sequence[Dict[str, Any]], where: str) -> Dict[int, Matrix]:
+    fixed: Dict[int, Matrix] = {}
+    indices, matrices = _stack(entries, "rotation_matrix", (3, 3), where)
+    if matrices is not None:
+        finite = np.isfinite(matrices).all(axis=(1, 2))
+        if not finite.all():
+            bad = indices[int(np.argmin(finite))]
+            raise ValueError(f"{_describe(where, bad, 'rotation_matrix')} must contain only finite numbers")
+        errors = np.abs(np.swapaxes(matrices, 1, 2) @ matrices - np.eye(3)).max(axis=(1, 2))
+        dets = np.linalg.det(matrices)
+        rejected = (dets <= 0) | (errors > NEAR_ROTATION_TOLERANCE)
+        if rejected.any():
+            k = int(np.argmax(rejected))
+            raise ValueError(f"{_describe(where, indices[k], 'rotation_matrix')} is not a rotation matrix "
+                             f"(det={dets[k]:.6g}, max |R^T R - I|={errors[k]:.3g})")
+        near = np.nonzero(errors > ORTHONORMAL_TOLERANCE)[0]
+        if near.size:
+            u, _, vt = np.linalg.svd(matrices[near])
+            for k, rotation in zip(near.tolist(), (u @ vt).tolist()):
+                fixed[indices[k]] = rotation
+    for field in VECTOR_FIELDS:
+        indices, vectors = _stack(entries, field, (3,), where)
+        if vectors is None:
+            continue
+        finite = np.isfinite(vectors).all(axis=1)
+        if not finite.all():
+            raise ValueError(f"{_describe(where, indices[int(np.argmin(finite))], field)} must contain only finite numbers")
+        if field == "scale":
+            zero = (vectors == 0).any(axis=1)
+            if zero.any():
+                raise ValueError(f"{_describe(where, indices[int(np.argmax(zero))], field)} factors must be non-zero")
+    return fixed
+
+
+def normalize_transforms(entries: Sequence[Dict[str, Any]], where: Optional[str] = "objects") -> List[Dict[str, Any]]:
+    """Validate the transforms of every entry; raises ValueError naming the first bad one.
+
+    Returns the entries with near-rotations replaced by their nearest rotation. Changed entries are
+    copied; the caller's dictionaries are not modified. where names the list in error messages.
+    """
+    fixed = (_numpy_pass if np is not None else _python_pass)(entries, where)
+    result = list(entries)
+    for index, rotation in fixed.items():
+        result[index] = {**result[index], "rotation_matrix": rotation}
+    return result
+
+
+def normalize_transform(entry: Dict[str, Any]) -> Dict[str, Any]:
+    """normalize_transforms for one entry; errors name the field only"""
+    return normalize_transforms([entry], None)[0]
+
+
+def normalize_rotation_matrix(rotation_matrix: Any, label: str = "rotation_matrix") -> Tuple[Matrix, bool]:
+    """(rotation, changed) for one matrix; see normalize_transforms"""
+    if rotation_matrix is None:
+        raise ValueError(f"{label} is required")
+    matrix = _matrix(rotation_matrix)
+    if matrix is None:
+        raise ValueError(f"{label} must be a 3x3 matrix")
+    return _check_rotation(matrix, label)
+
+
+def check_flat_vectors(values: Sequence[Any], label: str):
+    """Raise ValueError unless values is a flat list of finite numbers, 3 per object"""
+    if not isinstance(values, list) or len(values) % 3:
+        raise ValueError(f"{label} must be a flat list of numbers, 3 per object")
+    if np is not None:
+        try:
+            array = np.asarray(values)
+            ok = array.ndim == 1 and array.dtype.kind in "iuf" and bool(np.isfinite(array).all())
+        except (TypeError, ValueError, OverflowError):
+            ok = False
+    else:
+        ok = all(isinstance(v, (int, float)) and not isinstance(v, bool) and math.isfinite(v) for v in values)
+    if not ok:
+        raise ValueError(f"{label} must be a flat list of finite numbers, 3 per object")
@@ -0,0 +1,238 @@
+# Shared fixtures: a scripted plugin peer for the connection tests and a FakeRhinoServer per test
+import asyncio
+import base64
+import json
+import socket
+import threading
+
+import pytest
+
+from rhinomcp import chunking, inventory, server, spatial
+from rhinomcp.fake_rhino import FakeRhinoConfig, FakeRhinoServer
+from rhinomcp.server import (
+    COMPRESSION_ZLIB,
+    FEATURE_ATTACHMENTS,
+    FEATURE_REQUEST_IDS,
+    FLAG_ATTACHMENT,
+    FRAME_HEADER,
+    FRAMING_LENGTH_PREFIXED,
+    PROTOCOL_VERSION,
+    AsyncRhinoConnectionPool,
+    pack_message,
+    unpack_message,
+)
+
+
+class PluginStub:
+    """A minimal plugin on a background thread.
+
+    It answers negotiate like RhinoMCPServer.cs and every other command from handlers, a dictionary
+    of command type to a function of the params returning the result; an exception becomes an error
+    reply. framing=False answers negotiate like a plugin that predates it; features are granted
+    when the client asks for them, and so is zlib compression unless compression=False. With request
+    ids every command runs on its own thread, so a slow handler does not hold back later replies.
+    Bytes values in a result go out as attachment frames, or as base64 without that feature.
+    """
+
+    def __init__(self, handlers=None, framing=True, features=(FEATURE_REQUEST_IDS, FEATURE_ATTACHMENTS),
+                 compression=True):
+        self.handlers = dict(handlers or {})
+        self.framing = framing
+        self.features = frozenset(features)
+        self.compression = compression
+        self.received = []  # Command types in arrival order
+        self._clients = []
+        self._listener = socket.create_server(("127.0.0.1", 0))
+        self.port = self._listener.getsockname()[1]
+        threading.Thread(target=self._accept, daemon=True).start()
+
+    def close(self):
+        self._listener.close()
+        self.drop_clients()
+
+    def drop_clients(self):
+        """Close every connection from the plugin's side"""
+        for sock in self._clients:
+            try:
+                sock.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
+            sock.close()
+        self._clients.clear()
+
+    def _accept(self):
+        while True:
+            try:
+                sock, _ = self._listener.accept()
+            except OSError:
+                return
+            self._clients.append(sock)
+            threading.Thread(target=self._serve, args=(sock,), daemon=True).start()
+
+    def _serve(self, sock):
+        session = {"framed": False, "features": frozenset(), "compression": None, "threshold": 0,
+                   "buffer": bytearray(), "lock": threading.Lock()}
+        try:
+            while True:
+                command = self._read(sock, session)
+                if command is None:
+                    return
+                self.received.append(command.get("type"))
+                if command.get("type") == "negotiate":
+                    response = self._negotiate(command.get("params") or {})
+                    self._send(sock, session, response)
+                    session["framed"] = self.framing
+                    result = response.get("result", {})
+                    session["features"] = frozenset(result.get("features", ()))
+                    session["compression"] = result.get("compression")
+                    session["threshold"] = result.get("compression_threshold", 0)
+                elif FEATURE_REQUEST_IDS in session["features"]:
+                    threading.Thread(target=self._respond, args=(sock, session, command), daemon=True).start()
+                else:
+                    self._respond(sock, session, command)
+        except OSError:
+            pass
+
+    def _negotiate(self, params):
+        if not self.framing:
+            return {"status": "error", "message": "Unknown command type: negotiate"}
+        if FRAMING_LENGTH_PREFIXED not in params.get("framing", ()):
+            return {"status": "success", "result": {"version": PROTOCOL_VERSION, "framing": "legacy"}}
+        features = sorted(self.features & set(params.get("features", ())))
+        result = {"version": PROTOCOL_VERSION, "framing": FRAMING_LENGTH_PREFIXED, "features": features}
+        if self.compression and COMPRESSION_ZLIB in params.get("compression", ()):
+            result["compression"] = COMPRESSION_ZLIB
+            result["compression_threshold"] = params.get("compression_threshold", 0)
+        return {"status": "success", "result": result}
+
+    def _respond(self, sock, session, command):
+        response = self._execute(command)
+        if "id" in command:
+            response["id"] = command["id"]
+        result = response.get("result")
+        attachments = []
+        for key, value in list(result.items()) if isinstance(result, dict) else ():
+            if not isinstance(value, bytes):
+                continue
+            if FEATURE_ATTACHMENTS in session["features"]:
+                response.setdefault("attachments", []).append(key)
+                result[key] = None
+                attachments.append(value)
+            else:
+                result[key] = base64.b64encode(value).decode("ascii")
+        try:
+            self._send(sock, session, response, attachments)
+        except OSError:
+            pass
+
+    def _execute(self, command):
+        try:
+            result = self.handlers[command.get("type")](command.get("params") or {})
+        except KeyError:
+            return {"status": "error", "message": f"Unknown command type: {command.get('type')}"}
+        except Exception as e:
+            return {"status": "error", "message": str(e)}
+        return {"status": "success", "result": result}
+
+    def _read(self, sock, session):
+        buffer = session["buffer"]
+        if session["framed"]:
+            if not self._fill(sock, buffer, FRAME_HEADER.size):
+                return None
+            length, flags = FRAME_HEADER.unpack_from(buffer)
+            if not self._fill(sock, buffer, FRAME_HEADER.size + length):
+                return None
+            payload = bytes(buffer[FRAME_HEADER.size:FRAME_HEADER.size + length])
+            del buffer[:FRAME_HEADER.size + length]
+            return json.loads(unpack_message(flags, payload))
+        decoder = json.JSONDecoder()
+        while True:
+            text = buffer.decode("utf-8", errors="ignore").lstrip()
+            if text:
+                try:
+                    command, end = decoder.raw_decode(text)
+                except json.JSONDecodeError:
+                    pass
+                else:
+                    buffer.clear()
+                    return command
+            chunk = sock.recv(65536)
+            if not chunk:
+                return None
+            buffer += chunk
+
+    @staticmethod
+    def _fill(sock, buffer, size):
+        while len(buffer) < size:
+            chunk = sock.recv(65536)
+            if not chunk:
+                return False
+            buffer += chunk
+        return True
+
+    @staticmethod
+    def _send(sock, session, response, attachments=()):
+        payload = json.dumps(response).encode("utf-8")
+        if session["framed"]:
+            payload = pack_message(payload, session["compression"], session["threshold"])
+            payload += b"".join(FRAME_HEADER.pack(len(blob), FLAG_ATTACHMENT) + blob for blob in attachments)
+        with session["lock"]:
+            sock.sendall(payload)
+
+
+@pytest.fixture
+def plugin():
+    """Start a PluginStub(handlers, **options); all of them are closed after the test"""
+    stubs = []
+
+    def start(handlers=None, **options) -> PluginStub:
+        stub = PluginStub(handlers, **options)
+        stubs.append(stub)
+        return stub
+
+    yield start
+    for stub in stubs:
+        stub.close()
+
+
+@pytest.fixture(autouse=True)
+def clean_state():
+    """Forget the object cache, mirrors, index, chunk sizes and the tools' pool left behind by other tests"""
+    server.object_cache.clear()
+    server.object_cache.revision = None
+    inventory._mirrors.clear()
+    spatial._index = spatial.SpatialIndex()
+    spatial._synced_epoch = None
+    chunking.chunk_sizer._per_item.clear()
+    yield
+    server._async_rhino_pool = None
+
+
+@pytest.fixture
+def fake_rhino():
+    """Start a fake plugin with FakeRhinoConfig(**config) and point the tools at it"""
+    started = []
+
+    def start(**config) -> FakeRhinoServer:
+        fake = FakeRhinoServer(FakeRhinoConfig(**config)).start()
+        started.append(fake)
+        server._async_rhino_pool = AsyncRhinoConnectionPool(port=fake.port)
+        return fake
+
+    yield start
+    for fake in started:
+        fake.stop()
+
+
+@pytest.fixture
+def run():
+    """Run a coroutine on a fresh event loop, closing the tools' pool before the loop goes away"""
+    def run(coro):
+        async def main():
+            try:
+                return await coro
+            finally:
+                if server._async_rhino_pool is not None:
+                    await server._async_rhino_pool.close()
+        return asyncio.run(main())
+    return run
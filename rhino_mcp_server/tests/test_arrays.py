@@ -0,0 +1,147 @@
+# Array patterns: closed-form placements, the NumPy and Python paths, and array_objects
+import math
+
+import pytest
+
+from rhinomcp import arrays
+from rhinomcp.arrays import MAX_ARRAY_INSTANCES, parse_pattern
+from rhinomcp.tools.array_objects import array_objects
+
+PATTERNS = [
+    {"kind": "linear", "count": 50, "spacing": [2, 0.5, 0]},
+    {"kind": "grid", "counts": [7, 5, 3], "spacing": [1, 2, 3]},
+    {"kind": "polar", "count": 36, "center": [10, 0, 0], "axis": [0, 1, 1]},
+    {"kind": "polar", "count": 5, "center": [0, 0, 0], "angle": 90},
+    {"kind": "curve", "count": 40, "path": [[0, 0, 0], [10, 0, 0], [10, 10, 0], [10, 10, 0], [0, 0, 5]]},
+    {"kind": "curve", "count": 9, "path": [[0, 0, 0], [4, 0, 0], [0, 0, 0]]},  # Doubles back
+    {"kind": "grid", "counts": [20, 20], "spacing": [1, 1], "jitter": [0.2, 0.2, 0.05], "seed": 7},
+]
+
+
+def close(a, b):
+    if a is None or b is None:
+        return a is b
+    if isinstance(a, (list, tuple)):
+        return len(a) == len(b) and all(close(x, y) for x, y in zip(a, b))
+    return abs(a - b) < 1e-8
+
+
+def apply(placement, point):
+    translation, rotation, pivot = placement
+    if rotation is not None:
+        local = [point[i] - pivot[i] for i in range(3)]
+        point = [sum(rotation[i][j] * local[j] for j in range(3)) + pivot[i] for i in range(3)]
+    return [point[i] + translation[i] for i in range(3)]
+
+
+def python_placements(monkeypatch, pattern, start, end):
+    with monkeypatch.context() as patch:
+        patch.setattr(arrays, "np", None)
+        return pattern.placements(start, end)
+
+
+def test_linear_and_grid_offsets():
+    linear = parse_pattern(PATTERNS[0])
+    assert linear.count == 50
+    assert linear.placements(0, 3) == [([0.0, 0.0, 0.0], None, None), ([2.0, 0.5, 0.0], None, None),
+                                       ([4.0, 1.0, 0.0], None, None)]
+    grid = parse_pattern(PATTERNS[1])
+    assert grid.count == 105
+    assert grid.placements(7 * 5 + 7 + 2, 7 * 5 + 7 + 3)[0][0] == [2.0, 2.0, 3.0]
+
+
+def test_polar_spreads_a_full_turn_evenly():
+    pattern = parse_pattern({"kind": "polar", "count": 4, "center": [1, 0, 0]})
+    points = [apply(placement, [2, 0, 0]) for placement in pattern.placements(0, 4)]
+    assert close(points, [[2, 0, 0], [1, 1, 0], [0, 0, 0], [1, -1, 0]])
+    quarter = parse_pattern(PATTERNS[3])
+    assert close(apply(quarter.placements(4, 5)[0], [1, 0, 0]), [0, 1, 0])
+
+
+def test_curve_spreads_copies_by_length_and_turns_them():
+    pattern = parse_pattern({"kind": "curve", "count": 5, "path": [[0, 0, 0], [2, 0, 0], [2, 2, 0]]})
+    placements = pattern.placements(0, 5)
+    origins = [apply(placement, [0, 0, 0]) for placement in placements]
+    assert close(origins, [[0, 0, 0], [1, 0, 0], [2, 0, 0], [2, 1, 0], [2, 2, 0]])
+    assert close(apply(placements[3], [1, 0, 0]), [2, 2, 0])  # The x axis follows the tangent, now +y
+    flat = parse_pattern({"kind": "curve", "count": 3, "path": [[0, 0, 0], [2, 0, 0]], "orient": False})
+    assert all(rotation is None for _, rotation, _ in flat.placements(0, 3))
+
+
+@pytest.mark.skipif(arrays.np is None, reason="NumPy is not installed")
+@pytest.mark.parametrize("spec", PATTERNS)
+def test_numpy_and_python_paths_agree(monkeypatch, spec):
+    pattern = parse_pattern(spec)
+    for start, end in ((0, pattern.count), (1, 2), (pattern.count - 1, pattern.count)):
+        assert close(pattern.placements(start, end), python_placements(monkeypatch, pattern, start, end))
+
+
+def test_jitter_does_not_depend_on_chunking(monkeypatch):
+    pattern = parse_pattern(PATTERNS[6])
+    whole = pattern.placements(0, pattern.count)
+    assert whole[:3] != parse_pattern({**PATTERNS[6], "seed": 8}).placements(0, 3)
+    for chunk in (1, 7, 64):
+        pieces = [p for start in range(0, pattern.count, chunk)
+                  for p in pattern.placements(start, min(start + chunk, pattern.count))]
+        assert pieces == whole
+    assert close(python_placements(monkeypatch, pattern, 0, pattern.count), whole)
+    assert all(abs(t[0] - (k % 20)) <= 0.2 + 1e-9 for k, (t, _, _) in enumerate(whole))
+
+
+@pytest.mark.parametrize("spec, message", [
+    ({"kind": "spiral", "count": 3}, "pattern.kind"),
+    ({"kind": "linear", "count": 0, "spacing": [1, 0, 0]}, "positive integer"),
+    ({"kind": "linear", "count": True, "spacing": [1, 0, 0]}, "positive integer"),
+    ({"kind": "linear", "count": 3, "spacing": [1, 0]}, "list of 3 numbers"),
+    ({"kind": "linear", "count": 3, "spacing": [1, math.inf, 0]}, "finite"),
+    ({"kind": "grid", "counts": [2], "spacing": [1, 1]}, "counts"),
+    ({"kind": "polar", "count": 3, "center": [0, 0, 0], "axis": [0, 0, 0]}, "axis must not be zero"),
+    ({"kind": "curve", "count": 3, "path": [[0, 0, 0]]}, "at least 2 points"),
+    ({"kind": "curve", "count": 3, "path": [[1, 1, 1], [1, 1, 1]]}, "zero length"),
+    ({"kind": "linear", "count": MAX_ARRAY_INSTANCES + 1, "spacing": [1, 0, 0]}, "At most"),
+])
+def test_invalid_patterns_are_rejected(spec, message):
+    with pytest.raises(ValueError, match=message):
+        parse_pattern(spec)
+
+
+def test_array_objects_copies_every_instance(fake_rhino, run):
+    fake = fake_rhino(objects=3)
+    source = sorted(fake.scene.objects)[0]
+    center = fake.scene.objects[source].center
+
+    async def main():
+        result = await array_objects(None, {"kind": "grid", "counts": [30, 30], "spacing": [5, 5]}, ids=[source])
+        assert result["instances"] == 900 and result["copied"] == 899 and "error" not in result
+        assert len(fake.scene.objects) == 3 + 899
+        last = fake.scene.objects[result["ids"][-1]].center
+        assert close(last, [center[0] + 29 * 5, center[1] + 29 * 5, center[2]])
+
+    run(main())
+
+
+def test_array_objects_lists_null_ids_for_failed_copies(fake_rhino, run, monkeypatch):
+    fake = fake_rhino(objects=3)
+    source = sorted(fake.scene.objects)[0]
+    copy_objects = fake.scene.copy_objects
+    calls = []
+
+    def second_chunk_fails(params):
+        calls.append(len(params["objects"]))
+        if len(calls) == 2:
+            raise ValueError("Failed to add copied object to document.")
+        return copy_objects(params)
+
+    monkeypatch.setattr(fake.scene, "copy_objects", second_chunk_fails)
+
+    async def main():
+        result = await array_objects(None, {"kind": "linear", "count": 901, "spacing": [1, 0, 0]}, ids=[source])
+        ids = result["ids"]
+        assert len(ids) == 900 and result["error"] == "Failed to add copied object to document."
+        assert ids[calls[0]:calls[0] + calls[1]] == [None] * calls[1]
+        assert sum(1 for object_id in ids if object_id) == result["copied"] == 900 - calls[1] - result.get("not_sent", 0)
+        for row, object_id in enumerate(ids):
+            if object_id is not None:
+                assert fake.scene.objects[object_id].center[0] == fake.scene.objects[source].center[0] + row + 1
+
+    run(main())
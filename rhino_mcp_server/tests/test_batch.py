@@ -0,0 +1,65 @@
+# The batch command: one request when the plugin grants it, sequential sends otherwise
+import json
+
+import pytest
+
+from rhinomcp.fake_rhino import SUPPORTED_FEATURES
+from rhinomcp.server import FEATURE_BATCH, RhinoConnectionPool, get_async_rhino_connection
+from rhinomcp.tools.batch import batch
+
+POINT = {"type": "POINT", "params": {"x": 1, "y": 2, "z": 3}}
+
+
+def mixed_commands(object_id):
+    return [
+        {"type": "create_objects", "params": {"pt": POINT}},
+        {"type": "modify_objects", "params": {"objects": [{"id": object_id, "translation": [1, 0, 0]}]}},
+        {"type": "not_a_command", "params": {}},
+        {"type": "get_object_info", "params": {"id": object_id}},
+    ]
+
+
+@pytest.mark.parametrize("granted", [True, False], ids=["batched", "sequential"])
+def test_batches_report_every_item_in_order(fake_rhino, run, granted):
+    features = SUPPORTED_FEATURES if granted else tuple(f for f in SUPPORTED_FEATURES if f != FEATURE_BATCH)
+    fake = fake_rhino(objects=20, features=features)
+    object_id = sorted(fake.scene.objects)[0]
+
+    async def main():
+        rhino = await get_async_rhino_connection()
+        stopped = await rhino.send_batch(mixed_commands(object_id))
+        kept_going = await rhino.send_batch(mixed_commands(object_id), stop_on_error=False)
+        return stopped, kept_going
+
+    stopped, kept_going = run(main())
+    assert [item["status"] for item in stopped["results"]] == ["success", "success", "error", "skipped"]
+    assert (stopped["succeeded"], stopped["failed"], stopped["skipped"]) == (2, 1, 1)
+    assert [item["status"] for item in kept_going["results"]] == ["success", "success", "error", "success"]
+    assert kept_going["results"][3]["result"]["id"] == object_id
+    assert fake.commands.get("batch", 0) == (2 if granted else 0)
+    assert len(fake.scene.objects) == 22
+
+
+def test_blocking_pool_batches_too(fake_rhino):
+    fake = fake_rhino(objects=5)
+    pool = RhinoConnectionPool(port=fake.port)
+    try:
+        result = pool.send_batch([{"type": "create_objects", "params": {"a": POINT, "b": POINT}},
+                                  {"type": "get_document_info", "params": {"limit": 1}}])
+    finally:
+        pool.close()
+    assert result["succeeded"] == 2 and len(fake.scene.objects) == 7
+
+
+def test_batch_tool_returns_captures_as_images(fake_rhino, run):
+    fake_rhino(objects=5, capture_bytes=2048)
+
+    async def main():
+        return await batch(None, [{"type": "create_objects", "params": {"pt": POINT}},
+                                  {"type": "capture_view", "params": {"width": 32}}])
+
+    image, reply = run(main())
+    assert image.data[:4] == b"\x89PNG"
+    result = json.loads(reply)
+    assert result["results"][1]["result"]["image"] == 0 and "png_base64" not in result["results"][1]["result"]
+    assert "error" in run(batch(None, []))
@@ -0,0 +1,26 @@
+# Smoke runs of the benchmark scripts on tiny scenes
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+BENCHMARKS = Path(__file__).resolve().parents[1] / "benchmarks"
+
+
+def bench(script, *args):
+    completed = subprocess.run([sys.executable, str(BENCHMARKS / script), *args],
+                               capture_output=True, text=True, timeout=120)
+    assert completed.returncode == 0, completed.stderr
+    return completed.stdout
+
+
+def test_bench_tools_calls_every_tool_without_errors(tmp_path):
+    output = tmp_path / "bench.json"
+    report = json.loads(bench("bench_tools.py", "--sizes", "30", "--repeats", "1", "--polyline-points", "16",
+                              "--outline-max-points", "16", "--json", "--output", str(output)))
+    assert {row["tool"] for row in report["rows"]} >= {"get_document_info", "create_objects", "capture_view"}
+    assert [row["tool"] for row in report["rows"] if row["errors"]] == []
+
+    compared = bench("bench_tools.py", "--sizes", "30", "--repeats", "1", "--tools", "get_document_info",
+                     "--baseline", str(output))
+    assert "get_document_info" in compared
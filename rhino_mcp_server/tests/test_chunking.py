@@ -0,0 +1,144 @@
+# ChunkSizer and send_in_chunks against the fake plugin
+import pytest
+
+from rhinomcp.chunking import (
+    ITEM_BYTES_ESTIMATE,
+    POINT_BYTES_ESTIMATE,
+    ChunkSizer,
+    estimated_size,
+    send_in_chunks,
+)
+from rhinomcp.server import get_async_rhino_connection
+from rhinomcp.tools.create_objects import create_objects
+
+
+def points(count):
+    return [{"type": "POINT", "name": f"p{i}", "params": {"x": i, "y": 0, "z": 0}} for i in range(count)]
+
+
+def make_params(items):
+    def params(start, end, features):
+        return {str(index): items[index] for index in range(start, end)}
+    return params
+
+
+def contiguous(outcomes):
+    return all(a.end == b.start for a, b in zip(outcomes, outcomes[1:])) and outcomes[0].start == 0
+
+
+def test_sizer_starts_at_initial_and_targets_the_time_per_chunk():
+    sizer = ChunkSizer(target=2.0, initial=250, minimum=10, maximum=20000)
+    assert sizer.size_for("create_objects") == 250
+    sizer.observe("create_objects", 100, 1.0)  # 10 ms per item
+    assert sizer.size_for("create_objects") == 200
+    sizer.observe("create_objects", 100, 3.0)  # EWMA moves part of the way to 30 ms
+    assert sizer.size_for("create_objects") == int(2.0 / (0.01 + 0.3 * 0.02))
+    assert sizer.size_for("copy_objects") == 250
+    sizer.observe("copy_objects", 0, 5.0)  # Ignored
+    assert sizer.size_for("copy_objects") == 250
+    assert set(sizer.snapshot()) == {"create_objects"}
+
+
+def test_sizer_clamps_to_its_bounds():
+    sizer = ChunkSizer(target=1.0, minimum=10, maximum=1000)
+    sizer.observe("slow", 1, 60.0)
+    sizer.observe("fast", 1000, 1e-6)
+    assert sizer.size_for("slow") == 10 and sizer.size_for("fast") == 1000
+
+
+def test_estimated_size_grows_with_points_only():
+    assert estimated_size({"type": "BOX", "params": {"width": 1}}) == ITEM_BYTES_ESTIMATE
+    polyline = {"type": "POLYLINE", "params": {"points": [[0, 0, 0]] * 10}}
+    assert estimated_size(polyline) == ITEM_BYTES_ESTIMATE + 10 * POINT_BYTES_ESTIMATE
+    assert estimated_size("not an entry") == ITEM_BYTES_ESTIMATE
+
+
+def test_chunks_cover_every_item_in_order(fake_rhino, run):
+    fake = fake_rhino(objects=0)
+    items = points(1000)
+    seen = []
+
+    async def progress(done, total):
+        seen.append((done, total))
+
+    async def main():
+        rhino = await get_async_rhino_connection()
+        sizer = ChunkSizer(initial=120, maximum=300)
+        outcomes = await send_in_chunks(rhino, "create_objects", items, make_params(items), progress, sizer=sizer)
+        assert contiguous(outcomes) and outcomes[-1].end == 1000
+        assert all(outcome.error is None for outcome in outcomes)
+        assert all(outcome.end - outcome.start <= 300 for outcome in outcomes)
+        assert outcomes[0].end == 120 and "create_objects" in sizer.snapshot()
+        ids = [entry["id"] for outcome in outcomes for entry in outcome.result.values()]
+        assert [fake.scene.objects[object_id].name for object_id in ids] == [item["name"] for item in items]
+        assert seen == [(outcome.end, 1000) for outcome in outcomes]
+
+    run(main())
+    assert fake.commands["create_objects"] == len(seen)
+
+
+def test_max_bytes_cuts_chunks_before_the_item_count(fake_rhino, run):
+    fake_rhino(objects=0)
+    items = points(100)
+
+    async def main():
+        rhino = await get_async_rhino_connection()
+        outcomes = await send_in_chunks(rhino, "create_objects", items, make_params(items),
+                                        sizer=ChunkSizer(initial=100), max_bytes=10 * ITEM_BYTES_ESTIMATE)
+        assert [outcome.end - outcome.start for outcome in outcomes] == [10] * 10
+        # An item larger than max_bytes still goes, alone
+        big = await send_in_chunks(rhino, "create_objects", items[:3], make_params(items),
+                                   sizer=ChunkSizer(initial=100), size_of=lambda item: 10 ** 9)
+        assert [outcome.end - outcome.start for outcome in big] == [1, 1, 1]
+
+    run(main())
+
+
+@pytest.mark.parametrize("depth", [1, 2])
+def test_no_chunks_are_sent_after_a_failure(fake_rhino, run, depth):
+    fake = fake_rhino(objects=0)
+    items = points(1000)
+    create = make_params(items)
+
+    def failing(start, end, features):
+        if start >= 300:
+            raise ValueError("bad chunk")
+        return create(start, end, features)
+
+    async def main():
+        rhino = await get_async_rhino_connection()
+        outcomes = await send_in_chunks(rhino, "create_objects", items, failing,
+                                        sizer=ChunkSizer(initial=100, maximum=100), depth=depth)
+        assert contiguous(outcomes)
+        failed = [outcome for outcome in outcomes if outcome.error is not None]
+        assert failed[0].start == 300 and failed[0].error == "bad chunk"
+        assert outcomes[-1].end <= 300 + depth * 100  # At most the chunks already in flight
+        return outcomes
+
+    outcomes = run(main())
+    assert len(fake.scene.objects) == sum(o.end - o.start for o in outcomes if o.error is None)
+
+
+def test_nothing_is_sent_for_no_items(fake_rhino, run):
+    fake = fake_rhino(objects=0)
+
+    async def main():
+        rhino = await get_async_rhino_connection()
+        assert await send_in_chunks(rhino, "create_objects", [], make_params([])) == []
+
+    run(main())
+    assert fake.commands["create_objects"] == 0
+
+
+def test_create_objects_keeps_objects_sharing_a_name(fake_rhino, run):
+    fake = fake_rhino(objects=0)
+    specs = [{**spec, "name": "Brick"} for spec in points(30)]
+
+    async def main():
+        result = await create_objects(None, specs)
+        assert result["created"] == 30 and result["failed"] == 0
+        assert len(set(result["ids"])) == 30
+        assert [fake.scene.objects[object_id].center[0] for object_id in result["ids"]] == list(range(30))
+        assert await create_objects(None, []) == {"error": "objects must be a non-empty list"}
+
+    run(main())
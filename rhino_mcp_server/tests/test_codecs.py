@@ -0,0 +1,55 @@
+# JSON payload codecs
+import pytest
+
+from rhinomcp import server
+from rhinomcp.server import AsyncRhinoConnection, Codec, StdlibJsonCodec, _negotiate_request
+
+ENVELOPE = {"id": 7, "type": "create_objects",
+            "params": {"objects": [{"name": "pt", "points": [[0.5, -1.25, 3.0]] * 50, "text": "héllo"}]}}
+
+
+def json_codecs():
+    codecs = [StdlibJsonCodec()]
+    if server.orjson is not None:
+        codecs.append(server.OrjsonCodec())
+    return codecs
+
+
+@pytest.mark.parametrize("codec", json_codecs(), ids=lambda codec: codec.backend)
+def test_json_codecs_round_trip(codec):
+    payload = codec.encode(ENVELOPE)
+    assert isinstance(payload, bytes)
+    assert codec.decode(payload) == ENVELOPE
+    assert codec.decode(memoryview(payload)) == ENVELOPE
+    assert StdlibJsonCodec().decode(payload) == ENVELOPE
+
+
+def test_orjson_falls_back_for_what_it_cannot_encode():
+    if server.orjson is None:
+        pytest.skip("orjson is not installed")
+    assert server.OrjsonCodec().decode(server.OrjsonCodec().encode({1: [2 ** 70]})) == {"1": [2 ** 70]}
+
+
+def test_codecs_must_implement_encode_and_decode():
+    class EncodeOnly(Codec):
+        def encode(self, obj):
+            return b""
+
+    with pytest.raises(TypeError):
+        EncodeOnly()
+
+
+def test_connections_negotiate_no_codec_and_send_json(plugin, run):
+    assert "codecs" not in _negotiate_request(True)["params"]
+    stub = plugin({"echo": lambda params: params})
+
+    async def main():
+        connection = AsyncRhinoConnection(host="127.0.0.1", port=stub.port)
+        assert await connection.connect()
+        try:
+            assert connection.codec is server.JSON_CODEC
+            return await connection.send_command("echo", ENVELOPE["params"])
+        finally:
+            await connection.disconnect()
+
+    assert run(main()) == ENVELOPE["params"]
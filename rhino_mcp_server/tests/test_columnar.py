@@ -0,0 +1,83 @@
+# Columnar create_objects: validation, expansion, and both plugin paths through the fake
+import pytest
+
+from rhinomcp.columnar import columnar_chunk, columnar_count, columnar_object, expand_columnar
+from rhinomcp.fake_rhino import SUPPORTED_FEATURES
+from rhinomcp.server import FEATURE_COLUMNAR_CREATE
+from rhinomcp.tools.create_objects import create_objects
+
+COLUMNS = {
+    "templates": [
+        {"type": "BOX", "params": {"width": 2, "length": 1, "height": 0.5}, "color": [180, 60, 40]},
+        {"type": "SPHERE", "params": {"radius": 1.0}},
+    ],
+    "template": [0, 0, 0, 1],
+    "names": [None, None, None, "Ball"],
+    "translations": [0, 0, 0, 2, 0, 0, 4, 0, 0, 0, 3, 1],
+}
+
+
+@pytest.mark.parametrize("columns, message", [
+    ([], "must be a dictionary"),
+    ({**COLUMNS, "sizes": [1]}, "Unknown columns"),
+    ({**COLUMNS, "templates": []}, "non-empty list"),
+    ({**COLUMNS, "templates": [{"type": "BOX"}]}, "params must be a dictionary"),
+    ({**COLUMNS, "names": ["a"]}, "different numbers of objects"),
+    ({**COLUMNS, "translations": [0, 0]}, "3 per object"),
+    ({**COLUMNS, "translations": [0, 0, float("nan")] * 4}, "finite numbers"),
+    ({**COLUMNS, "template": [0, 0, 0, 2]}, "indices into templates"),
+    ({"templates": [{"params": {}}], "count": 2}, "type is required"),
+    ({"templates": [{"type": "BOX", "params": {}}]}, "needs count"),
+    ({"templates": [{"type": "BOX", "params": {}}], "count": 0}, "no objects"),
+])
+def test_invalid_columns_are_rejected(columns, message):
+    with pytest.raises(ValueError, match=message):
+        columnar_count(columns)
+
+
+def test_rows_expand_to_regular_entries():
+    assert columnar_count(COLUMNS) == 4
+    assert columnar_object(COLUMNS, 0) == {**COLUMNS["templates"][0], "translation": [0, 0, 0]}
+    assert columnar_object(COLUMNS, 3) == {**COLUMNS["templates"][1], "name": "Ball", "translation": [0, 3, 1]}
+    assert expand_columnar(COLUMNS, 1, 3) == {"1": columnar_object(COLUMNS, 1), "2": columnar_object(COLUMNS, 2)}
+
+
+def test_chunks_slice_every_column():
+    chunk = columnar_chunk(COLUMNS, 2, 4)
+    assert chunk["format"] == "columnar" and chunk["count"] == 2
+    assert chunk["template"] == [0, 1] and chunk["names"] == [None, "Ball"]
+    assert chunk["translations"] == [4, 0, 0, 0, 3, 1]
+    assert chunk["templates"] is COLUMNS["templates"]
+
+
+@pytest.mark.parametrize("columnar", [True, False])
+def test_create_objects_from_columns(fake_rhino, run, columnar):
+    features = SUPPORTED_FEATURES if columnar else tuple(f for f in SUPPORTED_FEATURES if f != FEATURE_COLUMNAR_CREATE)
+    fake = fake_rhino(objects=0, features=features)
+    count = 1200
+    columns = {
+        "templates": COLUMNS["templates"],
+        "template": [i % 2 for i in range(count)],
+        "names": [f"row-{i}" for i in range(count)],
+        "translations": [v for i in range(count) for v in (i, 0, 0)],
+    }
+
+    async def main():
+        result = await create_objects(None, columns=columns)
+        assert result["created"] == count and result["failed"] == 0 and "not_sent" not in result
+        assert len(set(result["ids"])) == count
+        created = fake.scene.objects
+        assert [created[object_id].name for object_id in result["ids"]] == columns["names"]
+
+    run(main())
+
+
+def test_create_objects_needs_exactly_one_input(fake_rhino, run):
+    fake_rhino(objects=0)
+
+    async def main():
+        assert "error" in await create_objects(None)
+        assert "error" in await create_objects(None, objects=[{"type": "POINT", "params": {}}], columns=COLUMNS)
+        assert "error" in await create_objects(None, columns={**COLUMNS, "names": ["a"]})
+
+    run(main())
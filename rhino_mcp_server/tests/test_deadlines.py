@@ -0,0 +1,60 @@
+# Adaptive per-command deadlines
+import time
+
+import pytest
+
+from rhinomcp.server import AdaptiveTimeouts, AsyncRhinoConnection, RhinoTimeoutError
+
+
+def test_base_deadlines_apply_until_replies_are_seen():
+    timeouts = AdaptiveTimeouts(base={"open_file": 300.0}, default=15.0, minimum=5.0, maximum=600.0)
+    assert timeouts.timeout_for("open_file") == 300.0
+    assert timeouts.timeout_for("anything") == 15.0
+    assert timeouts.snapshot() == {}
+
+
+def test_deadlines_follow_the_observed_latency_within_the_clamp():
+    timeouts = AdaptiveTimeouts(base={}, default=15.0, minimum=5.0, maximum=600.0)
+    for _ in range(50):
+        timeouts.observe("fast", 0.01)
+        timeouts.observe("steady", 4.0)
+    assert timeouts.timeout_for("fast") == 5.0
+    assert 12.0 <= timeouts.timeout_for("steady") < 15.0
+    timeouts.observe("huge", 1000.0)
+    assert timeouts.timeout_for("huge") == 600.0
+
+
+def test_a_missed_deadline_doubles_the_next_one_until_a_reply():
+    timeouts = AdaptiveTimeouts(base={}, default=15.0, minimum=5.0, maximum=600.0)
+    for _ in range(50):
+        timeouts.observe("cmd", 2.0)
+    settled = timeouts.timeout_for("cmd")
+    timeouts.timed_out("cmd", settled)
+    assert timeouts.timeout_for("cmd") == pytest.approx(2 * settled)
+    timeouts.timed_out("cmd", 2 * settled)
+    assert timeouts.timeout_for("cmd") == pytest.approx(4 * settled)
+    timeouts.observe("cmd", 2.0)
+    assert timeouts.timeout_for("cmd") == pytest.approx(settled, rel=0.05)
+
+
+def slow(params):
+    time.sleep(0.3)
+    return {}
+
+
+def test_connections_feed_their_estimates(plugin, run):
+    stub = plugin({"echo": lambda params: params, "slow": slow})
+    timeouts = AdaptiveTimeouts(base={"slow": 0.1}, default=15.0, minimum=0.05, maximum=600.0)
+
+    async def main():
+        connection = AsyncRhinoConnection("127.0.0.1", stub.port, timeouts=timeouts)
+        try:
+            await connection.send_command("echo", {})
+            with pytest.raises(RhinoTimeoutError):
+                await connection.send_command("slow", {})
+        finally:
+            await connection.disconnect()
+
+    run(main())
+    assert "echo" in timeouts.snapshot()
+    assert timeouts.timeout_for("slow") > 0.1
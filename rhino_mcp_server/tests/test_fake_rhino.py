@@ -0,0 +1,164 @@
+# The fake plugin: negotiation, pipelining and the scene behind the tools
+import asyncio
+import json
+
+from rhinomcp.fake_rhino import SUPPORTED_FEATURES
+from rhinomcp.server import (
+    COMPRESSION_ZLIB,
+    FEATURE_ATTACHMENTS,
+    FEATURE_REQUEST_IDS,
+    FRAMING_LEGACY,
+    FRAMING_LENGTH_PREFIXED,
+    AsyncRhinoConnection,
+    AsyncRhinoConnectionPool,
+)
+from rhinomcp.tools.extended_tools import capture_view
+from rhinomcp.tools.get_document_info import get_document_info
+
+
+async def connected(port, **options):
+    connection = AsyncRhinoConnection(host="127.0.0.1", port=port, **options)
+    assert await connection.connect()
+    return connection
+
+
+def test_negotiation_grants_framing_and_features(fake_rhino, run):
+    fake = fake_rhino(objects=10)
+
+    async def main():
+        connection = await connected(fake.port)
+        try:
+            assert connection.framing == FRAMING_LENGTH_PREFIXED
+            assert connection.features == frozenset(SUPPORTED_FEATURES)
+            assert connection.pipelined
+            info = await connection.send_command("get_document_info", {"limit": 5})
+            assert info["objects_returned"] == 5
+        finally:
+            await connection.disconnect()
+
+    run(main())
+
+
+def test_negotiation_falls_back_to_legacy_framing(fake_rhino, run):
+    fake = fake_rhino(objects=10, framing=False)
+
+    async def main():
+        connection = await connected(fake.port)
+        try:
+            assert connection.framing == FRAMING_LEGACY
+            assert connection.features == frozenset()
+            assert not connection.pipelined
+            info = await connection.send_command("get_document_info", {"limit": 3})
+            assert info["objects_returned"] == 3
+        finally:
+            await connection.disconnect()
+
+    run(main())
+
+
+def test_only_features_granted_by_both_sides_are_used(fake_rhino, run):
+    fake = fake_rhino(objects=10, features=(FEATURE_ATTACHMENTS, "not_a_client_feature"))
+
+    async def main():
+        connection = await connected(fake.port)
+        try:
+            assert connection.features == frozenset({FEATURE_ATTACHMENTS})
+            assert not connection.pipelined  # No request ids: one command at a time
+            assert (await connection.send_command("get_document_info", {"limit": 2}))["objects_returned"] == 2
+        finally:
+            await connection.disconnect()
+
+    run(main())
+
+
+def test_replies_are_matched_to_requests_by_id(fake_rhino, run):
+    # The fake answers ping on the client thread, ahead of the slow command queued before it
+    fake = fake_rhino(objects=50, command_latency={"get_document_info": 0.3})
+
+    async def main():
+        connection = await connected(fake.port)
+        assert FEATURE_REQUEST_IDS in connection.features
+        finished = []
+
+        async def send(command_type, params=None):
+            result = await connection.send_command(command_type, params)
+            finished.append(command_type)
+            return result
+
+        try:
+            slow = asyncio.create_task(send("get_document_info", {"limit": 7}))
+            await asyncio.sleep(0.05)
+            pong = await send("ping")
+            info = await slow
+        finally:
+            await connection.disconnect()
+        assert finished == ["ping", "get_document_info"]
+        assert pong == {"pong": True}
+        assert info["objects_returned"] == 7
+
+    run(main())
+
+
+def test_compressed_and_plain_pages_match(fake_rhino, run):
+    fake = fake_rhino(objects=300)
+
+    async def fetch(request_compression):
+        connection = await connected(fake.port, request_compression=request_compression, compression_threshold=1024)
+        try:
+            return connection.compression, await connection.send_command("get_document_info", {"limit": 300})
+        finally:
+            await connection.disconnect()
+
+    async def main():
+        compression, compressed = await fetch(True)
+        assert compression == COMPRESSION_ZLIB
+        compression, plain = await fetch(False)
+        assert compression is None
+        assert compressed["objects"] == plain["objects"]
+
+    run(main())
+
+
+def test_pool_replaces_connections_closed_by_rhino(fake_rhino, run):
+    fake = fake_rhino(objects=10)
+
+    async def main():
+        pool = AsyncRhinoConnectionPool(port=fake.port, size=1)
+        try:
+            async with pool.connection() as first:
+                pass
+            for session in list(fake._sessions):
+                fake._close_session(session)
+            await asyncio.sleep(0.05)
+            async with pool.connection() as second:
+                assert second is not first
+                assert (await second.send_command("get_document_info", {"limit": 1}))["objects_returned"] == 1
+        finally:
+            await pool.close()
+
+    run(main())
+
+
+def test_tools_page_through_the_fake_scene(fake_rhino, run):
+    fake = fake_rhino(objects=250)
+
+    async def main():
+        page = await get_document_info(None, limit=100, offset=200)
+        assert page["objects_returned"] == 50 and not page["objects_truncated"]
+        whole = await get_document_info(None, limit=5, all_pages=True)
+        assert whole["object_count"] == 250 and len(whole["objects"]) == 5
+        assert sum(whole["objects_by_type"].values()) == 250
+
+    run(main())
+    assert len(fake.scene.objects) == 250
+
+
+def test_capture_view_returns_the_png_attachment(fake_rhino, run):
+    fake_rhino(objects=10, capture_bytes=4096)
+
+    async def main():
+        return await capture_view(width=64, height=48)
+
+    image, metadata = run(main())
+    assert image.data[:4] == b"\x89PNG" and len(image.data) == 4096
+    assert json.loads(metadata)["width"] == 64
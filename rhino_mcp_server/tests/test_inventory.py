@@ -0,0 +1,168 @@
+# Paged document walks, DocumentMirror syncs with since / removed_ids, and the all_pages aggregate
+from rhinomcp import inventory
+from rhinomcp.inventory import DocumentMirror, aggregate_document_inventory, iter_document_objects, iter_document_pages
+from rhinomcp.server import AsyncRhinoConnectionPool, get_async_rhino_connection
+
+PARAMS = {"detail": "inventory", "include_bbox": True}
+OBJECTS = [
+    {"id": f"{i:04d}", "type": "CURVE" if i % 3 else "POINT", "layer": f"L{i % 4}",
+     "bbox": [[i, 0, 0], [i + 1, 2, 1]]}
+    for i in range(250)
+]
+
+
+def document_pages(params):
+    """get_document_info as the plugin pages it"""
+    offset, limit = params.get("offset", 0), params.get("limit", 100)
+    objects = OBJECTS[offset:offset + limit]
+    return {"meta_data": {"name": "stub"}, "layer_count": 4, "objects": objects,
+            "objects_returned": len(objects), "objects_truncated": offset + len(objects) < len(OBJECTS)}
+
+
+async def with_pool(stub, walk):
+    pool = AsyncRhinoConnectionPool(port=stub.port, size=2)
+    try:
+        return await walk(pool)
+    finally:
+        await pool.close()
+
+
+def test_iter_document_objects_walks_every_page(plugin, run):
+    stub = plugin({"get_document_info": document_pages})
+
+    async def walk(pool):
+        return [obj["id"] async for obj in iter_document_objects(pool, page_size=100, detail="inventory")]
+
+    assert run(with_pool(stub, walk)) == [obj["id"] for obj in OBJECTS]
+    assert stub.received.count("get_document_info") == 3
+
+
+def test_stopping_early_leaves_at_most_one_page_prefetched(plugin, run):
+    stub = plugin({"get_document_info": document_pages})
+
+    async def walk(pool):
+        async for page in iter_document_pages(pool, page_size=50):
+            return page["objects_returned"]
+
+    assert run(with_pool(stub, walk)) == 50
+    assert stub.received.count("get_document_info") <= 2
+
+
+def test_aggregate_counts_every_object(plugin, run):
+    stub = plugin({"get_document_info": document_pages})
+
+    async def walk(pool):
+        return await aggregate_document_inventory(pool, sample_size=10, page_size=100, detail="inventory")
+
+    result = run(with_pool(stub, walk))
+    assert result["object_count"] == 250 and result["pages_fetched"] == 3
+    assert result["objects_by_type"] == {"CURVE": 166, "POINT": 84}
+    assert sum(result["objects_by_layer"].values()) == 250
+    assert result["bbox"] == [[0, 0, 0], [250, 2, 1]]
+    assert len(result["objects"]) == 10 and result["objects_truncated"]
+    assert result["meta_data"] == {"name": "stub"} and result["layer_count"] == 4
+
+
+async def listing(**params):
+    rhino = await get_async_rhino_connection()
+    return {obj["id"]: obj async for obj in iter_document_objects(rhino, page_size=100, **{**PARAMS, **params})}
+
+
+def test_mirror_applies_changes_and_removals(fake_rhino, run):
+    fake = fake_rhino(objects=300)
+    ids = sorted(fake.scene.objects)
+
+    async def main():
+        rhino = await get_async_rhino_connection()
+        mirror = DocumentMirror(**PARAMS)
+        stats = await mirror.sync(rhino, page_size=100)
+        assert stats["full"] and stats["upserted"] == 300 and stats["pages_fetched"] == 3
+        first_token = mirror.token
+        assert first_token is not None
+
+        await rhino.send_command("delete_objects", {"ids": ids[:5], "confirm": True})
+        await rhino.send_command("modify_objects", {"objects": [{"id": ids[10], "translation": [3, 0, 0]}]})
+        stats = await mirror.sync(rhino, page_size=100)
+        assert not stats["full"]
+        assert stats["removed"] == 5 and stats["upserted"] == 1 and stats["pages_fetched"] == 1
+        assert mirror.token != first_token
+        assert mirror.objects == await listing()
+
+        stats = await mirror.sync(rhino, page_size=100)
+        assert (stats["upserted"], stats["removed"]) == (0, 0)
+
+    run(main())
+
+
+def test_expired_token_reloads_everything(fake_rhino, run):
+    fake = fake_rhino(objects=120)
+
+    async def main():
+        rhino = await get_async_rhino_connection()
+        mirror = DocumentMirror(**PARAMS)
+        await mirror.sync(rhino)
+        mirror.token = "another-session:0:0"
+        stats = await mirror.sync(rhino)
+        assert stats["full"] and stats["upserted"] == 120
+        assert sorted(mirror.objects) == sorted(fake.scene.objects)
+
+    run(main())
+
+
+def test_bbox_mirror_drops_objects_leaving_the_box(fake_rhino, run):
+    fake_rhino(objects=200)
+    bbox = [[-500, -500, -1000], [500, 500, 1000]]
+
+    async def main():
+        rhino = await get_async_rhino_connection()
+        mirror = DocumentMirror(**PARAMS, bbox=bbox)
+        await mirror.sync(rhino)
+        inside = sorted(mirror.objects)
+        assert inside and len(inside) < 200
+        await rhino.send_command("modify_objects", {"objects": [{"id": inside[0], "translation": [5000, 0, 0]}]})
+        stats = await mirror.sync(rhino)
+        assert not stats["full"] and stats["removed"] == 1
+        assert inside[0] not in mirror.objects
+        assert mirror.objects == await listing(bbox=bbox)
+
+    run(main())
+
+
+def test_aggregate_counts_every_object_and_updates_incrementally(fake_rhino, run):
+    fake = fake_rhino(objects=400)
+
+    async def main():
+        rhino = await get_async_rhino_connection()
+        first = await aggregate_document_inventory(rhino, sample_size=10, **PARAMS)
+        assert first["object_count"] == 400 and len(first["objects"]) == 10
+        assert sum(first["objects_by_type"].values()) == 400
+        assert first["sync"]["full"] and first["pages_fetched"] == 1
+
+        await rhino.send_command("delete_objects", {"ids": sorted(fake.scene.objects)[:3], "confirm": True})
+        second = await aggregate_document_inventory(rhino, sample_size=10, **PARAMS)
+        assert second["object_count"] == 397
+        assert second["sync"] == {"full": False, "upserted": 0, "removed": 3}
+
+    run(main())
+
+
+def test_aggregate_streams_documents_larger_than_the_mirror_cap(fake_rhino, run, monkeypatch):
+    fake = fake_rhino(objects=300)
+    monkeypatch.setattr(inventory, "MIRROR_MAX_OBJECTS", 250)
+
+    async def main():
+        rhino = await get_async_rhino_connection()
+        streamed = await aggregate_document_inventory(rhino, sample_size=5, page_size=100, **PARAMS)
+        mirror = inventory.document_mirror(**PARAMS)
+        assert mirror.oversized and not mirror.objects
+        assert streamed["object_count"] == 300 and "sync" not in streamed
+        assert sum(streamed["objects_by_layer"].values()) == 300
+
+        await rhino.send_command("delete_objects", {"ids": sorted(fake.scene.objects)[:60], "confirm": True})
+        shrunk = await aggregate_document_inventory(rhino, sample_size=5, page_size=100, **PARAMS)
+        assert shrunk["object_count"] == 240 and not mirror.oversized
+        mirrored = await aggregate_document_inventory(rhino, sample_size=5, page_size=100, **PARAMS)
+        assert mirrored["object_count"] == 240 and mirrored["sync"]["full"]
+        assert len(mirror.objects) == 240
+
+    run(main())
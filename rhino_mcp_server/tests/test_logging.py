@@ -0,0 +1,52 @@
+# Sampled command summaries and size-capped previews
+import json
+import logging
+
+from rhinomcp import server
+from rhinomcp.server import CommandLog, JsonLogFormatter, LogPreview
+
+
+def summaries(caplog):
+    return [record for record in caplog.records if record.levelno == logging.INFO and "calls=" in record.getMessage()]
+
+
+def test_info_summaries_are_sampled_per_command(caplog):
+    log = CommandLog(interval=3600)
+    with caplog.at_level(logging.INFO, logger=server.logger.name):
+        for _ in range(5):
+            log.record("get_document_info", 0.01, 100, 1000)
+        log.record("ping", 0.001, 10, 10, outcome="error")
+    emitted = summaries(caplog)
+    assert [record.rhino["command"] for record in emitted] == ["get_document_info", "ping"]
+    assert emitted[1].rhino["failures"] == 1
+
+
+def test_summaries_aggregate_the_calls_since_the_last_one(caplog):
+    log = CommandLog(interval=0)
+    with caplog.at_level(logging.INFO, logger=server.logger.name):
+        log.record("ping", 0.002, 10, 20)
+        log.record("ping", 0.004, 10, 20)
+    assert [record.rhino["calls"] for record in summaries(caplog)] == [1, 1]
+
+    log = CommandLog(interval=3600)
+    log.record("ping", 0.002, 10, 20)
+    for _ in range(3):
+        log.record("ping", 0.004, 10, 20)
+    log.interval = 0
+    with caplog.at_level(logging.INFO, logger=server.logger.name):
+        caplog.clear()
+        log.record("ping", 0.006, 10, 20)
+    (record,) = summaries(caplog)
+    assert record.rhino["calls"] == 4 and record.rhino["sent_bytes"] == 40 and record.rhino["max_ms"] == 6.0
+
+
+def test_previews_stay_small_for_large_payloads():
+    preview = str(LogPreview({"objects": [{"points": [[i, i, i] for i in range(10000)]}] * 1000}))
+    assert len(preview) <= server.LOG_PREVIEW_CHARS + 3
+
+
+def test_json_formatter_carries_the_structured_fields():
+    record = logging.LogRecord("RhinoMCPServer", logging.INFO, __file__, 1, "command=%s", ("ping",), None)
+    record.rhino = {"command": "ping", "calls": 2}
+    entry = json.loads(JsonLogFormatter().format(record))
+    assert entry["message"] == "command=ping" and entry["calls"] == 2 and entry["level"] == "INFO"
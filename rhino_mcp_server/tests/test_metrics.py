@@ -0,0 +1,55 @@
+# Command metrics: histograms, snapshots and the Prometheus rendering
+import json
+
+from rhinomcp import server
+from rhinomcp.metrics import CommandMetrics, CommandTiming, Histogram
+from rhinomcp.resources.metrics import rhino_metrics
+from rhinomcp.server import get_async_rhino_connection
+
+
+def test_histogram_quantiles_interpolate_inside_buckets():
+    histogram = Histogram((1, 2, 4))
+    for value in (0.5, 1.5, 1.5, 3, 10):
+        histogram.observe(value)
+    assert histogram.cumulative() == [1, 3, 4, 5]
+    assert histogram.quantile(0.5) == 1.75
+    assert histogram.quantile(1.0) == 10
+    assert Histogram((1,)).quantile(0.5) == 0.0
+
+
+def test_phases_split_the_duration():
+    timing = CommandTiming(encode=0.01, send=0.02, decode=0.03)
+    assert timing.phases(0.1)["wait"] == 0.1 - 0.06
+    assert timing.phases(0.01)["wait"] == 0.0
+
+
+def test_snapshot_orders_commands_by_total_time():
+    metrics = CommandMetrics()
+    for _ in range(3):
+        metrics.observe("ping", "ok", 0.001, CommandTiming(), 20, 20)
+    metrics.observe("open_file", "timeout", 2.0, CommandTiming(send=0.1), 100, 0)
+    snapshot = metrics.snapshot()
+    assert list(snapshot["commands"]) == ["open_file", "ping"]
+    assert snapshot["commands"]["ping"]["calls"] == 3
+    assert snapshot["commands"]["open_file"]["outcomes"] == {"timeout": 1}
+    text = metrics.prometheus_text()
+    assert 'rhinomcp_commands_total{command="ping",outcome="ok"} 3' in text
+    assert 'rhinomcp_command_duration_seconds_count{command="open_file"} 1' in text
+    metrics.reset()
+    assert metrics.snapshot()["commands"] == {}
+
+
+def test_connections_report_every_command(fake_rhino, run, monkeypatch):
+    fake_rhino(objects=50)
+    monkeypatch.setattr(server, "command_metrics", CommandMetrics())
+
+    async def main():
+        rhino = await get_async_rhino_connection()
+        await rhino.send_command("get_document_info", {"limit": 50})
+        await rhino.send_command("ping")
+
+    run(main())
+    commands = json.loads(rhino_metrics())["commands"]
+    assert commands["get_document_info"]["calls"] == 1
+    assert commands["get_document_info"]["received_bytes"]["total"] > 1000
+    assert commands["ping"]["outcomes"] == {"ok": 1}
@@ -0,0 +1,136 @@
+# ObjectInfoCache invalidation rules, and get_objects_info served from it
+import time
+
+from rhinomcp import object_cache as object_cache_module
+from rhinomcp.object_cache import ObjectInfoCache
+from rhinomcp.server import object_cache
+from rhinomcp.tools.get_object_info import get_object_info
+from rhinomcp.tools.get_objects_info import get_objects_info
+from rhinomcp.tools.modify_objects import modify_objects
+
+ID_A = "0f8fad5b-d9cb-469f-a165-70867728950e"
+ID_B = "7c9e6679-7425-40de-944b-e07fc1f90ae7"
+
+
+def cache_with(*ids):
+    cache = ObjectInfoCache(16)
+    cache.observe_revision(1)
+    for object_id in ids:
+        cache.put(cache.key(object_id, "obb_pose", False), {"id": object_id, "name": f"n-{object_id[:4]}"}, cache.epoch)
+    return cache
+
+
+def cached(cache, object_id):
+    return cache.get(cache.key(object_id, "obb_pose", False)) is not None
+
+
+def test_nothing_is_served_without_revisions():
+    cache = ObjectInfoCache(16)
+    cache.put(cache.key(ID_A, "obb_pose", False), {"id": ID_A}, cache.epoch)
+    assert not cached(cache, ID_A)
+
+
+def test_keys_ignore_braces_and_case():
+    cache = cache_with(ID_A)
+    assert cache.get(cache.key("{" + ID_A.upper() + "}", "obb_pose", False)) is not None
+
+
+def test_targeted_commands_drop_only_their_objects():
+    cache = cache_with(ID_A, ID_B)
+    cache.invalidate_for("modify_objects", {"objects": [{"id": ID_A, "translation": [1, 0, 0]}]})
+    assert not cached(cache, ID_A) and cached(cache, ID_B)
+    cache.invalidate_for("delete_objects", {"ids": [ID_B]})
+    assert not cached(cache, ID_B)
+
+
+def test_name_selectors_drop_matching_entries():
+    cache = cache_with(ID_A, ID_B)
+    cache.invalidate_for("modify_object", {"name": f"n-{ID_B[:4]}"})
+    assert cached(cache, ID_A) and not cached(cache, ID_B)
+
+
+def test_untargeted_commands_drop_everything():
+    cache = cache_with(ID_A, ID_B)
+    cache.invalidate_for("modify_objects", {"all": True, "translation": [1, 0, 0]})
+    assert not cached(cache, ID_A) and not cached(cache, ID_B)
+    cache = cache_with(ID_A)
+    cache.invalidate_for("run_command", {"command": "_Move"})
+    assert not cached(cache, ID_A)
+
+
+def test_batches_invalidate_per_command():
+    cache = cache_with(ID_A, ID_B)
+    epoch = cache.document_epoch
+    cache.invalidate_for("batch", {"commands": [{"type": "get_object_info", "params": {"id": ID_B}},
+                                                {"type": "delete_objects", "params": {"ids": [ID_A]}}]})
+    assert not cached(cache, ID_A) and cached(cache, ID_B)
+    assert cache.document_epoch == epoch + 1
+
+
+def test_read_only_commands_keep_entries_and_document_epoch():
+    cache = cache_with(ID_A)
+    epoch = cache.document_epoch
+    cache.invalidate_for("get_document_info", {})
+    assert cached(cache, ID_A) and cache.document_epoch == epoch
+    cache.invalidate_for("create_objects", {})  # New objects leave cached ones alone
+    assert cached(cache, ID_A) and cache.document_epoch == epoch + 1
+
+
+def test_revision_change_drops_everything():
+    cache = cache_with(ID_A)
+    epoch = cache.document_epoch
+    cache.observe_revision(2)
+    assert not cached(cache, ID_A)
+    assert cache.document_epoch == epoch + 1
+
+
+def test_late_results_from_an_older_epoch_are_not_stored():
+    cache = cache_with()
+    epoch = cache.epoch
+    cache.invalidate_for("delete_objects", {"ids": [ID_B]})
+    cache.put(cache.key(ID_A, "obb_pose", False), {"id": ID_A}, epoch)
+    assert not cached(cache, ID_A)
+
+
+def test_entries_expire_with_the_revision(monkeypatch):
+    cache = cache_with(ID_A)
+    now = time.monotonic()
+    monkeypatch.setattr(object_cache_module.time, "monotonic", lambda: now + object_cache_module.REVALIDATE_AFTER + 1)
+    assert not cached(cache, ID_A)
+
+
+def test_get_objects_info_uses_and_invalidates_the_cache(fake_rhino, run):
+    fake = fake_rhino(objects=20)
+    ids = sorted(fake.scene.objects)[:4]
+    selectors = [{"id": object_id} for object_id in ids]
+
+    async def main():
+        first = await get_objects_info(None, selectors)
+        sent = fake.commands["get_objects_info"]
+        again = await get_objects_info(None, selectors)
+        assert fake.commands["get_objects_info"] == sent  # All served from the cache
+        assert again == first
+        assert sorted(again) == ["geometry_detail", "include_world", "objects"]
+
+        await modify_objects(None, [{"id": ids[0], "translation": [5, 0, 0]}])
+        after = await get_objects_info(None, selectors)
+        assert fake.commands["get_objects_info"] == sent + 1
+        assert after["objects"][1:] == first["objects"][1:]
+        assert after["objects"][0] != first["objects"][0]
+        assert object_cache.hits >= 4 + 3
+
+    run(main())
+
+
+def test_get_object_info_normalises_its_cache_key(fake_rhino, run):
+    fake = fake_rhino(objects=5)
+    object_id = sorted(fake.scene.objects)[0]
+
+    async def main():
+        first = await get_object_info(None, id=object_id, geometry_detail=" OBB_Pose ", include_world=0)
+        sent = fake.commands["get_object_info"]
+        assert await get_object_info(None, id=object_id) == first
+        assert await get_object_info(None, id=object_id, geometry_detail="obb_pose", include_world=None) == first
+        assert fake.commands["get_object_info"] == sent
+
+    run(main())
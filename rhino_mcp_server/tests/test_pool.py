@@ -0,0 +1,168 @@
+# Connection pools: bounded checkout, the shared pipelined connection, health checks and reconnecting
+import asyncio
+import socket
+import threading
+
+import pytest
+
+from rhinomcp.server import AsyncRhinoConnectionPool, RhinoConnectionPool
+
+HANDLERS = {"echo": lambda params: params}
+
+
+def closed_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def test_checkouts_are_bounded_by_the_pool_size(plugin, run):
+    stub = plugin(HANDLERS)
+
+    async def main():
+        pool = AsyncRhinoConnectionPool(port=stub.port, size=2)
+        try:
+            first, second = await pool.checkout(), await pool.checkout()
+            assert first is not second
+            third = asyncio.ensure_future(pool.checkout())
+            await asyncio.sleep(0.05)
+            assert not third.done()  # Waits for a free connection
+            await pool.checkin(first)
+            assert await asyncio.wait_for(third, 1) is first
+            await pool.checkin(second)
+            await pool.checkin(first)
+            assert (await pool.send_command("echo", {"a": 1})) == {"a": 1}
+        finally:
+            await pool.close()
+        assert stub.received.count("negotiate") == 2
+
+    run(main())
+
+
+def meeting(parties):
+    """A handler that answers only once parties commands are being handled at the same time"""
+    barrier = threading.Barrier(parties, timeout=2)
+
+    def handler(params):
+        barrier.wait()
+        return params
+    return handler
+
+
+def test_concurrent_commands_share_one_pipelined_connection(plugin, run):
+    stub = plugin({**HANDLERS, "meet": meeting(3)})
+
+    async def main():
+        pool = AsyncRhinoConnectionPool(port=stub.port, size=4)
+        try:
+            assert (await pool.send_command("echo", {"a": 0})) == {"a": 0}
+            replies = await asyncio.gather(*(pool.send_command("meet", {"a": i}) for i in range(3)))
+            assert replies == [{"a": i} for i in range(3)]
+            assert (await pool.send_batch([{"type": "echo", "params": {"b": 1}}]))["results"][0]["result"] == {"b": 1}
+        finally:
+            await pool.close()
+        assert stub.received.count("negotiate") == 1
+
+    run(main())
+
+
+def test_legacy_peers_get_a_connection_each(plugin, run):
+    stub = plugin({**HANDLERS, "meet": meeting(2)}, features=())
+
+    async def main():
+        pool = AsyncRhinoConnectionPool(port=stub.port, size=4)
+        try:
+            replies = await asyncio.gather(*(pool.send_command("meet", {"a": i}) for i in range(2)))
+            assert replies == [{"a": 0}, {"a": 1}]
+            assert pool._shared is None and len(pool._idle) == 2
+        finally:
+            await pool.close()
+        assert stub.received.count("negotiate") == 2
+
+    run(main())
+
+
+def test_a_full_pool_hands_out_the_shared_connection(plugin, run):
+    stub = plugin(HANDLERS)
+
+    async def main():
+        pool = AsyncRhinoConnectionPool(port=stub.port, size=1)
+        try:
+            await pool.send_command("echo", {})
+            shared = pool._shared[0]
+            async with pool.connection() as exclusive:
+                assert exclusive is shared
+                waiting = asyncio.ensure_future(pool.send_command("echo", {"a": 1}))
+                await asyncio.sleep(0.05)
+                assert not waiting.done()  # No longer shared: waits for the checkin
+            assert await asyncio.wait_for(waiting, 1) == {"a": 1}
+            assert pool._shared[0] is shared
+        finally:
+            await pool.close()
+
+    run(main())
+
+
+def test_connections_closed_by_rhino_are_replaced(plugin, run):
+    stub = plugin(HANDLERS)
+
+    async def main():
+        pool = AsyncRhinoConnectionPool(port=stub.port, size=1)
+        try:
+            async with pool.connection() as first:
+                pass
+            stub.drop_clients()
+            await asyncio.sleep(0.05)
+            async with pool.connection() as second:
+                assert second is not first
+                assert (await second.send_command("echo", {"a": 2})) == {"a": 2}
+        finally:
+            await pool.close()
+
+    run(main())
+
+
+def test_idle_connections_are_pinged_before_reuse(plugin, run):
+    stub = plugin(HANDLERS)
+
+    async def main():
+        pool = AsyncRhinoConnectionPool(port=stub.port, size=1, idle_probe_after=3600)
+        try:
+            async with pool.connection() as first:
+                pass
+            async with pool.connection() as again:
+                assert again is first
+            assert "ping" not in stub.received  # Recently used: only the closed-socket check
+
+            pool.idle_probe_after = 0
+            async with pool.connection() as probed:
+                assert probed is first  # The stub rejects ping, which still proves it is alive
+            assert stub.received.count("ping") == 1
+        finally:
+            await pool.close()
+
+    run(main())
+
+
+def test_connecting_gives_up_after_the_retries(run):
+    async def main():
+        pool = AsyncRhinoConnectionPool(port=closed_port(), size=1, connect_retries=3, backoff=0.01)
+        with pytest.raises(ConnectionError, match="Could not connect to Rhino"):
+            await pool.checkout()
+        assert not pool.connected  # The failed slot was released
+
+    run(main())
+
+
+def test_blocking_pool_replaces_dead_connections(plugin):
+    stub = plugin(HANDLERS)
+    pool = RhinoConnectionPool(port=stub.port, size=1)
+    try:
+        with pool.connection() as first:
+            assert first.send_command("echo", {"a": 3}) == {"a": 3}
+        stub.drop_clients()
+        with pool.connection() as second:
+            assert second is not first
+        assert pool.send_command("echo", {"a": 4}) == {"a": 4}
+    finally:
+        pool.close()
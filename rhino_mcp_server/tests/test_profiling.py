@@ -0,0 +1,28 @@
+# Per-call tool profiles written by the profiling hook
+from rhinomcp.profiling import aggregate, load_summaries, start_profiling, stop_profiling
+from rhinomcp.server import mcp
+
+
+def test_profiled_calls_write_a_summary_with_their_rhino_commands(fake_rhino, run, tmp_path):
+    fake_rhino(objects=200)
+
+    async def main():
+        await mcp.call_tool("get_document_info", {"limit": 50})
+        await mcp.call_tool("get_document_info", {"limit": 10, "all_pages": True})
+        await mcp.call_tool("get_viewport_info", {})
+
+    profiler = start_profiling(tmp_path, tools=["get_document_info"], memory=True)
+    try:
+        run(main())
+    finally:
+        stop_profiling()
+
+    assert (profiler.profiled, profiler.skipped) == (2, 0)
+    summaries = load_summaries(tmp_path)
+    assert [summary["tool"] for summary in summaries] == ["get_document_info"] * 2
+    for summary in summaries:
+        assert (tmp_path / summary["profile"]).exists()
+        assert summary["rhino_commands"] >= 1 and summary["top_functions"]
+        assert {"encode", "send", "wait", "decode"} <= set(summary["commands"][0])
+        assert summary["memory"]["peak_bytes"] > 0
+    assert aggregate(summaries)["get_document_info"]["calls"] == 2
@@ -0,0 +1,278 @@
+# Wire protocol against a scripted plugin: negotiation, request ids, compression, attachments
+import asyncio
+import base64
+import time
+
+import pytest
+
+from rhinomcp import server
+from rhinomcp.server import (
+    COMPRESSION_ZLIB,
+    FEATURE_ATTACHMENTS,
+    FEATURE_REQUEST_IDS,
+    FLAG_COMPRESSED,
+    FRAME_HEADER,
+    FRAMING_LEGACY,
+    FRAMING_LENGTH_PREFIXED,
+    AsyncRhinoConnection,
+    RhinoConnection,
+    RhinoError,
+    RhinoTimeoutError,
+    encode_frame,
+    pack_message,
+    unpack_message,
+)
+
+
+def slow(params):
+    time.sleep(params.get("seconds", 0.3))
+    return {"slept": params.get("seconds", 0.3)}
+
+
+HANDLERS = {"echo": lambda params: params, "slow": slow}
+
+
+def test_encode_frame_prefixes_length_and_flags():
+    frame = encode_frame(b"abc", 1)
+    assert FRAME_HEADER.unpack(frame[:FRAME_HEADER.size]) == (3, 1)
+    assert frame[FRAME_HEADER.size:] == b"abc"
+
+
+def test_negotiation_switches_to_frames(plugin):
+    stub = plugin(HANDLERS)
+    connection = RhinoConnection("127.0.0.1", stub.port)
+    assert connection.connect()
+    try:
+        assert connection.framing == FRAMING_LENGTH_PREFIXED
+        assert connection.send_command("echo", {"a": 1}) == {"a": 1}
+        large = {"text": "x" * 3_000_000}  # Arrives over many recv calls
+        assert connection.send_command("echo", large) == large
+    finally:
+        connection.disconnect()
+    assert stub.received == ["negotiate", "echo", "echo"]
+
+
+def test_plugins_without_negotiate_stay_on_legacy_json(plugin):
+    stub = plugin(HANDLERS, framing=False)
+    connection = RhinoConnection("127.0.0.1", stub.port)
+    assert connection.connect()
+    try:
+        assert connection.framing == FRAMING_LEGACY
+        assert connection.send_command("echo", {"a": [1, 2]}) == {"a": [1, 2]}
+    finally:
+        connection.disconnect()
+
+
+def test_error_replies_raise_with_the_plugin_message(plugin):
+    def fail(params):
+        raise ValueError("No object with that id")
+
+    stub = plugin({"fail": fail})
+    connection = RhinoConnection("127.0.0.1", stub.port)
+    try:
+        with pytest.raises(Exception, match="No object with that id"):
+            connection.send_command("fail")
+    finally:
+        connection.disconnect()
+
+
+@pytest.mark.parametrize("framing", [True, False])
+def test_async_connection_speaks_both_framings(plugin, run, framing):
+    stub = plugin(HANDLERS, framing=framing, features=())
+
+    async def main():
+        connection = AsyncRhinoConnection("127.0.0.1", stub.port)
+        assert await connection.connect()
+        try:
+            assert connection.framing == (FRAMING_LENGTH_PREFIXED if framing else FRAMING_LEGACY)
+            # Concurrent callers share the connection one command at a time
+            replies = await asyncio.gather(*(connection.send_command("echo", {"n": n}) for n in range(20)))
+            assert replies == [{"n": n} for n in range(20)]
+            with pytest.raises(RhinoError, match="Unknown command type: nope"):
+                await connection.send_command("nope")
+            assert (await connection.send_command("echo", {"after": "error"})) == {"after": "error"}
+        finally:
+            await connection.disconnect()
+
+    run(main())
+
+
+def test_async_connection_reconnects_after_the_plugin_closes_it(plugin, run):
+    stub = plugin(HANDLERS)
+
+    async def main():
+        connection = AsyncRhinoConnection("127.0.0.1", stub.port)
+        try:
+            assert (await connection.send_command("echo", {"a": 1})) == {"a": 1}
+            stub.drop_clients()
+            with pytest.raises(Exception, match="Connection to Rhino lost"):
+                await connection.send_command("echo", {"a": 2})
+            assert not connection.connected
+            assert (await connection.send_command("echo", {"a": 3})) == {"a": 3}
+        finally:
+            await connection.disconnect()
+        assert stub.received.count("negotiate") == 2
+
+    run(main())
+
+
+def test_request_ids_are_granted_only_on_framed_connections(plugin, run):
+    async def features(**options):
+        connection = AsyncRhinoConnection("127.0.0.1", plugin(HANDLERS, **options).port)
+        assert await connection.connect()
+        try:
+            return connection.features, connection.pipelined
+        finally:
+            await connection.disconnect()
+
+    assert run(features()) == (frozenset({FEATURE_REQUEST_IDS, FEATURE_ATTACHMENTS}), True)
+    assert run(features(features=())) == (frozenset(), False)
+    assert run(features(framing=False)) == (frozenset(), False)
+
+
+def test_replies_are_matched_to_requests_by_id(plugin, run):
+    stub = plugin(HANDLERS)
+
+    async def main():
+        connection = AsyncRhinoConnection("127.0.0.1", stub.port)
+        finished = []
+
+        async def send(command_type, params):
+            result = await connection.send_command(command_type, params)
+            finished.append(command_type)
+            return result
+
+        try:
+            assert await connection.connect() and connection.pipelined
+            replies = await asyncio.gather(send("slow", {"seconds": 0.3}), send("echo", {"n": 1}))
+        finally:
+            await connection.disconnect()
+        assert finished == ["echo", "slow"]  # The fast reply overtook the slow one
+        assert replies == [{"slept": 0.3}, {"n": 1}]
+
+    run(main())
+
+
+def test_late_replies_after_a_timeout_are_discarded(plugin, run):
+    stub = plugin(HANDLERS)
+
+    async def main():
+        connection = AsyncRhinoConnection("127.0.0.1", stub.port)
+        try:
+            with pytest.raises(RhinoTimeoutError):
+                await connection.send_command("slow", {"seconds": 0.3}, timeout=0.1)
+            assert connection.connected  # The connection is kept; the late reply is dropped by id
+            await asyncio.sleep(0.3)
+            assert (await connection.send_command("echo", {"n": 2})) == {"n": 2}
+        finally:
+            await connection.disconnect()
+
+    run(main())
+
+
+def test_sync_connection_skips_stale_replies(plugin):
+    stub = plugin(HANDLERS)
+    connection = RhinoConnection("127.0.0.1", stub.port)
+    try:
+        assert connection.connect() and FEATURE_REQUEST_IDS in connection.features
+        with pytest.raises(RhinoTimeoutError):
+            connection.send_command("slow", {"seconds": 0.3}, timeout=0.1)
+        assert connection.sock is not None
+        assert connection.send_command("echo", {"n": 3}) == {"n": 3}
+    finally:
+        connection.disconnect()
+
+
+def test_pack_message_compresses_only_above_threshold():
+    small, large = b"x" * 100, b"y" * 5000
+    assert pack_message(small, COMPRESSION_ZLIB, 1024)[4] == 0
+    frame = pack_message(large, COMPRESSION_ZLIB, 1024)
+    assert frame[4] == FLAG_COMPRESSED and len(frame) < len(large)
+    assert unpack_message(frame[4], frame[5:]) == large
+    assert pack_message(large, None, 1024)[4] == 0
+
+
+@pytest.mark.parametrize("granted", [True, False])
+def test_compressed_replies_decode_like_plain_ones(plugin, run, monkeypatch, granted):
+    stub = plugin(HANDLERS, compression=granted)
+    flags_seen = []
+
+    def spy(flags, payload):
+        flags_seen.append(flags)
+        return unpack_message(flags, payload)
+
+    monkeypatch.setattr(server, "unpack_message", spy)
+    params = {"values": list(range(5000))}
+
+    async def main():
+        connection = AsyncRhinoConnection(host="127.0.0.1", port=stub.port,
+                                          request_compression=True, compression_threshold=1024)
+        assert await connection.connect()
+        try:
+            assert connection.compression == (COMPRESSION_ZLIB if granted else None)
+            assert await connection.send_command("echo", params) == params
+            assert await connection.send_command("echo", {"small": 1}) == {"small": 1}
+        finally:
+            await connection.disconnect()
+
+    run(main())
+    assert [bool(flags & FLAG_COMPRESSED) for flags in flags_seen] == [granted, False]
+
+
+def test_sync_connection_compresses_both_ways(plugin):
+    stub = plugin(HANDLERS)
+    connection = RhinoConnection("127.0.0.1", stub.port, request_compression=True, compression_threshold=1024)
+    assert connection.connect()
+    try:
+        assert connection.compression == COMPRESSION_ZLIB
+        params = {"text": "abc" * 10000}
+        assert connection.send_command("echo", params) == params
+    finally:
+        connection.disconnect()
+
+
+PNG = b"\x89PNG" + bytes(range(256)) * 16
+
+
+def capture(params):
+    return {"png_base64": PNG, "metadata": {"width": params.get("width", 0)}}
+
+
+def test_binary_results_arrive_as_attachment_frames(plugin, run):
+    stub = plugin({"capture_view": capture})
+
+    async def main():
+        connection = AsyncRhinoConnection(host="127.0.0.1", port=stub.port)
+        assert await connection.connect()
+        try:
+            assert FEATURE_ATTACHMENTS in connection.features
+            return await connection.send_command("capture_view", {"width": 64})
+        finally:
+            await connection.disconnect()
+
+    result = run(main())
+    assert isinstance(result["png_base64"], memoryview) and bytes(result["png_base64"]) == PNG
+    assert result["metadata"]["width"] == 64
+
+    connection = RhinoConnection("127.0.0.1", stub.port)
+    assert connection.connect()
+    try:
+        result = connection.send_command("capture_view", {})
+        assert bytes(result["png_base64"]) == PNG
+        assert connection.send_command("capture_view", {})["metadata"] == {"width": 0}
+    finally:
+        connection.disconnect()
+
+
+def test_binary_results_are_base64_without_attachments(plugin, run):
+    stub = plugin({"capture_view": capture}, features=(FEATURE_REQUEST_IDS,))
+
+    async def main():
+        connection = AsyncRhinoConnection(host="127.0.0.1", port=stub.port)
+        assert await connection.connect()
+        try:
+            return await connection.send_command("capture_view", {})
+        finally:
+            await connection.disconnect()
+
+    assert base64.b64decode(run(main())["png_base64"]) == PNG
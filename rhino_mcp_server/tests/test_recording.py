@@ -0,0 +1,73 @@
+# Recording sessions against the fake and replaying them
+import pytest
+
+from rhinomcp.recording import (
+    ReplayServer,
+    read_session,
+    read_session_header,
+    replay_session,
+    start_recording,
+    stop_recording,
+    summarize_session,
+)
+from rhinomcp.server import AsyncRhinoConnectionPool, RhinoError, get_async_rhino_connection
+
+
+@pytest.fixture
+def recorded(fake_rhino, run, tmp_path):
+    """A session with paged reads, a capture and an error reply, recorded from the fake"""
+    fake_rhino(objects=120, capture_bytes=4096)
+    path = tmp_path / "session.rmcp"
+
+    async def main():
+        rhino = await get_async_rhino_connection()
+        replies = {
+            "page": await rhino.send_command("get_document_info", {"limit": 100}),
+            "capture": await rhino.send_command("capture_view", {"width": 32}),
+        }
+        with pytest.raises(RhinoError):
+            await rhino.send_command("not_a_command", {})
+        return replies
+
+    start_recording(path)
+    try:
+        replies = run(main())
+    finally:
+        stop_recording()
+    return path, replies
+
+
+def test_recordings_keep_every_command_and_attachment(recorded):
+    path, replies = recorded
+    assert read_session_header(path)["format"] == "rhinomcp-session"
+    records = list(read_session(path))
+    assert [record.type for record in records] == ["get_document_info", "capture_view", "not_a_command"]
+    assert records[0].response["result"] == replies["page"]
+    assert bytes(records[1].response["result"]["png_base64"]) == bytes(replies["capture"]["png_base64"])
+    assert records[2].outcome != "ok"
+    stats = summarize_session(records)
+    assert stats["get_document_info"]["calls"] == 1 and stats["not_a_command"]["errors"] == 1
+
+
+def test_replays_answer_like_the_recorded_session(recorded, run):
+    path, replies = recorded
+    replay = ReplayServer(path, speed=0).start()
+
+    async def main():
+        pool = AsyncRhinoConnectionPool(port=replay.port)
+        try:
+            page = await pool.send_command("get_document_info", {"limit": 100})
+            other = await pool.send_command("capture_view", {"width": 999})  # Falls back to the type
+            timings = await replay_session(list(read_session(path)), pool, repeat=3, concurrency=2)
+            return page, other, timings
+        finally:
+            await pool.close()
+
+    try:
+        page, capture, timings = run(main())
+    finally:
+        replay.stop()
+    assert page == replies["page"]
+    assert bytes(capture["png_base64"]) == bytes(replies["capture"]["png_base64"])
+    assert (timings["get_document_info"]["calls"], timings["get_document_info"]["errors"]) == (3, 0)
+    assert timings["not_a_command"]["errors"] == 3
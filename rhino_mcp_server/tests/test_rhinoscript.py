@@ -0,0 +1,36 @@
+# The rhinoscriptsyntax reference: lazy loading and lookups
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import rhinomcp
+from rhinomcp.static.rhinoscriptsyntax import (
+    get_rhinoscript_function,
+    load_rhinoscriptsyntax,
+    rhinoscript_function_names,
+    rhinoscript_module_names,
+)
+
+
+def test_importing_the_package_does_not_load_the_table():
+    probe = ("import rhinomcp; from rhinomcp.static.rhinoscriptsyntax import load_rhinoscriptsyntax; "
+             "print(load_rhinoscriptsyntax.cache_info().currsize)")
+    completed = subprocess.run([sys.executable, "-c", probe], capture_output=True, text=True,
+                               env={**os.environ, "PYTHONPATH": str(Path(rhinomcp.__file__).parents[1])})
+    assert completed.stdout.strip() == "0", completed.stderr
+
+
+def test_lookups_by_name_and_module():
+    modules = rhinoscript_module_names()
+    assert "curve" in modules and "layer" in modules
+    function = get_rhinoscript_function("AddLine")
+    assert function["ModuleName"] == "curve" and "Signature" in function
+    assert get_rhinoscript_function(" addline ") is function
+    assert get_rhinoscript_function("NotAFunction") is None
+    assert "AddLine" in rhinoscript_function_names(["curve"])
+    assert "AddLine" not in rhinoscript_function_names(["layer"])
+
+
+def test_the_old_module_attribute_still_works():
+    assert rhinomcp.rhinoscriptsyntax_json is load_rhinoscriptsyntax()
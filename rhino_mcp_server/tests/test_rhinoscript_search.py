@@ -0,0 +1,40 @@
+# Ranked search over the rhinoscriptsyntax reference
+from rhinomcp.rhinoscript_search import FunctionSearchIndex, rhinoscript_search_index, terms
+from rhinomcp.tools.search_rhinoscript_functions import search_rhinoscript_functions
+
+
+def names(hits):
+    return [function["Name"] for function, _ in hits]
+
+
+def test_terms_keep_identifiers_whole_and_split():
+    assert terms("AddLoftSrf of curves") == ["addloftsrf", "add", "loft", "srf", "curve"]
+
+
+def test_natural_queries_rank_the_right_functions_first():
+    index = rhinoscript_search_index()
+    assert "AddLoftSrf" in names(index.search("loft curves into surface", 3))
+    assert names(index.search("OffsetCurve", 1)) == ["OffsetCurve"]
+    assert "OffsetCurve" in names(index.search("ofset curve", 5))  # Typo tolerated
+    hits = index.search("add", 10, modules=["layer"])
+    assert hits and all(function["ModuleName"] == "layer" for function, _ in hits)
+    scores = [score for _, score in index.search("circle", 10)]
+    assert scores == sorted(scores, reverse=True)
+
+
+def test_exact_terms_outrank_similar_ones():
+    index = FunctionSearchIndex([{"ModuleName": "demo", "functions": [
+        {"Name": "AddWidget", "Signature": "AddWidget(size)", "Description": "Adds a widget", "ModuleName": "demo"},
+        {"Name": "DeleteGadget", "Signature": "DeleteGadget(id)", "Description": "Removes a gadget",
+         "ModuleName": "demo"},
+    ]}])
+    assert names(index.search("widget", 5))[0] == "AddWidget"
+    assert names(index.search("gadgets", 5))[0] == "DeleteGadget"
+    assert index.search("unrelated", 5) == []
+
+
+def test_tool_returns_summaries_and_rejects_empty_queries(run):
+    result = run(search_rhinoscript_functions(None, "add line between points", k=3))
+    assert len(result["matches"]) == 3 and result["matches"][0]["name"]
+    assert {"name", "module", "signature", "score"} <= set(result["matches"][0])
+    assert "error" in run(search_rhinoscript_functions(None, "  "))
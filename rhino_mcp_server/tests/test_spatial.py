@@ -0,0 +1,222 @@
+# BoxTree and SpatialIndex against brute force, and query_region against the fake
+import math
+import random
+
+from rhinomcp import object_cache as object_cache_module
+from rhinomcp.fake_rhino import SUPPORTED_FEATURES
+from rhinomcp.inventory import DocumentMirror
+from rhinomcp.server import FEATURE_REVISIONS, get_async_rhino_connection
+from rhinomcp.spatial import BBOX_MODES, BoxTree, SpatialIndex, box_distance2, box_matches, box_of
+from rhinomcp.tools.query_region import _query_rhino, query_region
+
+
+def random_boxes(count, seed=1):
+    rng = random.Random(seed)
+    boxes = {}
+    for i in range(count):
+        lo = [rng.uniform(-100, 100) for _ in range(3)]
+        size = [rng.uniform(0, 10) for _ in range(3)]
+        boxes[f"{i:05d}"] = box_of([lo, [lo[j] + size[j] for j in range(3)]])
+    return boxes
+
+
+def brute_box(boxes, query, mode):
+    return sorted(object_id for object_id, box in boxes.items() if box_matches(query, box, mode))
+
+
+def brute_nearest(boxes, point, k=None, radius=None):
+    limit2 = radius * radius if radius is not None else math.inf
+    found = sorted((box_distance2(point, box), object_id) for object_id, box in boxes.items())
+    found = [(object_id, math.sqrt(d2)) for d2, object_id in found if d2 <= limit2]
+    return found[:k] if k is not None else found
+
+
+def mirror_of(boxes):
+    mirror = DocumentMirror()
+    mirror.version = mirror.reloaded_at = 1
+    mirror.objects = {object_id: {"id": object_id, "bbox": [list(box[:3]), list(box[3:])]}
+                      for object_id, box in boxes.items()}
+    return mirror
+
+
+def apply_changes(mirror, upserted, removed):
+    """What an incremental sync does to the mirror"""
+    mirror.version += 1
+    for object_id, box in upserted.items():
+        mirror.objects[object_id] = {"id": object_id, "bbox": [list(box[:3]), list(box[3:])]}
+        mirror.changed_at[object_id] = mirror.version
+    for object_id in removed:
+        mirror.objects.pop(object_id, None)
+        mirror.changed_at[object_id] = mirror.version
+
+
+def distances(result):
+    return [round(distance, 9) for _, distance in result]
+
+
+def test_box_of_orders_corners_and_rejects_malformed_input():
+    assert box_of([[1, 5, 3], [0, 2, 4]]) == (0, 2, 3, 1, 5, 4)
+    assert box_of([[1, 2], [3, 4]]) is None
+    assert box_of(None) is None
+
+
+def test_box_tree_search_finds_every_intersecting_box():
+    boxes = random_boxes(2000)
+    tree = BoxTree((box, object_id) for object_id, box in boxes.items())
+    assert len(tree) == 2000
+    rng = random.Random(2)
+    for _ in range(50):
+        lo = [rng.uniform(-110, 90) for _ in range(3)]
+        query = box_of([lo, [v + rng.uniform(1, 40) for v in lo]])
+        assert sorted(object_id for _, object_id in tree.search(query)) == brute_box(boxes, query, "intersects")
+    assert BoxTree(()).search((0, 0, 0, 1, 1, 1)) == []
+
+
+def test_box_tree_nearest_yields_increasing_distances():
+    boxes = random_boxes(500)
+    tree = BoxTree((box, object_id) for object_id, box in boxes.items())
+    order = [d2 for d2, _, _ in tree.nearest([3, -7, 12])]
+    assert len(order) == 500 and order == sorted(order)
+
+
+def test_index_queries_match_brute_force_in_every_mode():
+    boxes = random_boxes(1500)
+    index = SpatialIndex()
+    index.update(mirror_of(boxes))
+    query = box_of([[-30, -30, -30], [30, 30, 30]])
+    for mode in BBOX_MODES:
+        assert index.query_box(query, mode) == brute_box(boxes, query, mode)
+    point = [10, 20, -5]
+    assert distances(index.nearest(point, k=25)) == distances(brute_nearest(boxes, point, k=25))
+    assert distances(index.nearest(point, radius=15)) == distances(brute_nearest(boxes, point, radius=15))
+    assert distances(index.nearest(point, k=5, radius=15)) == distances(brute_nearest(boxes, point, 5, 15))
+
+
+def test_index_overlays_changes_until_a_rebuild():
+    boxes = random_boxes(1000)
+    mirror = mirror_of(boxes)
+    index = SpatialIndex()
+    index.update(mirror)
+    assert index.rebuilds == 1
+
+    moved, removed = "00003", "00004"
+    boxes[moved] = box_of([[500, 500, 500], [501, 501, 501]])
+    del boxes[removed]
+    apply_changes(mirror, {moved: boxes[moved]}, [removed])
+    index.update(mirror)
+    assert index.rebuilds == 1 and {moved, removed} <= index.masked
+
+    assert index.query_box(box_of([[499, 499, 499], [502, 502, 502]])) == [moved]
+    query = box_of([[-100, -100, -100], [100, 100, 100]])
+    for mode in BBOX_MODES:
+        assert index.query_box(query, mode) == brute_box(boxes, query, mode)
+    point = [400, 400, 400]
+    assert index.nearest(point, k=3)[0][0] == moved
+    assert distances(index.nearest(point, k=3)) == distances(brute_nearest(boxes, point, k=3))
+
+
+def test_query_region_index_agrees_with_rhino(fake_rhino, run):
+    fake_rhino(objects=300)
+    bbox = [[-300, -300, -1000], [300, 300, 1000]]
+
+    async def main():
+        first = await query_region(None, bbox=bbox, limit=1000)
+        assert first["source"] == "index" and first["sync"]["full"]
+        again = await query_region(None, bbox=bbox, bbox_mode="contained", limit=1000)
+        assert again["source"] == "index" and again["sync"] is None
+
+        rhino = await get_async_rhino_connection()
+        for mode in BBOX_MODES:
+            indexed = await query_region(None, bbox=bbox, bbox_mode=mode, limit=1000)
+            direct = await _query_rhino(rhino, bbox, mode, box_of(bbox), None, None, None, 1000)
+            assert [o["id"] for o in indexed["objects"]] == [o["id"] for o in direct["objects"]]
+            assert indexed["matched"] == direct["matched"]
+
+        point = [20, -40, 0]
+        indexed = await query_region(None, point=point, k=10, radius=400)
+        direct = await _query_rhino(rhino, None, "intersects", box_of([[v - 400 for v in point], [v + 400 for v in point]]),
+                                    point, 400, 10, 100)
+        assert [o["distance"] for o in indexed["objects"]] == [o["distance"] for o in direct["objects"]]
+
+    run(main())
+
+
+def test_query_region_resyncs_after_changes(fake_rhino, run, monkeypatch):
+    fake = fake_rhino(objects=100)
+    target = sorted(fake.scene.objects)[0]
+    far = [[8000, 8000, 8000], [10000, 10000, 10000]]
+
+    async def main():
+        assert (await query_region(None, bbox=far))["matched"] == 0
+        rhino = await get_async_rhino_connection()
+        await rhino.send_command("modify_objects", {"objects": [{"id": target, "translation": [9050, 9050, 9050]}]})
+        moved = await query_region(None, bbox=far)
+        assert moved["source"] == "index" and not moved["sync"]["full"]
+        assert [o["id"] for o in moved["objects"]] == [target]
+
+        # Edited in Rhino itself: seen through the revision once it is checked again
+        monkeypatch.setattr(object_cache_module, "REVALIDATE_AFTER", 0)
+        before = moved["objects"][0]["bbox"]
+        fake.scene.edit_externally(target)
+        edited = await query_region(None, bbox=far)
+        assert edited["sync"] is not None and edited["sync"]["upserted"] == 1
+        assert edited["objects"][0]["bbox"][0][0] == before[0][0] + 1
+
+    run(main())
+
+
+def test_query_region_sees_objects_created_or_copied_through_mcp(fake_rhino, run):
+    fake = fake_rhino(objects=50)
+    far = [[8000, 8000, 8000], [10000, 10000, 10000]]
+
+    async def main():
+        assert (await query_region(None, bbox=far))["matched"] == 0
+        rhino = await get_async_rhino_connection()
+        point = {"type": "POINT", "params": {"x": 9000, "y": 9000, "z": 9000}}
+        created = await rhino.send_command("create_objects", {"pt": point})
+        found = await query_region(None, bbox=far)
+        assert [o["id"] for o in found["objects"]] == [created["pt"]["id"]]
+
+        source = sorted(fake.scene.objects)[0]
+        await rhino.send_command("copy_objects", {"objects": [{"id": source, "translation": [9000, 9000, 9000]}]})
+        assert (await query_region(None, bbox=[[-10000] * 3, [10000] * 3], limit=1000))["matched"] == 52
+
+    run(main())
+
+
+def test_tokenless_plugins_reuse_the_index_for_nearest_queries(fake_rhino, run, monkeypatch):
+    fake = fake_rhino(objects=150)
+    monkeypatch.setattr(fake.scene, "change_token", lambda: None)
+    point = [0, 0, 0]
+
+    async def main():
+        first = await query_region(None, point=point, k=5)
+        assert first["source"] == "index" and first["sync"]["full"]
+        walks = fake.commands["get_document_info"]
+        again = await query_region(None, point=point, k=5)
+        assert again["source"] == "index" and again["sync"] is None
+        assert fake.commands["get_document_info"] == walks
+        assert again["objects"] == first["objects"]
+
+        rhino = await get_async_rhino_connection()
+        await rhino.send_command("delete_objects", {"ids": [first["objects"][0]["id"]], "confirm": True})
+        forwarded = await query_region(None, point=point, k=5, radius=5000)
+        assert forwarded["source"] == "rhino"
+        rebuilt = await query_region(None, point=point, k=5)
+        assert rebuilt["source"] == "index" and rebuilt["sync"]["full"]
+        assert [o["id"] for o in rebuilt["objects"]] == [o["id"] for o in forwarded["objects"]]
+
+    run(main())
+
+
+def test_tokenless_plugins_without_revisions_walk_rhino_every_time(fake_rhino, run, monkeypatch):
+    fake = fake_rhino(objects=150, features=tuple(f for f in SUPPORTED_FEATURES if f != FEATURE_REVISIONS))
+    monkeypatch.setattr(fake.scene, "change_token", lambda: None)
+
+    async def main():
+        first = await query_region(None, point=[0, 0, 0], k=5)
+        second = await query_region(None, point=[0, 0, 0], k=5)
+        assert second["source"] == "rhino"
+        assert [o["id"] for o in second["objects"]] == [o["id"] for o in first["objects"]]
+
+    run(main())
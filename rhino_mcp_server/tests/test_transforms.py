@@ -0,0 +1,91 @@
+# normalize_transforms on the NumPy and pure-Python paths
+import copy
+import math
+
+import pytest
+
+from rhinomcp import transforms
+from rhinomcp.transforms import (
+    NEAR_ROTATION_TOLERANCE,
+    check_flat_vectors,
+    normalize_rotation_matrix,
+    normalize_transform,
+    normalize_transforms,
+)
+
+IDENTITY = [[1, 0, 0], [0, 1, 0], [0, 0, 1]]
+c, s = math.cos(0.3), math.sin(0.3)
+ROTATION = [[c, -s, 0], [s, c, 0], [0, 0, 1]]
+ROUNDED = [[round(v, 3) for v in row] for row in ROTATION]  # Off by ~1e-4: near a rotation
+
+
+@pytest.fixture(params=["numpy", "python"])
+def path(request, monkeypatch):
+    if request.param == "python":
+        monkeypatch.setattr(transforms, "np", None)
+    elif transforms.np is None:
+        pytest.skip("NumPy is not installed")
+    return request.param
+
+
+def orthonormal_error(m):
+    return max(abs(sum(m[k][i] * m[k][j] for k in range(3)) - (i == j)) for i in range(3) for j in range(3))
+
+
+def test_valid_entries_pass_through_unchanged(path):
+    entries = [{"rotation_matrix": ROTATION, "translation": [1, 2, 3], "scale": [1, 2, 0.5]},
+               {"id": "x"}, {"pivot": [0, 0, 0], "rotation_matrix": IDENTITY}]
+    result = normalize_transforms(entries)
+    assert all(a is b for a, b in zip(result, entries))
+
+
+def test_near_rotations_are_replaced_by_the_nearest_rotation(path):
+    entries = [{"rotation_matrix": ROUNDED, "translation": [0, 0, 1]}]
+    before = copy.deepcopy(entries)
+    result = normalize_transforms(entries)
+    assert entries == before  # The caller's entries are not modified
+    fixed = result[0]["rotation_matrix"]
+    assert orthonormal_error(fixed) < 1e-12
+    assert max(abs(fixed[i][j] - ROTATION[i][j]) for i in range(3) for j in range(3)) < 1e-3
+    assert result[0]["translation"] == [0, 0, 1]
+
+
+def test_both_paths_find_the_same_rotation(monkeypatch):
+    if transforms.np is None:
+        pytest.skip("NumPy is not installed")
+    with_numpy = normalize_transform({"rotation_matrix": ROUNDED})["rotation_matrix"]
+    monkeypatch.setattr(transforms, "np", None)
+    without = normalize_transform({"rotation_matrix": ROUNDED})["rotation_matrix"]
+    assert max(abs(with_numpy[i][j] - without[i][j]) for i in range(3) for j in range(3)) < 1e-12
+
+
+@pytest.mark.parametrize("entry, message", [
+    ({"rotation_matrix": [[-1, 0, 0], [0, 1, 0], [0, 0, 1]]}, r"objects\[1\].rotation_matrix is not a rotation"),
+    ({"rotation_matrix": [[1, 0, 0], [0, 1, 0], [0, 0, 0]]}, "is not a rotation"),
+    ({"rotation_matrix": [[1 + 10 * NEAR_ROTATION_TOLERANCE, 0, 0], [0, 1, 0], [0, 0, 1]]}, "is not a rotation"),
+    ({"rotation_matrix": [[1, 0, 0], [0, 1, 0]]}, "must be a 3x3 matrix"),
+    ({"rotation_matrix": [[math.nan, 0, 0], [0, 1, 0], [0, 0, 1]]}, "finite"),
+    ({"translation": [0, math.inf, 0]}, r"objects\[1\].translation must contain only finite"),
+    ({"pivot": [0, 0]}, r"objects\[1\].pivot must be \[x, y, z\]"),
+    ({"scale": [1, 0, 1]}, "factors must be non-zero"),
+    ({"scale": ["a", 1, 1]}, r"must be \[x, y, z\]"),
+])
+def test_bad_transforms_name_the_entry(path, entry, message):
+    with pytest.raises(ValueError, match=message):
+        normalize_transforms([{"rotation_matrix": IDENTITY}, entry])
+
+
+def test_single_entries_name_only_the_field(path):
+    with pytest.raises(ValueError, match="^scale factors"):
+        normalize_transform({"scale": [0, 1, 1]})
+    assert normalize_rotation_matrix(ROTATION) == (ROTATION, False)
+    assert normalize_rotation_matrix(ROUNDED)[1]
+    with pytest.raises(ValueError, match="is required"):
+        normalize_rotation_matrix(None)
+
+
+def test_flat_vectors(path):
+    check_flat_vectors([0, 1, 2.5, 3, 4, 5], "translations")
+    for values in ([0, 1], [0, 1, math.nan], [0, 1, "2"], (0, 1, 2), [[0, 1, 2]]):
+        with pytest.raises(ValueError, match="translations must be a flat list"):
+            check_flat_vectors(values, "translations")